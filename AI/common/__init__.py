@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 共通モジュール
+
+データ前処理（data/）・翌日予測（tomorrow/）・学習（train/）から共有する処理群。
+"""
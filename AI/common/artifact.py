@@ -0,0 +1,491 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - モデル成果物バンドルモジュール
+
+学習済みモデルと翌日予測に必要な情報を1ファイル（非圧縮 .npz）にまとめて保存する。
+翌日予測スクリプトはバンドルを1回読み込むだけで予測でき、学習データ（Xtrain.csv 等）を参照しない。
+
+保存形式（<モデル保存先の拡張子なし>.bundle.npz）:
+    meta            形式バージョン・モデル名・モデル形式・特徴量の列順・学習データのハッシュ・評価指標・
+                    学習モード（common/warm_start.py の追加学習の判定用）（JSON）
+    scaler_mean     特徴量標準化の平均（float64）
+    scaler_scale    特徴量標準化の標準偏差（float64）
+    feature_min     学習データの特徴量最小値（float64）
+    feature_max     学習データの特徴量最大値（float64）
+    target_scaler   目的変数標準化の平均・標準偏差（Keras のみ、float64 の2要素）
+    model           モデル本体（LightGBM: モデル文字列、Keras: モデル構成JSON、
+                    scikit-learn: ノード配列ファイルに変換できない推定器のみ pickle）
+    weight_<i>      Keras の重み配列（get_weights() の順、float32）
+
+Keras 形式は読み込み時に common/mlp.py の DenseMLP（NumPy 推論）として復元するため、
+翌日予測で TensorFlow を読み込まない（環境変数 AI_KERAS_NUMPY=0 で TensorFlow のモデルに戻す）。
+LightGBM / RandomForest はノード配列を別ファイル（<バンドル名>.trees、common/trees.py の形式）に保存し、
+読み込み時はメモリマップした TreeEnsemble を使用する。LightGBM の読み込みや推定器の unpickle を行わず、
+複数のプロセスで同じモデルを読み込んでもページキャッシュを共有する
+（環境変数 AI_TREE_NUMPY=0 で保存時のモデルに戻す）。バンドルの meta にノード配列ファイルの名前と照合用IDを記録する。
+RandomForest はノード配列ファイルを保存形式とし、バンドルに pickle を重複して格納しない。
+推定器そのものが必要な場合（AI_TREE_NUMPY=0・追加学習）は、学習スクリプトが保存した旧形式の .sav を
+meta に記録したハッシュで照合して読み込む（.sav がない・更新された場合はノード配列で推論）。
+
+追加学習の起点として読み込む場合（load_artifact(library_model=True)）は、常に学習ライブラリのモデル
+（lightgbm.Booster / Keras モデル / scikit-learn 推定器）を復元する。
+
+旧形式の .sav / _scaler.pkl は従来どおり学習スクリプトが保存し、バンドルがない場合の読み込みに使用する。
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from common.mlp import DenseMLP, is_numpy_inference_enabled
+from common.trees import TreeEnsemble, is_tree_inference_enabled
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+BUNDLE_SUFFIX = ".bundle.npz"
+TREE_FILE_SUFFIX = ".trees"
+LEGACY_MODEL_SUFFIX = ".sav"
+
+# モデル形式（バンドル内のモデル本体の保存形式）
+FORMAT_LIGHTGBM = "lightgbm"  # Booster.model_to_string()
+FORMAT_KERAS = "keras"        # model.to_json() + get_weights()
+FORMAT_SKLEARN = "sklearn"    # ノード配列ファイル（変換できない推定器は pickle）
+MODEL_FORMATS = (FORMAT_LIGHTGBM, FORMAT_KERAS, FORMAT_SKLEARN)
+
+
+@dataclass
+class ModelArtifact:
+    """学習済みモデルと翌日予測に必要な前処理情報"""
+    model_name: str
+    model_format: str
+    model: Any
+    feature_columns: List[str]
+    scaler_mean: np.ndarray
+    scaler_scale: np.ndarray
+    feature_min: np.ndarray
+    feature_max: np.ndarray
+    target_mean: Optional[float] = None
+    target_scale: Optional[float] = None
+    train_data_hash: str = ""
+    metrics: Dict[str, float] = field(default_factory=dict)
+    training: Dict[str, Any] = field(default_factory=dict)
+    created_at: str = ""
+    format_version: int = ARTIFACT_FORMAT_VERSION
+
+    @property
+    def n_features(self) -> int:
+        """特徴量数"""
+        return len(self.scaler_mean)
+
+    def select_features(self, frame) -> np.ndarray:
+        """
+        DataFrame から学習時の列順で特徴量を取り出す
+
+        Args:
+            frame: 特徴量を含む DataFrame（列順は問わない）
+
+        Returns:
+            np.ndarray: float32 の特徴量配列
+
+        Raises:
+            ValueError: 学習時の特徴量列が不足している場合
+        """
+        missing = [col for col in self.feature_columns if col not in frame.columns]
+        if missing:
+            raise ValueError(f"特徴量列が不足しています: {missing} (学習時の列: {self.feature_columns})")
+        return frame[self.feature_columns].to_numpy(dtype=np.float32)
+
+    def clip(self, X: np.ndarray) -> np.ndarray:
+        """学習データの範囲で特徴量をクリップする"""
+        return np.clip(X, self.feature_min, self.feature_max)
+
+    def scale(self, X: np.ndarray) -> np.ndarray:
+        """特徴量を標準化する（StandardScaler.transform と同じ計算）"""
+        X = np.array(X, dtype=np.float32)
+        X -= self.scaler_mean
+        X /= self.scaler_scale
+        return X
+
+    def scaler(self):
+        """保存済みパラメータから学習済み StandardScaler を復元する"""
+        from sklearn.preprocessing import StandardScaler
+        return _restore_scaler(StandardScaler(), self.scaler_mean, self.scaler_scale)
+
+    def target_scaler(self):
+        """目的変数の StandardScaler を復元する（目的変数を標準化していないモデルは None）"""
+        if self.target_mean is None:
+            return None
+        from sklearn.preprocessing import StandardScaler
+        return _restore_scaler(StandardScaler(), np.array([self.target_mean]), np.array([self.target_scale]))
+
+    def predict(self, X: np.ndarray, clip: bool = False) -> np.ndarray:
+        """
+        標準化前の特徴量から予測する（標準化・目的変数の逆変換を含む）
+
+        Args:
+            X: 特徴量（学習時の列順）
+            clip: 学習データの範囲でクリップしてから標準化するか
+
+        Returns:
+            np.ndarray: 予測値（1次元、kW）
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if clip:
+            X = self.clip(X)
+        X_scaled = self.scale(X)
+        if self.model_format == FORMAT_KERAS:
+            y = np.asarray(self.model.predict(X_scaled, verbose=0), dtype=np.float64)
+        else:
+            y = np.asarray(self.model.predict(X_scaled), dtype=np.float64)
+        y = y.reshape(-1)
+        if self.target_mean is not None:
+            y = y * self.target_scale + self.target_mean
+        return y
+
+
+def _restore_scaler(scaler, mean: np.ndarray, scale: np.ndarray):
+    """StandardScaler に学習済みの属性を設定する"""
+    scaler.mean_ = np.asarray(mean, dtype=np.float64)
+    scaler.scale_ = np.asarray(scale, dtype=np.float64)
+    scaler.var_ = scaler.scale_ ** 2
+    scaler.n_features_in_ = len(scaler.mean_)
+    scaler.n_samples_seen_ = 0
+    return scaler
+
+
+def bundle_path(model_path: str) -> str:
+    """モデル保存先（.sav / .h5）に対応するバンドルのパス"""
+    return os.path.splitext(model_path)[0] + BUNDLE_SUFFIX
+
+
+def file_hash(path: str) -> str:
+    """ファイル内容の SHA-256 の16進文字列"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def data_hash(*arrays: np.ndarray) -> str:
+    """
+    学習データの内容ハッシュ（形状・dtype・値）
+
+    Args:
+        arrays: ハッシュ対象の配列
+
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.shape}|{array.dtype}".encode("utf-8"))
+        digest.update(array)
+    return digest.hexdigest()
+
+
+def build_artifact(model_name: str, model_format: str, model: Any, scaler, X_train: np.ndarray,
+                   y_train: np.ndarray, feature_columns: Sequence[str],
+                   metrics: Optional[Dict[str, float]] = None, target_scaler=None,
+                   training: Optional[Dict[str, Any]] = None) -> ModelArtifact:
+    """
+    学習結果からバンドルを作成する
+
+    Args:
+        model_name: モデル名（"LightGBM" / "Keras" / "RandomForest"）
+        model_format: モデル形式（MODEL_FORMATS のいずれか）
+        model: 学習済みモデル
+        scaler: 学習データで fit 済みの特徴量 StandardScaler（None なら標準化なし）
+        X_train: 標準化前の学習用特徴量（特徴量範囲・ハッシュ用）
+        y_train: 学習用目的変数（ハッシュ用）
+        feature_columns: 特徴量の列名（学習時の列順）
+        metrics: 評価指標（rmse / r2 / mae）
+        target_scaler: 目的変数の StandardScaler（目的変数を標準化したモデルのみ）
+        training: 学習モード・前回の全体再学習日時（common/warm_start.training_info の戻り値）
+
+    Returns:
+        ModelArtifact: バンドル
+
+    Raises:
+        ValueError: 未対応のモデル形式・列名と特徴量数の不一致
+    """
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"未対応のモデル形式です: {model_format} (対応: {', '.join(MODEL_FORMATS)})")
+    X_train = np.asarray(X_train)
+    n_features = X_train.shape[1]
+    if len(feature_columns) != n_features:
+        raise ValueError(f"列名({len(feature_columns)})と特徴量数({n_features})が一致しません")
+    return ModelArtifact(
+        model_name=model_name,
+        model_format=model_format,
+        model=model,
+        feature_columns=list(feature_columns),
+        scaler_mean=np.zeros(n_features) if scaler is None else np.asarray(scaler.mean_, dtype=np.float64),
+        scaler_scale=np.ones(n_features) if scaler is None else np.asarray(scaler.scale_, dtype=np.float64),
+        feature_min=X_train.min(axis=0).astype(np.float64),
+        feature_max=X_train.max(axis=0).astype(np.float64),
+        target_mean=None if target_scaler is None else float(np.ravel(target_scaler.mean_)[0]),
+        target_scale=None if target_scaler is None else float(np.ravel(target_scaler.scale_)[0]),
+        train_data_hash=data_hash(X_train, np.asarray(y_train)),
+        metrics={key: float(value) for key, value in (metrics or {}).items()},
+        training=dict(training or {}),
+        created_at=datetime.datetime.now().isoformat(timespec="seconds"),
+    )
+
+
+def _bytes_array(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _encode_model(model_format: str, model: Any) -> Dict[str, np.ndarray]:
+    """モデル本体をバンドル用の配列に変換する"""
+    if model_format == FORMAT_LIGHTGBM:
+        booster = getattr(model, "booster_", model)
+        return {"model": _bytes_array(booster.model_to_string().encode("utf-8"))}
+    if model_format == FORMAT_KERAS:
+        arrays = {"model": _bytes_array(model.to_json().encode("utf-8"))}
+        for i, weight in enumerate(model.get_weights()):
+            arrays[f"weight_{i}"] = np.asarray(weight, dtype=np.float32)
+        return arrays
+    return {"model": _bytes_array(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))}
+
+
+def tree_file_path(path: str) -> str:
+    """バンドルに対応するノード配列ファイルのパス"""
+    if path.endswith(BUNDLE_SUFFIX):
+        path = path[:-len(BUNDLE_SUFFIX)]
+    return path + TREE_FILE_SUFFIX
+
+
+def _save_tree_ensemble(path: str, model_format: str, model: Any) -> Optional[Dict[str, str]]:
+    """
+    決定木モデルのノード配列ファイルを保存する（NumPy 推論用）
+
+    Returns:
+        Optional[Dict[str, str]]: meta に記録するファイル名と照合用ID（未対応のモデルは None）
+    """
+    try:
+        if model_format == FORMAT_LIGHTGBM:
+            ensemble = TreeEnsemble.from_lightgbm(model)
+        elif model_format == FORMAT_SKLEARN:
+            ensemble = TreeEnsemble.from_sklearn(model)
+        else:
+            return None
+    except ValueError as e:
+        logger.info(f"NumPy 推論用のノード配列を保存しません: {e}")
+        return None
+    tree_path = tree_file_path(path)
+    file_id = uuid.uuid4().hex
+    ensemble.save(tree_path, file_id)
+    logger.info(f"ノード配列を保存しました: {tree_path} ({ensemble.nbytes / 1024 / 1024:.1f}MB)")
+    return {"name": os.path.basename(tree_path), "file_id": file_id}
+
+
+def _load_tree_ensemble(path: str, meta: Dict[str, Any], required: bool = False) -> Optional[TreeEnsemble]:
+    """
+    バンドルに対応するノード配列ファイルをメモリマップする（ない・無効・読み込めない場合は None）
+
+    required なら AI_TREE_NUMPY=0 でも読み込む（バンドルに他のモデル本体がない場合）
+    """
+    tree_file = meta.get("tree_file")
+    if not tree_file or not (required or is_tree_inference_enabled()):
+        return None
+    tree_path = os.path.join(os.path.dirname(os.path.abspath(path)), tree_file["name"])
+    try:
+        return TreeEnsemble.load(tree_path, file_id=tree_file["file_id"])
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"ノード配列ファイルを読み込めません（保存時のモデルを使用）: {tree_path}, {e}")
+        return None
+
+
+def legacy_model_path(path: str) -> str:
+    """バンドルに対応する旧形式のモデルファイル（学習スクリプトが保存する .sav）のパス"""
+    if path.endswith(BUNDLE_SUFFIX):
+        path = path[:-len(BUNDLE_SUFFIX)]
+    return path + LEGACY_MODEL_SUFFIX
+
+
+def _reference_model_file(path: str) -> Optional[Dict[str, str]]:
+    """meta に記録する旧形式のモデルファイルの名前とハッシュ（ファイルがない場合は None）"""
+    model_path = legacy_model_path(path)
+    if not os.path.exists(model_path):
+        return None
+    return {"name": os.path.basename(model_path), "sha256": file_hash(model_path)}
+
+
+def _load_model_file(path: str, meta: Dict[str, Any]) -> Optional[Any]:
+    """meta に記録した旧形式のモデルファイルを読み込む（ない・保存後に更新された・読み込めない場合は None）"""
+    model_file = meta.get("model_file")
+    if not model_file:
+        return None
+    model_path = os.path.join(os.path.dirname(os.path.abspath(path)), model_file["name"])
+    try:
+        if file_hash(model_path) != model_file["sha256"]:
+            logger.warning(f"モデルファイルがバンドルの保存後に更新されています（使用しません）: {model_path}")
+            return None
+        with open(model_path, "rb") as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError) as e:
+        logger.warning(f"モデルファイルを読み込めません: {model_path}, {e}")
+        return None
+
+
+def _decode_model(model_format: str, payload: Dict[str, np.ndarray], library_model: bool = False) -> Any:
+    """バンドル内の配列からモデルを復元する（library_model なら Keras も TensorFlow のモデル）"""
+    data = payload["model"].tobytes()
+    if model_format == FORMAT_LIGHTGBM:
+        import lightgbm as lgb
+        return lgb.Booster(model_str=data.decode("utf-8"))
+    if model_format == FORMAT_KERAS:
+        n_weights = sum(1 for name in payload if name.startswith("weight_"))
+        weights = [payload[f"weight_{i}"] for i in range(n_weights)]
+        if is_numpy_inference_enabled() and not library_model:
+            try:
+                return DenseMLP.from_keras_config(data.decode("utf-8"), weights)
+            except ValueError as e:
+                logger.info(f"NumPy 推論に未対応のため TensorFlow でモデルを復元します: {e}")
+        from tensorflow.keras.models import model_from_json
+        model = model_from_json(data.decode("utf-8"))
+        model.set_weights(weights)
+        return model
+    return pickle.loads(data)
+
+
+def save_artifact(path: str, artifact: ModelArtifact) -> None:
+    """
+    バンドルを保存する（一時ファイル経由で置換するため、読み込み中のプロセスに影響しない）
+
+    Args:
+        path: 保存先（bundle_path の戻り値）
+        artifact: バンドル
+    """
+    meta = {
+        "format_version": artifact.format_version,
+        "model_name": artifact.model_name,
+        "model_format": artifact.model_format,
+        "feature_columns": artifact.feature_columns,
+        "train_data_hash": artifact.train_data_hash,
+        "metrics": artifact.metrics,
+        "training": artifact.training,
+        "created_at": artifact.created_at,
+    }
+    tree_file = _save_tree_ensemble(path, artifact.model_format, artifact.model)
+    model_arrays = _encode_model(artifact.model_format, artifact.model)
+    if tree_file is not None:
+        meta["tree_file"] = tree_file
+        if artifact.model_format == FORMAT_SKLEARN:
+            # ノード配列ファイルを保存形式とし、推定器は学習スクリプトが保存した .sav を参照する
+            del model_arrays["model"]
+            model_file = _reference_model_file(path)
+            if model_file is not None:
+                meta["model_file"] = model_file
+    arrays = {
+        "meta": _bytes_array(json.dumps(meta, ensure_ascii=False).encode("utf-8")),
+        "scaler_mean": artifact.scaler_mean,
+        "scaler_scale": artifact.scaler_scale,
+        "feature_min": artifact.feature_min,
+        "feature_max": artifact.feature_max,
+        **model_arrays,
+    }
+    if artifact.target_mean is not None:
+        arrays["target_scaler"] = np.array([artifact.target_mean, artifact.target_scale], dtype=np.float64)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    logger.info(f"モデルバンドルを保存しました: {path}")
+
+
+def load_artifact(path: str, library_model: bool = False) -> ModelArtifact:
+    """
+    バンドルを読み込む（ファイルを1回開き、必要な配列のみ読み込んでモデルも復元する）
+
+    Args:
+        path: バンドルのパス
+        library_model: Trueなら NumPy 推論を使わず学習ライブラリのモデルを復元する（追加学習用）
+
+    Returns:
+        ModelArtifact: バンドル
+
+    Raises:
+        FileNotFoundError: バンドルが存在しない場合
+        ValueError: 形式バージョン・モデル形式が未対応の場合、モデル本体を復元できない場合
+    """
+    with open(path, "rb") as f:
+        with np.load(f, allow_pickle=False) as npz:
+            meta = json.loads(npz["meta"].tobytes().decode("utf-8"))
+            if meta.get("format_version") != ARTIFACT_FORMAT_VERSION:
+                raise ValueError(f"未対応のバンドル形式バージョンです: {meta.get('format_version')} ({path})")
+            if meta.get("model_format") not in MODEL_FORMATS:
+                raise ValueError(f"未対応のモデル形式です: {meta.get('model_format')} ({path})")
+            model = None if library_model else _load_tree_ensemble(path, meta)
+            # ノード配列で推論する場合はモデル本体（pickle 等）を読み込まない
+            names = [name for name in npz.files if name != "meta" and not (model is not None and name == "model")]
+            payload = {name: npz[name] for name in names}
+
+    if model is None and "model" in payload:
+        model = _decode_model(meta["model_format"], payload, library_model)
+    elif model is None:
+        # RandomForest: 推定器は旧形式の .sav、使えなければノード配列（追加学習用にはノード配列は使わない）
+        model = _load_model_file(path, meta)
+        if model is None and not library_model:
+            model = _load_tree_ensemble(path, meta, required=True)
+        if model is None:
+            raise ValueError(f"モデル本体を復元できません: {path}")
+    target = payload.get("target_scaler")
+    return ModelArtifact(
+        model_name=meta["model_name"],
+        model_format=meta["model_format"],
+        model=model,
+        feature_columns=list(meta["feature_columns"]),
+        scaler_mean=payload["scaler_mean"],
+        scaler_scale=payload["scaler_scale"],
+        feature_min=payload["feature_min"],
+        feature_max=payload["feature_max"],
+        target_mean=None if target is None else float(target[0]),
+        target_scale=None if target is None else float(target[1]),
+        train_data_hash=meta.get("train_data_hash", ""),
+        metrics=dict(meta.get("metrics", {})),
+        training=dict(meta.get("training", {})),
+        created_at=meta.get("created_at", ""),
+        format_version=meta["format_version"],
+    )
+
+
+def find_artifact(model_path: str) -> Optional[ModelArtifact]:
+    """
+    モデル保存先に対応するバンドルを読み込む（なければ None。翌日予測の旧形式フォールバック用）
+
+    Args:
+        model_path: モデル保存先（.sav / .h5）
+
+    Returns:
+        Optional[ModelArtifact]: バンドル（存在しない・読み込めない場合は None）
+    """
+    path = bundle_path(model_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        return load_artifact(path)
+    except Exception as e:
+        logger.warning(f"モデルバンドルを読み込めません（旧形式のモデルファイルを使用）: {path}, {e}")
+        return None
@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - バイナリデータセットモジュール
+
+data/data.py が作成する学習データセットを、特徴量・目的変数の配列ファイル（.npy）と
+学習/テスト分割のテスト行マスクとして保存する（出力形式によらず常に保存）。
+各学習スクリプトは np.load(mmap_mode='r') でコピーなしに読み込める。
+学習・テスト別のCSV（Xtrain/Xtest/Ytrain/Ytest.csv）は、環境変数 AI_DATASET_SPLIT_CSV=1 の場合のみ
+従来の読み込み側向けに出力する。
+
+保存形式（data/dataset/ 配下）:
+    X.npy            特徴量（float32, 行数 × 特徴量数）
+    y.npy            目的変数（int32, 行数）
+    split.npy        テストデータの行マスク（bool, 行数。学習・テストのコピーは保存しない）
+    meta.json        列名・形状・形式バージョン（最後に書き込み、完了マーカーを兼ねる）
+"""
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+logger = logging.getLogger(__name__)
+
+DATASET_DIR_NAME = "dataset"
+DATASET_FORMAT_VERSION = 2
+FEATURE_DTYPE = np.float32
+TARGET_DTYPE = np.int32
+
+# 出力形式の指定（data/data.py の save_datasets で使用）
+FORMAT_ENV_VAR = "AI_DATASET_FORMAT"
+FORMAT_CSV = "csv"        # バイナリデータセット + 統合データCSV（X.csv / Y.csv）
+FORMAT_BINARY = "binary"  # バイナリデータセットのみ
+DATASET_FORMATS = (FORMAT_CSV, FORMAT_BINARY)
+# 学習・テスト別CSV（Xtrain/Xtest/Ytrain/Ytest.csv）の出力（既定は出力しない）
+SPLIT_CSV_ENV_VAR = "AI_DATASET_SPLIT_CSV"
+SOURCE_MEMORY = "memory"  # DatasetSplit.source: ファイルを経由せずメモリ上で分割（common/pipeline.py）
+
+_ARRAY_FILES = ("X", "y", "split")
+_META_FILE = "meta.json"
+
+
+@dataclass
+class DatasetSplit:
+    """学習・テストに分割済みのデータセット"""
+    X_train: np.ndarray
+    X_test: np.ndarray
+    y_train: np.ndarray
+    y_test: np.ndarray
+    feature_columns: List[str] = field(default_factory=list)
+    target_columns: List[str] = field(default_factory=list)
+    source: str = FORMAT_CSV  # 読み込み元（"csv" / "binary" / "memory"）
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """X_train, X_test, y_train, y_test のタプルを返す"""
+        return self.X_train, self.X_test, self.y_train, self.y_test
+
+    def astype(self, dtype) -> "DatasetSplit":
+        """全配列を指定dtypeに変換したデータセットを返す（dtypeが一致する配列はコピーしない）"""
+        return DatasetSplit(
+            X_train=_as_dtype(self.X_train, dtype),
+            X_test=_as_dtype(self.X_test, dtype),
+            y_train=_as_dtype(self.y_train, dtype),
+            y_test=_as_dtype(self.y_test, dtype),
+            feature_columns=list(self.feature_columns),
+            target_columns=list(self.target_columns),
+            source=self.source,
+        )
+
+
+def resolve_dataset_format(value: Optional[str] = None) -> str:
+    """
+    データセット出力形式を決定する
+
+    Args:
+        value: 明示指定（Noneなら環境変数 AI_DATASET_FORMAT、未設定なら "csv"）
+
+    Returns:
+        str: "csv" / "binary"
+
+    Raises:
+        ValueError: 未対応の形式が指定された場合
+    """
+    if value is None:
+        value = os.environ.get(FORMAT_ENV_VAR, FORMAT_CSV)
+    value = value.strip().lower() or FORMAT_CSV
+    if value not in DATASET_FORMATS:
+        raise ValueError(f"未対応のデータセット形式です: {value} (対応: {', '.join(DATASET_FORMATS)})")
+    return value
+
+
+def is_split_csv_enabled() -> bool:
+    """
+    学習・テスト別CSVを出力するか判定する
+
+    Returns:
+        bool: 環境変数 AI_DATASET_SPLIT_CSV が有効値（"1"/"true"/"on" など）ならTrue（既定は出力しない）
+    """
+    value = os.environ.get(SPLIT_CSV_ENV_VAR, "0").strip().lower()
+    return value not in ("", "0", "false", "off", "no")
+
+
+def get_dataset_dir(data_dir: str) -> str:
+    """データディレクトリ配下のバイナリデータセット保存先を返す"""
+    return os.path.join(data_dir, DATASET_DIR_NAME)
+
+
+def _save_npy_atomic(path: str, array: np.ndarray) -> None:
+    """一時ファイル経由で .npy を書き込み、置換する（読み込み中のプロセスに影響しない）"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array, allow_pickle=False)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def split_test_mask(n_rows: int, test_size: float) -> np.ndarray:
+    """
+    学習・テスト分割をテスト行マスクとして作成する
+
+    train_test_split(shuffle=False) と同じ行数配分（末尾 test_size 割合がテスト）になる。
+
+    Args:
+        n_rows: 行数
+        test_size: テストデータの割合
+
+    Returns:
+        np.ndarray: テスト行なら True の bool 配列
+    """
+    _, test_index = train_test_split(np.arange(n_rows), test_size=test_size, shuffle=False)
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[test_index] = True
+    return mask
+
+
+def save_binary_dataset(dataset_dir: str, X: np.ndarray, y: np.ndarray, test_mask: np.ndarray,
+                        feature_columns: Sequence[str], target_columns: Sequence[str],
+                        extra_meta: Optional[Dict] = None) -> str:
+    """
+    バイナリデータセットを保存する
+
+    Args:
+        dataset_dir: 保存先ディレクトリ
+        X: 特徴量（行数 × 特徴量数）
+        y: 目的変数（行数、または行数 × 1）
+        test_mask: テスト行マスク（bool, 行数）
+        feature_columns: 特徴量の列名
+        target_columns: 目的変数の列名
+        extra_meta: meta.json に追記する情報
+
+    Returns:
+        str: 保存先ディレクトリ
+
+    Raises:
+        ValueError: 配列の形状・インデックスが不正な場合
+    """
+    X = np.ascontiguousarray(X, dtype=FEATURE_DTYPE)
+    y = np.ascontiguousarray(np.asarray(y).reshape(-1), dtype=TARGET_DTYPE)
+    test_mask = np.asarray(test_mask, dtype=bool).reshape(-1)
+
+    if X.ndim != 2 or X.shape[0] != y.shape[0]:
+        raise ValueError(f"特徴量と目的変数の形状が一致しません: X={X.shape}, y={y.shape}")
+    if X.shape[1] != len(feature_columns):
+        raise ValueError(f"特徴量の列数が列名と一致しません: {X.shape[1]} != {len(feature_columns)}")
+    if test_mask.shape[0] != X.shape[0]:
+        raise ValueError(f"分割マスクの行数が一致しません: {test_mask.shape[0]} != {X.shape[0]}")
+
+    os.makedirs(dataset_dir, exist_ok=True)
+    # 書き込み中の不整合を検出できるよう、完了マーカー（meta.json）を先に削除
+    meta_path = os.path.join(dataset_dir, _META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    arrays = {"X": X, "y": y, "split": test_mask}
+    for name in _ARRAY_FILES:
+        _save_npy_atomic(os.path.join(dataset_dir, f"{name}.npy"), arrays[name])
+
+    meta = {
+        "version": DATASET_FORMAT_VERSION,
+        "n_rows": int(X.shape[0]),
+        "feature_columns": list(feature_columns),
+        "target_columns": list(target_columns),
+        "n_train": int((~test_mask).sum()),
+        "n_test": int(test_mask.sum()),
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"バイナリデータセット保存完了: {dataset_dir} ({X.shape[0]:,}行)")
+    return dataset_dir
+
+
+def read_dataset_meta(dataset_dir: str) -> Optional[Dict]:
+    """meta.json を読み込む（存在しない・形式バージョン不一致ならNone）"""
+    meta_path = os.path.join(dataset_dir, _META_FILE)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != DATASET_FORMAT_VERSION:
+        return None
+    return meta
+
+
+def find_binary_dataset(csv_path: str) -> Optional[str]:
+    """
+    CSVパスに対応するバイナリデータセットを探す
+
+    CSVと同じディレクトリの dataset/ が完成済みで、かつCSVより新しい
+    （またはCSVが存在しない）場合のみ対象とする。
+
+    Args:
+        csv_path: 学習用CSVパス（例: data/Xtrain.csv）
+
+    Returns:
+        Optional[str]: データセットディレクトリ、見つからなければNone
+    """
+    dataset_dir = get_dataset_dir(os.path.dirname(os.path.abspath(csv_path)))
+    if read_dataset_meta(dataset_dir) is None:
+        return None
+    if os.path.exists(csv_path):
+        meta_mtime = os.stat(os.path.join(dataset_dir, _META_FILE)).st_mtime_ns
+        if os.stat(csv_path).st_mtime_ns > meta_mtime:
+            return None
+    return dataset_dir
+
+
+def _take_rows(array: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """行マスクの対象が連続範囲ならスライス（ビュー）、それ以外はコピーで取り出す"""
+    index = np.flatnonzero(mask)
+    if index.size == 0:
+        return array[:0]
+    start, stop = int(index[0]), int(index[-1]) + 1
+    if stop - start == index.size:
+        return array[start:stop]
+    return array[index]
+
+
+def _as_dtype(array: np.ndarray, dtype) -> np.ndarray:
+    """dtypeが一致すればコピーせずに返す"""
+    return array if dtype is None else array.astype(dtype, copy=False)
+
+
+def split_arrays(X: np.ndarray, y: np.ndarray, test_mask: np.ndarray,
+                 feature_columns: Sequence[str], target_columns: Sequence[str],
+                 dtype=FEATURE_DTYPE) -> DatasetSplit:
+    """
+    メモリ上の特徴量・目的変数をテスト行マスクで学習・テストに分割する
+
+    CSV・バイナリデータセットを経由した場合と同じdtype・形状（目的変数は1次元）になる。
+
+    Args:
+        X: 特徴量（行数 × 特徴量数）
+        y: 目的変数（行数、または行数 × 1）
+        test_mask: テスト行マスク（bool, 行数）
+        feature_columns: 特徴量の列名
+        target_columns: 目的変数の列名
+        dtype: 変換先のdtype
+
+    Returns:
+        DatasetSplit: 分割済みデータセット（連続範囲の分割は変換後配列のビュー）
+
+    Raises:
+        ValueError: 配列の行数が一致しない場合
+    """
+    X = _as_dtype(np.asarray(X), dtype)
+    y = _as_dtype(np.asarray(y).reshape(-1), dtype)
+    test_mask = np.asarray(test_mask, dtype=bool).reshape(-1)
+    if not (X.shape[0] == y.shape[0] == test_mask.shape[0]):
+        raise ValueError(f"行数が一致しません: X={X.shape[0]}, y={y.shape[0]}, split={test_mask.shape[0]}")
+
+    return DatasetSplit(
+        X_train=_take_rows(X, ~test_mask),
+        X_test=_take_rows(X, test_mask),
+        y_train=_take_rows(y, ~test_mask),
+        y_test=_take_rows(y, test_mask),
+        feature_columns=list(feature_columns),
+        target_columns=list(target_columns),
+        source=SOURCE_MEMORY,
+    )
+
+
+def load_binary_dataset(dataset_dir: str, dtype=None, mmap: bool = True) -> DatasetSplit:
+    """
+    バイナリデータセットを読み込み、学習・テストに分割する
+
+    Args:
+        dataset_dir: データセットディレクトリ
+        dtype: 変換先のdtype（Noneなら保存時のdtype。特徴量と一致すればコピーなし）
+        mmap: Trueなら np.load(mmap_mode='r') でメモリマップとして読み込む
+
+    Returns:
+        DatasetSplit: 分割済みデータセット（連続範囲の分割はメモリマップのビュー）
+
+    Raises:
+        FileNotFoundError: データセットが存在しない・未完成の場合
+    """
+    meta = read_dataset_meta(dataset_dir)
+    if meta is None:
+        raise FileNotFoundError(f"バイナリデータセットが見つかりません: {dataset_dir}")
+
+    mmap_mode = "r" if mmap else None
+    arrays = {name: np.load(os.path.join(dataset_dir, f"{name}.npy"), mmap_mode=mmap_mode, allow_pickle=False)
+              for name in _ARRAY_FILES}
+    test_mask = np.asarray(arrays["split"])
+
+    X, y = arrays["X"], arrays["y"]
+    return DatasetSplit(
+        X_train=_as_dtype(_take_rows(X, ~test_mask), dtype),
+        X_test=_as_dtype(_take_rows(X, test_mask), dtype),
+        y_train=_as_dtype(_take_rows(y, ~test_mask), dtype),
+        y_test=_as_dtype(_take_rows(y, test_mask), dtype),
+        feature_columns=list(meta.get("feature_columns", [])),
+        target_columns=list(meta.get("target_columns", [])),
+        source=FORMAT_BINARY,
+    )
+
+
+def load_training_split(xtrain_csv: str, xtest_csv: str, ytrain_csv: str, ytest_csv: str,
+                        dtype=FEATURE_DTYPE, mmap: bool = True) -> DatasetSplit:
+    """
+    学習・テストデータを読み込む（バイナリデータセット優先、なければCSV）
+
+    Args:
+        xtrain_csv: 学習用特徴量CSVパス
+        xtest_csv: テスト用特徴量CSVパス
+        ytrain_csv: 学習用目的変数CSVパス
+        ytest_csv: テスト用目的変数CSVパス
+        dtype: 変換先のdtype
+        mmap: バイナリデータセットをメモリマップで読み込むか
+
+    Returns:
+        DatasetSplit: 分割済みデータセット（目的変数は1次元）
+    """
+    dataset_dir = find_binary_dataset(xtrain_csv)
+    if dataset_dir is not None:
+        split = load_binary_dataset(dataset_dir, dtype=dtype, mmap=mmap)
+        logger.info(f"バイナリデータセットを読み込みました: {dataset_dir}")
+        return split
+
+    X_train_df = pd.read_csv(xtrain_csv)
+    y_train_df = pd.read_csv(ytrain_csv)
+    return DatasetSplit(
+        X_train=X_train_df.to_numpy().astype(dtype),
+        X_test=pd.read_csv(xtest_csv).to_numpy().astype(dtype),
+        y_train=y_train_df.values.astype(dtype).flatten(),
+        y_test=pd.read_csv(ytest_csv).values.astype(dtype).flatten(),
+        feature_columns=list(X_train_df.columns),
+        target_columns=list(y_train_df.columns),
+        source=FORMAT_CSV,
+    )
+
+
+# CSVファイル名 → (配列名, 分割) の対応（data/data.py の出力ファイル名）
+_CSV_PARTS = {
+    "x": ("X", None), "y": ("y", None),
+    "xtrain": ("X", "train"), "xtest": ("X", "test"),
+    "ytrain": ("y", "train"), "ytest": ("y", "test"),
+}
+
+
+def load_dataset_array(csv_path: str, dtype=None) -> np.ndarray:
+    """
+    データセットCSV1ファイル分の配列を読み込む（バイナリデータセット優先、なければCSV）
+
+    Args:
+        csv_path: X.csv / Y.csv / Xtrain.csv / Xtest.csv / Ytrain.csv / Ytest.csv のパス
+        dtype: 変換先のdtype（Noneなら変換しない）
+
+    Returns:
+        np.ndarray: CSVの pd.read_csv(...).values と同じ形状（目的変数は 行数 × 1）の配列
+
+    Raises:
+        FileNotFoundError: CSV・バイナリデータセットのいずれも存在しない場合
+    """
+    part = _CSV_PARTS.get(os.path.splitext(os.path.basename(csv_path))[0].lower())
+    dataset_dir = find_binary_dataset(csv_path) if part else None
+    if dataset_dir is None:
+        values = pd.read_csv(csv_path).values
+        return values if dtype is None else values.astype(dtype)
+
+    name, subset = part
+    array = np.load(os.path.join(dataset_dir, f"{name}.npy"), mmap_mode="r", allow_pickle=False)
+    if subset is not None:
+        test_mask = np.load(os.path.join(dataset_dir, "split.npy"), allow_pickle=False)
+        array = _take_rows(array, test_mask if subset == "test" else ~test_mask)
+    if array.ndim == 1:
+        array = array.reshape(-1, 1)
+    return _as_dtype(array, dtype)
+
+
+def load_feature_frame(xtrain_csv: str) -> pd.DataFrame:
+    """
+    学習用特徴量を列名付きDataFrameで読み込む（翌日予測のスケーラー作成用）
+
+    バイナリデータセットから読み込む場合も、CSV経由と同じ値になるよう
+    float32 の最短10進表記を float64 に変換する（CSV書き出し・再読み込みと等価）。
+
+    Args:
+        xtrain_csv: 学習用特徴量CSVパス
+
+    Returns:
+        pd.DataFrame: 学習用特徴量
+    """
+    dataset_dir = find_binary_dataset(xtrain_csv)
+    if dataset_dir is None:
+        return pd.read_csv(xtrain_csv)
+    values = load_dataset_array(xtrain_csv).astype(str).astype(np.float64)
+    return pd.DataFrame(values, columns=read_dataset_meta(dataset_dir)["feature_columns"])
+
+
+def read_feature_columns(xtrain_csv: str) -> List[str]:
+    """
+    学習用特徴量の列名を読み込む（バイナリデータセットはメタ情報、CSVはヘッダー行のみ）
+
+    Args:
+        xtrain_csv: 学習用特徴量CSVパス
+
+    Returns:
+        List[str]: 特徴量の列名（列順）
+    """
+    dataset_dir = find_binary_dataset(xtrain_csv)
+    if dataset_dir is not None:
+        return list(read_dataset_meta(dataset_dir)["feature_columns"])
+    return list(pd.read_csv(xtrain_csv, nrows=0).columns)
+
+
+def dataset_exists(csv_path: str) -> bool:
+    """CSVまたは対応するバイナリデータセットが存在するか"""
+    return os.path.exists(csv_path) or find_binary_dataset(csv_path) is not None
+
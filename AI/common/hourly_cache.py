@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 時間別値の永続キャッシュモジュール
+
+Open-Meteo 等から取得した1時間単位の値（気温など）を、地点キー単位で .npz に保存する。
+
+- 取得時点で既に確定していた過去の時間（final）は期限なしで保持する
+- 予測値など未確定の時間は ttl_seconds 経過で期限切れとし、再取得対象にする
+
+保存形式（キャッシュディレクトリ配下）:
+    <key>.npz      HOURS（datetime64[h]、昇順・重複なし）, VALUES（float64）,
+                   FINAL（bool）, FETCHED_AT（取得時刻、UNIX秒）
+"""
+
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = ("HOURS", "VALUES", "FINAL", "FETCHED_AT")
+
+
+def as_hours(values) -> np.ndarray:
+    """日時配列を1時間単位の datetime64[h] に変換する"""
+    return np.asarray(values, dtype="datetime64[h]")
+
+
+def _empty() -> Dict[str, np.ndarray]:
+    return {
+        "HOURS": np.array([], dtype="datetime64[h]"),
+        "VALUES": np.array([], dtype=np.float64),
+        "FINAL": np.array([], dtype=bool),
+        "FETCHED_AT": np.array([], dtype=np.float64),
+    }
+
+
+def _lookup(entry: Dict[str, np.ndarray], hours: np.ndarray):
+    """hours の各時間が保存済みか（found）と保存位置（pos）を返す"""
+    pos = np.searchsorted(entry["HOURS"], hours)
+    found = pos < len(entry["HOURS"])
+    found[found] = entry["HOURS"][pos[found]] == hours[found]
+    return found, pos[found]
+
+
+class HourlyValueCache:
+    """地点キー単位の時間別値キャッシュ（確定値は永続、未確定値はTTL）"""
+
+    def __init__(self, cache_dir: str, ttl_seconds: float, final_lag_hours: int = 0):
+        """
+        Args:
+            cache_dir: キャッシュディレクトリ
+            ttl_seconds: 未確定の時間の有効期間（秒）
+            final_lag_hours: 取得時点からこの時間数以上前の時間を確定値として扱う
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.final_lag_hours = final_lag_hours
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        """キーに対応するキャッシュファイルパス"""
+        return os.path.join(self.cache_dir, re.sub(r"[^0-9A-Za-z._-]", "-", key) + ".npz")
+
+    def _load(self, key: str) -> Dict[str, np.ndarray]:
+        # 他プロセスの更新を取りこぼさないよう毎回ファイルから読み込む（1地点1年分でも数百KB）
+        path = self.path(key)
+        if not os.path.exists(path):
+            return _empty()
+        try:
+            with np.load(path, allow_pickle=False) as payload:
+                return {name: payload[name] for name in _FIELDS}
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"時間別キャッシュの読み込みに失敗しました（破棄して再取得）: {path}, {e}")
+            return _empty()
+
+    def stale_mask(self, key: str, hours: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """
+        取得が必要な時間（未保存・期限切れ）を判定する
+
+        Args:
+            key: 地点キー
+            hours: 対象時間（datetime64[h]）
+            now: 現在時刻（UNIX秒、Noneなら time.time()）
+
+        Returns:
+            np.ndarray: hours と同じ長さの bool 配列（True が取得対象）
+        """
+        hours = as_hours(hours)
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._load(key)
+            found, idx = _lookup(entry, hours)
+            fresh = np.zeros(len(hours), dtype=bool)
+            fresh[found] = entry["FINAL"][idx] | (now - entry["FETCHED_AT"][idx] < self.ttl_seconds)
+        return ~fresh
+
+    def get(self, key: str, hours: np.ndarray) -> np.ndarray:
+        """
+        保存済みの値を取得する
+
+        Args:
+            key: 地点キー
+            hours: 対象時間（datetime64[h]）
+
+        Returns:
+            np.ndarray: 値（未保存の時間は NaN）
+        """
+        hours = as_hours(hours)
+        with self._lock:
+            entry = self._load(key)
+            found, idx = _lookup(entry, hours)
+            values = np.full(len(hours), np.nan)
+            values[found] = entry["VALUES"][idx]
+        return values
+
+    def update(self, key: str, hours: np.ndarray, values: np.ndarray,
+               local_now: np.datetime64, now: Optional[float] = None) -> None:
+        """
+        取得した値を保存する（同じ時間は新しい値で上書き。ただし確定済みの時間は変更しない）
+
+        Args:
+            key: 地点キー
+            hours: 取得した時間（datetime64[h]、値と同じ時刻系）
+            values: 取得した値
+            local_now: hours と同じ時刻系での現在時刻（確定判定に使用）
+            now: 現在時刻（UNIX秒、Noneなら time.time()）
+        """
+        hours = as_hours(hours)
+        values = np.asarray(values, dtype=np.float64)
+        now = time.time() if now is None else now
+        final = hours <= as_hours(local_now) - np.timedelta64(self.final_lag_hours, "h")
+        # 欠損値（NaN）は確定扱いにしない（後で値が入る可能性がある）
+        final &= ~np.isnan(values)
+
+        with self._lock:
+            entry = self._load(key)
+            # 日付単位の取得で含まれた確定済みの時間は既存の値を維持
+            incoming = ~np.isin(hours, entry["HOURS"][entry["FINAL"]])
+            hours, values, final = hours[incoming], values[incoming], final[incoming]
+            keep = ~np.isin(entry["HOURS"], hours)
+            merged = {
+                "HOURS": np.concatenate([entry["HOURS"][keep], hours]),
+                "VALUES": np.concatenate([entry["VALUES"][keep], values]),
+                "FINAL": np.concatenate([entry["FINAL"][keep], final]),
+                "FETCHED_AT": np.concatenate([entry["FETCHED_AT"][keep], np.full(len(hours), now)]),
+            }
+            order = np.argsort(merged["HOURS"], kind="mergesort")
+            merged = {name: array[order] for name, array in merged.items()}
+            self._save(key, merged)
+
+    def _save(self, key: str, entry: Dict[str, np.ndarray]) -> None:
+        path = self.path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, **entry)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        except OSError as e:
+            # キャッシュ保存失敗は処理を止めない
+            logger.warning(f"時間別キャッシュの保存に失敗しました: {path}, {e}")
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 条件付きGETダウンロードキャッシュモジュール
+
+外部データ（TEPCO月別ZIP等）のダウンロード結果を、検証子（ETag / Last-Modified）・
+内容ハッシュ（SHA-256）とパース済み配列（.npz）としてURL単位で保存する。
+
+- 次回以降は If-None-Match / If-Modified-Since を付けて要求し、304 Not Modified なら
+  保存済みの配列をそのまま使う（再ダウンロード・再パースなし）
+- サーバーが検証子を返さない・無視する場合も、内容ハッシュが一致すれば再パースしない
+
+保存形式（キャッシュディレクトリ配下、URLのハッシュをファイル名に使用）:
+    <key>.npz      パース済み配列
+    <key>.json     URL・検証子・内容ハッシュ（最後に書き込み、完了マーカーを兼ねる）
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+CACHE_ENV_VAR = "AI_DOWNLOAD_CACHE"  # "0"/"false"/"off" でキャッシュ無効化
+
+
+def is_download_cache_enabled() -> bool:
+    """
+    ダウンロードキャッシュが有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_DOWNLOAD_CACHE が無効値でなければTrue
+    """
+    value = os.environ.get(CACHE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+
+def content_digest(content: bytes) -> str:
+    """ダウンロード内容のSHA-256ハッシュを計算する"""
+    return hashlib.sha256(content).hexdigest()
+
+
+def spool_response(response, max_memory_bytes: int,
+                   chunk_size: int = 64 * 1024) -> Tuple[tempfile.SpooledTemporaryFile, str]:
+    """
+    ストリーミングレスポンスを一時ファイルに書き出しながら内容ハッシュを計算する
+
+    max_memory_bytes を超えるまではメモリ上、超えた分はディスク上の一時ファイルに保持するため、
+    ダウンロードサイズに関わらずメモリ使用量は一定以下に収まる。
+
+    Args:
+        response: stream=True で取得した requests のレスポンス
+        max_memory_bytes: メモリ上に保持する最大サイズ
+        chunk_size: 読み込み単位
+
+    Returns:
+        Tuple[SpooledTemporaryFile, str]: 先頭にシーク済みの一時ファイル（呼び出し側で close）, SHA-256ハッシュ
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory_bytes)
+    digest = hashlib.sha256()
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                digest.update(chunk)
+                spool.write(chunk)
+        spool.seek(0)
+    except BaseException:
+        spool.close()
+        raise
+    return spool, digest.hexdigest()
+
+
+def _write_atomic(path: str, write) -> None:
+    """一時ファイル経由で書き込み、置換する（読み込み中のプロセスに影響しない）"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ConditionalDownloadCache:
+    """URL単位の条件付きGETキャッシュ（検証子・内容ハッシュ・パース済み配列）"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _paths(self, url: str):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".npz"
+
+    def read_meta(self, url: str) -> Optional[Dict]:
+        """
+        保存済みメタデータを読み込む
+
+        Args:
+            url: ダウンロードURL
+
+        Returns:
+            Optional[Dict]: メタデータ（未保存・形式バージョン不一致・URL不一致・配列欠落ならNone）
+        """
+        meta_path, payload_path = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_FORMAT_VERSION or meta.get("url") != url:
+            return None
+        if not os.path.exists(payload_path):
+            return None
+        return meta
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        条件付きGET用のリクエストヘッダーを作成する
+
+        Args:
+            url: ダウンロードURL
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since（キャッシュがなければ空）
+        """
+        meta = self.read_meta(url)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str, digest: Optional[str] = None) -> Optional[Dict[str, np.ndarray]]:
+        """
+        保存済みのパース済み配列を読み込む
+
+        Args:
+            url: ダウンロードURL
+            digest: 内容ハッシュ（指定時は保存済みハッシュと一致する場合のみ返す）
+
+        Returns:
+            Optional[Dict[str, np.ndarray]]: 配列名と配列のマッピング、該当なしならNone
+        """
+        meta = self.read_meta(url)
+        if meta is None or (digest is not None and meta.get("sha256") != digest):
+            return None
+        _, payload_path = self._paths(url)
+        try:
+            with np.load(payload_path, allow_pickle=False) as payload:
+                return {name: payload[name] for name in payload.files}
+        except (OSError, ValueError) as e:
+            logger.warning(f"ダウンロードキャッシュの読み込みに失敗しました: {url}, {e}")
+            return None
+
+    def store(self, url: str, response_headers: Mapping[str, str], digest: str,
+              arrays: Optional[Dict[str, np.ndarray]] = None) -> None:
+        """
+        検証子・内容ハッシュとパース済み配列を保存する
+
+        Args:
+            url: ダウンロードURL
+            response_headers: レスポンスヘッダー（ETag / Last-Modified を記録）
+            digest: 内容ハッシュ
+            arrays: パース済み配列（Noneなら保存済み配列を維持して検証子のみ更新）
+        """
+        meta_path, payload_path = self._paths(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if arrays is not None:
+                _write_atomic(payload_path, lambda f: np.savez(f, **arrays))
+            meta = {
+                "version": CACHE_FORMAT_VERSION,
+                "url": url,
+                "etag": response_headers.get("ETag"),
+                "last_modified": response_headers.get("Last-Modified"),
+                "sha256": digest,
+                "stored_at": time.time(),
+            }
+            data = json.dumps(meta, ensure_ascii=False, indent=2).encode("utf-8")
+            _write_atomic(meta_path, lambda f: f.write(data))
+        except OSError as e:
+            # キャッシュ保存失敗は処理を止めない
+            logger.warning(f"ダウンロードキャッシュの保存に失敗しました: {url}, {e}")
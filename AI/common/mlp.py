@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - Keras 全結合ネットワークの NumPy 推論モジュール
+
+Keras_train.py の create_keras_model が作成する Dense / Dropout の Sequential モデルを、
+TensorFlow を読み込まずに NumPy の行列積で推論する。
+Dropout は推論時には何もしないため除外し、Dense 層の重み・バイアス・活性化関数のみを保持する。
+
+モデルバンドル（common/artifact.py）の Keras 形式はモデル構成JSONと重み配列を保存しているため、
+翌日予測ではバンドルから直接 DenseMLP を作成する（未対応のレイヤーを含む場合のみ TensorFlow を使用）。
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Sequence, Union
+
+import numpy as np
+
+NUMPY_INFERENCE_ENV_VAR = "AI_KERAS_NUMPY"
+
+# 推論時に何もしないレイヤー
+PASSTHROUGH_LAYERS = ("InputLayer", "Dropout", "GaussianNoise", "GaussianDropout", "AlphaDropout")
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+
+ACTIVATIONS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "linear": lambda x: x,
+    "relu": lambda x: np.maximum(x, 0, out=x),
+    "tanh": np.tanh,
+    "sigmoid": _sigmoid,
+    "softplus": lambda x: np.logaddexp(x, 0),
+    "elu": lambda x: np.where(x > 0, x, np.expm1(np.minimum(x, 0))),
+}
+
+
+def is_numpy_inference_enabled() -> bool:
+    """
+    Keras モデルの NumPy 推論が有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_KERAS_NUMPY が無効値でなければTrue
+    """
+    value = os.environ.get(NUMPY_INFERENCE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+
+@dataclass
+class DenseLayer:
+    """全結合層（kernel: 入力次元×出力次元、bias: 出力次元）"""
+    kernel: np.ndarray
+    bias: np.ndarray
+    activation: str
+
+
+class DenseMLP:
+    """
+    Dense 層のみの Sequential モデルの NumPy 推論
+
+    Keras モデルと同じく float32 で計算し、predict は (行数, 出力次元) の配列を返す。
+    """
+
+    def __init__(self, layers: Sequence[DenseLayer]):
+        if not layers:
+            raise ValueError("Dense 層がありません")
+        for i, layer in enumerate(layers):
+            if layer.activation not in ACTIVATIONS:
+                raise ValueError(f"未対応の活性化関数です: {layer.activation} (層 {i})")
+            if i > 0 and layers[i - 1].kernel.shape[1] != layer.kernel.shape[0]:
+                raise ValueError(f"層 {i} の入力次元が前の層の出力次元と一致しません")
+        self.layers: List[DenseLayer] = list(layers)
+
+    @property
+    def input_dim(self) -> int:
+        """入力次元数"""
+        return self.layers[0].kernel.shape[0]
+
+    @classmethod
+    def from_keras_config(cls, model_config: Union[str, dict], weights: Sequence[np.ndarray]) -> "DenseMLP":
+        """
+        Keras の Sequential モデル構成（to_json の出力）と get_weights() の重みから作成する
+
+        Args:
+            model_config: model.to_json() の文字列、またはそれを読み込んだ辞書
+            weights: model.get_weights() の重み配列（レイヤー順）
+
+        Returns:
+            DenseMLP: NumPy 推論モデル
+
+        Raises:
+            ValueError: Sequential 以外・未対応のレイヤー・重みの数や形状の不一致
+        """
+        if isinstance(model_config, str):
+            model_config = json.loads(model_config)
+        if model_config.get("class_name") != "Sequential":
+            raise ValueError(f"Sequential 以外のモデルには対応していません: {model_config.get('class_name')}")
+
+        weights = list(weights)
+        layers = []
+        position = 0
+        for layer in model_config["config"]["layers"]:
+            class_name = layer["class_name"]
+            if class_name in PASSTHROUGH_LAYERS:
+                continue
+            if class_name != "Dense":
+                raise ValueError(f"未対応のレイヤーです: {class_name}")
+            layer_config = layer["config"]
+            kernel = np.asarray(weights[position], dtype=np.float32)
+            position += 1
+            if layer_config.get("use_bias", True):
+                bias = np.asarray(weights[position], dtype=np.float32)
+                position += 1
+            else:
+                bias = np.zeros(kernel.shape[1], dtype=np.float32)
+            if kernel.ndim != 2 or kernel.shape[1] != layer_config["units"] or bias.shape != (kernel.shape[1],):
+                raise ValueError(f"Dense 層 {layer_config.get('name')} の重みの形状が構成と一致しません")
+            activation = layer_config.get("activation", "linear")
+            if isinstance(activation, dict):
+                activation = activation.get("config", {}).get("name", activation.get("class_name"))
+            layers.append(DenseLayer(kernel, bias, activation))
+        if position != len(weights):
+            raise ValueError(f"重みの数({len(weights)})がモデル構成と一致しません（使用: {position}）")
+        return cls(layers)
+
+    @classmethod
+    def from_keras_model(cls, model) -> "DenseMLP":
+        """学習済み Keras モデルから作成する（学習スクリプト・テスト用）"""
+        return cls.from_keras_config(model.to_json(), model.get_weights())
+
+    def predict(self, X: np.ndarray, verbose: int = 0, batch_size: int = None) -> np.ndarray:
+        """
+        順伝播で予測する（Keras の model.predict と同じ呼び出し方に対応）
+
+        Args:
+            X: 標準化済みの特徴量（行数×入力次元）
+            verbose: 未使用（Keras との互換用）
+            batch_size: 未使用（Keras との互換用）
+
+        Returns:
+            np.ndarray: float32 の予測値（行数×出力次元）
+
+        Raises:
+            ValueError: 特徴量数が入力次元と一致しない場合
+        """
+        h = np.asarray(X, dtype=np.float32)
+        if h.ndim != 2 or h.shape[1] != self.input_dim:
+            raise ValueError(f"特徴量数({h.shape[-1]})がモデルの入力次元({self.input_dim})と一致しません")
+        for layer in self.layers:
+            h = h @ layer.kernel
+            h += layer.bias
+            h = ACTIVATIONS[layer.activation](h)
+        return h
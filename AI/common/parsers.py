@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 高速CSVパーサーモジュール
+
+TEPCO電力需要実績（juyo-YYYY.csv・日別ZIP内CSV）と気象庁気温データ
+（temperature-YYYY.csv）の各レイアウトを、行単位のPython処理なしで
+エポック時間（1970-01-01 00:00 からの経過時間）配列と型付き値配列に変換する。
+
+区切り文字（/ : 空白）をカンマに置換して全項目を数値列として pandas の C パーサーで
+読み込み、日付の妥当性判定・経過時間の計算は NumPy のベクトル演算で行う。
+"""
+
+import io
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 日時項目の区切り文字（カンマに統一して数値列として読み込む）
+_DELIMITER_TABLE = bytes.maketrans(b"/: ", b",,,")
+# 時刻の範囲表記（例: "0:00〜1:00"）の区切り文字候補
+_RANGE_MARKS = ("〜", "～")
+
+# 1行あたりの日時項目数（年, 月, 日, 時, 分）
+_JUYO_DATETIME_FIELDS = 5
+# 気象庁形式の日時項目数（年, 月, 日, 時, 分, 秒）
+_JMA_DATETIME_FIELDS = 6
+# 気象庁形式の1地点あたりの列数（気温, 品質情報, 均質番号）
+_JMA_FIELDS_PER_STATION = 3
+
+Source = Union[str, bytes, BinaryIO]
+
+
+@dataclass
+class ParsedTable:
+    """パース結果（エポック時間配列と値配列）"""
+    epoch_hours: np.ndarray                      # int64: 1970-01-01 00:00 からの経過時間
+    minutes: np.ndarray                          # int64: 時刻の分（0-59）
+    columns: Dict[str, np.ndarray]               # 列名 → 値配列（行数は epoch_hours と同一）
+    metadata_lines: List[str] = field(default_factory=list)  # 先頭のメタデータ・ヘッダー行
+    stations: List[str] = field(default_factory=list)        # 気象庁形式の地点名（列順）
+    invalid_rows: int = 0                        # 日時・値が不正で除外した行数
+
+    def __len__(self) -> int:
+        return len(self.epoch_hours)
+
+    def datetimes(self) -> np.ndarray:
+        """エポック時間・分を datetime64[ns] 配列に変換する"""
+        total_minutes = self.epoch_hours * 60 + self.minutes
+        return total_minutes.astype("datetime64[m]").astype("datetime64[ns]")
+
+
+def _read_bytes(source: Source) -> bytes:
+    """パス・バイト列・ファイルオブジェクトから内容を取得する"""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read()
+    return source.read()
+
+
+def _split_header(raw: bytes, skiprows: int, encoding: str) -> Tuple[List[str], bytes]:
+    """
+    先頭 skiprows 行をメタデータとして分離する
+
+    Shift-JIS の2バイト目に改行コード（0x0A）は現れないため、バイト列のまま分割できる。
+    """
+    offset = 0
+    lines: List[str] = []
+    for _ in range(skiprows):
+        end = raw.find(b"\n", offset)
+        if end < 0:
+            lines.append(raw[offset:].rstrip(b"\r").decode(encoding))
+            return lines, b""
+        lines.append(raw[offset:end].rstrip(b"\r").decode(encoding))
+        offset = end + 1
+    return lines, raw[offset:]
+
+
+def _normalize_body(body: bytes, encoding: str) -> bytes:
+    """データ部の範囲表記・改行コードを除去し、日時区切りをカンマに統一する"""
+    for mark in _RANGE_MARKS:
+        try:
+            encoded = mark.encode(encoding)
+        except (UnicodeEncodeError, LookupError):
+            continue
+        if encoded in body:
+            # 範囲表記の終了側（〜以降、次の区切りまで）を削除して開始時刻のみ残す
+            body = re.sub(re.escape(encoded) + rb"[^,\r\n]*", b"", body)
+    return body.translate(_DELIMITER_TABLE, b"\r")
+
+
+def _max_fields(body: bytes) -> int:
+    """データ部の1行あたりの最大項目数を求める（NumPyで一括集計）"""
+    buf = np.frombuffer(body, dtype=np.uint8)
+    if buf.size == 0:
+        return 0
+    comma_cumsum = np.cumsum(buf == ord(","))
+    # 各行末までのカンマ累積数の差分が行ごとのカンマ数
+    line_ends = np.append(np.flatnonzero(buf == ord("\n")), buf.size - 1)
+    per_line = np.diff(np.concatenate(([0], comma_cumsum[line_ends])))
+    return int(per_line.max()) + 1
+
+
+def _read_numeric_fields(body: bytes, n_fields: int, nrows: Optional[int]) -> np.ndarray:
+    """
+    正規化済みデータ部の先頭 n_fields 項目を float64 の2次元配列として読み込む
+
+    全項目が数値のため pandas の C パーサーで型推論なしに一括変換できる。
+    数値以外の値（欠損記号等）を含む場合のみ列単位で数値化し、NaNとして扱う。
+    """
+    first_line = body[:body.find(b"\n")] if b"\n" in body else body
+    width = max(first_line.count(b",") + 1, n_fields)
+    # 数値以外の項目（後続セクションの日本語見出し等）はNaNになるため、任意バイトを
+    # 復号できる latin-1 で読み込む（Shift-JIS の2バイト目に区切り文字・改行は現れない）
+    options = dict(header=None, usecols=list(range(n_fields)), nrows=nrows,
+                   skip_blank_lines=True, engine="c", encoding="latin-1")
+    try:
+        try:
+            frame = pd.read_csv(io.BytesIO(body), names=list(range(width)), dtype=np.float64, **options)
+        except ValueError:
+            frame = pd.read_csv(io.BytesIO(body), names=list(range(width)), **options)
+    except pd.errors.ParserError:
+        # 行ごとの項目数が異なる場合（日別ZIPの後続セクション等）は最大項目数で読み直す
+        width = max(_max_fields(body), n_fields)
+        frame = pd.read_csv(io.BytesIO(body), names=list(range(width)), **options)
+
+    for col in frame.columns:
+        if frame[col].dtype == object:
+            frame[col] = pd.to_numeric(frame[col], errors="coerce")
+    return frame.to_numpy(dtype=np.float64)
+
+
+def _epoch_hours(fields: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    年・月・日・時・分の列から経過時間を計算する
+
+    Returns:
+        (epoch_hours, minutes, valid): 経過時間, 分, 妥当な日時かどうか
+    """
+    with np.errstate(invalid="ignore"):
+        valid = np.isfinite(fields).all(axis=1)
+        parts = np.where(np.isfinite(fields), fields, 0).astype(np.int64)
+    year, month, day, hour, minute = (parts[:, i] for i in range(5))
+
+    valid &= (month >= 1) & (month <= 12) & (hour >= 0) & (hour <= 23) & (minute >= 0) & (minute <= 59)
+    month_start = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype("datetime64[M]")
+    first_day = month_start.astype("datetime64[D]").astype(np.int64)
+    month_length = (month_start + 1).astype("datetime64[D]").astype(np.int64) - first_day
+    valid &= (day >= 1) & (day <= month_length)
+
+    epoch_hours = (first_day + day - 1) * 24 + hour
+    return epoch_hours, minute, valid
+
+
+def parse_juyo(source: Source, skiprows: int = 3, encoding: str = "SHIFT-JIS",
+               nrows: Optional[int] = None, value_columns: Sequence[str] = ("KW",)) -> ParsedTable:
+    """
+    TEPCO電力需要実績CSVをパースする
+
+    年別ファイル（メタデータ2行 + 日本語ヘッダー1行）と日別ZIP内CSV
+    （skiprows=14, nrows=24）の両方に対応する。TIME列の範囲表記
+    （例: "0:00〜1:00"）は開始時刻として扱う。
+
+    Args:
+        source: ファイルパス・バイト列・ファイルオブジェクト
+        skiprows: データ行より前の行数
+        encoding: 文字コード
+        nrows: 読み込む最大行数（Noneなら全行）
+        value_columns: 時刻列に続く値列の名前（先頭から順に割り当て）
+
+    Returns:
+        ParsedTable: パース結果（値列は float64、欠損・不正日時の行は除外）
+    """
+    metadata_lines, body = _split_header(_read_bytes(source), skiprows, encoding)
+    n_values = len(value_columns)
+    if not body.strip():
+        return ParsedTable(np.empty(0, np.int64), np.empty(0, np.int64),
+                           {name: np.empty(0) for name in value_columns}, metadata_lines)
+
+    fields = _read_numeric_fields(_normalize_body(body, encoding), _JUYO_DATETIME_FIELDS + n_values, nrows)
+    epoch_hours, minutes, valid = _epoch_hours(fields[:, :_JUYO_DATETIME_FIELDS])
+    values = fields[:, _JUYO_DATETIME_FIELDS:]
+    valid &= np.isfinite(values).all(axis=1)
+
+    invalid_rows = int((~valid).sum())
+    if invalid_rows:
+        logger.warning(f"不正な行を除外しました: {invalid_rows}行")
+
+    return ParsedTable(
+        epoch_hours=epoch_hours[valid],
+        minutes=minutes[valid],
+        columns={name: values[valid, i] for i, name in enumerate(value_columns)},
+        metadata_lines=metadata_lines,
+        invalid_rows=invalid_rows,
+    )
+
+
+def parse_jma_temperature(source: Source, skiprows: int = 5, encoding: str = "SHIFT-JIS",
+                          nrows: Optional[int] = None) -> ParsedTable:
+    """
+    気象庁「過去の気象データ」形式の気温CSVをパースする
+
+    ヘッダー5行（ダウンロード時刻・空行・地点名・項目名・品質情報/均質番号）の後に
+    「年月日時, (気温, 品質情報, 均質番号) × 地点数」が続くレイアウトに対応する。
+
+    Args:
+        source: ファイルパス・バイト列・ファイルオブジェクト
+        skiprows: データ行より前の行数
+        encoding: 文字コード
+        nrows: 読み込む最大行数（Noneなら全行）
+
+    Returns:
+        ParsedTable: パース結果。columns は TEMP（先頭地点の気温）と
+            TEMP_ALL / QUALITY / HOMOGENEITY（行数 × 地点数の2次元配列）。
+            気温の欠損はNaNのまま保持し、日時が不正な行のみ除外する。
+    """
+    metadata_lines, body = _split_header(_read_bytes(source), skiprows, encoding)
+
+    # 地点名行（例: ",東京,東京,東京"）から地点数を判定
+    stations: List[str] = []
+    if len(metadata_lines) >= 3:
+        names = metadata_lines[2].split(",")[1:]
+        stations = names[::_JMA_FIELDS_PER_STATION]
+    n_stations = max(1, len(stations))
+
+    if not body.strip():
+        empty = np.empty((0, n_stations))
+        return ParsedTable(np.empty(0, np.int64), np.empty(0, np.int64),
+                           {"TEMP": np.empty(0), "TEMP_ALL": empty, "QUALITY": empty, "HOMOGENEITY": empty},
+                           metadata_lines, stations)
+
+    n_fields = _JMA_DATETIME_FIELDS + n_stations * _JMA_FIELDS_PER_STATION
+    fields = _read_numeric_fields(_normalize_body(body, encoding), n_fields, nrows)
+    epoch_hours, minutes, valid = _epoch_hours(fields[:, :5])
+
+    invalid_rows = int((~valid).sum())
+    if invalid_rows:
+        logger.warning(f"日時が不正な行を除外しました: {invalid_rows}行")
+
+    station_fields = fields[valid, _JMA_DATETIME_FIELDS:].reshape(-1, n_stations, _JMA_FIELDS_PER_STATION)
+    return ParsedTable(
+        epoch_hours=epoch_hours[valid],
+        minutes=minutes[valid],
+        columns={
+            "TEMP": station_fields[:, 0, 0],
+            "TEMP_ALL": station_fields[:, :, 0],
+            "QUALITY": station_fields[:, :, 1],
+            "HOMOGENEITY": station_fields[:, :, 2],
+        },
+        metadata_lines=metadata_lines,
+        stations=stations,
+        invalid_rows=invalid_rows,
+    )
+
+
+def format_juyo_rows(datetimes: np.ndarray, kw: np.ndarray) -> str:
+    """
+    日時・電力値配列を juyo-YYYY.csv のデータ行（"YYYY/MM/DD,HH:MM,KW"）に整形する
+
+    Args:
+        datetimes: datetime64 配列
+        kw: 電力値配列（整数）
+
+    Returns:
+        str: 改行区切りのデータ行（末尾改行付き、0行なら空文字列）
+    """
+    if len(datetimes) == 0:
+        return ""
+    stamps = np.datetime_as_string(np.asarray(datetimes, dtype="datetime64[m]"), unit="m")
+    # "YYYY-MM-DDTHH:MM" → "YYYY/MM/DD,HH:MM"
+    dates = np.char.replace(np.char.replace(stamps, "-", "/"), "T", ",")
+    rows = np.char.add(np.char.add(dates, ","), np.asarray(kw, dtype=np.int64).astype(str))
+    return "\n".join(rows.tolist()) + "\n"
+
+
+def format_jma_temperature_rows(datetimes: np.ndarray, temps: np.ndarray) -> str:
+    """
+    日時・気温配列を気象庁形式（temperature-YYYY.csv）のデータ行に整形する
+
+    日時は気象庁CSVと同じ "YYYY/M/D H:00:00"（0時のみ "00:00:00"）、
+    地点ごとに「気温, 品質情報, 均質番号」を出力する（欠損は気温を空欄・品質情報1=欠測）。
+
+    Args:
+        datetimes: datetime64 配列（1時間単位）
+        temps: 気温（行数、または行数 × 地点数の配列、欠損はNaN）
+
+    Returns:
+        str: 改行区切りのデータ行（末尾改行付き、0行なら空文字列）
+    """
+    if len(datetimes) == 0:
+        return ""
+    index = pd.DatetimeIndex(np.asarray(datetimes, dtype="datetime64[h]").astype("datetime64[ns]"))
+    hours = index.hour.to_numpy().astype(str)
+    hours = np.where(hours == "0", "00", hours)
+    rows = np.char.add(np.char.add(np.char.add(index.year.to_numpy().astype(str), "/"),
+                                   np.char.add(index.month.to_numpy().astype(str), "/")),
+                       np.char.add(np.char.add(index.day.to_numpy().astype(str), " "),
+                                   np.char.add(hours, ":00:00")))
+
+    temps = np.asarray(temps, dtype=np.float64)
+    if temps.ndim == 1:
+        temps = temps[:, None]
+    missing = np.isnan(temps)
+    # 丸めで生じる -0.0 は 0.0 として出力
+    rounded = np.round(np.where(missing, 0.0, temps), 1) + 0.0
+    values = np.where(missing, "", np.char.mod("%.1f", rounded))
+    quality = np.where(missing, ",1,1", ",8,1")
+    for k in range(temps.shape[1]):
+        rows = np.char.add(np.char.add(np.char.add(rows, ","), values[:, k]), quality[:, k])
+    return "\n".join(rows.tolist()) + "\n"
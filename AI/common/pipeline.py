@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - インプロセス・パイプラインAPI
+
+データ前処理（data/data.py）と各モデルの学習（train/<Model>/<Model>_train.py）を
+サブプロセス・CSV往復なしに同一プロセス内で連結する。
+
+    X_df, y_df, split = build_dataset(["2022", "2023"])
+    artifact = train("LightGBM", split)
+
+学習モジュールは初回呼び出し時に1回だけ読み込んでプロセス内に保持するため、
+サーバー（server.py）から繰り返し呼び出す場合もインタプリタ起動・重いimportが発生しない。
+
+コマンドライン実行（AI/ ディレクトリから）:
+    python common/pipeline.py LightGBM 2022,2023
+"""
+
+import importlib
+import importlib.util
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import DatasetSplit, split_arrays, split_test_mask
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(_AI_DIR, "data")
+DEFAULT_TEST_SIZE = 0.1
+
+# データセット保存先（data/data.py の main() と同じファイル名）
+DATASET_FILES = {
+    "x_csv": "X.csv", "y_csv": "Y.csv",
+    "Xtrain_csv": "Xtrain.csv", "Xtest_csv": "Xtest.csv",
+    "Ytrain_csv": "Ytrain.csv", "Ytest_csv": "Ytest.csv",
+}
+
+# モデル名 → (学習スクリプト, 成果物ファイル名の接頭辞, モデル保存ファイル名)
+# 出力先は各学習スクリプトの main() と同じ（train/<Model>/ 配下）
+MODEL_SCRIPTS: Dict[str, Tuple[str, str, str]] = {
+    "LightGBM": (os.path.join("train", "LightGBM", "LightGBM_train.py"), "LightGBM", "LightGBM_model.sav"),
+    "Keras": (os.path.join("train", "Keras", "Keras_train.py"), "Keras", "Keras_model.h5"),
+    "PyCaret": (os.path.join("train", "Pycaret", "Pycaret_train.py"), "Pycaret", "Pycaret_model"),
+    "RandomForest": (os.path.join("train", "RandomForest", "RandomForest_train.py"), "RandomForest", "RandomForest_model.sav"),
+}
+
+# train() の params で指定できるキー（各学習スクリプトの train() のハイパーパラメータ引数）
+TRAIN_PARAM_KEYS = ("learning_rate", "epochs", "validation_split")
+
+_module_cache: Dict[str, Any] = {}
+_module_lock = threading.Lock()
+
+
+@dataclass
+class TrainArtifact:
+    """学習結果（保存済みモデル・予測結果のパスと評価指標）"""
+    model_name: str
+    model_path: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    metrics: Dict[str, float] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+
+def dataset_paths(data_dir: str = DATA_DIR) -> Dict[str, str]:
+    """データセット6ファイルの保存先パス（data.save_datasets の引数名 → パス）"""
+    return {key: os.path.join(data_dir, name) for key, name in DATASET_FILES.items()}
+
+
+def _model_entry(model_name: str) -> Tuple[str, str, str]:
+    """MODEL_SCRIPTS の定義を取得する（未対応のモデル名は ValueError）"""
+    if model_name not in MODEL_SCRIPTS:
+        raise ValueError(f"未対応のモデル名です: {model_name} (対応: {', '.join(MODEL_SCRIPTS)})")
+    return MODEL_SCRIPTS[model_name]
+
+
+def model_output_paths(model_name: str) -> Dict[str, str]:
+    """
+    モデルの成果物パス（各学習スクリプトの main() と同じ出力先）を返す
+
+    Args:
+        model_name: モデル名（MODEL_SCRIPTS のキー）
+
+    Returns:
+        Dict[str, str]: model_sav, ypred_csv, ypred_png, ypred_7d_png, history_png
+
+    Raises:
+        ValueError: 未対応のモデル名の場合
+    """
+    script, prefix, model_file = _model_entry(model_name)
+    model_dir = os.path.join(_AI_DIR, os.path.dirname(script))
+    return {
+        "model_sav": os.path.join(model_dir, model_file),
+        "ypred_csv": os.path.join(model_dir, f"{prefix}_Ypred.csv"),
+        "ypred_png": os.path.join(model_dir, f"{prefix}_Ypred.png"),
+        "ypred_7d_png": os.path.join(model_dir, f"{prefix}_Ypred_7d.png"),
+        "history_png": os.path.join(model_dir, f"{prefix}_history.png"),
+    }
+
+
+def _load_script_module(name: str, relpath: str) -> Any:
+    """
+    スクリプトファイルをモジュールとして読み込む（プロセス内で1回のみ）
+
+    Args:
+        name: モジュール名
+        relpath: AI/ からの相対パス
+
+    Returns:
+        Any: 読み込んだモジュール
+    """
+    with _module_lock:
+        module = _module_cache.get(name)
+        if module is not None:
+            return module
+
+        # グラフはファイル保存のみのため、GUIなしバックエンドを使用（サーバーのワーカースレッドからも安全）
+        if "matplotlib.pyplot" not in sys.modules:
+            import matplotlib
+            matplotlib.use("Agg")
+
+        spec = importlib.util.spec_from_file_location(name, os.path.join(_AI_DIR, relpath))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _module_cache[name] = module
+        return module
+
+
+def _data_module() -> Any:
+    """データ前処理モジュール（data/data.py）"""
+    return importlib.import_module("data.data")
+
+
+def build_dataset(years: Optional[List[str]] = None,
+                  test_size: float = DEFAULT_TEST_SIZE,
+                  persist: bool = False,
+                  data_dir: str = DATA_DIR) -> Tuple[pd.DataFrame, pd.DataFrame, DatasetSplit]:
+    """
+    学習データセットをメモリ上に作成する（data/data.py の data() と同じ前処理・分割）
+
+    Args:
+        years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全共通年）
+        test_size: テストデータの割合
+        persist: Trueなら data() と同じくデータセットファイルも保存する（翌日予測スクリプト用）
+        data_dir: データディレクトリ
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame, DatasetSplit]: 特徴量データ, ターゲットデータ, 分割済みデータセット
+
+    Raises:
+        FileNotFoundError: データファイルが見つからない場合
+        ValueError: 共通年が見つからない・データが不正な場合
+    """
+    X_df, y_df = _data_module().build_feature_target(years, data_dir)
+
+    if persist:
+        persist_dataset(X_df, y_df, test_size, data_dir)
+
+    test_mask = split_test_mask(len(X_df), test_size)
+    split = split_arrays(X_df.to_numpy(), y_df.to_numpy(), test_mask,
+                         list(X_df.columns), list(y_df.columns))
+    print(f"メモリ上のデータセット作成完了: 学習{len(split.X_train)}行, テスト{len(split.X_test)}行")
+    return X_df, y_df, split
+
+
+def persist_dataset(X_df: pd.DataFrame, y_df: pd.DataFrame,
+                    test_size: float = DEFAULT_TEST_SIZE, data_dir: str = DATA_DIR) -> None:
+    """
+    データセットファイルを data() と同じ形式で保存する（翌日予測スクリプト用）
+
+    Args:
+        X_df: 特徴量データ
+        y_df: ターゲットデータ
+        test_size: テストデータの割合
+        data_dir: データディレクトリ
+    """
+    paths = dataset_paths(data_dir)
+    _data_module().save_datasets(X_df, y_df, paths["x_csv"], paths["y_csv"], test_size,
+                                 paths["Xtrain_csv"], paths["Xtest_csv"],
+                                 paths["Ytrain_csv"], paths["Ytest_csv"])
+
+
+def load_trainer(model_name: str) -> Any:
+    """
+    モデルの学習モジュールを取得する（初回のみ読み込み）
+
+    Args:
+        model_name: モデル名（MODEL_SCRIPTS のキー）
+
+    Returns:
+        Any: 学習モジュール（train() を持つ）
+
+    Raises:
+        ValueError: 未対応のモデル名の場合
+    """
+    script, prefix, _ = _model_entry(model_name)
+    return _load_script_module(f"{prefix}_train", script)
+
+
+def train(model_name: str, dataset: DatasetSplit,
+          params: Optional[Dict[str, Any]] = None) -> TrainArtifact:
+    """
+    メモリ上のデータセットでモデルを学習する（各学習スクリプトの train() を使用）
+
+    Args:
+        model_name: モデル名（"LightGBM" / "Keras" / "PyCaret" / "RandomForest"）
+        dataset: 分割済みデータセット（build_dataset の戻り値など）
+        params: ハイパーパラメータ（learning_rate / epochs / validation_split、未指定はモデル既定値）
+
+    Returns:
+        TrainArtifact: 保存済みモデル・予測結果のパスと評価指標
+
+    Raises:
+        ValueError: 未対応のモデル名・パラメータの場合
+        RuntimeError: 学習に失敗した場合
+    """
+    params = dict(params or {})
+    unknown = sorted(set(params) - set(TRAIN_PARAM_KEYS))
+    if unknown:
+        raise ValueError(f"未対応のパラメータです: {unknown} (対応: {', '.join(TRAIN_PARAM_KEYS)})")
+
+    trainer = load_trainer(model_name)
+    outputs = model_output_paths(model_name)
+    csv_paths = dataset_paths()
+
+    start_time = time.time()
+    result = trainer.train(
+        csv_paths["Xtrain_csv"], csv_paths["Xtest_csv"], csv_paths["Ytrain_csv"], csv_paths["Ytest_csv"],
+        outputs["model_sav"], outputs["ypred_csv"], outputs["ypred_png"], outputs["ypred_7d_png"],
+        history_png=outputs["history_png"], dataset=dataset, **params
+    )
+    if not result:
+        raise RuntimeError(f"{model_name}モデルの学習に失敗しました")
+
+    rmse, r2, mae = (float(v) for v in result[:3])
+    artifact = TrainArtifact(
+        model_name=model_name,
+        model_path=outputs["model_sav"],
+        outputs=outputs,
+        metrics={"rmse": rmse, "r2": r2, "mae": mae},
+        elapsed=time.time() - start_time,
+    )
+    logger.info(f"{model_name}学習完了: RMSE={rmse:.3f}, R2={r2:.4f}, MAE={mae:.3f} ({artifact.elapsed:.2f}秒)")
+    return artifact
+
+
+def run_pipeline(model_name: str, years: Optional[List[str]] = None,
+                 params: Optional[Dict[str, Any]] = None,
+                 persist: bool = True) -> TrainArtifact:
+    """
+    データセット作成から学習までを同一プロセスで実行する
+
+    Args:
+        model_name: モデル名
+        years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全共通年）
+        params: ハイパーパラメータ
+        persist: データセットファイルも保存するか（翌日予測スクリプトが参照するため既定はTrue）
+
+    Returns:
+        TrainArtifact: 学習結果
+    """
+    _model_entry(model_name)  # データセット作成前にモデル名を検証
+    _, _, split = build_dataset(years, persist=persist)
+    return train(model_name, split, params)
+
+
+def main() -> None:
+    """コマンドライン実行: python common/pipeline.py <モデル名> [年,年,...]"""
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "LightGBM"
+    years = None
+    if len(sys.argv) > 2 and sys.argv[2].strip():
+        years = [y.strip() for y in sys.argv[2].split(",") if y.strip()]
+
+    artifact = run_pipeline(model_name, years)
+    metrics = artifact.metrics
+    print(f"最終結果 - RMSE: {metrics['rmse']:.3f} kW, R2スコア: {metrics['r2']:.4f}, MAE: {metrics['mae']:.3f} kW")
+    print(f"モデル保存先: {artifact.model_path} (実行時間: {artifact.elapsed:.2f}秒)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,679 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - ハイパーパラメータ探索
+
+LightGBMConfig / RandomForestConfig / KerasConfig のハイパーパラメータ候補を、
+学習年最適化（train/<Model>/<Model>_optimize_years.py）の generate_rolling_combinations と同じ
+ローリング組み合わせ（2年学習→1年テスト）で評価する。
+
+- 候補（試行）はプロセスプールで並列に学習・評価する（年別データは親プロセスで1回だけ作成）。
+- Successive Halving: 全試行を直近の組み合わせ1つで評価し、RMSE上位 1/ETA のみ次の段階
+  （より多くの組み合わせ）に進める。LightGBM は各組み合わせ内でも早期終了で反復を打ち切る。
+- 評価結果は組み合わせ1つごとに試行記録ファイル（JSON）に保存し、中断後は同じファイルを指定すると
+  評価済みの組み合わせを再計算せずに再開する。
+
+    study = run_search("LightGBM", n_trials=27, workers=4)
+    print(study.best_trial().params)
+
+探索結果は手動で設定クラスに反映するか、環境変数 AI_USE_TUNED_PARAMS=1 で学習時に
+試行記録ファイル（train/<Model>/<Model>_search_study.json）の最良の試行のパラメータを適用する。
+
+コマンドライン実行（AI/ ディレクトリから）:
+    python common/search.py LightGBM [試行数] [並列数]
+"""
+
+import concurrent.futures
+import contextlib
+import dataclasses
+import functools
+import io
+import json
+import logging
+import math
+import multiprocessing
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common import pipeline
+
+logger = logging.getLogger(__name__)
+
+STUDY_FORMAT_VERSION = 1
+
+# 学習時に探索済みパラメータ（試行記録ファイルの最良の試行）を適用するかを切り替える環境変数
+TUNED_PARAMS_ENV_VAR = "AI_USE_TUNED_PARAMS"
+
+# 試行の状態
+STATE_RUNNING = "running"    # 評価中（次の段階に進む可能性がある）
+STATE_PRUNED = "pruned"      # 途中の段階で打ち切り
+STATE_COMPLETE = "complete"  # 全組み合わせで評価済み
+STATE_FAILED = "failed"      # 学習・評価でエラー
+
+# 並列実行時にワーカーごとのスレッド数を制限する環境変数（LightGBM / scikit-learn / TensorFlow）
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "TF_NUM_INTRAOP_THREADS", "TF_NUM_INTEROP_THREADS")
+
+# 探索範囲（モデル名 → 設定クラスのフィールド名 → 候補値）
+SEARCH_SPACES: Dict[str, Dict[str, List[Any]]] = {
+    "LightGBM": {
+        "DEFAULT_LEARNING_RATE": [0.02, 0.05, 0.1],
+        "DEFAULT_NUM_LEAVES": [15, 31, 63, 127],
+        "DEFAULT_MAX_DEPTH": [-1, 8, 12],
+        "DEFAULT_MIN_CHILD_SAMPLES": [10, 20, 50],
+        "DEFAULT_COLSAMPLE_BYTREE": [0.75, 1.0],
+    },
+    "RandomForest": {
+        "n_estimators": [100, 150, 300],
+        "max_depth": [12, 20, None],
+        "min_samples_leaf": [1, 2, 4, 8],
+        "max_features": [0.5, 0.75, 1.0],
+    },
+    "Keras": {
+        "DEFAULT_LEARNING_RATE": [0.0002, 0.0005, 0.001],
+        "NEURAL_NETWORK_UNITS": [128, 256],
+        "DROPOUT_RATE": [0.0, 0.05, 0.1],
+        "L2_REGULARIZATION": [0.0001, 0.0005, 0.001],
+        "DEFAULT_BATCH_SIZE": [64, 128, 256],
+    },
+}
+
+
+@dataclass(frozen=True)
+class SearchConfig:
+    """ハイパーパラメータ探索設定クラス"""
+    N_TRIALS: int = 27
+    ETA: int = 3           # 各段階で残す試行の割合（1/ETA）と、段階ごとの組み合わせ数の倍率
+    SEED: int = 42
+    # spawn: 親プロセスの読み込み済みライブラリ（TensorFlow など）の状態を引き継がない
+    START_METHOD: str = "spawn"
+    STUDY_FILE_SUFFIX: str = "_search_study.json"
+
+
+config = SearchConfig()
+
+
+@dataclass
+class Trial:
+    """1つのハイパーパラメータ候補の評価記録"""
+    number: int
+    params: Dict[str, Any]
+    scores: Dict[str, Dict[str, float]] = field(default_factory=dict)  # テスト年 → rmse / r2 / mae / elapsed
+    state: str = STATE_RUNNING
+    pruned_at: Optional[int] = None  # 打ち切った時点の評価済み組み合わせ数
+    error: Optional[str] = None
+
+    def mean_rmse(self, fold_keys: Iterable[str]) -> float:
+        """指定した組み合わせの平均RMSE（未評価・失敗時は inf）"""
+        fold_keys = list(fold_keys)
+        if self.state == STATE_FAILED or any(key not in self.scores for key in fold_keys):
+            return math.inf
+        return float(np.mean([self.scores[key]["rmse"] for key in fold_keys]))
+
+
+@dataclass
+class Study:
+    """
+    探索全体の記録（試行記録ファイルの内容）
+
+    folds は評価順（直近のテスト年から）に並べた (学習年リスト, テスト年)。
+    """
+    model_name: str
+    space: Dict[str, List[Any]]
+    folds: List[Tuple[List[int], int]]
+    n_trials: int
+    eta: int
+    seed: int
+    trials: List[Trial] = field(default_factory=list)
+    path: Optional[str] = None
+
+    @property
+    def fold_keys(self) -> List[str]:
+        """評価順の組み合わせキー（テスト年）"""
+        return [str(test_year) for _, test_year in self.folds]
+
+    def settings(self) -> Dict[str, Any]:
+        """再開時に一致を確認する探索条件"""
+        return {
+            "model": self.model_name,
+            "space": self.space,
+            "folds": [[list(train_years), test_year] for train_years, test_year in self.folds],
+            "n_trials": self.n_trials,
+            "eta": self.eta,
+            "seed": self.seed,
+        }
+
+    def best_trial(self) -> Optional[Trial]:
+        """全組み合わせで評価した試行のうち平均RMSEが最小の試行"""
+        complete = [trial for trial in self.trials if trial.state == STATE_COMPLETE]
+        if not complete:
+            return None
+        return min(complete, key=lambda trial: (trial.mean_rmse(self.fold_keys), trial.number))
+
+    def to_dict(self) -> Dict[str, Any]:
+        best = self.best_trial()
+        return {
+            "format_version": STUDY_FORMAT_VERSION,
+            **self.settings(),
+            "best": None if best is None else {
+                "number": best.number, "params": best.params, "rmse": best.mean_rmse(self.fold_keys)},
+            "trials": [dataclasses.asdict(trial) for trial in self.trials],
+        }
+
+    def save(self) -> None:
+        """試行記録ファイルに保存する（一時ファイルに書き込んでから置き換え）"""
+        if self.path is None:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @classmethod
+    def load_or_create(cls, path: Optional[str], model_name: str, space: Dict[str, List[Any]],
+                       folds: List[Tuple[List[int], int]], n_trials: int, eta: int, seed: int) -> "Study":
+        """
+        試行記録ファイルがあれば読み込み（再開）、なければ新しい探索を作成する
+
+        Args:
+            path: 試行記録ファイルのパス（Noneなら保存しない）
+            model_name: モデル名
+            space: 探索範囲
+            folds: 評価順の (学習年リスト, テスト年)
+            n_trials: 試行数
+            eta: Successive Halving の倍率
+            seed: 候補抽出の乱数シード
+
+        Returns:
+            Study: 探索記録
+
+        Raises:
+            ValueError: 既存ファイルの形式・探索条件が異なる場合
+        """
+        study = cls(model_name, space, folds, n_trials, eta, seed, path=path)
+        if path is None or not os.path.exists(path):
+            study.trials = [Trial(number, params)
+                            for number, params in enumerate(sample_params(space, n_trials, seed))]
+            study.save()
+            return study
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("format_version") != STUDY_FORMAT_VERSION:
+            raise ValueError(f"試行記録ファイルの形式バージョンが異なります: {data.get('format_version')}")
+        saved = {key: data.get(key) for key in study.settings()}
+        # JSON経由で比較する（タプル・リストの違いを無視）
+        if saved != json.loads(json.dumps(study.settings())):
+            raise ValueError(f"試行記録ファイルの探索条件が異なります（別のファイルを指定してください）: {path}")
+        study.trials = [Trial(**trial) for trial in data["trials"]]
+        print(f"試行記録ファイルから再開します: {path} "
+              f"（評価済み {sum(len(trial.scores) for trial in study.trials)} 件）")
+        return study
+
+
+def rung_budgets(n_folds: int, eta: int) -> List[int]:
+    """
+    Successive Halving の各段階で評価する組み合わせ数（1, eta, eta^2, ... , n_folds）
+
+    Args:
+        n_folds: 組み合わせ数
+        eta: 倍率
+
+    Returns:
+        List[int]: 段階ごとの評価済み組み合わせ数（最後は n_folds）
+    """
+    if n_folds <= 0:
+        raise ValueError("評価する組み合わせがありません")
+    budgets, budget = [], 1
+    while budget < n_folds:
+        budgets.append(budget)
+        budget *= max(2, eta)
+    budgets.append(n_folds)
+    return budgets
+
+
+def sample_params(space: Dict[str, List[Any]], n_trials: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    探索範囲から重複のない候補を抽出する（1件目は設定クラスの既定値 = 空のパラメータ）
+
+    Args:
+        space: 設定クラスのフィールド名 → 候補値
+        n_trials: 候補数（既定値を含む）
+        seed: 乱数シード
+
+    Returns:
+        List[Dict[str, Any]]: 候補のパラメータ（組み合わせ総数が n_trials 以下なら全組み合わせ）
+    """
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = int(np.prod(sizes)) if names else 0
+    n_sampled = min(max(n_trials - 1, 0), total)
+    indices = random.Random(seed).sample(range(total), n_sampled)
+
+    candidates: List[Dict[str, Any]] = [{}]
+    for index in sorted(indices):
+        params = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            index, position = divmod(index, size)
+            params[name] = space[name][position]
+        candidates.append({name: params[name] for name in names})
+    return candidates
+
+
+# =============================================================================
+# 試行の学習・評価（ワーカープロセス）
+# =============================================================================
+
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(model_name: str, year_data: Dict[str, Tuple[np.ndarray, np.ndarray]],
+                 threads: Optional[int] = None) -> None:
+    """
+    ワーカープロセスの初期化（学習モジュールの読み込みと年別データの保持）
+
+    Args:
+        model_name: モデル名
+        year_data: テスト年・学習年 → (特徴量, 目的変数)
+        threads: ワーカーあたりのスレッド数（Noneなら制限しない）
+    """
+    if threads:
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = str(threads)
+    with contextlib.redirect_stdout(io.StringIO()):
+        trainer = pipeline.load_trainer(model_name)
+    _worker_state.update(model_name=model_name, year_data=year_data, threads=threads, trainer=trainer)
+
+
+@contextlib.contextmanager
+def _trainer_config(trainer: Any, params: Dict[str, Any]):
+    """学習モジュールの設定（モジュール変数 config）を候補の値に一時的に差し替える"""
+    base_config = trainer.config
+    trainer.config = dataclasses.replace(base_config, **params)
+    try:
+        yield trainer.config
+    finally:
+        trainer.config = base_config
+
+
+def _fit_predict_lightgbm(trainer: Any, params: Dict[str, Any], X_train: np.ndarray,
+                          y_train: np.ndarray, X_test: np.ndarray) -> np.ndarray:
+    """LightGBM: 設定を差し替えて学習スクリプトと同じ標準化・早期終了で学習し、テスト年を予測する"""
+    with _trainer_config(trainer, params):
+        X_train_scaled, X_test_scaled, _ = trainer.prepare_data_with_scaling(X_train, X_test)
+        model = trainer.train_lightgbm_model(trainer.create_lightgbm_model(), X_train_scaled, y_train)
+        return model.predict(X_test_scaled)
+
+
+def _fit_predict_random_forest(trainer: Any, params: Dict[str, Any], X_train: np.ndarray,
+                               y_train: np.ndarray, X_test: np.ndarray) -> np.ndarray:
+    """RandomForest: 設定を作成し、学習スクリプトと同じ標準化で学習してテスト年を予測する"""
+    rf_config = trainer.RandomForestConfig(**params)
+    if _worker_state.get("threads"):
+        rf_config.n_jobs = _worker_state["threads"]
+    X_train_scaled, X_test_scaled, _ = trainer.prepare_data_with_scaling(rf_config, X_train, X_test)
+    model = trainer.train_random_forest_model(
+        rf_config, trainer.create_random_forest_model(rf_config), X_train_scaled, y_train)
+    return model.predict(X_test_scaled)
+
+
+def _fit_predict_keras(trainer: Any, params: Dict[str, Any], X_train: np.ndarray,
+                       y_train: np.ndarray, X_test: np.ndarray) -> np.ndarray:
+    """Keras: 設定を差し替えて学習スクリプトと同じ構成・早期終了で学習し、テスト年を予測する（元スケール）"""
+    with _trainer_config(trainer, params):
+        X_train_scaled, X_test_scaled, y_train_scaled, _, _, y_scaler = trainer.prepare_data_with_scaling(
+            X_train, X_test, y_train, np.zeros(len(X_test)))
+        model = trainer.create_keras_model(X_train_scaled.shape[1])
+        trainer.train_model_with_validation(model, X_train_scaled, y_train_scaled)
+        y_pred = y_scaler.inverse_transform(model.predict(X_test_scaled, verbose=0).reshape(-1, 1)).ravel()
+    trainer.tf.keras.backend.clear_session()
+    return y_pred
+
+
+# モデル名 → 学習・予測関数（trainer, params, X_train, y_train, X_test → テスト年の予測値）
+FIT_PREDICT: Dict[str, Callable[..., np.ndarray]] = {
+    "LightGBM": _fit_predict_lightgbm,
+    "RandomForest": _fit_predict_random_forest,
+    "Keras": _fit_predict_keras,
+}
+
+
+def evaluate_fold(params: Dict[str, Any], train_years: List[int], test_year: int) -> Dict[str, float]:
+    """
+    1つの候補を1つの組み合わせで学習・評価する（_init_worker 済みのプロセスで実行）
+
+    Args:
+        params: 設定クラスのフィールド名 → 値
+        train_years: 学習年リスト
+        test_year: テスト年
+
+    Returns:
+        Dict[str, float]: rmse / r2 / mae / elapsed
+    """
+    start_time = time.time()
+    year_data = _worker_state["year_data"]
+    X_train = np.concatenate([year_data[str(year)][0] for year in train_years])
+    y_train = np.concatenate([year_data[str(year)][1] for year in train_years])
+    X_test, y_test = year_data[str(test_year)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        y_pred = FIT_PREDICT[_worker_state["model_name"]](
+            _worker_state["trainer"], params, X_train, y_train, X_test)
+
+    return {
+        "rmse": float(np.sqrt(mean_squared_error(y_test, y_pred))),
+        "r2": float(r2_score(y_test, y_pred)),
+        "mae": float(mean_absolute_error(y_test, y_pred)),
+        "elapsed": time.time() - start_time,
+    }
+
+
+# =============================================================================
+# 探索の実行（親プロセス）
+# =============================================================================
+
+def load_year_data(years: Iterable[int], data_dir: str = pipeline.DATA_DIR) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    年ごとの特徴量・目的変数を作成する（data/data.py と同じ前処理を1年ずつ実行）
+
+    Args:
+        years: 対象年
+        data_dir: データディレクトリ
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: 年 → (特徴量 float32, 目的変数)
+    """
+    year_data = {}
+    for year in years:
+        X_df, y_df = pipeline._data_module().build_feature_target([str(year)], data_dir)
+        year_data[str(year)] = (X_df.to_numpy(dtype=np.float32), y_df.to_numpy().ravel())
+    return year_data
+
+
+def rolling_folds(model_name: str, years: Optional[List[int]] = None) -> List[Tuple[List[int], int]]:
+    """
+    学習年最適化と同じローリング組み合わせ（2年学習→1年テスト）を評価順（直近のテスト年から）に返す
+
+    Args:
+        model_name: モデル名（学習年最適化スクリプトの選択に使用）
+        years: 利用可能な年（Noneなら電力・気温データの共通年）
+
+    Returns:
+        List[Tuple[List[int], int]]: (学習年リスト, テスト年)
+    """
+    script, prefix, _ = pipeline._model_entry(model_name)
+    optimizer_module = pipeline._load_script_module(
+        f"{prefix}_optimize_years", os.path.join(os.path.dirname(script), f"{prefix}_optimize_years.py"))
+    if years is None:
+        years = [int(year) for year in optimizer_module.get_available_years() if year.isdigit()]
+    combinations = optimizer_module.YearCombinationOptimizer(sorted(years)).generate_rolling_combinations()
+    return list(reversed(combinations))
+
+
+def default_study_path(model_name: str) -> str:
+    """試行記録ファイルの既定の保存先（train/<Model>/<Model>_search_study.json）"""
+    script, prefix, _ = pipeline._model_entry(model_name)
+    return os.path.join(_AI_DIR, os.path.dirname(script), f"{prefix}{config.STUDY_FILE_SUFFIX}")
+
+
+def successive_halving(study: Study,
+                       run_jobs: Callable[[List[Tuple[Trial, int]]], Iterable[Tuple[Trial, int, Any]]]) -> Study:
+    """
+    Successive Halving で試行を評価・打ち切りする
+
+    各段階で、残っている試行を先頭 rung_budgets() 個の組み合わせで評価し（評価済みは再計算しない）、
+    平均RMSEの上位 1/eta のみ次の段階に進める。評価結果は1件ごとに試行記録ファイルに保存する。
+
+    Args:
+        study: 探索記録
+        run_jobs: (試行, 組み合わせ番号) のリストを評価し、(試行, 組み合わせ番号, 評価結果または例外) を
+            完了順に返す関数
+
+    Returns:
+        Study: 評価後の探索記録
+    """
+    fold_keys = study.fold_keys
+    survivors = [trial for trial in study.trials if trial.state != STATE_FAILED]
+    budgets = rung_budgets(len(study.folds), study.eta)
+
+    for rung, budget in enumerate(budgets):
+        jobs = [(trial, fold) for trial in survivors for fold in range(budget)
+                if fold_keys[fold] not in trial.scores]
+        print(f"[段階 {rung + 1}/{len(budgets)}] 試行 {len(survivors)} 件 × 組み合わせ {budget} 件"
+              f"（未評価 {len(jobs)} 件）")
+        for trial, fold, result in run_jobs(jobs):
+            if isinstance(result, Exception):
+                trial.state, trial.error = STATE_FAILED, str(result)[:500]
+                print(f"  試行 {trial.number}: 失敗 - {trial.error}")
+            else:
+                trial.scores[fold_keys[fold]] = result
+                print(f"  試行 {trial.number} テスト年 {fold_keys[fold]}: RMSE {result['rmse']:.1f} kW"
+                      f"（{result['elapsed']:.1f}秒）")
+            study.save()
+
+        keys = fold_keys[:budget]
+        ranked = sorted((trial for trial in survivors if trial.state != STATE_FAILED),
+                        key=lambda trial: (trial.mean_rmse(keys), trial.number))
+        if budget == len(study.folds):
+            for trial in ranked:
+                trial.state = STATE_COMPLETE
+            break
+        n_keep = max(1, math.ceil(len(ranked) / study.eta))
+        for trial in ranked[n_keep:]:
+            trial.state, trial.pruned_at = STATE_PRUNED, budget
+        survivors = ranked[:n_keep]
+        study.save()
+
+    study.save()
+    return study
+
+
+def _run_in_process(jobs: List[Tuple[Trial, int]], folds: List[Tuple[List[int], int]]):
+    """評価を現在のプロセスで順に実行する（並列数1）"""
+    for trial, fold in jobs:
+        try:
+            result = evaluate_fold(trial.params, *folds[fold])
+        except Exception as e:
+            result = e
+        yield trial, fold, result
+
+
+def _run_in_pool(executor: concurrent.futures.Executor, jobs: List[Tuple[Trial, int]],
+                 folds: List[Tuple[List[int], int]]):
+    """評価をプロセスプールで並列に実行し、完了順に返す"""
+    futures = {executor.submit(evaluate_fold, trial.params, *folds[fold]): (trial, fold) for trial, fold in jobs}
+    for future in concurrent.futures.as_completed(futures):
+        trial, fold = futures[future]
+        try:
+            result = future.result()
+        except Exception as e:
+            result = e
+        yield trial, fold, result
+
+
+def run_search(model_name: str,
+               n_trials: int = config.N_TRIALS,
+               workers: Optional[int] = None,
+               study_path: Optional[str] = None,
+               years: Optional[List[int]] = None,
+               eta: int = config.ETA,
+               seed: int = config.SEED,
+               start_method: str = config.START_METHOD,
+               data_dir: str = pipeline.DATA_DIR) -> Study:
+    """
+    ハイパーパラメータ探索を実行する（試行記録ファイルがあれば続きから再開）
+
+    Args:
+        model_name: モデル名（"LightGBM" / "RandomForest" / "Keras"）
+        n_trials: 試行数（設定クラスの既定値を含む）
+        workers: 並列数（Noneなら CPU コア数、1ならプロセスプールを使わない）
+        study_path: 試行記録ファイル（Noneなら train/<Model>/<Model>_search_study.json）
+        years: 利用可能な年（Noneなら電力・気温データの共通年）
+        eta: Successive Halving の倍率
+        seed: 候補抽出の乱数シード
+        start_method: ワーカーの起動方式（multiprocessing の start method）
+        data_dir: データディレクトリ
+
+    Returns:
+        Study: 探索結果
+
+    Raises:
+        ValueError: 未対応のモデル名・組み合わせを作成できない場合・試行記録ファイルの探索条件が異なる場合
+    """
+    if model_name not in SEARCH_SPACES:
+        raise ValueError(f"探索に未対応のモデル名です: {model_name} (対応: {', '.join(SEARCH_SPACES)})")
+    folds = rolling_folds(model_name, years)
+    if not folds:
+        raise ValueError("ローリング組み合わせを作成できません（3年以上のデータが必要です）")
+
+    study = Study.load_or_create(study_path or default_study_path(model_name), model_name,
+                                 SEARCH_SPACES[model_name], folds, n_trials, eta, seed)
+    fold_years = sorted({year for train_years, test_year in folds for year in [*train_years, test_year]})
+    year_data = load_year_data(fold_years, data_dir)
+
+    workers = workers or os.cpu_count() or 1
+    print(f"{model_name}ハイパーパラメータ探索: 試行 {len(study.trials)} 件, 組み合わせ {len(folds)} 件, "
+          f"並列数 {workers}, 試行記録 {study.path}")
+    start_time = time.time()
+    if workers == 1:
+        _init_worker(model_name, year_data)
+        successive_halving(study, lambda jobs: _run_in_process(jobs, folds))
+    else:
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker, initargs=(model_name, year_data, threads)) as executor:
+            successive_halving(study, lambda jobs: _run_in_pool(executor, jobs, folds))
+
+    best = study.best_trial()
+    logger.info(f"{model_name}ハイパーパラメータ探索完了 ({time.time() - start_time:.1f}秒)")
+    if best is not None:
+        print(f"最良の試行: {best.number} - 平均RMSE {best.mean_rmse(study.fold_keys):.3f} kW, "
+              f"パラメータ {best.params or '（既定値）'}")
+    return study
+
+
+# =============================================================================
+# 探索結果の適用（学習スクリプト）
+# =============================================================================
+
+def is_tuned_params_enabled() -> bool:
+    """
+    学習時に探索済みパラメータを適用するか判定する
+
+    Returns:
+        bool: 環境変数 AI_USE_TUNED_PARAMS が有効値（"1"/"true"/"on" など）ならTrue（既定は無効）
+    """
+    value = os.environ.get(TUNED_PARAMS_ENV_VAR, "0").strip().lower()
+    return value not in ("", "0", "false", "off", "no")
+
+
+def load_tuned_params(model_name: str, study_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    試行記録ファイルから最良の試行のパラメータを読み込む
+
+    Args:
+        model_name: モデル名
+        study_path: 試行記録ファイル（Noneなら train/<Model>/<Model>_search_study.json）
+
+    Returns:
+        Optional[Dict[str, Any]]: 設定クラスのフィールド名 → 値（ファイル・全組み合わせで評価した試行がなければNone）
+
+    Raises:
+        ValueError: 試行記録ファイルの形式バージョン・モデル名が異なる場合
+    """
+    path = study_path or default_study_path(model_name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format_version") != STUDY_FORMAT_VERSION:
+        raise ValueError(f"試行記録ファイルの形式バージョンが異なります: {data.get('format_version')}")
+    if data.get("model") != model_name:
+        raise ValueError(f"試行記録ファイルのモデル名が異なります: {data.get('model')}（期待値: {model_name}）")
+
+    folds = [(list(train_years), test_year) for train_years, test_year in data["folds"]]
+    study = Study(model_name, data["space"], folds, data["n_trials"], data["eta"], data["seed"],
+                  trials=[Trial(**trial) for trial in data["trials"]], path=path)
+    best = study.best_trial()
+    return None if best is None else dict(best.params)
+
+
+def tuned_config(model_name: str, base_config: Any, study_path: Optional[str] = None) -> Any:
+    """
+    AI_USE_TUNED_PARAMS 有効時に、設定を最良の試行のパラメータで置き換えたコピーを返す
+
+    Args:
+        model_name: モデル名
+        base_config: 学習モジュールの設定（dataclass）
+        study_path: 試行記録ファイル（Noneなら既定の保存先）
+
+    Returns:
+        Any: 置き換えた設定（無効時・探索結果がない場合は base_config）
+    """
+    if not is_tuned_params_enabled():
+        return base_config
+    path = study_path or default_study_path(model_name)
+    params = load_tuned_params(model_name, path)
+    if params is None:
+        print(f"[WARNING] 探索結果がないため既定の設定で学習します: {path}")
+        return base_config
+    print(f"探索済みパラメータを適用します: {params or '（既定値）'}（{path}）")
+    return dataclasses.replace(base_config, **params)
+
+
+def use_tuned_params(model_name: str) -> Callable:
+    """
+    学習関数のデコレータ: 実行中のみ学習モジュールの設定（モジュール変数 config）を tuned_config の結果に差し替える
+
+    明示的に渡した引数（learning_rate など）は設定より優先される。
+
+    Args:
+        model_name: モデル名
+
+    Returns:
+        Callable: デコレータ
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            module_globals = func.__globals__
+            base_config = module_globals["config"]
+            module_globals["config"] = tuned_config(model_name, base_config)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                module_globals["config"] = base_config
+        return wrapper
+    return decorator
+
+
+def main() -> None:
+    """コマンドライン実行: python common/search.py <モデル名> [試行数] [並列数]"""
+    model_name = sys.argv[1] if len(sys.argv) > 1 else "LightGBM"
+    n_trials = int(sys.argv[2]) if len(sys.argv) > 2 else config.N_TRIALS
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+
+    study = run_search(model_name, n_trials, workers)
+    best = study.best_trial()
+    if best is None:
+        print("[ERROR] 全組み合わせで評価できた試行がありません")
+        sys.exit(1)
+    for name, value in best.params.items():
+        print(f"  {name} = {value!r}")
+    print(f"学習時に適用するには {TUNED_PARAMS_ENV_VAR}=1 を設定してください")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 気温観測地点（重み付き）定義モジュール
+
+TEMP 特徴量を複数地点の気温の加重平均として作成するための地点セットと、
+行列（時間 × 地点）からのベクトル化した加重平均を提供する。
+学習データ（data/data.py の temperature-YYYY.csv）と翌日予測（tomorrow/temp.py の Open-Meteo）で
+同じ地点セット・同じ集約を使うこと（翌日予測は地点セットの全地点を取得するため、
+学習データに含まれない地点があればエラーにする）。
+
+地点セットは環境変数 AI_TEMP_STATIONS で指定する（未指定なら東京1地点＝従来どおり）:
+    AI_TEMP_STATIONS=kanto
+    AI_TEMP_STATIONS="東京:35.6785:139.6823:0.5;横浜:35.4383:139.6517:0.3;さいたま:35.8753:139.5867:0.2"
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+STATIONS_ENV_VAR = "AI_TEMP_STATIONS"
+
+
+@dataclass(frozen=True)
+class Station:
+    """気温観測地点（地点名は気象庁CSVの地点名行と一致させる）"""
+    name: str
+    latitude: float
+    longitude: float
+    weight: float = 1.0
+
+
+DEFAULT_STATIONS: Tuple[Station, ...] = (
+    Station("東京", 35.6785, 139.6823, 1.0),
+)
+
+# 東京電力管内の気象台（重みは都県の人口比の概算）
+KANTO_STATIONS: Tuple[Station, ...] = (
+    Station("東京", 35.6785, 139.6823, 14.0),
+    Station("横浜", 35.4383, 139.6517, 9.2),
+    Station("さいたま", 35.8753, 139.5867, 7.3),
+    Station("千葉", 35.6017, 140.1033, 6.3),
+    Station("水戸", 36.3800, 140.4667, 2.8),
+    Station("宇都宮", 36.5483, 139.8700, 1.9),
+    Station("前橋", 36.4050, 139.0600, 1.9),
+    Station("甲府", 35.6667, 138.5533, 0.8),
+    Station("沼津", 35.1017, 138.8633, 1.2),
+)
+
+STATION_PRESETS: Dict[str, Tuple[Station, ...]] = {
+    "default": DEFAULT_STATIONS,
+    "tokyo": DEFAULT_STATIONS,
+    "kanto": KANTO_STATIONS,
+}
+
+
+def parse_stations(spec: str) -> Tuple[Station, ...]:
+    """
+    地点セット指定文字列を解析する
+
+    Args:
+        spec: プリセット名（default / tokyo / kanto）または
+            "地点名:緯度:経度:重み" を ";" 区切りで並べた文字列（重みは省略時1.0）
+
+    Returns:
+        Tuple[Station, ...]: 地点セット
+
+    Raises:
+        ValueError: 書式が不正・重みが0以下の場合
+    """
+    preset = STATION_PRESETS.get(spec.strip().lower())
+    if preset is not None:
+        return preset
+
+    stations = []
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        fields = item.split(":")
+        if len(fields) not in (3, 4):
+            raise ValueError(f"地点の指定が不正です（地点名:緯度:経度[:重み]）: {item}")
+        weight = float(fields[3]) if len(fields) == 4 else 1.0
+        if weight <= 0:
+            raise ValueError(f"地点の重みは正の値である必要があります: {item}")
+        stations.append(Station(fields[0].strip(), float(fields[1]), float(fields[2]), weight))
+    if not stations:
+        raise ValueError(f"地点が指定されていません: {spec!r}")
+    return tuple(stations)
+
+
+def resolve_stations(spec: Optional[str] = None,
+                     default: Sequence[Station] = DEFAULT_STATIONS) -> Tuple[Station, ...]:
+    """
+    使用する地点セットを決定する
+
+    Args:
+        spec: 地点セット指定（Noneなら環境変数 AI_TEMP_STATIONS）
+        default: 未指定時の地点セット
+
+    Returns:
+        Tuple[Station, ...]: 地点セット
+    """
+    if spec is None:
+        spec = os.environ.get(STATIONS_ENV_VAR, "")
+    if not spec.strip():
+        return tuple(default)
+    return parse_stations(spec)
+
+
+def stations_signature(stations: Sequence[Station]) -> str:
+    """地点セットを識別する文字列（キャッシュキー用）"""
+    return ";".join(f"{s.name}:{s.latitude:.4f}:{s.longitude:.4f}:{s.weight:g}" for s in stations)
+
+
+def weights_for_columns(column_names: Sequence[str], stations: Sequence[Station]) -> np.ndarray:
+    """
+    列（地点名）ごとの重みを作成する（地点セットにない列は0）
+
+    Args:
+        column_names: 列の地点名（気象庁CSVの地点名行の順）
+        stations: 地点セット
+
+    Returns:
+        np.ndarray: 列ごとの重み（同じ地点名が複数列ある場合は先頭列のみ）
+
+    Raises:
+        ValueError: 地点セットの地点が列にない場合（除外すると翌日予測の全地点平均と TEMP の定義が変わるため）
+    """
+    by_name = {s.name: s.weight for s in stations}
+    weights = np.zeros(len(column_names), dtype=np.float64)
+    seen = set()
+    for k, name in enumerate(column_names):
+        name = name.strip()
+        if name in by_name and name not in seen:
+            weights[k] = by_name[name]
+            seen.add(name)
+    missing = [s.name for s in stations if s.name not in seen]
+    if missing:
+        raise ValueError(f"気温データに地点セット（{STATIONS_ENV_VAR}）の地点がありません: {missing}"
+                         f"（データの地点: {[name.strip() for name in column_names]}）")
+    return weights
+
+
+def weighted_temperature(temps: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """
+    時間 × 地点の気温行列を加重平均する（欠損地点は除いて重みを正規化）
+
+    Args:
+        temps: 気温（行数 × 地点数、欠損はNaN）
+        weights: 地点ごとの重み
+
+    Returns:
+        np.ndarray: 加重平均気温（全地点欠損の行はNaN）
+    """
+    temps = np.asarray(temps, dtype=np.float64)
+    if temps.ndim == 1:
+        temps = temps[:, None]
+    weights = np.asarray(weights, dtype=np.float64)
+    nonzero = np.flatnonzero(weights)
+    if len(nonzero) == 1:
+        # 1地点のみ（従来の東京1地点など）は値をそのまま使う
+        return temps[:, nonzero[0]].copy()
+    valid = ~np.isnan(temps)
+    w = np.where(valid, weights, 0.0)
+    total = w.sum(axis=1)
+    weighted = (np.where(valid, temps, 0.0) * w).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, weighted / total, np.nan)
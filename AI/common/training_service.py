@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 常駐学習サービス
+
+モデルごとに常駐ワーカープロセスを1つ起動し、学習モジュール（train/<Model>/<Model>_train.py）を
+読み込んだまま保持する。TensorFlow / LightGBM / scikit-learn / PyCaret の import と
+matplotlib のフォント検索はワーカー起動時の1回のみで、以降の学習要求では発生しない。
+
+学習データセットは親プロセス（server.py）のメモリ上に保持し、対象年・元データ（juyo / temperature）が
+変わらない限り再作成しない。学習要求ごとにワーカーへ配列を渡し、ワーカーは common/pipeline.py の
+train()（各学習スクリプトの train()）で学習する。
+
+異なるモデルはそれぞれのワーカープロセス（別CPUコア）で並行に学習する。
+同じモデルへの要求は成果物ファイルが共通のため順番に処理する。
+
+    service = get_training_service()
+    result = service.train("LightGBM", ["2023", "2024"], {"learning_rate": 0.05})
+"""
+
+import atexit
+import contextlib
+import glob
+import io
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common import pipeline
+from common.dataset import DatasetSplit, get_dataset_dir, split_arrays, split_test_mask
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TrainingServiceConfig:
+    """常駐学習サービス設定クラス"""
+    # spawn: サーバーのスレッド・読み込み済みライブラリの状態を引き継がない新しいプロセスで起動
+    START_METHOD: str = "spawn"
+    JOB_TIMEOUT_SECONDS: float = 2400.0   # 1回の学習の上限（server.py のサブプロセス実行と同じ）
+    SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    DATASET_CACHE_SIZE: int = 4           # メモリ上に保持するデータセット数（対象年の組み合わせ単位）
+
+
+config = TrainingServiceConfig()
+
+
+def _source_stamp(data_dir: str) -> Tuple[Tuple[str, int, int], ...]:
+    """元データファイル（juyo / temperature）の更新時刻・サイズ"""
+    paths = sorted(glob.glob(os.path.join(data_dir, "juyo-*.csv")) +
+                   glob.glob(os.path.join(data_dir, "temperature-*.csv")))
+    stamps = []
+    for path in paths:
+        st = os.stat(path)
+        stamps.append((os.path.basename(path), st.st_mtime_ns, st.st_size))
+    return tuple(stamps)
+
+
+def _persisted_stamp(data_dir: str) -> Tuple[Tuple[str, int], ...]:
+    """保存済みデータセットファイル（CSV・バイナリ）の更新時刻"""
+    paths = list(pipeline.dataset_paths(data_dir).values())
+    paths += sorted(glob.glob(os.path.join(get_dataset_dir(data_dir), "*")))
+    return tuple((path, os.stat(path).st_mtime_ns) for path in paths if os.path.exists(path))
+
+
+class DatasetStore:
+    """
+    学習データセットのメモリ上キャッシュ
+
+    対象年（未指定時は環境変数 AI_TARGET_YEARS）・テスト割合・元データの更新時刻をキーとし、
+    キーが変わらない限り data/data.py の前処理を再実行しない。
+    データセットファイル（翌日予測スクリプトが参照）は、最後に保存した内容と異なる場合のみ保存し直す。
+    """
+
+    def __init__(self, data_dir: str = pipeline.DATA_DIR, max_entries: int = config.DATASET_CACHE_SIZE):
+        self.data_dir = data_dir
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Tuple[pd.DataFrame, pd.DataFrame, DatasetSplit]]" = OrderedDict()
+        self._persisted: Optional[Tuple[Any, Tuple[Tuple[str, int], ...]]] = None
+        self._lock = threading.Lock()
+
+    def _key(self, years: Optional[List[str]], test_size: float) -> Any:
+        years_key = tuple(sorted(str(y) for y in years)) if years else os.environ.get("AI_TARGET_YEARS", "")
+        return years_key, float(test_size), _source_stamp(self.data_dir)
+
+    def get(self, years: Optional[List[str]] = None, test_size: float = pipeline.DEFAULT_TEST_SIZE,
+            persist: bool = True) -> Tuple[DatasetSplit, bool]:
+        """
+        データセットを取得する（キャッシュになければ作成）
+
+        Args:
+            years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全共通年）
+            test_size: テストデータの割合
+            persist: データセットファイルも保存するか
+
+        Returns:
+            Tuple[DatasetSplit, bool]: 分割済みデータセット, キャッシュを使用したか
+        """
+        data_module = pipeline._data_module()
+        with self._lock:
+            key = self._key(years, test_size)
+            entry = self._entries.get(key)
+            cached = entry is not None
+            if cached:
+                self._entries.move_to_end(key)
+                data_module.report_progress(
+                    f"メモリ上のデータセットを使用: 学習{len(entry[2].X_train)}行, テスト{len(entry[2].X_test)}行")
+            else:
+                X_df, y_df = data_module.build_feature_target(years, self.data_dir)
+                test_mask = split_test_mask(len(X_df), test_size)
+                split = split_arrays(X_df.to_numpy(), y_df.to_numpy(), test_mask,
+                                     list(X_df.columns), list(y_df.columns))
+                data_module.report_progress(
+                    f"メモリ上のデータセット作成完了: 学習{len(split.X_train)}行, テスト{len(split.X_test)}行")
+                entry = (X_df, y_df, split)
+                self._entries[key] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+            if persist and self._persisted != (key, _persisted_stamp(self.data_dir)):
+                pipeline.persist_dataset(entry[0], entry[1], test_size, self.data_dir)
+                self._persisted = (key, _persisted_stamp(self.data_dir))
+            return entry[2], cached
+
+
+def _join_lines(lines: List[str]) -> str:
+    """取り込んだメッセージを標準出力と同じ形式の文字列にする"""
+    return "".join(f"{line}\n" for line in lines)
+
+
+def _worker_main(conn, model_name: str) -> None:
+    """
+    ワーカープロセス本体（学習モジュールを読み込んで常駐し、学習要求を順に処理する）
+
+    Args:
+        conn: 親プロセスとの通信用 Connection（要求: (dataset, params)、None で終了）
+        model_name: 担当するモデル名
+    """
+    # 起動時に学習モジュール（重いライブラリ・フォント設定を含む）を読み込んでおく。
+    # 失敗した場合は学習要求時に再度読み込み、エラー内容を結果として返す
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            pipeline.load_trainer(model_name)
+        except Exception:
+            pass
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+        dataset, params = job
+        stdout, stderr = io.StringIO(), io.StringIO()
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                artifact = pipeline.train(model_name, dataset, params)
+            result = {'status': 'ok', 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(),
+                      'returncode': 0, **artifact.metrics, 'elapsed': artifact.elapsed}
+        except Exception as e:
+            result = {'status': 'error', 'message': str(e), 'stdout': stdout.getvalue(),
+                      'stderr': stderr.getvalue() + traceback.format_exc(), 'returncode': 1}
+        try:
+            conn.send(result)
+        except (EOFError, OSError):
+            break
+
+
+class _Worker:
+    """1モデル分の常駐ワーカープロセス"""
+
+    def __init__(self, model_name: str, context):
+        self.model_name = model_name
+        self.lock = threading.Lock()  # 同じモデルの学習要求を直列化
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, model_name),
+                                       name=f"train-{model_name}", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+
+    def run(self, dataset: DatasetSplit, params: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """学習要求を送り、結果を待つ（タイムアウト時はワーカーを停止）"""
+        self.conn.send((dataset, params))
+        if not self.conn.poll(timeout):
+            self.stop(0)
+            raise TimeoutError(f"{self.model_name}の学習が{timeout:.0f}秒以内に終了しませんでした")
+        return self.conn.recv()
+
+    def stop(self, timeout: float = config.SHUTDOWN_TIMEOUT_SECONDS) -> None:
+        """ワーカーを終了する（応答がなければ強制終了）"""
+        try:
+            if timeout and self.process.is_alive():
+                self.conn.send(None)
+                self.process.join(timeout)
+        except (EOFError, OSError):
+            pass
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(config.SHUTDOWN_TIMEOUT_SECONDS)
+        self.conn.close()
+
+
+class TrainingService:
+    """モデルごとの常駐ワーカープロセスと、メモリ上のデータセットを管理する学習サービス"""
+
+    def __init__(self, data_dir: str = pipeline.DATA_DIR, start_method: str = config.START_METHOD,
+                 job_timeout: float = config.JOB_TIMEOUT_SECONDS):
+        """
+        Args:
+            data_dir: データディレクトリ
+            start_method: ワーカーの起動方式（multiprocessing の start method）
+            job_timeout: 1回の学習の上限（秒）
+        """
+        self.datasets = DatasetStore(data_dir)
+        self.job_timeout = job_timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: Dict[str, _Worker] = {}
+        self._lock = threading.Lock()
+
+    def _worker(self, model_name: str) -> _Worker:
+        """モデルのワーカーを取得する（未起動・停止済みなら起動）"""
+        with self._lock:
+            worker = self._workers.get(model_name)
+            if worker is None or not worker.is_alive():
+                if worker is not None:
+                    logger.warning(f"{model_name}の学習ワーカーが停止していたため再起動します")
+                    worker.stop(0)
+                worker = _Worker(model_name, self._context)
+                self._workers[model_name] = worker
+            return worker
+
+    def warmup(self, models: Iterable[str]) -> None:
+        """
+        ワーカーを事前に起動する（学習モジュールの読み込みを最初の学習要求より前に済ませる）
+
+        Args:
+            models: モデル名リスト
+        """
+        for model_name in models:
+            pipeline._model_entry(model_name)
+            self._worker(model_name)
+
+    def train(self, model_name: str, years: Optional[List[str]] = None,
+              params: Optional[Dict[str, Any]] = None,
+              test_size: float = pipeline.DEFAULT_TEST_SIZE) -> Dict[str, Any]:
+        """
+        モデルを学習する（データセット作成は親プロセス、学習はモデルのワーカープロセスで実行）
+
+        Args:
+            model_name: モデル名（"LightGBM" / "Keras" / "PyCaret" / "RandomForest"）
+            years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全共通年）
+            params: ハイパーパラメータ（learning_rate / epochs / validation_split）
+            test_size: テストデータの割合
+
+        Returns:
+            Dict[str, Any]: status / stdout / stderr / returncode（server.py のスクリプト実行結果と同じ形式）。
+                成功時は rmse / r2 / mae / elapsed / dataset_cached を追加
+
+        Raises:
+            ValueError: 未対応のモデル名・パラメータの場合
+        """
+        pipeline._model_entry(model_name)
+        params = dict(params or {})
+        unknown = sorted(set(params) - set(pipeline.TRAIN_PARAM_KEYS))
+        if unknown:
+            raise ValueError(f"未対応のパラメータです: {unknown} (対応: {', '.join(pipeline.TRAIN_PARAM_KEYS)})")
+
+        start_time = time.time()
+        worker = self._worker(model_name)  # データセット作成中にワーカーの起動・読み込みを進める
+        # データセット作成のメッセージはこのスレッド分のみ取り込む（サーバーは要求ごとにスレッドで並行処理し、
+        # sys.stdout を差し替えると他の要求の出力と混ざる・戻す順序が崩れるため）
+        with pipeline._data_module().capture_progress() as progress:
+            try:
+                dataset, cached = self.datasets.get(years, test_size)
+            except Exception as e:
+                return {'status': 'error', 'message': str(e), 'stdout': _join_lines(progress),
+                        'stderr': traceback.format_exc(), 'returncode': 1}
+
+        with worker.lock:
+            try:
+                result = worker.run(dataset, params, self.job_timeout)
+            except (TimeoutError, EOFError, OSError) as e:
+                logger.error(f"{model_name}の学習ワーカーでエラーが発生しました: {e}")
+                result = {'status': 'error', 'message': str(e), 'stdout': '', 'stderr': '', 'returncode': 1}
+
+        result['stdout'] = _join_lines(progress) + result.get('stdout', '')
+        result['dataset_cached'] = cached
+        logger.info(f"{model_name}学習要求完了: status={result['status']} "
+                    f"(データセット{'再利用' if cached else '作成'}, {time.time() - start_time:.2f}秒)")
+        return result
+
+    def shutdown(self) -> None:
+        """全ワーカーを終了する"""
+        with self._lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.stop()
+
+
+_service: Optional[TrainingService] = None
+_service_lock = threading.Lock()
+
+
+def get_training_service() -> TrainingService:
+    """プロセス内で共有する学習サービスを取得する（終了時にワーカーを停止）"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TrainingService()
+            atexit.register(_service.shutdown)
+        return _service
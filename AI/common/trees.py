@@ -0,0 +1,426 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 決定木アンサンブルの NumPy 推論モジュール
+
+LightGBM（Booster.dump_model の木構造）と scikit-learn の RandomForestRegressor を、
+全ての木のノードを連結した配列（特徴量番号・しきい値・左右の子ノード・葉の値）に変換し、
+NumPy のみで予測する。翌日予測で LightGBM の読み込みや推定器の unpickle が不要になる。
+
+ノード配列（分岐ノードと葉を別々に連結）:
+    feature         分岐に使う特徴量番号（特徴量数に応じて int8 / int16）
+    threshold       しきい値（特徴量 <= しきい値 なら左の子へ。RandomForest は float32、LightGBM は float64）
+    left / right    子ノード（0以上: 分岐ノードの番号、負: ~葉の番号。int32）
+    leaf_value      葉の値（float64）
+    default_left    欠損値を左の子へ送るか（LightGBM のみ意味を持つ）
+    missing_type    欠損値の扱い（0: なし、1: ゼロを欠損扱い、2: NaN を欠損扱い。LightGBM のみ意味を持つ）
+    roots           各木の根（left / right と同じ表し方。int32）
+
+予測は全ての行・全ての木の現在ノードを (行数, 木の数) の配列で持ち、木の深さの回数だけ一斉に1段ずつ進める。
+
+保存形式（.trees、save / load）:
+    先頭8バイトの識別子・ヘッダー長・JSONヘッダーの後に、各配列を64バイト境界に揃えて連続して書き込む。
+    load はファイルをメモリマップするため読み込み時間がほぼかからず、同じファイルを読み込む複数のプロセスは
+    OSのページキャッシュを共有する。
+"""
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from typing import Dict, List, Optional
+
+import numpy as np
+
+TREE_INFERENCE_ENV_VAR = "AI_TREE_NUMPY"
+
+TREE_FILE_MAGIC = b"PDFTREES"
+TREE_FILE_VERSION = 1
+_ALIGNMENT = 64
+_HEADER_LENGTH = struct.Struct("<Q")
+
+MISSING_NONE = 0
+MISSING_ZERO = 1
+MISSING_NAN = 2
+_LIGHTGBM_MISSING_TYPES = {"None": MISSING_NONE, "Zero": MISSING_ZERO, "NaN": MISSING_NAN}
+_LIGHTGBM_ZERO_THRESHOLD = 1e-35
+
+# 1回の一括評価で扱う（行数×木の数）の上限（作業用配列のメモリを抑える）
+MAX_BATCH_CELLS = 1 << 20
+
+_ARRAY_NAMES = ("feature", "threshold", "left", "right", "leaf_value", "default_left", "missing_type", "roots")
+
+
+def is_tree_inference_enabled() -> bool:
+    """
+    決定木アンサンブルの NumPy 推論が有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_TREE_NUMPY が無効値でなければTrue
+    """
+    value = os.environ.get(TREE_INFERENCE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+
+def _feature_dtype(n_features: int) -> np.dtype:
+    """特徴量番号を表せる最小の整数型"""
+    return np.dtype(np.int8) if n_features <= np.iinfo(np.int8).max else np.dtype(np.int16)
+
+
+def round_down_float32(threshold: np.ndarray) -> np.ndarray:
+    """
+    しきい値を float32 に切り下げる
+
+    float32 の特徴量 x について「x <= しきい値」と「x <= 切り下げたしきい値」は常に一致するため、
+    float32 に変換してから比較する scikit-learn の決定木と同じ分岐になる。
+
+    Args:
+        threshold: float64 のしきい値
+
+    Returns:
+        np.ndarray: float32 のしきい値
+    """
+    threshold = np.asarray(threshold, dtype=np.float64)
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+class _NodeBuffer:
+    """木を1本ずつ追加してノード配列を作成する（LightGBM 用）"""
+
+    def __init__(self):
+        self.feature: List[int] = []
+        self.threshold: List[float] = []
+        self.left: List[int] = []
+        self.right: List[int] = []
+        self.default_left: List[bool] = []
+        self.missing_type: List[int] = []
+        self.leaf_value: List[float] = []
+        self.roots: List[int] = []
+
+    def add_split(self, feature: int, threshold: float, default_left: bool, missing_type: int) -> int:
+        node = len(self.feature)
+        self.feature.append(feature)
+        self.threshold.append(threshold)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.default_left.append(default_left)
+        self.missing_type.append(missing_type)
+        return node
+
+    def add_leaf(self, value: float) -> int:
+        self.leaf_value.append(value)
+        return ~(len(self.leaf_value) - 1)
+
+
+class TreeEnsemble:
+    """
+    連結したノード配列で表した決定木アンサンブル
+
+    予測値は各木の葉の値の合計（LightGBM）または平均（RandomForest）。
+    float32_input のモデルは scikit-learn と同じく特徴量を float32 に変換してからしきい値と比較する。
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, left: np.ndarray, right: np.ndarray,
+                 leaf_value: np.ndarray, roots: np.ndarray, n_features: int, average: bool = False,
+                 float32_input: bool = False, default_left: np.ndarray = None,
+                 missing_type: np.ndarray = None, max_depth: Optional[int] = None):
+        n_nodes = len(feature)
+        for name, array in (("threshold", threshold), ("left", left), ("right", right)):
+            if len(array) != n_nodes:
+                raise ValueError(f"ノード配列 {name} の長さ({len(array)})がノード数({n_nodes})と一致しません")
+        if len(roots) == 0:
+            raise ValueError("木がありません")
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.n_features = int(n_features)
+        self.average = bool(average)
+        self.float32_input = bool(float32_input)
+        self.default_left = np.zeros(n_nodes, dtype=bool) if default_left is None else default_left
+        self.missing_type = np.zeros(n_nodes, dtype=np.int8) if missing_type is None else missing_type
+        self.has_zero_missing = bool(np.any(self.missing_type == MISSING_ZERO))
+        self.max_depth = self._max_depth() if max_depth is None else int(max_depth)
+
+    @property
+    def n_trees(self) -> int:
+        """木の数"""
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        """全ての木のノード数（分岐ノードと葉）の合計"""
+        return len(self.feature) + len(self.leaf_value)
+
+    @property
+    def nbytes(self) -> int:
+        """ノード配列の合計バイト数"""
+        return sum(getattr(self, name).nbytes for name in _ARRAY_NAMES)
+
+    def _max_depth(self) -> int:
+        """最も深い木の深さ（根から葉までの分岐の数）"""
+        idx = np.asarray(self.roots, dtype=np.int64)
+        idx = idx[idx >= 0]
+        depth = 0
+        while len(idx):
+            depth += 1
+            idx = np.concatenate([self.left[idx], self.right[idx]])
+            idx = idx[idx >= 0]
+        return depth
+
+    @classmethod
+    def from_lightgbm(cls, model) -> "TreeEnsemble":
+        """
+        LightGBM のモデル（LGBMRegressor / Booster）から作成する
+
+        Args:
+            model: 学習済みの LGBMRegressor または Booster
+
+        Returns:
+            TreeEnsemble: ノード配列で表したモデル
+
+        Raises:
+            ValueError: 回帰以外の目的関数・カテゴリ分岐・線形木を含むモデル
+        """
+        booster = getattr(model, "booster_", model)
+        dump = booster.dump_model()
+        objective = str(dump.get("objective", "")).split(" ")[0]
+        if objective not in ("regression", "regression_l1", "huber", "fair", "quantile", "mape"):
+            raise ValueError(f"NumPy 推論に未対応の目的関数です: {objective}")
+
+        buffer = _NodeBuffer()
+        for tree in dump["tree_info"]:
+            if tree.get("is_linear"):
+                raise ValueError("NumPy 推論は線形木に対応していません")
+            buffer.roots.append(cls._add_lightgbm_node(buffer, tree["tree_structure"]))
+        n_features = dump["max_feature_idx"] + 1
+        return cls(
+            feature=np.asarray(buffer.feature, dtype=_feature_dtype(n_features)),
+            threshold=np.asarray(buffer.threshold, dtype=np.float64),
+            left=np.asarray(buffer.left, dtype=np.int32),
+            right=np.asarray(buffer.right, dtype=np.int32),
+            leaf_value=np.asarray(buffer.leaf_value, dtype=np.float64),
+            roots=np.asarray(buffer.roots, dtype=np.int32),
+            n_features=n_features,
+            default_left=np.asarray(buffer.default_left, dtype=bool),
+            missing_type=np.asarray(buffer.missing_type, dtype=np.int8),
+        )
+
+    @staticmethod
+    def _add_lightgbm_node(buffer: _NodeBuffer, root: dict) -> int:
+        """LightGBM の木構造（dump_model の tree_structure、葉の値は学習率を適用済み）をノード配列に追加する"""
+        root_id = None
+        stack = [(root, None, None)]
+        while stack:
+            node, parent, is_left = stack.pop()
+            if "leaf_value" in node:
+                node_id = buffer.add_leaf(float(node["leaf_value"]))
+            else:
+                if node.get("decision_type", "<=") != "<=":
+                    raise ValueError(f"NumPy 推論に未対応の分岐です: {node.get('decision_type')}")
+                node_id = buffer.add_split(
+                    feature=int(node["split_feature"]),
+                    threshold=float(node["threshold"]),
+                    default_left=bool(node.get("default_left", True)),
+                    missing_type=_LIGHTGBM_MISSING_TYPES.get(node.get("missing_type", "None"), MISSING_NONE),
+                )
+                stack.append((node["right_child"], node_id, False))
+                stack.append((node["left_child"], node_id, True))
+            if parent is None:
+                root_id = node_id
+            elif is_left:
+                buffer.left[parent] = node_id
+            else:
+                buffer.right[parent] = node_id
+        return root_id
+
+    @classmethod
+    def from_sklearn(cls, model) -> "TreeEnsemble":
+        """
+        scikit-learn の RandomForestRegressor（ExtraTreesRegressor も可）から作成する
+
+        Args:
+            model: 学習済みの RandomForestRegressor
+
+        Returns:
+            TreeEnsemble: ノード配列で表したモデル（しきい値は float32）
+
+        Raises:
+            ValueError: 決定木の平均で予測するアンサンブル以外・多出力のモデル
+        """
+        from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+        if not isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+            raise ValueError(f"NumPy 推論に未対応のモデルです: {type(model).__name__}")
+        if model.n_outputs_ != 1:
+            raise ValueError("NumPy 推論は1出力のモデルのみ対応しています")
+
+        features, thresholds, lefts, rights, leaf_values, roots = [], [], [], [], [], []
+        n_splits = n_leaves = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left < 0
+            split = ~is_leaf
+            # 元のノード番号 → 連結後の番号（分岐ノードは0以上、葉は ~葉の番号）
+            new_id = np.where(is_leaf, ~(n_leaves + np.cumsum(is_leaf) - 1),
+                              n_splits + np.cumsum(split) - 1).astype(np.int32)
+            features.append(tree.feature[split])
+            thresholds.append(tree.threshold[split])
+            lefts.append(new_id[tree.children_left[split]])
+            rights.append(new_id[tree.children_right[split]])
+            leaf_values.append(tree.value[is_leaf, 0, 0])
+            roots.append(new_id[0])
+            n_splits += int(split.sum())
+            n_leaves += int(is_leaf.sum())
+        return cls(
+            feature=np.concatenate(features).astype(_feature_dtype(model.n_features_in_)),
+            threshold=round_down_float32(np.concatenate(thresholds)),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            leaf_value=np.concatenate(leaf_values).astype(np.float64),
+            roots=np.asarray(roots, dtype=np.int32),
+            n_features=model.n_features_in_,
+            average=True,
+            float32_input=True,
+        )
+
+    def save(self, path: str, file_id: str = "") -> None:
+        """
+        ノード配列をメモリマップ可能な1ファイルに保存する（一時ファイル経由で置換）
+
+        Args:
+            path: 保存先（.trees）
+            file_id: 対応するモデルバンドルとの照合用ID（load で検証）
+        """
+        arrays = {name: np.ascontiguousarray(getattr(self, name)) for name in _ARRAY_NAMES}
+        entries = {}
+        offset = 0
+        for name, array in arrays.items():
+            entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+        header = json.dumps({
+            "format_version": TREE_FILE_VERSION,
+            "file_id": file_id,
+            "n_features": self.n_features,
+            "average": self.average,
+            "float32_input": self.float32_input,
+            "max_depth": self.max_depth,
+            "arrays": entries,
+        }).encode("utf-8")
+        prefix_length = len(TREE_FILE_MAGIC) + _HEADER_LENGTH.size + len(header)
+        header += b" " * (-prefix_length % _ALIGNMENT)
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(TREE_FILE_MAGIC)
+                f.write(_HEADER_LENGTH.pack(len(header)))
+                f.write(header)
+                for array in arrays.values():
+                    f.write(array.tobytes())
+                    f.write(b"\0" * (-array.nbytes % _ALIGNMENT))
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str, file_id: Optional[str] = None, use_mmap: bool = True) -> "TreeEnsemble":
+        """
+        save で保存したノード配列を読み込む
+
+        Args:
+            path: 保存先（.trees）
+            file_id: 指定時は保存時のIDと一致するか検証する
+            use_mmap: ファイルをメモリマップするか（False ならメモリに読み込む）
+
+        Returns:
+            TreeEnsemble: ノード配列で表したモデル（use_mmap 時の配列は読み取り専用）
+
+        Raises:
+            FileNotFoundError: ファイルが存在しない場合
+            ValueError: 形式が不正・形式バージョンやIDが一致しない場合
+        """
+        prefix_size = len(TREE_FILE_MAGIC) + _HEADER_LENGTH.size
+        with open(path, "rb") as f:
+            prefix = f.read(prefix_size)
+            if len(prefix) != prefix_size or not prefix.startswith(TREE_FILE_MAGIC):
+                raise ValueError(f"決定木ファイルの形式が不正です: {path}")
+            (header_length,) = _HEADER_LENGTH.unpack(prefix[len(TREE_FILE_MAGIC):])
+            try:
+                header = json.loads(f.read(header_length).decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise ValueError(f"決定木ファイルのヘッダーが不正です: {path}, {e}")
+            if header.get("format_version") != TREE_FILE_VERSION:
+                raise ValueError(f"未対応の決定木ファイル形式バージョンです: {header.get('format_version')} ({path})")
+            if file_id is not None and header.get("file_id") != file_id:
+                raise ValueError(f"決定木ファイルがモデルバンドルと対応していません: {path}")
+            if use_mmap:
+                buffer = np.frombuffer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), dtype=np.uint8)
+            else:
+                f.seek(0)
+                buffer = np.frombuffer(f.read(), dtype=np.uint8)
+
+        data_start = prefix_size + header_length
+        arrays: Dict[str, np.ndarray] = {}
+        for name in _ARRAY_NAMES:
+            entry = header["arrays"][name]
+            dtype = np.dtype(entry["dtype"])
+            nbytes = int(np.prod(entry["shape"], dtype=np.int64)) * dtype.itemsize
+            start = data_start + entry["offset"]
+            if start + nbytes > len(buffer):
+                raise ValueError(f"決定木ファイルが途中で切れています: {path}")
+            arrays[name] = buffer[start:start + nbytes].view(dtype).reshape(entry["shape"])
+        return cls(**arrays, n_features=header["n_features"], average=header["average"],
+                   float32_input=header["float32_input"], max_depth=header["max_depth"])
+
+    def _predict_batch(self, X: np.ndarray) -> np.ndarray:
+        idx = np.broadcast_to(self.roots, (len(X), self.n_trees)).copy()
+        check_missing = self.has_zero_missing or bool(np.isnan(X).any())
+        for _ in range(self.max_depth):
+            active = idx >= 0
+            if not active.any():
+                break
+            node = np.where(active, idx, 0)
+            x = np.take_along_axis(X, self.feature[node].astype(np.intp), axis=1)
+            threshold = self.threshold[node]
+            if check_missing:
+                missing_type = self.missing_type[node]
+                is_nan = np.isnan(x)
+                x = np.where(is_nan & (missing_type != MISSING_NAN), 0.0, x)
+                use_default = (((missing_type == MISSING_ZERO) & (np.abs(x) <= _LIGHTGBM_ZERO_THRESHOLD))
+                               | ((missing_type == MISSING_NAN) & is_nan))
+                go_left = np.where(use_default, self.default_left[node], x <= threshold)
+            else:
+                go_left = x <= threshold
+            idx = np.where(active, np.where(go_left, self.left[node], self.right[node]), idx)
+        total = self.leaf_value[~idx].sum(axis=1)
+        return total / self.n_trees if self.average else total
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        全ての木を一括でたどって予測する
+
+        Args:
+            X: 特徴量（行数×特徴量数。LightGBM・scikit-learn と同じく学習時の特徴量の並び）
+
+        Returns:
+            np.ndarray: 予測値（1次元、float64）
+
+        Raises:
+            ValueError: 特徴量数が学習時と一致しない場合
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"特徴量数({X.shape[-1]})が学習時({self.n_features})と一致しません")
+        X = X.astype(np.float32 if self.float32_input else np.float64)
+        batch_rows = max(1, MAX_BATCH_CELLS // self.n_trees)
+        return np.concatenate([self._predict_batch(X[start:start + batch_rows])
+                               for start in range(0, len(X), batch_rows)]) if len(X) else np.zeros(0)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 追加学習（ウォームスタート）の判定
+
+日次の再学習で、前回のモデルバンドル（common/artifact.py）を起点に直近の期間だけを学習するか、
+全期間で学習し直すかを判定する。追加学習そのものは各学習スクリプトが行う
+（LightGBM: init_model で反復を追加、Keras: 保存済みの重みを数エポック再学習、RandomForest: warm_start で木を追加）。
+
+次の場合は全体再学習に戻す:
+- 追加学習が無効（環境変数 AI_WARM_START が未設定・無効値）、前回のバンドルがない・読み込めない
+- 特徴量の列・学習データの先頭（対象年）が前回と異なる、学習データが前回より短い
+- 前回の全体再学習から FULL_RETRAIN_DAYS 日以上経過（定期的な全体再学習）
+- ドリフト検出: 前回以降に追加された行での前回モデルの RMSE が、前回のテストRMSEの DRIFT_RMSE_RATIO 倍を超える、
+  または追加された行のうち学習データの特徴量範囲外の行の割合が DRIFT_OUT_OF_RANGE_FRACTION を超える
+
+学習データが前回と同じ場合は学習せず前回のモデルをそのまま使用する。
+学習モード・前回の全体再学習日時などはバンドルの meta（training）に記録する。
+"""
+
+import datetime
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from common.artifact import ModelArtifact, bundle_path, data_hash, load_artifact
+
+logger = logging.getLogger(__name__)
+
+WARM_START_ENV_VAR = "AI_WARM_START"
+
+# 学習モード
+MODE_FULL = "full"    # 全期間で学習し直す
+MODE_WARM = "warm"    # 前回のモデルに直近の期間を追加学習
+MODE_REUSE = "reuse"  # 学習データが前回と同じため前回のモデルをそのまま使用
+
+
+@dataclass(frozen=True)
+class WarmStartConfig:
+    """追加学習の判定設定クラス"""
+    FULL_RETRAIN_DAYS: int = 7              # 前回の全体再学習からこの日数以上経過したら全体再学習
+    RECENT_WINDOW_HOURS: int = 24 * 28      # 追加学習に使用する直近の行数（学習データ末尾）
+    HISTORY_HEAD_ROWS: int = 24 * 7         # 対象年の一致確認に使う先頭の行数
+    DRIFT_MIN_ROWS: int = 24                # ドリフト判定に使う最小の行数
+    DRIFT_RMSE_RATIO: float = 1.5
+    DRIFT_OUT_OF_RANGE_FRACTION: float = 0.05
+
+
+config = WarmStartConfig()
+
+
+def is_warm_start_enabled() -> bool:
+    """
+    追加学習が有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_WARM_START が有効値（"1"/"true"/"on" など）ならTrue（既定は無効）
+    """
+    value = os.environ.get(WARM_START_ENV_VAR, "0").strip().lower()
+    return value not in ("", "0", "false", "off", "no")
+
+
+@dataclass
+class WarmStartPlan:
+    """学習モードの判定結果"""
+    mode: str
+    reason: str
+    previous: Optional[ModelArtifact] = None  # 前回のバンドル（追加学習・再利用時。モデルは学習ライブラリの形式）
+
+    @property
+    def is_full(self) -> bool:
+        return self.mode == MODE_FULL
+
+    def recent_window(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """追加学習に使用する直近の期間（学習データ末尾 RECENT_WINDOW_HOURS 行）"""
+        return X[-config.RECENT_WINDOW_HOURS:], y[-config.RECENT_WINDOW_HOURS:]
+
+
+def history_hash(X_train: np.ndarray, y_train: np.ndarray) -> str:
+    """学習データ先頭のハッシュ（対象年の選択が前回と同じか確認する）"""
+    rows = config.HISTORY_HEAD_ROWS
+    return data_hash(np.asarray(X_train)[:rows], np.asarray(y_train)[:rows])
+
+
+def _parse_time(value: Any) -> Optional[datetime.datetime]:
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def detect_drift(previous: ModelArtifact, X_new: np.ndarray, y_new: np.ndarray) -> Optional[str]:
+    """
+    前回以降に追加された行で前回モデルの精度・特徴量範囲を確認する
+
+    Args:
+        previous: 前回のバンドル
+        X_new: 追加された行の特徴量（標準化前）
+        y_new: 追加された行の目的変数
+
+    Returns:
+        Optional[str]: ドリフトを検出した場合はその理由（なければ None）
+    """
+    X_new = np.asarray(X_new, dtype=np.float32)
+    out_of_range = np.any((X_new < previous.feature_min) | (X_new > previous.feature_max), axis=1).mean()
+    if out_of_range > config.DRIFT_OUT_OF_RANGE_FRACTION:
+        return f"学習データの特徴量範囲外の行が {out_of_range:.1%}"
+
+    reference_rmse = previous.metrics.get("rmse")
+    if reference_rmse:
+        y_pred = previous.predict(X_new)
+        rmse = float(np.sqrt(np.mean((np.ravel(y_new) - y_pred) ** 2)))
+        if rmse > reference_rmse * config.DRIFT_RMSE_RATIO:
+            return f"追加データの RMSE {rmse:.1f} kW が前回のテストRMSE {reference_rmse:.1f} kW の{config.DRIFT_RMSE_RATIO}倍超"
+    return None
+
+
+def plan_training(model_path: str, X_train: np.ndarray, y_train: np.ndarray,
+                  feature_columns: Sequence[str], now: Optional[datetime.datetime] = None) -> WarmStartPlan:
+    """
+    前回のバンドルと学習データから学習モード（全体再学習・追加学習・再利用）を判定する
+
+    Args:
+        model_path: モデル保存先（.sav / .h5、バンドルのパスはここから求める）
+        X_train: 学習用特徴量（標準化前、時系列順）
+        y_train: 学習用目的変数
+        feature_columns: 特徴量の列名
+        now: 現在日時（Noneなら現在時刻）
+
+    Returns:
+        WarmStartPlan: 判定結果
+    """
+    plan = _plan_training(model_path, X_train, y_train, feature_columns, now or datetime.datetime.now())
+    labels = {MODE_FULL: "全体再学習", MODE_WARM: "追加学習", MODE_REUSE: "前回のモデルを再利用"}
+    print(f"学習モード: {labels[plan.mode]}（{plan.reason}）")
+    return plan
+
+
+def _plan_training(model_path: str, X_train: np.ndarray, y_train: np.ndarray,
+                   feature_columns: Sequence[str], now: datetime.datetime) -> WarmStartPlan:
+    if not is_warm_start_enabled():
+        return WarmStartPlan(MODE_FULL, f"{WARM_START_ENV_VAR} が無効")
+    path = bundle_path(model_path)
+    if not os.path.exists(path):
+        return WarmStartPlan(MODE_FULL, "前回のモデルバンドルがありません")
+    try:
+        previous = load_artifact(path, library_model=True)
+    except Exception as e:
+        logger.warning(f"前回のモデルバンドルを読み込めません（全体再学習します）: {path}, {e}")
+        return WarmStartPlan(MODE_FULL, "前回のモデルバンドルを読み込めません")
+
+    training = previous.training
+    full_trained_at = _parse_time(training.get("full_trained_at"))
+    previous_rows = int(training.get("train_rows", 0))
+    if list(feature_columns) != previous.feature_columns:
+        return WarmStartPlan(MODE_FULL, "特徴量の列が前回と異なります")
+    if full_trained_at is None or training.get("history_hash") != history_hash(X_train, y_train):
+        return WarmStartPlan(MODE_FULL, "学習データの対象年が前回と異なります")
+    if len(X_train) < previous_rows:
+        return WarmStartPlan(MODE_FULL, "学習データが前回より短くなっています")
+    if previous.train_data_hash == data_hash(np.asarray(X_train), np.asarray(y_train)):
+        return WarmStartPlan(MODE_REUSE, "学習データが前回と同じです", previous)
+    elapsed_days = (now - full_trained_at).total_seconds() / 86400
+    if elapsed_days >= config.FULL_RETRAIN_DAYS:
+        return WarmStartPlan(MODE_FULL, f"前回の全体再学習から{elapsed_days:.1f}日経過（定期的な全体再学習）")
+
+    start = max(0, min(previous_rows, len(X_train) - config.DRIFT_MIN_ROWS))
+    drift = detect_drift(previous, X_train[start:], y_train[start:])
+    if drift is not None:
+        return WarmStartPlan(MODE_FULL, f"ドリフト検出: {drift}")
+    return WarmStartPlan(MODE_WARM, f"追加 {len(X_train) - previous_rows} 行・直近 "
+                                    f"{min(len(X_train), config.RECENT_WINDOW_HOURS)} 行で学習", previous)
+
+
+def training_info(plan: WarmStartPlan, X_train: np.ndarray, y_train: np.ndarray,
+                  now: Optional[datetime.datetime] = None) -> Dict[str, Any]:
+    """
+    バンドルの meta に記録する学習モード・前回の全体再学習日時
+
+    Args:
+        plan: 判定結果
+        X_train: 学習用特徴量（標準化前）
+        y_train: 学習用目的変数
+        now: 現在日時（Noneなら現在時刻）
+
+    Returns:
+        Dict[str, Any]: mode / full_trained_at / warm_updates / train_rows / history_hash
+    """
+    now = now or datetime.datetime.now()
+    previous = plan.previous.training if plan.previous is not None else {}
+    if plan.is_full:
+        full_trained_at, warm_updates = now.isoformat(timespec="seconds"), 0
+    else:
+        full_trained_at = previous.get("full_trained_at")
+        warm_updates = int(previous.get("warm_updates", 0)) + (plan.mode == MODE_WARM)
+    return {
+        "mode": plan.mode,
+        "full_trained_at": full_trained_at,
+        "warm_updates": warm_updates,
+        "train_rows": int(len(X_train)),
+        "history_hash": history_hash(X_train, y_train),
+    }
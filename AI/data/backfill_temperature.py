@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - 過去気温データ一括取得（temperature-YYYY.csv 作成）モジュール
+
+juyo-YYYY.csv はあるが temperature-YYYY.csv がない年（get_common_years で学習対象から外れる年）の
+気温データを Open-Meteo の過去データAPI（再解析）から取得し、気象庁「過去の気象データ」と同じ
+レイアウトで data/temperature-YYYY.csv に保存する。
+
+- 年ごとの期間を CHUNK_DAYS 日単位のリクエストに分割し、MAX_WORKERS 並列で取得する
+  （リクエスト開始間隔は MIN_REQUEST_INTERVAL 秒以上に制限）
+- 取得は tomorrow/temp.py の fetch_hourly_matrix（時間別気温キャッシュ）経由で行うため、
+  中断後に再実行するとキャッシュ済みの期間はリクエストせずに再開する
+- 年のすべての期間を取得できた時点でその年のファイルを書き込む（年の途中で失敗した年は書き込まない）
+- 気象庁からダウンロードしたファイルは上書きしない。このモジュールで作成した当年分など
+  年末まで揃っていないファイルのみ、再実行時に最新の期間まで作成し直す
+- 地点は環境変数 AI_TEMP_STATIONS の地点セット（未指定なら東京1地点）。各地点の列を地点名付きで
+  出力し、data/data.py が同じ地点セットの重みで加重平均する
+
+コマンドライン実行（AI/ ディレクトリから）:
+    python data/backfill_temperature.py              # 気温データがない年をすべて作成
+    python data/backfill_temperature.py 2025,2026    # 年を指定
+    python data/backfill_temperature.py 2016-2026    # 範囲指定
+"""
+
+import glob
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.hourly_cache import as_hours
+from common.parsers import format_jma_temperature_rows, parse_jma_temperature
+from common.stations import Station, resolve_stations
+from tomorrow import temp as tomorrow_temp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class BackfillConfig:
+    """過去気温データ一括取得設定クラス"""
+    DATA_DIR: str = os.path.join(_AI_DIR, "data")
+    POWER_FILE_PATTERN: str = "juyo-*.csv"
+    TEMP_FILE_TEMPLATE: str = "temperature-{year}.csv"
+    ENCODING: str = "SHIFT-JIS"
+    TEMP_DATA_SKIPROWS: int = 5
+    TIMEZONE: str = "Asia%2FTokyo"
+
+    CHUNK_DAYS: int = 92                # 1リクエストで取得する最大日数
+    MAX_WORKERS: int = 4                # 並列リクエスト数
+    MIN_REQUEST_INTERVAL: float = 0.5   # リクエスト開始間隔の下限（秒、API利用制限対策）
+    ARCHIVE_DELAY_DAYS: int = 5         # 過去データAPIの公開遅れ（この日数より前の日まで取得）
+
+    # 作成したファイルの2行目（気象庁CSVでは空行）に記録する出典。再実行時の作成し直し判定に使用
+    SOURCE_MARKER: str = "出典：Open-Meteo Historical Weather API"
+
+
+config = BackfillConfig()
+
+
+class RateLimiter:
+    """リクエスト開始間隔を min_interval 秒以上に保つ（スレッド間で共有）"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def wait(self) -> None:
+        """次のリクエストを開始してよい時刻まで待機する"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def parse_years(spec: str) -> List[int]:
+    """
+    年の指定文字列を解析する
+
+    Args:
+        spec: "2025,2026" / "2016-2026" / 両者の組み合わせ
+
+    Returns:
+        List[int]: 年リスト（昇順・重複なし）
+
+    Raises:
+        ValueError: 書式が不正な場合
+    """
+    years = set()
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        if "-" in part:
+            first, last = (int(y) for y in part.split("-", 1))
+            years.update(range(first, last + 1))
+        else:
+            years.add(int(part))
+    if not years:
+        raise ValueError(f"年が指定されていません: {spec!r}")
+    return sorted(years)
+
+
+def temperature_path(year: int, data_dir: Optional[str] = None) -> str:
+    """年の気温データファイルパス"""
+    return os.path.join(data_dir or config.DATA_DIR, config.TEMP_FILE_TEMPLATE.format(year=year))
+
+
+def year_hours(year: int) -> np.ndarray:
+    """
+    気象庁形式の年ファイルが含む時間（1/1 1:00 〜 翌年1/1 0:00）
+
+    Args:
+        year: 年
+
+    Returns:
+        np.ndarray: 時間（datetime64[h]）
+    """
+    first = as_hours(np.datetime64(f"{year}-01-01T01"))
+    return np.arange(first, first + np.timedelta64(_days_in_year(year) * 24, "h"))
+
+
+def _days_in_year(year: int) -> int:
+    return int((np.datetime64(f"{year + 1}-01-01") - np.datetime64(f"{year}-01-01")).astype(int))
+
+
+def year_chunks(year: int, last_day: np.datetime64, chunk_days: int = config.CHUNK_DAYS) -> List[Tuple[str, str]]:
+    """
+    年の取得期間をリクエスト単位（日付範囲）に分割する
+
+    Args:
+        year: 年
+        last_day: 取得可能な最終日
+        chunk_days: 1リクエストの最大日数
+
+    Returns:
+        List[Tuple[str, str]]: (開始日, 終了日) のリスト（YYYY-MM-DD、終了日を含む）。
+            翌年1/1 0:00 を含めるため最後の期間は翌年1/1まで
+    """
+    first = np.datetime64(f"{year}-01-01")
+    stop = min(np.datetime64(f"{year + 1}-01-01"), np.datetime64(last_day, "D"))
+    starts = np.arange(first, stop + np.timedelta64(1, "D"), np.timedelta64(chunk_days, "D"))
+    ends = np.minimum(starts + np.timedelta64(chunk_days - 1, "D"), stop)
+    chunks = [(str(s), str(e)) for s, e in zip(starts, ends)]
+    if len(chunks) > 1 and chunks[-1][0] == chunks[-1][1] == str(np.datetime64(f"{year + 1}-01-01")):
+        # 翌年1/1（0:00の1時間分）のみの期間は直前の期間に含める
+        chunks[-2:] = [(chunks[-2][0], chunks[-1][1])]
+    return chunks
+
+
+def needs_backfill(path: str, year: int) -> bool:
+    """
+    年の気温データを作成する必要があるか判定する
+
+    Args:
+        path: 気温データファイルパス
+        year: 年
+
+    Returns:
+        bool: ファイルがない、またはこのモジュールで作成した年末まで揃っていないファイルの場合はTrue
+    """
+    if not os.path.exists(path):
+        return True
+    with open(path, "r", encoding=config.ENCODING, errors="replace") as f:
+        f.readline()
+        marker = f.readline().strip()
+    if marker != config.SOURCE_MARKER:
+        return False
+    parsed = parse_jma_temperature(path, skiprows=config.TEMP_DATA_SKIPROWS, encoding=config.ENCODING)
+    return len(parsed) == 0 or parsed.epoch_hours[-1] < year_hours(year)[-1].astype("int64")
+
+
+def missing_years(data_dir: Optional[str] = None) -> List[int]:
+    """電力データ（juyo-YYYY.csv）があり、気温データの作成が必要な年"""
+    data_dir = data_dir or config.DATA_DIR
+    years = sorted(int(os.path.basename(path)[5:9])
+                   for path in glob.glob(os.path.join(data_dir, config.POWER_FILE_PATTERN)))
+    return [year for year in years if needs_backfill(temperature_path(year, data_dir), year)]
+
+
+def _chunk_needs_request(coordinates: Sequence[Tuple[str, str]], start_date: str, end_date: str,
+                         base_url: str) -> bool:
+    """期間内にキャッシュにない・期限切れの時間があるか（キャッシュ無効時は常にTrue）"""
+    if not tomorrow_temp.is_temperature_cache_enabled():
+        return True
+    hours = tomorrow_temp.requested_hours(0, 0, start_date, end_date, tomorrow_temp.local_now(config.TIMEZONE))
+    cache = tomorrow_temp.get_temperature_cache()
+    return any(cache.stale_mask(tomorrow_temp.location_cache_key(lat, lon, config.TIMEZONE, base_url), hours).any()
+               for lat, lon in coordinates)
+
+
+def fetch_chunk(coordinates: Sequence[Tuple[str, str]], start_date: str, end_date: str,
+                base_url: str, limiter: RateLimiter) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    1期間分の時間別気温を取得する（キャッシュ済みの期間はリクエストしない）
+
+    Args:
+        coordinates: 地点の (緯度, 経度) リスト
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+        base_url: APIエンドポイント
+        limiter: リクエスト間隔制限
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 時間（datetime64[h]）, 気温（時間 × 地点、欠損はNaN）
+    """
+    if _chunk_needs_request(coordinates, start_date, end_date, base_url):
+        limiter.wait()
+    return tomorrow_temp.fetch_hourly_matrix(coordinates, config.TIMEZONE, 0, 0, start_date, end_date, base_url)
+
+
+def write_temperature_csv(path: str, hours: np.ndarray, values: np.ndarray, stations: Sequence[Station]) -> None:
+    """
+    気象庁形式の気温データCSVを書き込む（一時ファイル経由で置き換え）
+
+    Args:
+        path: 出力ファイルパス
+        hours: 時間（datetime64[h]）
+        values: 気温（時間 × 地点、欠損はNaN）
+        stations: 地点セット（列順）
+    """
+    downloaded_at = time.strftime("%Y/%m/%d %H:%M:%S")
+    header = [
+        f"ダウンロードした時刻：{downloaded_at}",
+        config.SOURCE_MARKER,
+        "".join(f",{s.name},{s.name},{s.name}" for s in stations),
+        "年月日時" + ",気温(℃),気温(℃),気温(℃)" * len(stations),
+        "," + ",品質情報,均質番号" * len(stations),
+    ]
+    content = "\n".join(header) + "\n" + format_jma_temperature_rows(hours, values)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding=config.ENCODING, newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def backfill_temperature(years: Sequence[int],
+                         stations: Optional[Sequence[Station]] = None,
+                         data_dir: Optional[str] = None,
+                         base_url: Optional[str] = None,
+                         max_workers: int = config.MAX_WORKERS,
+                         min_interval: float = config.MIN_REQUEST_INTERVAL) -> Dict[int, Optional[str]]:
+    """
+    指定年の気温データを取得して temperature-YYYY.csv を作成する
+
+    Args:
+        years: 対象年
+        stations: 地点セット（Noneなら環境変数 AI_TEMP_STATIONS、未指定なら東京1地点）
+        data_dir: 出力ディレクトリ（Noneなら data/）
+        base_url: APIエンドポイント（Noneなら OPEN_METEO_ARCHIVE_URL）
+        max_workers: 並列リクエスト数
+        min_interval: リクエスト開始間隔の下限（秒）
+
+    Returns:
+        Dict[int, Optional[str]]: 年 → 作成したファイルパス（取得に失敗した年はNone）
+    """
+    stations = tuple(stations) if stations is not None else resolve_stations()
+    coordinates = [(f"{s.latitude:.4f}", f"{s.longitude:.4f}") for s in stations]
+    base_url = base_url or tomorrow_temp.config.OPEN_METEO_ARCHIVE_URL
+    last_day = (tomorrow_temp.local_now(config.TIMEZONE).astype("datetime64[D]")
+                - np.timedelta64(config.ARCHIVE_DELAY_DAYS, "D"))
+    limiter = RateLimiter(min_interval)
+
+    chunks = {year: year_chunks(year, last_day) for year in years}
+    remaining = {year: len(periods) for year, periods in chunks.items()}
+    hours = {year: year_hours(year) for year in years}
+    values = {year: np.full((len(hours[year]), len(stations)), np.nan) for year in years}
+    failed = set(year for year in years if not chunks[year])
+    results: Dict[int, Optional[str]] = {year: None for year in years}
+    logger.info(f"過去気温データ取得: {len(years)}年・{sum(remaining.values())}期間・{len(stations)}地点 "
+                f"（{', '.join(s.name for s in stations)}）")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(fetch_chunk, coordinates, start, end, base_url, limiter): (year, start, end)
+                   for year, periods in chunks.items() for start, end in periods}
+        for future in as_completed(futures):
+            year, start, end = futures[future]
+            remaining[year] -= 1
+            try:
+                fetched_hours, fetched_values = future.result()
+                pos = np.searchsorted(hours[year], fetched_hours)
+                in_range = pos < len(hours[year])
+                in_range[in_range] = hours[year][pos[in_range]] == fetched_hours[in_range]
+                values[year][pos[in_range]] = fetched_values[in_range]
+            except Exception as e:
+                logger.error(f"気温データ取得失敗: {start} 〜 {end}: {e}")
+                failed.add(year)
+            if remaining[year] == 0 and year not in failed:
+                results[year] = _write_year(year, hours[year], values[year], stations, data_dir)
+
+    for year in sorted(failed):
+        logger.error(f"{year}年の気温データは一部の期間を取得できなかったため作成していません（再実行で再開）")
+    return results
+
+
+def _write_year(year: int, hours: np.ndarray, values: np.ndarray, stations: Sequence[Station],
+                data_dir: Optional[str]) -> Optional[str]:
+    """年の気温データを書き込む（末尾の未公開期間は除く）"""
+    available = np.flatnonzero(~np.isnan(values).all(axis=1))
+    if len(available) == 0:
+        logger.warning(f"{year}年の気温データがありません")
+        return None
+    rows = slice(0, available[-1] + 1)
+    path = temperature_path(year, data_dir)
+    write_temperature_csv(path, hours[rows], values[rows], stations)
+    print(f"気温データ作成完了: {path} ({available[-1] + 1}行, 欠損{int(np.isnan(values[rows]).any(axis=1).sum())}行)")
+    return path
+
+
+def main() -> None:
+    """コマンドライン実行: python data/backfill_temperature.py [年（2025,2026 / 2016-2026）]"""
+    start_time = time.time()
+    try:
+        print("=== 過去気温データ一括取得開始 ===")
+        if len(sys.argv) > 1 and sys.argv[1].strip():
+            years = parse_years(sys.argv[1])
+            years = [year for year in years if needs_backfill(temperature_path(year), year)]
+        else:
+            years = missing_years()
+        if not years:
+            print("作成が必要な気温データはありません")
+            return
+
+        print(f"対象年: {', '.join(str(year) for year in years)}")
+        results = backfill_temperature(years)
+        failed = [year for year, path in results.items() if path is None]
+        elapsed_time = time.time() - start_time
+        if failed:
+            print(f"取得できなかった年: {', '.join(str(year) for year in failed)}（再実行で再開します）")
+            print(f"=== 過去気温データ一括取得失敗 (実行時間: {elapsed_time:.2f}秒) ===")
+            sys.exit(1)
+        print(f"=== 過去気温データ一括取得完了 (実行時間: {elapsed_time:.2f}秒) ===")
+    except Exception as e:
+        print(f"エラーが発生しました: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
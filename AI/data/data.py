@@ -6,15 +6,22 @@
 """
 
 # 標準ライブラリインポート
+import contextlib
 import datetime as dt
 import glob
+import hashlib
+import json
 import os
+import tempfile
 import sys
+import threading
 import traceback
 import warnings
 import time
 import gc
-from typing import List, Optional, Tuple, Dict, Any, Union
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterator, List, Optional, Tuple, Dict, Any, Union
 from dataclasses import dataclass, field
 from functools import lru_cache
 import logging
@@ -22,7 +29,16 @@ import logging
 # サードパーティライブラリインポート
 import pandas as pd
 import numpy as np
-import sklearn.model_selection as cross_validation
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import (FORMAT_CSV, get_dataset_dir, is_split_csv_enabled, resolve_dataset_format,
+                            save_binary_dataset, split_test_mask)
+from common.parsers import parse_jma_temperature, parse_juyo
+from common.stations import (STATIONS_ENV_VAR, resolve_stations, stations_signature, weighted_temperature,
+                             weights_for_columns)
 
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
@@ -67,6 +83,21 @@ class DataConfig:
     FEATURE_COLUMNS: List[str] = field(default_factory=lambda: ["MONTH", "WEEK", "HOUR", "TEMP"])
     TARGET_COLUMNS: List[str] = field(default_factory=lambda: ["KW"])
 
+    # パース済みCSVキャッシュ設定（年単位の.npzファイル、ソースCSVと同じ階層のcache/に保存）
+    CACHE_DIR_NAME: str = "cache"
+    CACHE_FORMAT_VERSION: int = 3
+    CACHE_ENV_VAR: str = "AI_DATA_CACHE"  # "0"/"false"/"off" でキャッシュ無効化
+    HASH_CHUNK_SIZE: int = 1024 * 1024
+
+    # 年単位並列読み込み設定（0: CPUコア数から自動決定, 1: 逐次処理）
+    MAX_WORKERS: int = 0
+    WORKERS_ENV_VAR: str = "AI_DATA_WORKERS"
+
+    # 祝日カレンダー設定（春分・秋分の近似式が有効な範囲）
+    HOLIDAY_MIN_YEAR: int = 2000
+    HOLIDAY_MAX_YEAR: int = 2099
+    LONG_WEEKEND_MIN_DAYS: int = 3
+
 # スライス定数（dataclass の外で定義）
 POWER_FILE_YEAR_SLICE = slice(5, 9)  # "juyo-YYYY.csv"のYYYY部分
 TEMP_FILE_YEAR_SLICE = slice(12, 16)  # "temperature-YYYY.csv"のYYYY部分
@@ -74,6 +105,41 @@ TEMP_FILE_YEAR_SLICE = slice(12, 16)  # "temperature-YYYY.csv"のYYYY部分
 # 統一設定インスタンス
 config = DataConfig()
 
+# 進捗メッセージの取り込み先（スレッドごと。常駐学習サービスがリクエスト単位で取得）
+_progress = threading.local()
+
+
+def report_progress(message: str) -> None:
+    """
+    進捗メッセージを出力する（capture_progress() 中のスレッドでは標準出力に出さず取り込む）
+
+    Args:
+        message: 出力するメッセージ
+    """
+    lines = getattr(_progress, "lines", None)
+    if lines is None:
+        print(message)
+    else:
+        lines.append(message)
+
+
+@contextlib.contextmanager
+def capture_progress() -> Iterator[List[str]]:
+    """
+    現在のスレッドの進捗メッセージをリストに取り込む（sys.stdout は差し替えない）
+
+    Yields:
+        List[str]: 取り込んだメッセージ（ブロック終了後も参照可能）
+    """
+    previous = getattr(_progress, "lines", None)
+    _progress.lines = lines = []
+    try:
+        yield lines
+    finally:
+        _progress.lines = previous
+        if previous is not None:
+            previous.extend(lines)
+
 # CSVバリデーション関数
 def validate_csv_file(file_path: str, required_columns: List[str], skiprows: int, encoding: str) -> bool:
     """
@@ -156,9 +222,422 @@ def safe_file_operation(operation: str):
         return wrapper
     return decorator
 
+
+# ================================================================
+# パース済みCSVキャッシュ（年単位・.npz形式）
+# ================================================================
+
+def is_parse_cache_enabled() -> bool:
+    """
+    パース済みCSVキャッシュが有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_DATA_CACHE が無効値でなければTrue
+    """
+    value = os.environ.get(config.CACHE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+
+def get_cache_path(source_path: str) -> str:
+    """
+    ソースCSVに対応するキャッシュファイルパスを取得する
+
+    Args:
+        source_path: ソースCSVファイルパス
+
+    Returns:
+        str: キャッシュファイルパス（例: data/cache/juyo-2024.npz）
+    """
+    directory, filename = os.path.split(source_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, config.CACHE_DIR_NAME, f"{stem}.npz")
+
+
+def _file_sha256(file_path: str) -> str:
+    """ファイル内容のSHA-256ハッシュを計算する"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(config.HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_source_signature(source_path: str) -> Dict[str, Any]:
+    """
+    ソースCSVの同一性判定用シグネチャ（更新時刻・サイズ・内容ハッシュ）を計算する
+
+    Args:
+        source_path: ソースCSVファイルパス
+
+    Returns:
+        Dict[str, Any]: mtime_ns, size, sha256 を含む辞書
+    """
+    stat = os.stat(source_path)
+    return {
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": _file_sha256(source_path),
+    }
+
+
+def check_source_signature(source_path: str, signature: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    ソースファイルが記録済みシグネチャと同一内容か判定する
+
+    更新時刻とサイズが一致すればそのまま採用し、更新時刻のみ異なる場合
+    （git checkout 等）は内容ハッシュで同一性を確認する。
+
+    Args:
+        source_path: ソースファイルパス
+        signature: 記録済みシグネチャ（mtime_ns, size, sha256）
+
+    Returns:
+        Optional[Dict[str, Any]]: 同一なら現在のシグネチャ、異なる場合はNone
+    """
+    if not os.path.exists(source_path):
+        return None
+    stat = os.stat(source_path)
+    if stat.st_size != signature.get("size"):
+        return None
+    if stat.st_mtime_ns != signature.get("mtime_ns") and _file_sha256(source_path) != signature.get("sha256"):
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": signature.get("sha256")}
+
+
+def write_npz_atomic(cache_path: str, arrays: Dict[str, np.ndarray]) -> None:
+    """
+    配列群を.npzファイルへ原子的に書き込む
+
+    Args:
+        cache_path: 出力先パス
+        arrays: 配列名と配列のマッピング
+    """
+    cache_dir = os.path.dirname(cache_path)
+    os.makedirs(cache_dir, exist_ok=True)
+    # 書き込み途中のファイルを読まないよう一時ファイル経由で置き換える
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            np.savez(f, **arrays)
+        os.replace(tmp_path, cache_path)
+        tmp_path = None
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_cached_frame(source_path: str, parse_key: str) -> Optional[pd.DataFrame]:
+    """
+    有効なキャッシュが存在すればDataFrameを復元する
+
+    Args:
+        source_path: ソースCSVファイルパス
+        parse_key: 読み込み条件を表すキー（skiprows・エンコーディング等）
+
+    Returns:
+        Optional[pd.DataFrame]: 復元したDataFrame、キャッシュが無効な場合はNone
+    """
+    cache_path = get_cache_path(source_path)
+    if not os.path.exists(cache_path) or not os.path.exists(source_path):
+        return None
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["__meta__"]))
+            if meta.get("version") != config.CACHE_FORMAT_VERSION or meta.get("parse_key") != parse_key:
+                return None
+
+            signature = check_source_signature(source_path, meta)
+            if signature is None:
+                return None
+            refresh = signature["mtime_ns"] != meta["mtime_ns"]
+
+            columns: Dict[str, Any] = {}
+            for i, name in enumerate(meta["columns"]):
+                values = npz[f"col_{i}"]
+                if f"isna_{i}" in npz.files:
+                    # 文字列列は欠損位置を復元してobject型に戻す
+                    values = values.astype(object)
+                    values[npz[f"isna_{i}"]] = np.nan
+                columns[name] = values
+            df = pd.DataFrame(columns, columns=meta["columns"])
+
+        if refresh:
+            # 内容は同一のため、更新時刻を記録し直して次回のハッシュ計算を省略
+            save_cached_frame(source_path, parse_key, df, signature)
+        return df
+
+    except Exception as e:
+        logger.warning(f"キャッシュ読み込み失敗（CSVから再読み込みします）: {cache_path} - {e}")
+        return None
+
+
+def save_cached_frame(source_path: str, parse_key: str, df: pd.DataFrame, signature: Dict[str, Any]) -> None:
+    """
+    パース済みDataFrameをキャッシュファイルへ保存する（失敗しても処理は継続）
+
+    Args:
+        source_path: ソースCSVファイルパス
+        parse_key: 読み込み条件を表すキー
+        df: 保存するDataFrame
+        signature: compute_source_signature() で得たシグネチャ
+    """
+    cache_path = get_cache_path(source_path)
+    try:
+        arrays: Dict[str, np.ndarray] = {}
+        for i, name in enumerate(df.columns):
+            series = df[name]
+            if series.dtype == object:
+                # 文字列列はUnicode配列として保存（pickle不要）
+                arrays[f"isna_{i}"] = series.isna().to_numpy()
+                arrays[f"col_{i}"] = series.astype(str).to_numpy(dtype=str)
+            else:
+                arrays[f"col_{i}"] = series.to_numpy()
+
+        meta = {
+            "version": config.CACHE_FORMAT_VERSION,
+            "parse_key": parse_key,
+            "columns": [str(c) for c in df.columns],
+            **signature,
+        }
+        arrays["__meta__"] = np.array(json.dumps(meta))
+
+        write_npz_atomic(cache_path, arrays)
+
+    except Exception as e:
+        logger.warning(f"キャッシュ保存失敗: {cache_path} - {e}")
+
+
+def load_csv_with_cache(source_path: str, parse_key: str,
+                        reader: Callable[[str], pd.DataFrame]) -> pd.DataFrame:
+    """
+    キャッシュ優先でCSVを読み込む
+
+    有効なキャッシュがあればCSVの検証・デコードを行わずに復元し、
+    なければ reader で読み込んだ結果をキャッシュに保存する。
+
+    Args:
+        source_path: ソースCSVファイルパス
+        parse_key: 読み込み条件を表すキー
+        reader: CSVを検証・読み込みする関数
+
+    Returns:
+        pd.DataFrame: 読み込んだDataFrame
+    """
+    if not is_parse_cache_enabled():
+        return reader(source_path)
+
+    cached = load_cached_frame(source_path, parse_key)
+    if cached is not None:
+        report_progress(f"キャッシュから読み込み: {get_cache_path(source_path)}")
+        return cached
+
+    # 読み込み前にシグネチャを取得（読み込み中の更新を次回検出できるようにする）
+    signature = compute_source_signature(source_path) if os.path.exists(source_path) else None
+    df = reader(source_path)
+    if signature is not None:
+        save_cached_frame(source_path, parse_key, df, signature)
+    return df
+
+
+def _read_power_csv(power_file: str) -> pd.DataFrame:
+    """電力データCSVを検証して読み込む（DATETIME, KW）"""
+    # CSVファイル検証
+    validate_csv_file(
+        power_file,
+        required_columns=["DATE", "TIME", "KW"],
+        skiprows=config.POWER_DATA_SKIPROWS,
+        encoding=config.ENCODING
+    )
+
+    # 高速パーサーで日時・電力値を直接型付き配列として取得
+    parsed = parse_juyo(power_file, skiprows=config.POWER_DATA_SKIPROWS, encoding=config.ENCODING)
+    return pd.DataFrame({
+        "DATETIME": parsed.datetimes(),
+        "KW": parsed.columns["KW"].astype('int32'),  # KWは整数値のためint32
+    })
+
+
+def _read_temperature_csv(temp_file: str) -> pd.DataFrame:
+    """気温データCSVを検証して読み込む（DATETIME, TEMP）"""
+    # CSVファイル検証
+    validate_csv_file(
+        temp_file,
+        required_columns=["DATE", "TIME", "TEMP"],
+        skiprows=config.TEMP_DATA_SKIPROWS,
+        encoding=config.ENCODING
+    )
+
+    # 高速パーサーで日時・気温を直接型付き配列として取得（気温の欠損はNaN）
+    parsed = parse_jma_temperature(temp_file, skiprows=config.TEMP_DATA_SKIPROWS, encoding=config.ENCODING)
+
+    # 複数地点の列は地点セット（環境変数 AI_TEMP_STATIONS）の重みで加重平均。
+    # 翌日予測は地点セットの全地点で平均するため、地点が欠けたデータでは学習しない
+    stations = resolve_stations()
+    if parsed.stations:
+        try:
+            weights = weights_for_columns(parsed.stations, stations)
+        except ValueError as e:
+            raise ValueError(f"{e}: {temp_file}（{STATIONS_ENV_VAR} から地点を外すか、"
+                             f"地点を含む気温データを用意してください）") from e
+        temp = weighted_temperature(parsed.columns["TEMP_ALL"], weights)
+    elif len(stations) == 1:
+        # 地点名行のない従来のレイアウトは1地点分のデータとして扱う
+        temp = parsed.columns["TEMP"]
+    else:
+        raise ValueError(f"地点名行のない気温データでは複数地点の加重平均を作成できません: {temp_file}")
+    return pd.DataFrame({
+        "DATETIME": parsed.datetimes(),
+        "TEMP": temp,
+    })
+
+
+def _power_parse_key() -> str:
+    """電力データ読み込み条件のキャッシュキー"""
+    return f"power:{config.POWER_DATA_SKIPROWS}:{config.ENCODING}"
+
+
+def _temperature_parse_key() -> str:
+    """気温データ読み込み条件のキャッシュキー"""
+    return f"temperature:{config.TEMP_DATA_SKIPROWS}:{config.ENCODING}:{stations_signature(resolve_stations())}"
+
+
+# ================================================================
+# 祝日カレンダー（配列ベース・年単位キャッシュ）
+# ================================================================
+
+# 1970-01-01（木曜日）を基準とした曜日計算用オフセット（月曜日=0）
+_EPOCH_WEEKDAY = 3
+
+
+def _day_number(year: int, month: int, day: int) -> int:
+    """年月日を1970-01-01からの経過日数に変換する"""
+    return int(np.datetime64(f"{year:04d}-{month:02d}-{day:02d}", 'D').astype(np.int64))
+
+
+def _nth_monday(year: int, month: int, n: int) -> int:
+    """指定月の第n月曜日を経過日数で返す（ハッピーマンデー制度）"""
+    first = np.datetime64(f"{year:04d}-{month:02d}-01", 'D')
+    return int(np.busday_offset(first, n - 1, roll='forward', weekmask='Mon').astype(np.int64))
+
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """経過日数から曜日（月曜日=0〜日曜日=6）を求める"""
+    return (days + _EPOCH_WEEKDAY) % 7
+
+
+@lru_cache(maxsize=None)
+def _holiday_days_for_year(year: int) -> np.ndarray:
+    """
+    1年分の祝日（振替休日・国民の休日を含む）を経過日数の配列で返す
+
+    Args:
+        year: 対象年
+
+    Returns:
+        np.ndarray: 昇順の経過日数配列（int64、読み取り専用）
+    """
+    d = lambda m, day: _day_number(year, m, day)
+
+    # 春分・秋分（1980〜2099年で有効な近似式）
+    offset = year - 1980
+    spring = int(20.8431 + 0.242194 * offset - offset // 4)
+    autumn = int(23.2488 + 0.242194 * offset - offset // 4)
+
+    base = {
+        d(1, 1),                     # 元日
+        _nth_monday(year, 1, 2),     # 成人の日
+        d(2, 11),                    # 建国記念の日
+        d(3, spring),                # 春分の日
+        d(4, 29),                    # みどりの日（〜2006年）/ 昭和の日（2007年〜）
+        d(5, 3),                     # 憲法記念日
+        d(5, 5),                     # こどもの日
+        d(9, autumn),                # 秋分の日
+        d(11, 3),                    # 文化の日
+        d(11, 23),                   # 勤労感謝の日
+    }
+    if year >= 2007:
+        base.add(d(5, 4))            # みどりの日
+    if year <= 2018:
+        base.add(d(12, 23))          # 天皇誕生日（平成）
+    elif year >= 2020:
+        base.add(d(2, 23))           # 天皇誕生日（令和）
+
+    # 海の日・山の日・体育の日/スポーツの日（東京五輪による2020・2021年の特例を含む）
+    if year == 2020:
+        base.update({d(7, 23), d(7, 24), d(8, 10)})
+    elif year == 2021:
+        base.update({d(7, 22), d(7, 23), d(8, 8)})
+    else:
+        base.add(d(7, 20) if year <= 2002 else _nth_monday(year, 7, 3))
+        base.add(_nth_monday(year, 10, 2))
+        if year >= 2016:
+            base.add(d(8, 11))
+    base.add(d(9, 15) if year <= 2002 else _nth_monday(year, 9, 3))  # 敬老の日
+
+    if year == 2019:
+        base.update({d(5, 1), d(10, 22)})  # 即位の日・即位礼正殿の儀
+
+    holidays = np.array(sorted(base), dtype=np.int64)
+
+    # 国民の休日：前後を祝日に挟まれた平日（2006年以前は日曜日を除く）
+    gaps = np.diff(holidays)
+    sandwiched = holidays[:-1][gaps == 2] + 1
+    if year < 2007:
+        sandwiched = sandwiched[_weekday(sandwiched) != 6]
+    sandwiched = sandwiched[~np.isin(sandwiched, holidays)]
+
+    # 振替休日：日曜日の祝日の後で最初の祝日でない日（2006年以前は翌日のみ）
+    all_days = set(holidays.tolist()) | set(sandwiched.tolist())
+    substitutes = []
+    for sunday in holidays[_weekday(holidays) == 6].tolist():
+        day = sunday + 1
+        if year >= 2007:
+            while day in all_days:
+                day += 1
+        if day not in all_days:
+            substitutes.append(day)
+
+    table = np.unique(np.concatenate([holidays, sandwiched, np.array(substitutes, dtype=np.int64)]))
+    table.setflags(write=False)
+    return table
+
+
+@lru_cache(maxsize=None)
+def get_holiday_table(start_year: int, end_year: int) -> np.ndarray:
+    """
+    指定年範囲の祝日テーブルを取得する（年単位でキャッシュ）
+
+    Args:
+        start_year: 開始年
+        end_year: 終了年（含む）
+
+    Returns:
+        np.ndarray: 昇順の経過日数配列（int64、読み取り専用）
+
+    Raises:
+        ValueError: 対応範囲外の年が指定された場合
+    """
+    if start_year < config.HOLIDAY_MIN_YEAR or end_year > config.HOLIDAY_MAX_YEAR:
+        raise ValueError(
+            f"祝日カレンダーの対応範囲外です: {start_year}-{end_year} "
+            f"(対応範囲: {config.HOLIDAY_MIN_YEAR}-{config.HOLIDAY_MAX_YEAR})"
+        )
+    table = np.concatenate([_holiday_days_for_year(y) for y in range(start_year, end_year + 1)]
+                           or [np.empty(0, dtype=np.int64)])
+    table.setflags(write=False)
+    return table
+
+
+def _index_day_numbers(date_index: pd.DatetimeIndex) -> np.ndarray:
+    """日時インデックスを経過日数の配列に変換する"""
+    return date_index.values.astype('datetime64[D]').astype(np.int64)
+
+
 def _detect_holidays(date_index: pd.DatetimeIndex) -> pd.Series:
     """
-    日本の祝日を検出する（簡易版）
+    日本の祝日を検出する（振替休日・国民の休日・春分/秋分の日を含む）
     
     Args:
         date_index: 日時インデックス
@@ -166,54 +645,16 @@ def _detect_holidays(date_index: pd.DatetimeIndex) -> pd.Series:
     Returns:
         pd.Series: 祝日フラグ（1: 祝日, 0: 平日）
     """
-    # 主要な固定祝日と移動祝日（簡易実装）
-    holiday_dates = set()
-    
-    for year in range(2016, 2026):
-        # 固定祝日
-        holiday_dates.update([
-            f"{year}-01-01",  # 元日
-            f"{year}-02-11",  # 建国記念の日
-            f"{year}-04-29",  # 昭和の日
-            f"{year}-05-03",  # 憲法記念日
-            f"{year}-05-04",  # みどりの日
-            f"{year}-05-05",  # こどもの日
-            f"{year}-08-11",  # 山の日
-            f"{year}-11-03",  # 文化の日
-            f"{year}-11-23",  # 勤労感謝の日
-            f"{year}-12-23",  # 天皇誕生日（2019年以降）
-        ])
-        
-        # 移動祝日（簡易計算）
-        # 成人の日（1月第2月曜日）
-        jan_mondays = pd.date_range(f"{year}-01-01", f"{year}-01-31", freq='W-MON')
-        if len(jan_mondays) >= 2:
-            holiday_dates.add(jan_mondays[1].strftime("%Y-%m-%d"))
-            
-        # 海の日（7月第3月曜日）
-        jul_mondays = pd.date_range(f"{year}-07-01", f"{year}-07-31", freq='W-MON')
-        if len(jul_mondays) >= 3:
-            holiday_dates.add(jul_mondays[2].strftime("%Y-%m-%d"))
-            
-        # 敬老の日（9月第3月曜日）
-        sep_mondays = pd.date_range(f"{year}-09-01", f"{year}-09-30", freq='W-MON')
-        if len(sep_mondays) >= 3:
-            holiday_dates.add(sep_mondays[2].strftime("%Y-%m-%d"))
-            
-        # 体育の日/スポーツの日（10月第2月曜日）
-        oct_mondays = pd.date_range(f"{year}-10-01", f"{year}-10-31", freq='W-MON')
-        if len(oct_mondays) >= 2:
-            holiday_dates.add(oct_mondays[1].strftime("%Y-%m-%d"))
-    
-    # 日付文字列をdatetimeに変換
-    holiday_set = {pd.to_datetime(date).date() for date in holiday_dates}
-    
-    # インデックスの日付と照合
-    return pd.Series([1 if date.date() in holiday_set else 0 for date in date_index], index=date_index)
+    if len(date_index) == 0:
+        return pd.Series(np.zeros(0, dtype=int), index=date_index)
+
+    days = _index_day_numbers(date_index)
+    table = get_holiday_table(int(date_index.year.min()), int(date_index.year.max()))
+    return pd.Series(np.isin(days, table).astype(int), index=date_index)
 
 def _detect_long_weekends(date_index: pd.DatetimeIndex, is_holiday: pd.Series) -> pd.Series:
     """
-    連休を検出する
+    連休を検出する（土日・祝日が暦日で連続する期間をランレングスで判定）
     
     Args:
         date_index: 日時インデックス
@@ -222,72 +663,79 @@ def _detect_long_weekends(date_index: pd.DatetimeIndex, is_holiday: pd.Series) -
     Returns:
         pd.Series: 連休フラグ（1: 3日以上の連休期間, 0: 通常）
     """
-    # 週末と祝日を統合
-    weekday = pd.Series([date.weekday() for date in date_index], index=date_index)
-    is_weekend = (weekday >= 5).astype(int)
-    is_off = (is_weekend | is_holiday).astype(bool)
-    
-    # 連続する休日期間を検出
-    long_weekend_flags = []
-    consecutive_count = 0
-    
-    for i, is_off_day in enumerate(is_off):
-        if is_off_day:
-            consecutive_count += 1
-        else:
-            # 連続期間終了：3日以上なら連休
-            if consecutive_count >= 3:
-                # 過去の連続期間をすべて連休フラグに設定
-                start_idx = max(0, i - consecutive_count)
-                for j in range(start_idx, i):
-                    if j < len(long_weekend_flags):
-                        long_weekend_flags[j] = 1
-            consecutive_count = 0
-            
-        long_weekend_flags.append(0)  # デフォルトは0
-    
-    # 最後の連続期間をチェック
-    if consecutive_count >= 3:
-        start_idx = len(long_weekend_flags) - consecutive_count
-        for j in range(start_idx, len(long_weekend_flags)):
-            long_weekend_flags[j] = 1
-    
-    return pd.Series(long_weekend_flags, index=date_index)
+    if len(date_index) == 0:
+        return pd.Series(np.zeros(0, dtype=int), index=date_index)
+
+    days = _index_day_numbers(date_index)
+    first_day = int(days.min())
+    n_days = int(days.max()) - first_day + 1
+
+    # 暦日単位の休日フラグ（インデックスに含まれない日も週末・祝日として判定）
+    calendar = np.arange(first_day, first_day + n_days, dtype=np.int64)
+    holiday_days = days[np.asarray(is_holiday, dtype=bool)]
+    start_year = int(date_index.year.min())
+    end_year = int(date_index.year.max())
+    if config.HOLIDAY_MIN_YEAR <= start_year and end_year <= config.HOLIDAY_MAX_YEAR:
+        holiday_days = np.union1d(holiday_days, get_holiday_table(start_year, end_year))
+    is_off = (_weekday(calendar) >= 5) | np.isin(calendar, holiday_days)
+
+    # ランレングス：休日の連続区間の開始・終了位置と長さ
+    edges = np.diff(np.concatenate(([0], is_off.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    long_runs = (ends - starts) >= config.LONG_WEEKEND_MIN_DAYS
+
+    marks = np.zeros(n_days + 1, dtype=np.int64)
+    np.add.at(marks, starts[long_runs], 1)
+    np.add.at(marks, ends[long_runs], -1)
+    is_long = np.cumsum(marks[:-1]) > 0
+
+    return pd.Series(is_long[days - first_day].astype(int), index=date_index)
 
 @safe_file_operation("データファイル検索")
-def load_data_files() -> Tuple[List[str], List[str]]:
+def load_data_files(target_years: Optional[List[str]] = None,
+                    data_dir: Optional[str] = None) -> Tuple[List[str], List[str]]:
     """
     データファイルのパスを取得する
     
+    Args:
+        target_years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全年）
+        data_dir: データディレクトリ（Noneならカレントディレクトリ基準の既定パターン）
+    
     Returns:
         Tuple[List[str], List[str]]: 電力データファイル群, 気温データファイル群
         
     Raises:
         FileNotFoundError: データファイルが見つからない場合
     """
-    power_files = sorted(glob.glob(config.POWER_DATA_PATTERN))
-    temp_files = sorted(glob.glob(config.TEMP_DATA_PATTERN))
+    power_pattern = config.POWER_DATA_PATTERN
+    temp_pattern = config.TEMP_DATA_PATTERN
+    if data_dir:
+        power_pattern = os.path.join(data_dir, os.path.basename(power_pattern))
+        temp_pattern = os.path.join(data_dir, os.path.basename(temp_pattern))
+    power_files = sorted(glob.glob(power_pattern))
+    temp_files = sorted(glob.glob(temp_pattern))
 
-    # 環境変数 'AI_TARGET_YEARS' によるフィルタ（オプション）
+    # 対象年（引数優先、次に環境変数 'AI_TARGET_YEARS'）によるフィルタ（オプション）
     try:
-        env_years = os.environ.get('AI_TARGET_YEARS', '')
+        env_years = ','.join(str(y) for y in target_years) if target_years else os.environ.get('AI_TARGET_YEARS', '')
         if env_years:
             allowed = set([y.strip() for y in env_years.split(',') if y.strip()])
             if allowed:
                 power_files = [f for f in power_files if os.path.basename(f)[POWER_FILE_YEAR_SLICE] in allowed]
                 temp_files = [f for f in temp_files if os.path.basename(f)[TEMP_FILE_YEAR_SLICE] in allowed]
-                print(f"AI_TARGET_YEARS によりファイルを絞り込み: {sorted(list(allowed))}")
+                report_progress(f"AI_TARGET_YEARS によりファイルを絞り込み: {sorted(list(allowed))}")
     except Exception:
         # 環境変数の解析に失敗した場合は無視して通常動作を継続
         pass
     
     if not power_files:
-        raise FileNotFoundError(f"電力データファイルが見つかりません: {config.POWER_DATA_PATTERN}")
+        raise FileNotFoundError(f"電力データファイルが見つかりません: {power_pattern}")
     if not temp_files:
-        raise FileNotFoundError(f"気温データファイルが見つかりません: {config.TEMP_DATA_PATTERN}")
+        raise FileNotFoundError(f"気温データファイルが見つかりません: {temp_pattern}")
     
-    print(f"電力データファイル: {len(power_files)}件")
-    print(f"気温データファイル: {len(temp_files)}件")
+    report_progress(f"電力データファイル: {len(power_files)}件")
+    report_progress(f"気温データファイル: {len(temp_files)}件")
     
     return power_files, temp_files
 
@@ -317,11 +765,15 @@ def get_common_years(power_files: List[str], temp_files: List[str]) -> Tuple[Lis
         
         # 共通年を取得
         common_years = sorted(list(set(power_years) & set(temp_years)))
+        missing_temp_years = sorted(set(power_years) - set(temp_years))
+        if missing_temp_years:
+            logger.warning(f"気温データがないため除外する年: {', '.join(missing_temp_years)}"
+                           f"（data/backfill_temperature.py で作成できます）")
         
         if not common_years:
             raise ValueError("電力データと気温データの共通年が見つかりません")
         
-        print(f"共通年: {len(common_years)}年分 ({', '.join(common_years)})")
+        report_progress(f"共通年: {len(common_years)}年分 ({', '.join(common_years)})")
         
         return common_years, power_map, temp_map
         
@@ -352,34 +804,15 @@ def load_power_data(power_files: List[str], power_map: Dict[str, str], common_ye
     
     for year in common_years:
         power_file = power_map[year]
-        print(f"電力データ読み込み中: {power_file}")
-        
-        # CSVファイル検証
-        validate_csv_file(
-            power_file,
-            required_columns=["DATE", "TIME", "KW"],
-            skiprows=config.POWER_DATA_SKIPROWS,
-            encoding=config.ENCODING
-        )
-        
-        # メモリ効率化：dtypeを明示的に指定
-        df = pd.read_csv(
-            power_file,
-            encoding=config.ENCODING,
-            skiprows=config.POWER_DATA_SKIPROWS,
-            header=None,
-            names=["DATE", "TIME", "KW"]
-        )
-        
-        # float32型変換（メモリ最適化）
-        if 'KW' in df.columns:
-            df['KW'] = df['KW'].astype('int32')  # KWは整数値のためint32
-            
+        report_progress(f"電力データ読み込み中: {power_file}")
+
+        # 有効なキャッシュがあればCSVの検証・デコードを省略
+        df = load_csv_with_cache(power_file, _power_parse_key(), _read_power_csv)
         power_data_list.append(df)
         
     # メモリ効率的な結合
     combined_data = pd.concat(power_data_list, ignore_index=True, copy=False)
-    print(f"電力データ読み込み完了: {len(combined_data)}行 (メモリ最適化済み)")
+    report_progress(f"電力データ読み込み完了: {len(combined_data)}行 (メモリ最適化済み)")
     
     return combined_data
 
@@ -405,37 +838,15 @@ def load_temperature_data(temp_files: List[str], temp_map: Dict[str, str], commo
     
     for year in common_years:
         temp_file = temp_map[year]
-        print(f"気温データ読み込み中: {temp_file}")
-        
-        # CSVファイル検証
-        validate_csv_file(
-            temp_file,
-            required_columns=["DATE", "TIME", "TEMP"],
-            skiprows=config.TEMP_DATA_SKIPROWS,
-            encoding=config.ENCODING
-        )
-        
-        # メモリ効率化：dtypeを明示的に指定（CSV結果維持のため元の型を保持）
-        df = pd.read_csv(
-            temp_file,
-            encoding=config.ENCODING,
-            skiprows=config.TEMP_DATA_SKIPROWS,
-            header=None,
-            names=["DATE", "TEMP"],
-            usecols=[0, 1],
-            index_col=False
-            # CSV結果維持のためdtype指定を削除
-        )
-        
-        # 早期メモリ最適化（CSV結果維持のためコメントアウト）
-        # if MEMORY_EFFICIENT_DTYPES:
-        #     df['TEMP'] = df['TEMP'].astype('float32')
-            
+        report_progress(f"気温データ読み込み中: {temp_file}")
+
+        # 有効なキャッシュがあればCSVの検証・デコードを省略
+        df = load_csv_with_cache(temp_file, _temperature_parse_key(), _read_temperature_csv)
         temp_data_list.append(df)
         
     # メモリ効率的な結合
     combined_data = pd.concat(temp_data_list, ignore_index=True, copy=False)
-    print(f"気温データ読み込み完了: {len(combined_data)}行 (メモリ最適化済み)")
+    report_progress(f"気温データ読み込み完了: {len(combined_data)}行 (メモリ最適化済み)")
     
     return combined_data
 
@@ -454,10 +865,10 @@ def process_power_data(df: pd.DataFrame) -> pd.DataFrame:
         ValueError: データ形式が不正な場合
     """
     try:
-        print("電力データ前処理開始")
+        report_progress("電力データ前処理開始")
         
-        # データ検証
-        required_columns = ["DATE", "TIME", "KW"]
+        # データ検証（パーサー出力のDATETIME列、またはDATE・TIME文字列列）
+        required_columns = ["DATETIME", "KW"] if "DATETIME" in df.columns else ["DATE", "TIME", "KW"]
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             raise ValueError(f"必要な列が不足しています: {missing_columns}")
@@ -465,14 +876,16 @@ def process_power_data(df: pd.DataFrame) -> pd.DataFrame:
         # インデックスリセット（inplace=Trueでメモリ効率化）
         df.reset_index(drop=True, inplace=True)
         
-        # 時間データの前処理（元の実装を保持してCSV結果維持）
-        df['TIME'] = df['TIME'].astype(str).apply(
-            lambda x: x.split('〜')[0] if '〜' in x else x
-        )
-        
-        # 日時インデックスの作成（効率化版）
-        datetime_series = pd.to_datetime(df['DATE'] + ' ' + df['TIME'], format="%Y/%m/%d %H:%M")
-        df.index = datetime_series
+        if "DATETIME" in df.columns:
+            # パース済み日時をそのままインデックスに使用
+            df.index = pd.DatetimeIndex(df.pop("DATETIME"))
+        else:
+            # 時間データの前処理（範囲表記は開始時刻のみ採用）
+            df['TIME'] = df['TIME'].astype(str).str.split('〜', n=1).str[0]
+
+            # 日時インデックスの作成
+            datetime_series = pd.to_datetime(df['DATE'] + ' ' + df['TIME'], format="%Y/%m/%d %H:%M")
+            df.index = datetime_series
 
         # 日時順に並べ替え、重複時刻は先頭のみ採用
         df.sort_index(inplace=True)
@@ -483,7 +896,7 @@ def process_power_data(df: pd.DataFrame) -> pd.DataFrame:
         df["WEEK"] = df.index.weekday  # 曜日情報（0-6）
         df["HOUR"] = df.index.hour    # 時間情報（0-23）
         
-        print("電力データ前処理完了 (パフォーマンス最適化済み)")
+        report_progress("電力データ前処理完了 (パフォーマンス最適化済み)")
         return df
         
     except Exception as e:
@@ -506,20 +919,24 @@ def process_temperature_data(df: pd.DataFrame) -> pd.DataFrame:
         ValueError: データ形式が不正な場合
     """
     try:
-        print("気温データ前処理開始")
+        report_progress("気温データ前処理開始")
         
         # データ検証
+        if "DATETIME" in df.columns:
+            # パース済み日時（不正行はパーサーで除外済み）をDATE列として扱う
+            df = df.rename(columns={"DATETIME": "DATE"})
         required_columns = ["DATE", "TEMP"]
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
             raise ValueError(f"必要な列が不足しています: {missing_columns}")
         
         # 日時データを日時型に変換（高速化版）
-        df.loc[:, 'DATE'] = pd.to_datetime(
-            df['DATE'].astype(str), 
-            format="%Y/%m/%d %H:%M:%S", 
-            errors='coerce'
-        )
+        if not pd.api.types.is_datetime64_any_dtype(df['DATE']):
+            df.loc[:, 'DATE'] = pd.to_datetime(
+                df['DATE'].astype(str), 
+                format="%Y/%m/%d %H:%M:%S", 
+                errors='coerce'
+            )
         
         # null値削除（inplace=Trueでメモリ効率化）
         df.dropna(subset=['DATE'], inplace=True)
@@ -531,7 +948,7 @@ def process_temperature_data(df: pd.DataFrame) -> pd.DataFrame:
         # if MEMORY_EFFICIENT_DTYPES:
         #     df['TEMP'] = df['TEMP'].astype('float32')
         
-        print("気温データ前処理完了 (パフォーマンス最適化済み)")
+        report_progress("気温データ前処理完了 (パフォーマンス最適化済み)")
         return df
         
     except Exception as e:
@@ -540,6 +957,323 @@ def process_temperature_data(df: pd.DataFrame) -> pd.DataFrame:
         raise
 
 
+def resolve_max_workers(n_years: int) -> int:
+    """
+    年単位並列処理のワーカー数を決定する
+
+    Args:
+        n_years: 処理対象の年数
+
+    Returns:
+        int: ワーカー数（1なら逐次処理）
+    """
+    workers = config.MAX_WORKERS
+    env_value = os.environ.get(config.WORKERS_ENV_VAR, '').strip()
+    if env_value:
+        try:
+            workers = int(env_value)
+        except ValueError:
+            logger.warning(f"{config.WORKERS_ENV_VAR} の値が不正です（無視します）: {env_value}")
+
+    if workers <= 0:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, n_years))
+
+
+def load_and_process_year(year: str, power_file: str, temp_file: str) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    1年分の電力・気温データを読み込み、前処理まで実行する（プロセスプールのワーカー処理）
+
+    Args:
+        year: 対象年
+        power_file: 電力データCSVファイルパス
+        temp_file: 気温データCSVファイルパス
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: 前処理済み電力データ, 前処理済み気温データ
+    """
+    report_progress(f"{year}年データ読み込み・前処理中: {power_file}, {temp_file}")
+    power_df = load_csv_with_cache(power_file, _power_parse_key(), _read_power_csv)
+    temp_df = load_csv_with_cache(temp_file, _temperature_parse_key(), _read_temperature_csv)
+    return process_power_data(power_df), process_temperature_data(temp_df)
+
+
+def run_year_jobs(power_map: Dict[str, str], temp_map: Dict[str, str],
+                  years: List[str], max_workers: int) -> List[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    年ごとの読み込み・前処理を実行する（max_workers > 1 ならプロセスプールで並列実行）
+
+    Args:
+        power_map: 年と電力データファイルパスのマッピング
+        temp_map: 年と気温データファイルパスのマッピング
+        years: 処理対象の年リスト
+        max_workers: プロセス数
+
+    Returns:
+        List[Tuple[pd.DataFrame, pd.DataFrame]]: 年順の（電力データ, 気温データ）
+    """
+    args = [(year, power_map[year], temp_map[year]) for year in years]
+    if max_workers <= 1:
+        return [load_and_process_year(*a) for a in args]
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(load_and_process_year, *zip(*args)))
+    except (BrokenProcessPool, OSError) as e:
+        # プロセス起動不可の環境では逐次処理にフォールバック
+        logger.warning(f"プロセスプールを利用できないため逐次処理に切り替えます: {e}")
+        return [load_and_process_year(*a) for a in args]
+
+
+@safe_file_operation("年単位並列読み込み・前処理")
+def load_and_process_years(power_map: Dict[str, str], temp_map: Dict[str, str],
+                           common_years: List[str], max_workers: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    年ごとの読み込み・前処理をプロセスプールで並列実行し、結果を結合する
+
+    年ファイルは互いに独立しているため、読み込み・日時変換を年単位で並列化し、
+    結合後に年をまたぐ重複・順序のみ全体で補正する。
+
+    Args:
+        power_map: 年と電力データファイルパスのマッピング
+        temp_map: 年と気温データファイルパスのマッピング
+        common_years: 処理対象の年リスト
+        max_workers: プロセス数
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: 前処理済み電力データ, 前処理済み気温データ
+    """
+    results = run_year_jobs(power_map, temp_map, common_years, max_workers)
+
+    # 年順に結合（各年は前処理済みのため、年をまたぐ場合のみ並べ替え・重複除去）
+    power_df = pd.concat([r[0] for r in results], copy=False)
+    if not power_df.index.is_monotonic_increasing or power_df.index.has_duplicates:
+        power_df = power_df.sort_index()
+        power_df = power_df[~power_df.index.duplicated(keep='first')]
+    temp_df = pd.concat([r[1] for r in results], copy=False)
+
+    report_progress(f"年単位並列処理完了: {len(common_years)}年分 ({max_workers}プロセス), "
+                    f"電力データ{len(power_df)}行, 気温データ{len(temp_df)}行")
+    return power_df, temp_df
+
+
+# ================================================================
+# 年単位マージ済み特徴量ストア
+# ================================================================
+
+# パーティション内のフレーム名（マージ済み行・気温未対応の電力行・電力未対応の気温行）
+PARTITION_FRAMES: Tuple[str, ...] = ("merged", "orphan_power", "orphan_temp")
+
+
+def get_partition_path(power_file: str, year: str) -> str:
+    """
+    年単位特徴量パーティションのファイルパスを取得する
+
+    Args:
+        power_file: 電力データCSVファイルパス（キャッシュ配置先の基準）
+        year: 対象年
+
+    Returns:
+        str: パーティションファイルパス（例: data/cache/features-2024.npz）
+    """
+    return os.path.join(os.path.dirname(power_file), config.CACHE_DIR_NAME, f"features-{year}.npz")
+
+
+def build_year_partition(power_df: pd.DataFrame, temp_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    前処理済みの1年分の電力・気温データから特徴量パーティションを作成する
+
+    年末年始の境界時刻（例: 翌年1月1日0時）は気温データが前年ファイルに含まれるため、
+    年内で対応が取れない電力行・気温行は別フレームとして保持し、結合時に補完する。
+
+    Args:
+        power_df: 前処理済み電力データ（日時インデックス）
+        temp_df: 前処理済み気温データ（日時インデックス）
+
+    Returns:
+        Dict[str, pd.DataFrame]: merged, orphan_power, orphan_temp の各フレーム
+    """
+    calendar_cols = ["MONTH", "WEEK", "HOUR"]
+    in_temp = power_df.index.isin(temp_df.index)
+
+    merged = power_df.loc[in_temp, calendar_cols + config.TARGET_COLUMNS].copy()
+    merged["TEMP"] = pd.to_numeric(temp_df["TEMP"].reindex(merged.index), errors='coerce')
+    merged = merged.dropna()[config.FEATURE_COLUMNS + config.TARGET_COLUMNS]
+
+    orphan_power = power_df.loc[~in_temp, calendar_cols + config.TARGET_COLUMNS]
+    orphan_temp = temp_df.loc[~temp_df.index.isin(power_df.index), ["TEMP"]].copy()
+    orphan_temp["TEMP"] = pd.to_numeric(orphan_temp["TEMP"], errors='coerce')
+
+    return {"merged": merged, "orphan_power": orphan_power, "orphan_temp": orphan_temp}
+
+
+def save_year_partition(partition_path: str, partition: Dict[str, pd.DataFrame],
+                        sources: Dict[str, Dict[str, Any]]) -> None:
+    """
+    特徴量パーティションを保存する（失敗しても処理は継続）
+
+    Args:
+        partition_path: 保存先パス
+        partition: build_year_partition() の結果
+        sources: ソースファイル種別ごとのシグネチャ（power, temperature）
+    """
+    try:
+        arrays: Dict[str, np.ndarray] = {}
+        columns: Dict[str, List[str]] = {}
+        for name in PARTITION_FRAMES:
+            frame = partition[name]
+            arrays[f"{name}__index"] = frame.index.asi8
+            columns[name] = [str(c) for c in frame.columns]
+            for col in frame.columns:
+                arrays[f"{name}__{col}"] = frame[col].to_numpy()
+
+        meta = {
+            "version": config.CACHE_FORMAT_VERSION,
+            "parse_keys": [_power_parse_key(), _temperature_parse_key()],
+            "columns": columns,
+            "sources": sources,
+        }
+        arrays["__meta__"] = np.array(json.dumps(meta))
+        write_npz_atomic(partition_path, arrays)
+
+    except Exception as e:
+        logger.warning(f"特徴量パーティション保存失敗: {partition_path} - {e}")
+
+
+def load_year_partition(partition_path: str, power_file: str, temp_file: str) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    有効な特徴量パーティションを読み込む
+
+    電力・気温いずれかのソースCSVが変更されていれば無効として扱う。
+
+    Args:
+        partition_path: パーティションファイルパス
+        power_file: 電力データCSVファイルパス
+        temp_file: 気温データCSVファイルパス
+
+    Returns:
+        Optional[Dict[str, pd.DataFrame]]: パーティション、無効な場合はNone
+    """
+    if not os.path.exists(partition_path):
+        return None
+
+    try:
+        with np.load(partition_path, allow_pickle=False) as npz:
+            meta = json.loads(str(npz["__meta__"]))
+            if (meta.get("version") != config.CACHE_FORMAT_VERSION
+                    or meta.get("parse_keys") != [_power_parse_key(), _temperature_parse_key()]):
+                return None
+
+            sources = {
+                "power": check_source_signature(power_file, meta["sources"]["power"]),
+                "temperature": check_source_signature(temp_file, meta["sources"]["temperature"]),
+            }
+            if sources["power"] is None or sources["temperature"] is None:
+                return None
+
+            partition: Dict[str, pd.DataFrame] = {}
+            for name in PARTITION_FRAMES:
+                index = pd.DatetimeIndex(npz[f"{name}__index"].view("datetime64[ns]"))
+                partition[name] = pd.DataFrame(
+                    {col: npz[f"{name}__{col}"] for col in meta["columns"][name]},
+                    index=index,
+                    columns=meta["columns"][name],
+                )
+
+        if sources != meta["sources"]:
+            # 内容は同一のため、更新時刻を記録し直して次回のハッシュ計算を省略
+            save_year_partition(partition_path, partition, sources)
+        return partition
+
+    except Exception as e:
+        logger.warning(f"特徴量パーティション読み込み失敗（再作成します）: {partition_path} - {e}")
+        return None
+
+
+def assemble_partitions(partitions: List[Dict[str, pd.DataFrame]]) -> pd.DataFrame:
+    """
+    年単位パーティションを結合してマージ済みデータを組み立てる
+
+    Args:
+        partitions: 年順に並んだパーティションのリスト
+
+    Returns:
+        pd.DataFrame: マージ済みデータ（MONTH, WEEK, HOUR, TEMP, KW）
+
+    Raises:
+        ValueError: 結合後のデータが空の場合
+    """
+    merged = pd.concat([p["merged"] for p in partitions], copy=False)
+
+    # 年境界の電力行を隣接年の気温行で補完
+    orphan_power = pd.concat([p["orphan_power"] for p in partitions], copy=False)
+    orphan_temp = pd.concat([p["orphan_temp"] for p in partitions], copy=False)
+    if len(orphan_power) and len(orphan_temp):
+        orphan_temp = orphan_temp[~orphan_temp.index.duplicated(keep='first')]
+        boundary = orphan_power.copy()
+        boundary["TEMP"] = orphan_temp["TEMP"].reindex(boundary.index)
+        boundary = boundary.dropna()[merged.columns]
+        if len(boundary):
+            merged = pd.concat([merged, boundary], copy=False)
+
+    if not merged.index.is_monotonic_increasing or merged.index.has_duplicates:
+        merged = merged.sort_index(kind='mergesort')
+        merged = merged[~merged.index.duplicated(keep='first')]
+
+    if len(merged) == 0:
+        raise ValueError("マージ後のデータが空です")
+    return merged
+
+
+@safe_file_operation("特徴量ストア読み込み")
+def load_feature_store(power_map: Dict[str, str], temp_map: Dict[str, str],
+                       common_years: List[str]) -> pd.DataFrame:
+    """
+    年単位特徴量ストアから対象年のマージ済みデータを組み立てる
+
+    ソースCSVが変更された年（または未作成の年）のみ読み込み・前処理・マージを行い、
+    それ以外の年は保存済みパーティションを結合するだけで済ませる。
+
+    Args:
+        power_map: 年と電力データファイルパスのマッピング
+        temp_map: 年と気温データファイルパスのマッピング
+        common_years: 処理対象の年リスト
+
+    Returns:
+        pd.DataFrame: マージ済みデータ（MONTH, WEEK, HOUR, TEMP, KW）
+    """
+    partitions: Dict[str, Dict[str, pd.DataFrame]] = {}
+    stale_years: List[str] = []
+    for year in common_years:
+        partition = load_year_partition(get_partition_path(power_map[year], year),
+                                        power_map[year], temp_map[year])
+        if partition is None:
+            stale_years.append(year)
+        else:
+            partitions[year] = partition
+
+    if stale_years:
+        report_progress(f"特徴量パーティション再作成: {', '.join(stale_years)}")
+        # 読み込み前にシグネチャを取得（読み込み中の更新を次回検出できるようにする）
+        signatures = {
+            year: {
+                "power": compute_source_signature(power_map[year]),
+                "temperature": compute_source_signature(temp_map[year]),
+            }
+            for year in stale_years
+        }
+
+        results = run_year_jobs(power_map, temp_map, stale_years, resolve_max_workers(len(stale_years)))
+
+        for year, (power_df, temp_df) in zip(stale_years, results):
+            partitions[year] = build_year_partition(power_df, temp_df)
+            save_year_partition(get_partition_path(power_map[year], year), partitions[year], signatures[year])
+
+    reused = len(common_years) - len(stale_years)
+    merged_df = assemble_partitions([partitions[year] for year in common_years])
+    report_progress(f"特徴量ストア結合完了: {len(merged_df)}行 (再利用{reused}年 / 再作成{len(stale_years)}年)")
+    return merged_df
+
+
 def merge_data(power_df: pd.DataFrame, temp_df: pd.DataFrame) -> pd.DataFrame:
     """
     電力データと気温データをマージ（パフォーマンス最適化版）
@@ -555,7 +1289,7 @@ def merge_data(power_df: pd.DataFrame, temp_df: pd.DataFrame) -> pd.DataFrame:
         ValueError: データのマージに失敗した場合
     """
     try:
-        print("データマージ開始")
+        report_progress("データマージ開始")
         
         # 高速マージ：元のロジックを保持してCSV結果維持
         power_df["TEMP"] = temp_df.reindex(power_df.index).TEMP
@@ -566,7 +1300,7 @@ def merge_data(power_df: pd.DataFrame, temp_df: pd.DataFrame) -> pd.DataFrame:
         if len(merged_df) == 0:
             raise ValueError("マージ後のデータが空です")
         
-        print(f"データマージ完了: {len(merged_df)}行 (パフォーマンス最適化済み)")
+        report_progress(f"データマージ完了: {len(merged_df)}行 (パフォーマンス最適化済み)")
         return merged_df
         
     except Exception as e:
@@ -589,7 +1323,7 @@ def create_feature_target_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataF
         ValueError: 特徴量またはターゲット列が不足している場合
     """
     try:
-        print("特徴量・ターゲットデータ作成開始")
+        report_progress("特徴量・ターゲットデータ作成開始")
         
         # 必要な列の存在確認
         missing_features = [col for col in config.FEATURE_COLUMNS if col not in df.columns]
@@ -627,8 +1361,8 @@ def create_feature_target_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataF
             y_df = y_df.apply(lambda s: pd.to_numeric(s, errors='coerce'))
             y_df = y_df.dropna().astype(int)
         
-        print(f"特徴量データ作成完了: {X_df.shape}")
-        print(f"ターゲットデータ作成完了: {y_df.shape}")
+        report_progress(f"特徴量データ作成完了: {X_df.shape}")
+        report_progress(f"ターゲットデータ作成完了: {y_df.shape}")
         
         return X_df, y_df
         
@@ -639,11 +1373,31 @@ def create_feature_target_data(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataF
 
 
 @safe_file_operation("データセット保存")
+def save_binary_split(dataset_dir: str, X_df: pd.DataFrame, y_df: pd.DataFrame,
+                      test_mask: np.ndarray, test_size: float) -> None:
+    """
+    データセットをバイナリ形式（特徴量・目的変数配列 + テスト行マスク）で保存
+
+    Args:
+        dataset_dir: 保存先ディレクトリ
+        X_df: 特徴量データ
+        y_df: ターゲットデータ
+        test_mask: テスト行マスク
+        test_size: テストデータの割合
+    """
+    save_binary_dataset(dataset_dir, X_df.to_numpy(np.float32), y_df.to_numpy(), test_mask,
+                        list(X_df.columns), list(y_df.columns), extra_meta={"test_size": test_size})
+    report_progress(f"バイナリデータセット保存完了: {dataset_dir}")
+    report_progress(f"学習データ: {int((~test_mask).sum())}行, テストデータ: {int(test_mask.sum())}行")
+
+
 def save_datasets(X_df: pd.DataFrame, y_df: pd.DataFrame, 
                  x_csv: str, y_csv: str, test_size: float,
-                 Xtrain_csv: str, Xtest_csv: str, Ytrain_csv: str, Ytest_csv: str) -> None:
+                 Xtrain_csv: str, Xtest_csv: str, Ytrain_csv: str, Ytest_csv: str,
+                 dataset_format: Optional[str] = None,
+                 split_csv: Optional[bool] = None) -> None:
     """
-    データセットをCSVファイルに保存
+    データセットをバイナリデータセット（配列・テスト行マスク・メタ情報）とCSVファイルに保存
     
     Args:
         X_df: 特徴量データ
@@ -655,12 +1409,15 @@ def save_datasets(X_df: pd.DataFrame, y_df: pd.DataFrame,
         Xtest_csv: テスト用特徴量CSVファイルパス
         Ytrain_csv: 学習用ターゲットCSVファイルパス
         Ytest_csv: テスト用ターゲットCSVファイルパス
+        dataset_format: 出力形式（"csv": X.csv / Y.csv も出力、"binary": バイナリのみ。
+            Noneなら環境変数 AI_DATASET_FORMAT）
+        split_csv: 学習・テスト別CSVも出力するか（Noneなら環境変数 AI_DATASET_SPLIT_CSV）
         
     Raises:
         IOError: ファイル保存に失敗した場合
         ValueError: データ分割に失敗した場合
     """
-    print("データ保存開始")
+    report_progress("データ保存開始")
     
     # データ検証
     if X_df.empty or y_df.empty:
@@ -668,26 +1425,95 @@ def save_datasets(X_df: pd.DataFrame, y_df: pd.DataFrame,
     
     if not (0 < test_size < 1):
         raise ValueError("test_sizeは0と1の間の値である必要があります")
-    
-    # すべてのデータの保存
-    X_df.to_csv(x_csv, index=False)
-    y_df.to_csv(y_csv, index=False)
-    print(f"すべてのデータ保存完了: {x_csv}, {y_csv}")
-    
-    # 学習・テストデータの分割（shuffle=Falseを保持してCSV結果維持）
-    X_train, X_test, y_train, y_test = cross_validation.train_test_split(
-        X_df.values, y_df.values.flatten(), test_size=test_size, shuffle=False
-    )
 
-    # 学習・テストデータの保存
-    # 注意: X_df の列はダミー列展開により増えている可能性があるため、保存時は元の X_df.columns を使用する
-    pd.DataFrame(X_train, columns=X_df.columns).to_csv(Xtrain_csv, index=False)
-    pd.DataFrame(X_test, columns=X_df.columns).to_csv(Xtest_csv, index=False)
-    pd.DataFrame(y_train, columns=y_df.columns).to_csv(Ytrain_csv, index=False)
-    pd.DataFrame(y_test, columns=y_df.columns).to_csv(Ytest_csv, index=False)
-    
-    print(f"学習・テストデータ保存完了")
-    print(f"学習データ: {len(X_train)}行, テストデータ: {len(X_test)}行")
+    dataset_format = resolve_dataset_format(dataset_format)
+    if split_csv is None:
+        split_csv = is_split_csv_enabled()
+    data_dir = os.path.dirname(os.path.abspath(Xtrain_csv))
+    dataset_dir = get_dataset_dir(data_dir)
+
+    # 学習・テストの分割はテスト行マスクとして1回だけ作成（shuffle=Falseを保持してCSV結果維持）
+    test_mask = split_test_mask(len(X_df), test_size)
+
+    if dataset_format == FORMAT_CSV:
+        # すべてのデータの保存
+        X_df.to_csv(x_csv, index=False)
+        y_df.to_csv(y_csv, index=False)
+        report_progress(f"すべてのデータ保存完了: {x_csv}, {y_csv}")
+
+    split_paths = (Xtrain_csv, Xtest_csv, Ytrain_csv, Ytest_csv)
+    if split_csv:
+        # 学習・テストデータの保存（shuffle=Falseのため先頭が学習・末尾がテスト。コピーせずスライスで書き出す）
+        # 注意: X_df の列はダミー列展開により増えている可能性があるため、保存時は元の X_df.columns を使用する
+        n_train = int((~test_mask).sum())
+        X_values = X_df.values
+        y_values = y_df.values
+        pd.DataFrame(X_values[:n_train], columns=X_df.columns).to_csv(Xtrain_csv, index=False)
+        pd.DataFrame(X_values[n_train:], columns=X_df.columns).to_csv(Xtest_csv, index=False)
+        pd.DataFrame(y_values[:n_train], columns=y_df.columns).to_csv(Ytrain_csv, index=False)
+        pd.DataFrame(y_values[n_train:], columns=y_df.columns).to_csv(Ytest_csv, index=False)
+        report_progress(f"学習・テスト別CSV保存完了: {Xtrain_csv}, {Xtest_csv}, {Ytrain_csv}, {Ytest_csv}")
+    else:
+        # 以前に出力した学習・テスト別CSVは今回の分割と一致しないため削除
+        stale = [path for path in split_paths if os.path.exists(path)]
+        for path in stale:
+            os.remove(path)
+        if stale:
+            report_progress(f"古い学習・テスト別CSVを削除しました: {', '.join(os.path.basename(p) for p in stale)}")
+
+    # 分割（テスト行マスク）とメタ情報は形式によらず保存する。
+    # CSVより後に書き込み、読み込み側でバイナリデータセットが優先されるようにする
+    save_binary_split(dataset_dir, X_df, y_df, test_mask, test_size)
+
+
+def build_feature_target(target_years: Optional[List[str]] = None,
+                         data_dir: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    年別CSVから特徴量・ターゲットデータをメモリ上に作成する（ファイル保存なし）
+
+    Args:
+        target_years: 対象年リスト（Noneなら環境変数 AI_TARGET_YEARS、未設定なら全共通年）
+        data_dir: データディレクトリ（Noneならカレントディレクトリ基準の data/）
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: 特徴量データ, ターゲットデータ
+
+    Raises:
+        FileNotFoundError: 有効なデータファイルが見つからない場合
+        ValueError: 電力データと気温データの共通年が見つからない場合
+    """
+    # 1. データファイルの取得
+    power_files, temp_files = load_data_files(target_years, data_dir)
+
+    if not power_files or not temp_files:
+        raise FileNotFoundError("有効なデータファイルが見つかりません")
+
+    # 2. 共通年の取得
+    common_years, power_map, temp_map = get_common_years(power_files, temp_files)
+
+    if not common_years:
+        raise ValueError("電力データと気温データの共通年が見つかりません")
+
+    if is_parse_cache_enabled():
+        # 3-5. 年単位特徴量ストアから結合（変更された年のみ再作成）
+        merged_df = load_feature_store(power_map, temp_map, common_years)
+    else:
+        # 3-4. データ読み込み・前処理（複数コア利用可能な場合は年単位で並列化）
+        max_workers = resolve_max_workers(len(common_years))
+        if max_workers > 1:
+            power_df, temp_df = load_and_process_years(power_map, temp_map, common_years, max_workers)
+        else:
+            power_df = load_power_data(power_files, power_map, common_years)
+            temp_df = load_temperature_data(temp_files, temp_map, common_years)
+
+            power_df = process_power_data(power_df)
+            temp_df = process_temperature_data(temp_df)
+
+        # 5. データマージ
+        merged_df = merge_data(power_df, temp_df)
+
+    # 6. 特徴量・ターゲットデータ作成
+    return create_feature_target_data(merged_df)
 
 
 def data(x_csv: str, y_csv: str, test_size: float, 
@@ -715,35 +1541,8 @@ def data(x_csv: str, y_csv: str, test_size: float,
         print("電力需要予測AIモデル - データ前処理開始")
         print("=" * 60)
         
-        # 1. データファイルの取得
-        power_files, temp_files = load_data_files()
-        
-        if not power_files or not temp_files:
-            error_msg = "有効なデータファイルが見つかりません"
-            logger.error(error_msg)
-            return error_msg
-        
-        # 2. 共通年の取得
-        common_years, power_map, temp_map = get_common_years(power_files, temp_files)
-        
-        if not common_years:
-            error_msg = "電力データと気温データの共通年が見つかりません"
-            logger.error(error_msg)
-            return error_msg
-        
-        # 3. データ読み込み
-        power_df = load_power_data(power_files, power_map, common_years)
-        temp_df = load_temperature_data(temp_files, temp_map, common_years)
-        
-        # 4. データ前処理
-        power_df = process_power_data(power_df)
-        temp_df = process_temperature_data(temp_df)
-        
-        # 5. データマージ
-        merged_df = merge_data(power_df, temp_df)
-        
-        # 6. 特徴量・ターゲットデータ作成
-        X_df, y_df = create_feature_target_data(merged_df)
+        # 1-6. 特徴量・ターゲットデータ作成（データファイル取得・共通年・読み込み・マージ）
+        X_df, y_df = build_feature_target()
         
         # 7. データ保存
         save_datasets(X_df, y_df, x_csv, y_csv, test_size,
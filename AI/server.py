@@ -10,6 +10,23 @@ PORT = 8002
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 LOG_PATH = os.path.join(PROJECT_ROOT, 'server.log')
 
+# /run-train をスクリプトのサブプロセスではなく常駐学習ワーカーで実行する（common/training_service.py）
+# リクエストの "inprocess": true/false が優先。未指定時はこの環境変数（"1"/"true"/"on" で有効）
+INPROCESS_ENV_VAR = 'AI_INPROCESS_PIPELINE'
+# サーバー起動時に常駐学習ワーカーを起動しておくモデル（例: "LightGBM,Keras"、インプロセス有効時のみ）
+WARMUP_ENV_VAR = 'AI_TRAIN_WARMUP'
+
+
+def _inprocess_enabled() -> bool:
+    return os.environ.get(INPROCESS_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _training_service():
+    if PROJECT_ROOT not in sys.path:
+        sys.path.append(PROJECT_ROOT)
+    from common.training_service import get_training_service
+    return get_training_service()
+
 def _log(msg: str):
     try:
         ts = ''
@@ -136,6 +153,15 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                     }, status_code=400)
                     return
 
+                # In-process mode: build dataset and train in this process without CSV round-trips
+                inprocess = payload.get('inprocess')
+                if inprocess is None:
+                    inprocess = _inprocess_enabled()
+                if inprocess and model != 'Echo':
+                    result = self._run_pipeline_inprocess(model, years, payload.get('params'))
+                    self._json_response(result, status_code=200 if result['status'] == 'ok' else 500)
+                    return
+
                 # Always prepare an environment dict so _run_script can read other keys.
                 env = os.environ.copy()
                 if years:
@@ -172,21 +198,16 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 try:
                     env = os.environ.copy()
 
-                    # 両方のスクリプトを順次実行
-                    _log("Running tomorrow data.py and temp.py")
-                    data_out = self._run_script(os.path.join('tomorrow', 'data.py'), env=env)
-                    temp_out = self._run_script(os.path.join('tomorrow', 'temp.py'), env=env)
-
-                    # 両方の結果を統合
-                    combined_stdout = (data_out.get('stdout') or '') + '\n--- TEMP STDOUT ---\n' + (temp_out.get('stdout') or '')
-                    combined_stderr = (data_out.get('stderr') or '') + '\n--- TEMP STDERR ---\n' + (temp_out.get('stderr') or '')
-                    combined_returncode = max(data_out.get('returncode', 0), temp_out.get('returncode', 0))
+                    # 電力データ取得と気温データ取得を1プロセス内で並行実行
+                    _log("Running tomorrow prepare.py (data.py + temp.py concurrently)")
+                    out = self._run_script(os.path.join('tomorrow', 'prepare.py'), env=env)
+                    returncode = out.get('returncode', 0)
 
                     result = {
-                        'status': 'ok' if combined_returncode == 0 else 'error',
-                        'stdout': combined_stdout,
-                        'stderr': combined_stderr,
-                        'returncode': combined_returncode
+                        'status': 'ok' if returncode == 0 else 'error',
+                        'stdout': out.get('stdout') or '',
+                        'stderr': out.get('stderr') or '',
+                        'returncode': returncode
                     }
                     self._json_response(result, status_code=200 if result['status'] == 'ok' else 500)
                 except Exception as e:
@@ -310,6 +331,39 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 'error': str(e)
             }, status_code=500)
 
+    def _run_pipeline_inprocess(self, model, years=None, params=None):
+        """
+        データセット作成・学習を常駐学習ワーカーで実行する（common/training_service.py）
+
+        データセットはサーバープロセスのメモリ上に保持し、学習はモデルごとの常駐ワーカープロセスで行う。
+        異なるモデルの要求は並行に処理される。
+
+        Args:
+            model: モデル名
+            years: 対象年リスト（Noneなら全共通年）
+            params: ハイパーパラメータ（learning_rate / epochs / validation_split）
+
+        Returns:
+            dict: _run_script と同じ形式の結果（成功時は rmse / r2 / mae / elapsed を追加）
+        """
+        import traceback
+
+        target_years = [str(y) for y in years] if years else None
+        _log(f"Running in-process training: model={model}, years={target_years or '(none)'}, params={params}")
+        try:
+            result = _training_service().train(model, target_years, params)
+        except Exception as e:
+            tb = traceback.format_exc()
+            _log(f"In-process training error: {e}\nTraceback:\n{tb}")
+            return {'status': 'error', 'message': str(e), 'stdout': '', 'stderr': tb, 'returncode': 1}
+
+        if result['status'] == 'ok':
+            _log(f"In-process training finished: model={model} rmse={result.get('rmse')} "
+                 f"elapsed={result.get('elapsed', 0):.2f}s dataset_cached={result.get('dataset_cached')}")
+        else:
+            _log(f"In-process training error: model={model} {result.get('message')}\n{result.get('stderr', '')[-20000:]}")
+        return result
+
     def _run_script(self, script_relpath, env=None):
         full = os.path.join(PROJECT_ROOT, script_relpath)
         if not os.path.exists(full):
@@ -367,6 +421,13 @@ def _start():
         daemon_threads = True
 
     httpd = ThreadingHTTPServer(('', PORT), Handler)
+    warmup = [m.strip() for m in os.environ.get(WARMUP_ENV_VAR, '').split(',') if m.strip()]
+    if warmup and _inprocess_enabled():
+        try:
+            _training_service().warmup(warmup)
+            _log(f"Training workers started: {warmup}")
+        except Exception as e:
+            _log(f"Training worker warmup failed: {e}")
     print(f"AI server running at http://localhost:{PORT}/ (serving from {PROJECT_ROOT})")
     # Open dashboard in default browser after short delay to allow server to bind
     try:
@@ -8,6 +8,7 @@
 
 # 必要なライブラリのインポート
 import os
+import sys
 import time
 import gc
 from datetime import datetime, timedelta
@@ -15,6 +16,7 @@ from typing import Tuple, Any, Optional
 from dataclasses import dataclass
 from functools import wraps
 import glob
+import importlib.util
 import warnings
 
 import pandas as pd
@@ -35,6 +37,14 @@ except ImportError:
     print("警告: psutilが利用できません。メモリ監視機能を無効化します。")
     PSUTIL_AVAILABLE = False
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import load_dataset_array
+from common.artifact import ModelArtifact, find_artifact
+from common.mlp import DenseMLP
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -61,14 +71,19 @@ plt.rcParams['axes.linewidth'] = 1.0
 
 print("Keras Tomorrow: パフォーマンス最適化設定を適用しました")
 
-try:
-    from tensorflow.keras.models import load_model
-    TENSORFLOW_AVAILABLE = True
+# TensorFlowは旧形式（h5）のモデルを読み込む場合のみインポートする
+# （モデルバンドルは NumPy で推論するため、TensorFlowの起動時間がかからない）
+TENSORFLOW_AVAILABLE = importlib.util.find_spec("tensorflow") is not None
+if TENSORFLOW_AVAILABLE:
     print("TensorFlow: 利用可能")
-except ImportError:
+else:
     print("警告: TensorFlowが利用できません。互換性モードで実行します。")
-    TENSORFLOW_AVAILABLE = False
-    load_model = None
+
+
+def load_model(filepath: str, **kwargs) -> Any:
+    """Kerasモデル（.h5）を読み込む（TensorFlowは初回呼び出し時にインポート）"""
+    from tensorflow.keras.models import load_model as keras_load_model
+    return keras_load_model(filepath, **kwargs)
 
 
 @dataclass
@@ -193,10 +208,10 @@ def load_training_data(xtrain_path: str, xtest_path: str, ytrain_path: str) -> T
         monitor_memory_usage("データ読み込み開始")
         
         print(f"訓練データを読み込んでいます: {xtrain_path}")
-        xtrain = pd.read_csv(xtrain_path).values.astype('float32')  # メモリ効率化
+        xtrain = load_dataset_array(xtrain_path, dtype='float32')  # バイナリデータセット優先
         
         print(f"テストデータを読み込んでいます: {xtest_path}")
-        xtest = pd.read_csv(xtest_path).values.astype('float32')  # メモリ効率化
+        xtest = load_dataset_array(xtest_path, dtype='float32')  # バイナリデータセット優先
         
         # tomorrow予測では、Xtestの最後168行(最新7日分)のみ使用
         expected_rows = config.PAST_DAYS * 24
@@ -205,7 +220,7 @@ def load_training_data(xtrain_path: str, xtest_path: str, ytrain_path: str) -> T
             xtest = xtest[-expected_rows:]
         
         print(f"ラベルデータを読み込んでいます: {ytrain_path}")
-        ytrain = pd.read_csv(ytrain_path).values.astype('float32')  # メモリ効率化
+        ytrain = load_dataset_array(ytrain_path, dtype='float32')  # バイナリデータセット優先
         
         elapsed_time = time.time() - start_time
         monitor_memory_usage("データ読み込み完了")
@@ -225,13 +240,15 @@ def load_training_data(xtrain_path: str, xtest_path: str, ytrain_path: str) -> T
 
 
 @robust_model_operation
-def load_test_and_tomorrow_data(ytest_path: str, xtomorrow_path: str) -> Tuple[np.ndarray, np.ndarray]:
+def load_test_and_tomorrow_data(ytest_path: str, xtomorrow_path: str,
+                                feature_columns: Optional[list] = None) -> Tuple[np.ndarray, np.ndarray]:
     """
     テストデータと明日予測用データ読み込み（パフォーマンス最適化版）
     
     Args:
         ytest_path: テスト用目的変数データのパス
         xtomorrow_path: 明日予測用特徴量データのパス
+        feature_columns: 学習時の特徴量の列順（指定時は明日予測用データを並べ替え）
         
     Returns:
         読み込んだテストラベルと明日予測用データのタプル
@@ -254,7 +271,10 @@ def load_test_and_tomorrow_data(ytest_path: str, xtomorrow_path: str) -> Tuple[n
         print(f"[DEBUG] Ytest統計: 平均={ytest.mean():.2f}, 標準偏差={ytest.std():.2f}, 最小={ytest.min():.2f}, 最大={ytest.max():.2f}, 先頭5件={ytest[:5].flatten().tolist()}")
         
         print(f"明日予測用データを読み込んでいます: {xtomorrow_path}")
-        xtomorrow = pd.read_csv(xtomorrow_path).values.astype('float32')  # メモリ効率化
+        xtomorrow_df = pd.read_csv(xtomorrow_path)
+        if feature_columns:
+            xtomorrow_df = xtomorrow_df[list(feature_columns)]
+        xtomorrow = xtomorrow_df.values.astype('float32')  # メモリ効率化
         
         elapsed_time = time.time() - start_time
         monitor_memory_usage("テスト・明日データ読み込み完了")
@@ -313,7 +333,7 @@ def load_scaler_and_model(model_path: str) -> Tuple[StandardScaler, object]:
         except Exception as pickle_error:
             print(f"Pickleモデル読み込み失敗: {pickle_error}")
             # フォールバック: Kerasモデル読み込み
-            if os.path.exists(h5_model_path) and load_model is not None:
+            if os.path.exists(h5_model_path) and TENSORFLOW_AVAILABLE:
                 print(f"Kerasモデル（.h5）を読み込んでいます: {h5_model_path}")
                 # 絶対パスに変換してエンコーディング問題を回避
                 abs_path = os.path.abspath(h5_model_path)
@@ -599,6 +619,26 @@ def calculate_evaluation_metrics(ypred: np.ndarray, ytest: np.ndarray) -> Tuple[
         raise
 
 
+@robust_model_operation
+def load_model_bundle(model_path: str) -> Optional[ModelArtifact]:
+    """
+    モデルバンドル（モデル構成・重み・スケーラー・特徴量範囲・列順）を読み込む
+    
+    Args:
+        model_path: モデルファイルのパス（.sav / .h5、同じディレクトリの .bundle.npz を使用）
+        
+    Returns:
+        Optional[ModelArtifact]: バンドル（ない場合はNone）
+    """
+    artifact = find_artifact(model_path)
+    if artifact is None:
+        print("[INFO] モデルバンドルがないため旧形式（学習データ・h5・スケーラー）で予測します")
+        return None
+    print(f"[OK] モデルバンドル読み込み成功: 列順={artifact.feature_columns}, 作成日時={artifact.created_at}")
+    print(f"推論エンジン: {'NumPy' if isinstance(artifact.model, DenseMLP) else 'TensorFlow'}")
+    return artifact
+
+
 def load_model_and_scaler(model_path: str) -> Tuple[Any, Any]:
     """
     学習済みモデルとスケーラーを読み込む（エラー回避版）
@@ -865,17 +905,27 @@ def tomorrow(
         monitor_memory_usage("明日予測処理開始")
         start_memory = 0.0  # デフォルト値
         
-        # 訓練・テストデータの読み込み（最適化版）
-        Xtrain, Xtest, Ytrain = load_training_data(xtrain_csv, xtest_csv, ytrain_csv)
-        feature_min = np.min(Xtrain, axis=0)
-        feature_max = np.max(Xtrain, axis=0)
-        
-        # テストラベルと明日データの読み込み（最適化版）
-        Ytest, Xtomorrow = load_test_and_tomorrow_data(ytest_csv, xtomorrow_csv)
-        
-        # モデルとスケーラーのロード（メモリ効率化）
-        print("訓練済みモデルとスケーラーを読み込んでいます...")
-        keras_info, scaler, y_scaler = load_model_and_scaler(model_sav)
+        artifact = load_model_bundle(model_sav)
+        if artifact is not None:
+            # モデルバンドルの特徴量範囲・スケーラー・モデルを使用（学習データは読み込まない）
+            Ytest, Xtomorrow = load_test_and_tomorrow_data(ytest_csv, xtomorrow_csv, artifact.feature_columns)
+            Xtrain, Ytrain = None, None
+            Xtest = Xtomorrow[:len(Ytest)]
+            feature_min = artifact.feature_min.astype(np.float32)
+            feature_max = artifact.feature_max.astype(np.float32)
+            keras_info, scaler, y_scaler = artifact.model, artifact.scaler(), artifact.target_scaler()
+        else:
+            # 訓練・テストデータの読み込み（旧形式）
+            Xtrain, Xtest, Ytrain = load_training_data(xtrain_csv, xtest_csv, ytrain_csv)
+            feature_min = np.min(Xtrain, axis=0)
+            feature_max = np.max(Xtrain, axis=0)
+            
+            # テストラベルと明日データの読み込み（最適化版）
+            Ytest, Xtomorrow = load_test_and_tomorrow_data(ytest_csv, xtomorrow_csv)
+            
+            # モデルとスケーラーのロード（メモリ効率化）
+            print("訓練済みモデルとスケーラーを読み込んでいます...")
+            keras_info, scaler, y_scaler = load_model_and_scaler(model_sav)
         
         # メモリ監視
         monitor_memory_usage("モデル読み込み完了")
@@ -14,6 +14,7 @@ import pickle
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
 import traceback
 import os
+import sys
 import datetime
 import time
 import gc
@@ -22,6 +23,14 @@ from dataclasses import dataclass
 from functools import wraps
 from typing import Tuple, Optional, Dict, Any
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import load_feature_frame
+from common.artifact import ModelArtifact, find_artifact
+from common.trees import TreeEnsemble
+
 # matplotlib日本語フォント設定
 plt.rcParams['figure.dpi'] = 100
 plt.rcParams['savefig.dpi'] = 100
@@ -123,7 +132,8 @@ def robust_model_operation(operation_name: str):
 @robust_model_operation("学習データ読み込み")
 def load_training_data(config: LightGBMTomorrowConfig) -> Tuple[pd.DataFrame, StandardScaler]:
     """学習データを読み込み、標準化スケーラーを作成"""
-    X_train = pd.read_csv(config.XTRAIN_CSV)
+    # バイナリデータセット（data/dataset/）があれば優先して読み込む
+    X_train = load_feature_frame(config.XTRAIN_CSV)
 
     # 学習時に保存したスケーラーがあれば優先して使用
     scaler_path = config.MODEL_SAV.replace('.sav', '_scaler.pkl')
@@ -146,11 +156,26 @@ def load_training_data(config: LightGBMTomorrowConfig) -> Tuple[pd.DataFrame, St
     print(f"学習データ形状: {X_train_scaled.shape}")
     return X_train_scaled, scaler
 
+@robust_model_operation("モデルバンドル読み込み")
+def load_model_bundle(config: LightGBMTomorrowConfig) -> Optional[ModelArtifact]:
+    """モデルバンドル（モデル・スケーラー・列順）を読み込み（なければ旧形式のファイルを使用）"""
+    artifact = find_artifact(config.MODEL_SAV)
+    if artifact is None:
+        print("モデルバンドルがないため旧形式（学習データ・スケーラー・モデルファイル）で予測します")
+        return None
+    print(f"モデルバンドル読み込み完了: 列順={artifact.feature_columns}, 作成日時={artifact.created_at}")
+    if isinstance(artifact.model, TreeEnsemble):
+        print(f"推論エンジン: NumPy（木の数={artifact.model.n_trees}, ノード数={artifact.model.n_nodes}）")
+    return artifact
+
 @robust_model_operation("テスト・翌日データ読み込み")
-def load_test_and_tomorrow_data(config: LightGBMTomorrowConfig, scaler: StandardScaler) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    """テストデータと翌日データを読み込み、標準化"""
+def load_test_and_tomorrow_data(config: LightGBMTomorrowConfig, scaler: StandardScaler,
+                                feature_columns: Optional[list] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """テストデータと翌日データを読み込み、標準化（feature_columns 指定時は学習時の列順に並べ替え）"""
     y_test = pd.read_csv(config.YTEST_CSV).values.astype('int32').flatten()
     Xtomorrow = pd.read_csv(config.XTOMORROW_CSV)
+    if feature_columns:
+        Xtomorrow = Xtomorrow[list(feature_columns)]
     
     # 翌日データを標準化
     Xtomorrow_scaled = pd.DataFrame(scaler.transform(Xtomorrow), columns=Xtomorrow.columns)
@@ -196,9 +221,9 @@ def predict_with_model(model, Xtomorrow_scaled: pd.DataFrame, y_test: pd.DataFra
     # テスト部分で精度評価
     Y_test_pred = model.predict(X_test_part)
     
-    # 精度計算（テスト部分のみ）
+    # 精度計算（テスト部分のみ。LGBMRegressor.score と同じ決定係数）
     try:
-        accuracy = model.score(X_test_part, y_test)
+        accuracy = r2_score(y_test, Y_test_pred)
         print(f'テスト精度: {accuracy:.4f}')
     except Exception as e:
         print(f'精度計算でエラーが発生: {e}')
@@ -301,20 +326,27 @@ def execute_tomorrow_prediction(config: LightGBMTomorrowConfig) -> Tuple[Optiona
     Returns:
         Tuple[RMSE, Score, R2, MAE]
     """
-    # 1. 学習データ読み込み・標準化スケーラー作成
-    result = load_training_data(config)
-    if result is None:
-        return None, None, None, None
-    X_train_scaled, scaler = result
+    # 1. モデルバンドル読み込み（学習データは読み込まない）
+    #    バンドルがない場合は学習データ読み込み・標準化スケーラー作成（旧形式）
+    artifact = load_model_bundle(config)
+    if artifact is not None:
+        scaler, model, feature_columns = artifact.scaler(), artifact.model, artifact.feature_columns
+    else:
+        result = load_training_data(config)
+        if result is None:
+            return None, None, None, None
+        X_train_scaled, scaler = result
+        model, feature_columns = None, None
     
     # 2. テスト・翌日データ読み込み・標準化
-    result = load_test_and_tomorrow_data(config, scaler)
+    result = load_test_and_tomorrow_data(config, scaler, feature_columns)
     if result is None:
         return None, None, None, None
     y_test, Xtomorrow_scaled = result
     
-    # 3. モデル読み込み
-    model = load_model(config)
+    # 3. モデル読み込み（旧形式のみ）
+    if model is None:
+        model = load_model(config)
     if model is None:
         return None, None, None, None
     
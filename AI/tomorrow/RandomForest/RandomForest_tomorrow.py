@@ -9,6 +9,7 @@
 import datetime
 import glob
 import os
+import sys
 import pickle
 import traceback
 import time
@@ -24,6 +25,14 @@ import pandas as pd
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.preprocessing import StandardScaler
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import dataset_exists, load_dataset_array
+from common.artifact import ModelArtifact, find_artifact
+from common.trees import TreeEnsemble
+
 # matplotlib日本語フォント設定
 plt.rcParams['figure.dpi'] = 100
 plt.rcParams['savefig.dpi'] = 100
@@ -110,20 +119,46 @@ def robust_model_operation(operation_name: str):
 @robust_model_operation("学習・テスト・翌日データ読み込み")
 def load_training_and_test_data(config: RandomForestTomorrowConfig) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """学習データ、テストデータ、翌日データを読み込み"""
-    if not os.path.exists(config.XTRAIN_CSV):
+    if not dataset_exists(config.XTRAIN_CSV):
         raise FileNotFoundError(f"学習用データファイルが見つかりません: {config.XTRAIN_CSV}")
     if not os.path.exists(config.YTEST_CSV):
         raise FileNotFoundError(f"テストデータファイルが見つかりません: {config.YTEST_CSV}")
     if not os.path.exists(config.XTOMORROW_CSV):
         raise FileNotFoundError(f"予測用データファイルが見つかりません: {config.XTOMORROW_CSV}")
     
-    x_train = pd.read_csv(config.XTRAIN_CSV).to_numpy().astype('float32')
+    x_train = load_dataset_array(config.XTRAIN_CSV, dtype='float32')
     y_test = pd.read_csv(config.YTEST_CSV).values.astype('int32').flatten()
     x_tomorrow = pd.read_csv(config.XTOMORROW_CSV).to_numpy().astype('float32')
     
     print(f"データ読み込み完了 - x_train: {x_train.shape}, y_test: {y_test.shape}, x_tomorrow: {x_tomorrow.shape}")
     return x_train, y_test, x_tomorrow
 
+@robust_model_operation("テスト・翌日データ読み込み")
+def load_test_and_tomorrow_data(config: RandomForestTomorrowConfig, feature_columns: list) -> Tuple[np.ndarray, np.ndarray]:
+    """テストデータと翌日データを読み込み（翌日データは学習時の列順に並べ替え）"""
+    if not os.path.exists(config.YTEST_CSV):
+        raise FileNotFoundError(f"テストデータファイルが見つかりません: {config.YTEST_CSV}")
+    if not os.path.exists(config.XTOMORROW_CSV):
+        raise FileNotFoundError(f"予測用データファイルが見つかりません: {config.XTOMORROW_CSV}")
+    
+    y_test = pd.read_csv(config.YTEST_CSV).values.astype('int32').flatten()
+    x_tomorrow = pd.read_csv(config.XTOMORROW_CSV)[list(feature_columns)].to_numpy().astype('float32')
+    
+    print(f"データ読み込み完了 - y_test: {y_test.shape}, x_tomorrow: {x_tomorrow.shape}")
+    return y_test, x_tomorrow
+
+@robust_model_operation("モデルバンドル読み込み")
+def load_model_bundle(config: RandomForestTomorrowConfig) -> Optional[ModelArtifact]:
+    """モデルバンドル（モデル・スケーラー・列順）を読み込み（なければ旧形式のファイルを使用）"""
+    artifact = find_artifact(config.MODEL_SAV)
+    if artifact is None:
+        print("モデルバンドルがないため旧形式（学習データ・スケーラー・モデルファイル）で予測します")
+        return None
+    print(f"モデルバンドル読み込み完了: 列順={artifact.feature_columns}, 作成日時={artifact.created_at}")
+    if isinstance(artifact.model, TreeEnsemble):
+        print(f"推論エンジン: NumPy（木の数={artifact.model.n_trees}, ノード数={artifact.model.n_nodes}）")
+    return artifact
+
 @robust_model_operation("データ標準化")
 def standardize_data(config: RandomForestTomorrowConfig, x_train: np.ndarray, x_tomorrow: np.ndarray) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
     """データの標準化を実行"""
@@ -174,8 +209,8 @@ def predict_with_model(model, x_tomorrow: np.ndarray, y_test: np.ndarray) -> np.
     x_test_part = x_tomorrow[:test_length]
     x_forecast_part = x_tomorrow[test_length:]
     
-    # テスト部分で精度評価
-    test_accuracy = model.score(x_test_part, y_test)
+    # テスト部分で精度評価（RandomForestRegressor.score と同じ決定係数）
+    test_accuracy = r2_score(y_test, model.predict(x_test_part))
     print(f"テスト精度（R2スコア参考値）: {test_accuracy:.3f}")
     
     # 全期間の予測（過去7日分+予測7日分）
@@ -310,20 +345,32 @@ def tomorrow(
 @robust_model_operation("RandomForest翌日予測メイン処理")
 def execute_tomorrow_prediction(config: RandomForestTomorrowConfig) -> Optional[Tuple[float, float]]:
     """統一されたRandomForest翌日予測処理"""
-    # 1. データ読み込み
-    x_train, y_test, x_tomorrow = load_training_and_test_data(config)
-    if x_train is None or y_test is None or x_tomorrow is None:
-        return None, None
-    
-    # 2. データ標準化
-    x_train_scaled, x_tomorrow_scaled, scaler = standardize_data(config, x_train, x_tomorrow)
-    if x_train_scaled is None or x_tomorrow_scaled is None:
-        return None, None
-    
-    # 3. モデル読み込み
-    model = load_random_forest_model(config)
-    if model is None:
-        return None, None
+    artifact = load_model_bundle(config)
+    if artifact is not None:
+        # 1-3. モデルバンドルのスケーラー・モデルを使用（学習データは読み込まない）
+        result = load_test_and_tomorrow_data(config, artifact.feature_columns)
+        if result is None:
+            return None, None
+        y_test, x_tomorrow = result
+        x_tomorrow_scaled = artifact.scaler().transform(x_tomorrow)
+        model = artifact.model
+    else:
+        # 1. データ読み込み（旧形式）
+        result = load_training_and_test_data(config)
+        if result is None:
+            return None, None
+        x_train, y_test, x_tomorrow = result
+        
+        # 2. データ標準化
+        result = standardize_data(config, x_train, x_tomorrow)
+        if result is None:
+            return None, None
+        x_train_scaled, x_tomorrow_scaled, scaler = result
+        
+        # 3. モデル読み込み
+        model = load_random_forest_model(config)
+        if model is None:
+            return None, None
     
     # 4. 予測実行
     y_tomorrow = predict_with_model(model, x_tomorrow_scaled, y_test)
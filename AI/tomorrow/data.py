@@ -12,10 +12,12 @@ import traceback
 import warnings
 import logging
 import gc
-from typing import Optional, List, Dict, Any, Tuple, Union
+from typing import Optional, List, Dict, Any, Tuple, Union, BinaryIO
 from functools import lru_cache
 from dataclasses import dataclass, field
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 # サードパーティライブラリインポート
 import pandas as pd
@@ -25,12 +27,21 @@ import urllib.request
 import zipfile
 import io
 import requests
+from requests.adapters import HTTPAdapter
 from urllib3.exceptions import InsecureRequestWarning
+from urllib3.util.retry import Retry
 try:
     import psutil
 except Exception:
     psutil = None
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.http_cache import ConditionalDownloadCache, is_download_cache_enabled, spool_response
+from common.parsers import format_juyo_rows, parse_juyo
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -178,11 +189,27 @@ class TomorrowDataConfig:
     CHUNK_SIZE: int = 10000
     MAX_RETRIES: int = 3
     REQUEST_TIMEOUT: int = 30
+    RETRY_BACKOFF_FACTOR: float = 0.5  # リトライ間隔（0.5秒, 1秒, 2秒, ...）
+    RETRY_STATUS_CODES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    FETCH_WORKERS: int = 2             # 月別ZIPの同時取得数（当月・前月）
+    PARSE_WORKERS: int = 4             # 日別CSVの並列パース数
+    ZIP_SPOOL_MAX_BYTES: int = 8 * 1024 * 1024  # ZIPをメモリ上に保持する上限（超過分は一時ファイル）
+    ZIP_CHUNK_BYTES: int = 64 * 1024            # ストリーミング読み込み単位
     MEMORY_THRESHOLD_MB: float = 100.0
     
     # URL設定
     TEPCO_URL_TEMPLATE: str = "https://www.tepco.co.jp/forecast/html/images/{year:04d}{month:02d}_power_usage.zip"
     
+    # 年別ファイルの差分更新設定（末尾のみ読み込み、新しい行だけ追記。過去行の修正時のみ全体書き換え）
+    INCREMENTAL_UPDATE: bool = True
+    INCREMENTAL_ENV_VAR: str = "AI_JUYO_INCREMENTAL"  # "0"/"false"/"off" で従来の全体書き換え
+    TAIL_READ_BYTES: int = 32 * 1024  # 末尾読み込みの初期サイズ（不足時は4倍ずつ拡大）
+    TAIL_MIN_DAYS: int = 35           # 末尾読み込みで最低限確保する日数（予測データセットの過去期間用）
+    
+    # 月別ZIPのダウンロードキャッシュ（条件付きGET。未変更ならパース済みデータを再利用）
+    # 環境変数 AI_DOWNLOAD_CACHE=0 で無効化
+    DOWNLOAD_CACHE_DIR: str = os.path.join(_AI_DIR, "data", "cache", "downloads")
+    
     # データ型最適化マッピング
     OPTIMIZED_DTYPES: Dict[str, str] = field(default_factory=lambda: {
         'DATE': 'object',
@@ -196,6 +223,33 @@ class TomorrowDataConfig:
 # 統一設定インスタンス
 config = TomorrowDataConfig()
 
+def empty_juyo_frame() -> pd.DataFrame:
+    """
+    空の電力データフレーム（DATETIME・KW列）を作成
+
+    Returns:
+        pd.DataFrame: 0行の電力データフレーム
+    """
+    return pd.DataFrame({
+        'DATETIME': pd.Series([], dtype='datetime64[ns]'),
+        'KW': pd.Series([], dtype=config.OPTIMIZED_DTYPES['KW']),
+    })
+
+def parsed_juyo_frame(parsed) -> pd.DataFrame:
+    """
+    parse_juyo の結果を電力データフレーム（DATETIME・KW列）に変換
+
+    Args:
+        parsed: common.parsers.parse_juyo の戻り値
+
+    Returns:
+        pd.DataFrame: DATETIME（datetime64）・KW（int32）列のデータフレーム
+    """
+    return pd.DataFrame({
+        'DATETIME': parsed.datetimes(),
+        'KW': parsed.columns['KW'].astype(config.OPTIMIZED_DTYPES['KW']),
+    })
+
 def safe_file_operation(operation: str):
     """
     ファイル操作エラーハンドリングデコレータ（強化版）
@@ -279,35 +333,21 @@ def load_existing_data(file_path: str) -> Tuple[pd.DataFrame, List[str], str]:
         file_path: ファイルパス
         
     Returns:
-        Tuple[pd.DataFrame, List[str], str]: データフレーム, メタデータ行, 日本語ヘッダー
+        Tuple[pd.DataFrame, List[str], str]: データフレーム（DATETIME・KW列）, メタデータ行, 日本語ヘッダー
         
     Raises:
         FileNotFoundError: ファイルが見つからない場合
         UnicodeDecodeError: エンコーディングエラーの場合
     """
-    metadata_lines: List[str] = []
-    japanese_header: str = ""
-    
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"ファイルが存在しません: {file_path}")
     
-    # メタデータとヘッダーの効率的読み込み
-    with open(file_path, 'r', encoding=config.ENCODING, buffering=8192) as f:
-        metadata_lines.append(f.readline().rstrip('\r\n'))  # Line 1
-        metadata_lines.append(f.readline().rstrip('\r\n'))  # Line 2
-        japanese_header = f.readline().rstrip('\r\n')       # Line 3
-    
-    # 最適化されたデータ読み込み
-    df = pd.read_csv(
-        file_path, 
-        encoding=config.ENCODING, 
-        skiprows=config.CSV_SKIPROWS, 
-        header=None, 
-        names=config.EXPECTED_HEADER,
-        dtype={'DATE': 'object', 'TIME': 'object', 'KW': 'int32'},
-        engine='c',  # C エンジン使用（高速化）
-        low_memory=False
-    )
+    # メタデータ・ヘッダーとデータ行を一括パース（日時は型付き配列として取得）
+    parsed = parse_juyo(file_path, skiprows=config.CSV_SKIPROWS, encoding=config.ENCODING)
+    header_lines = parsed.metadata_lines + [""] * (config.CSV_SKIPROWS - len(parsed.metadata_lines))
+    metadata_lines: List[str] = header_lines[:2]  # Line 1, 2
+    japanese_header: str = header_lines[2]        # Line 3
+    df = parsed_juyo_frame(parsed)
     
     logger.info(f"既存データ読み込み完了: {file_path} ({len(df):,}行)")
     return df, metadata_lines, japanese_header
@@ -342,10 +382,7 @@ def create_new_file_with_headers(file_path: str) -> Tuple[pd.DataFrame, List[str
             f.write(japanese_header + '\n')
         
         # 最適化されたデータ型でDataFrame作成
-        empty_df = pd.DataFrame(columns=config.EXPECTED_HEADER)
-        for col in config.EXPECTED_HEADER:
-            if col in config.OPTIMIZED_DTYPES:
-                empty_df[col] = empty_df[col].astype(config.OPTIMIZED_DTYPES[col])
+        empty_df = empty_juyo_frame()
         
         logger.info(f"新規ファイル作成完了: {file_path}")
         
@@ -396,27 +433,38 @@ def data(Ytest_csv: str, past_days: Union[str, int], forecast_days: Union[str, i
         # 成功した月の結果を全て収集 -> 最終的に結合してデータセット作成を行う
         latest_dfs_list: List[pd.DataFrame] = []
 
+        # ダウンロードは候補月を並列に実施（年別ファイルの更新は同一ファイルを扱うため順番に行う）
+        fetched = fetch_months_concurrently([generate_file_url(y, m) for y, m in candidates])
+
         for year_try, month_try in candidates:
             zip_file_url = generate_file_url(year_try, month_try)
             juyo_target_path = generate_target_path(year_try)
+            new_df = fetched.get(zip_file_url)
+            if new_df is None:
+                logger.warning(f"最新データ取得失敗のためスキップ: {zip_file_url}")
+                continue
 
             logger.info(f"試行対象URL: {zip_file_url}")
             logger.info(f"試行対象ファイル: {juyo_target_path}")
 
-            # 既存データ読み込み or 新規作成
-            try:
-                existing_df, original_metadata_lines, original_japanese_header_line = load_existing_data(juyo_target_path)
-            except FileNotFoundError:
-                logger.info(f"ファイル {juyo_target_path} が存在しません。新規作成します。")
-                existing_df = pd.DataFrame(columns=config.EXPECTED_HEADER)
-                original_metadata_lines = []
-                original_japanese_header_line = config.JAPANESE_HEADER
-
-            # 最新データ取得とマージ処理（成功ならリストに追加）
-            month_df = download_and_extract_latest_data(
-                zip_file_url, existing_df, original_metadata_lines, 
-                original_japanese_header_line, juyo_target_path
-            )
+            if is_incremental_update_enabled():
+                # 差分更新（年別ファイルの末尾のみ読み込み、新しい行だけ追記）
+                month_df = update_juyo_file_incremental(zip_file_url, juyo_target_path, new_df)
+            else:
+                # 既存データ読み込み or 新規作成
+                try:
+                    existing_df, original_metadata_lines, original_japanese_header_line = load_existing_data(juyo_target_path)
+                except FileNotFoundError:
+                    logger.info(f"ファイル {juyo_target_path} が存在しません。新規作成します。")
+                    existing_df = empty_juyo_frame()
+                    original_metadata_lines = []
+                    original_japanese_header_line = config.JAPANESE_HEADER
+
+                # 最新データ取得とマージ処理（成功ならリストに追加）
+                month_df = download_and_extract_latest_data(
+                    zip_file_url, existing_df, original_metadata_lines, 
+                    original_japanese_header_line, juyo_target_path, new_df
+                )
 
             if month_df is not None:
                 latest_dfs_list.append(month_df)
@@ -439,7 +487,7 @@ def data(Ytest_csv: str, past_days: Union[str, int], forecast_days: Union[str, i
             return result_message
         
         # メモリクリーンアップ
-        del latest_df, existing_df
+        del latest_df, latest_dfs_list
         gc.collect()
         
         logger.info("tomorrow予測データ取得完了")
@@ -451,77 +499,215 @@ def data(Ytest_csv: str, past_days: Union[str, int], forecast_days: Union[str, i
         traceback.print_exc()
         return error_msg
 
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def get_http_session() -> requests.Session:
+    """
+    共有HTTPセッションを取得（接続プール・リトライ設定済み、プロセス内で1つ）
+    
+    接続エラー・RETRY_STATUS_CODES のレスポンスは MAX_RETRIES 回まで指数バックオフで再試行する。
+    
+    Returns:
+        requests.Session: 共有セッション
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            retry = Retry(
+                total=config.MAX_RETRIES,
+                backoff_factor=config.RETRY_BACKOFF_FACTOR,
+                status_forcelist=config.RETRY_STATUS_CODES,
+                allowed_methods=frozenset(["GET"]),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=config.FETCH_WORKERS,
+                                  pool_maxsize=config.FETCH_WORKERS, max_retries=retry)
+            session = requests.Session()
+            session.verify = False
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+def fetch_months_concurrently(zip_file_urls: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    複数の月別ZIPを並列に取得する（所要時間は最も遅いダウンロードで決まる）
+    
+    Args:
+        zip_file_urls: ZIPファイルURLリスト
+        
+    Returns:
+        Dict[str, Optional[pd.DataFrame]]: URL → 取得データ（失敗時はNone）
+    """
+    def _fetch(url: str) -> Optional[pd.DataFrame]:
+        try:
+            return fetch_latest_month_data(url)
+        except Exception as e:
+            logger.error(f"ZIPファイル取得エラー: {url}, {e}")
+            return None
+
+    workers = max(1, min(config.FETCH_WORKERS, len(zip_file_urls)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_fetch, zip_file_urls))
+    return dict(zip(zip_file_urls, results))
+
+def _parse_zip_member(z: zipfile.ZipFile, filename: str) -> pd.DataFrame:
+    """
+    月別ZIP内の日別CSV1件から当日実績（先頭24時間）をパースする
+
+    Args:
+        z: 月別ZIP
+        filename: 日別CSVのメンバー名
+
+    Returns:
+        pd.DataFrame: 当日実績（DATETIME・KW列）
+    """
+    with z.open(filename) as csv_file:
+        parsed = parse_juyo(
+            csv_file,
+            skiprows=config.ZIP_SKIPROWS,
+            encoding=config.ENCODING,
+            nrows=config.ZIP_NROWS
+        )
+    return parsed_juyo_frame(parsed)
+
+def _cached_members(cached: Optional[Dict[str, np.ndarray]]) -> Dict[Tuple[str, int], pd.DataFrame]:
+    """前回のパース結果をメンバー（名前, CRC32）単位に分割する（メンバー情報がない場合は空）"""
+    if not cached or 'MEMBERS' not in cached:
+        return {}
+    frame = _juyo_frame_from_arrays(cached)
+    bounds = np.concatenate([[0], np.cumsum(cached['MEMBER_ROWS'])])
+    return {
+        (str(name), int(crc)): frame.iloc[bounds[k]:bounds[k + 1]].reset_index(drop=True)
+        for k, (name, crc) in enumerate(zip(cached['MEMBERS'], cached['MEMBER_CRC']))
+    }
+
+def parse_month_zip(
+    zip_file: Union[str, BinaryIO],
+    cached: Optional[Dict[str, np.ndarray]] = None
+) -> Tuple[pd.DataFrame, Dict[str, np.ndarray]]:
+    """
+    月別ZIPから日別CSVの当日実績をパースする
+
+    前回のパース結果（cached）と名前・CRC32が一致するメンバーは再利用し、
+    新しい日（または修正された日）のメンバーのみ PARSE_WORKERS スレッドで並列にパースする。
+
+    Args:
+        zip_file: ZIPファイル（パスまたはシーク可能なファイルオブジェクト）
+        cached: 前回の戻り値の配列（Noneなら全メンバーをパース）
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, np.ndarray]]: 取得データ（DATETIME・KW列、日別CSV順に結合）,
+            キャッシュ保存用の配列（メンバー名・CRC32・行数を含む）
+
+    Raises:
+        zipfile.BadZipFile: ZIP形式が不正な場合
+    """
+    reusable = _cached_members(cached)
+    with zipfile.ZipFile(zip_file) as z:
+        members = sorted((info for info in z.infolist() if info.filename.endswith('.csv')),
+                         key=lambda info: info.filename)
+        frames: List[Optional[pd.DataFrame]] = [reusable.get((info.filename, info.CRC)) for info in members]
+        pending = [k for k, frame in enumerate(frames) if frame is None]
+        if pending:
+            workers = max(1, min(config.PARSE_WORKERS, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                parsed = executor.map(lambda k: _parse_zip_member(z, members[k].filename), pending)
+                for k, frame in zip(pending, parsed):
+                    frames[k] = frame
+        logger.info(f"日別CSVパース: {len(pending)}件（再利用 {len(members) - len(pending)}件）")
+
+    new_df = pd.concat(frames, ignore_index=True) if frames else empty_juyo_frame()
+    arrays = _juyo_frame_to_arrays(new_df)
+    arrays['MEMBERS'] = np.array([info.filename for info in members], dtype=str)
+    arrays['MEMBER_CRC'] = np.array([info.CRC for info in members], dtype=np.uint32)
+    arrays['MEMBER_ROWS'] = np.array([len(frame) for frame in frames], dtype=np.int64)
+    return new_df, arrays
+
+def get_download_cache() -> Optional[ConditionalDownloadCache]:
+    """
+    月別ZIPのダウンロードキャッシュを取得
+
+    Returns:
+        Optional[ConditionalDownloadCache]: キャッシュ（環境変数 AI_DOWNLOAD_CACHE で無効化時はNone）
+    """
+    if not is_download_cache_enabled():
+        return None
+    return ConditionalDownloadCache(config.DOWNLOAD_CACHE_DIR)
+
+def _juyo_frame_from_arrays(arrays: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """キャッシュの配列から電力データフレームを復元"""
+    return pd.DataFrame({
+        'DATETIME': arrays['DATETIME'].astype('datetime64[ns]'),
+        'KW': arrays['KW'].astype(config.OPTIMIZED_DTYPES['KW']),
+    })
+
+def _juyo_frame_to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """電力データフレームをキャッシュ保存用の配列に変換"""
+    return {
+        'DATETIME': df['DATETIME'].to_numpy(dtype='datetime64[ns]'),
+        'KW': df['KW'].to_numpy(dtype=config.OPTIMIZED_DTYPES['KW']),
+    }
+
 @safe_file_operation("最新データダウンロード・展開")
 @monitor_memory_usage
-def download_and_extract_latest_data(
-    zip_file_url: str, 
-    existing_df: pd.DataFrame, 
-    original_metadata_lines: List[str], 
-    original_japanese_header_line: str, 
-    juyo_target_path: str
-) -> Optional[pd.DataFrame]:
+def fetch_latest_month_data(zip_file_url: str) -> Optional[pd.DataFrame]:
     """
-    最新データをダウンロード・展開し、既存データとマージ
+    月別ZIPをダウンロードし、日別CSVの当日実績をパースする
+    
+    レスポンスはストリーミングで一時ファイル（ZIP_SPOOL_MAX_BYTES までメモリ、超過分はディスク）に書き出す。
+    ダウンロードキャッシュ有効時は前回の ETag / Last-Modified で条件付きGETを行い、
+    304 Not Modified、または内容ハッシュが前回と同じ場合は保存済みのパース結果を返す。
+    内容が変わった場合も、前回から変わっていない日別CSVはパースせずに再利用する。
     
     Args:
         zip_file_url: ZIPファイルURL
-        existing_df: 既存データフレーム
-        original_metadata_lines: 元のメタデータ行
-        original_japanese_header_line: 元の日本語ヘッダー行
-        juyo_target_path: 出力ファイルパス
         
     Returns:
-        Optional[pd.DataFrame]: マージ済みデータフレーム、失敗時はNone
-        
-    Raises:
-        Exception: ダウンロード・展開・マージ処理エラー
+        Optional[pd.DataFrame]: 取得データ（DATETIME・KW列、日別CSV順に結合）、失敗時はNone
     """
-    # 出力先ディレクトリ作成
-    target_dir = os.path.dirname(juyo_target_path)
-    os.makedirs(target_dir, exist_ok=True)
-    
-    # 最新データダウンロード・展開
-    new_data_dfs: List[pd.DataFrame] = []
+    cache = get_download_cache()
     
     try:
-        # 効率的HTTPリクエスト（セッション使用）
-        session = requests.Session()
-        session.verify = False
-        
-        response = session.get(zip_file_url, timeout=config.REQUEST_TIMEOUT, stream=True)
-        response.raise_for_status()
-
-        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-            csv_files_in_zip = sorted([name for name in z.namelist() if name.endswith('.csv')])
-
-            for filename in csv_files_in_zip:
-                with z.open(filename) as csv_file:
-                    # 最適化されたCSV読み込み
-                    df_to_append = pd.read_csv(
-                        csv_file, 
-                        encoding=config.ENCODING, 
-                        header=None, 
-                        skiprows=config.ZIP_SKIPROWS, 
-                        nrows=config.ZIP_NROWS, 
-                        usecols=config.ZIP_USECOLS,
-                        dtype={'0': 'object', '1': 'object', '2': 'int32'},
-                        engine='c'  # C エンジン使用（高速化）
-                    )
-                    df_to_append.columns = config.EXPECTED_HEADER  # 英語ヘッダー割り当て
-                    
-                    # 効率的文字列処理
-                    str_cols = df_to_append.select_dtypes(include=['object']).columns
-                    for col in str_cols:
-                        df_to_append[col] = df_to_append[col].astype('string').str.replace('\r', '', regex=False)
-                    
-                    new_data_dfs.append(df_to_append)
-        
-        session.close()
+        # 共有セッション（接続プール・リトライ）で取得
+        session = get_http_session()
+        
+        headers = cache.conditional_headers(zip_file_url) if cache else {}
+        response = session.get(zip_file_url, timeout=config.REQUEST_TIMEOUT, headers=headers, stream=True)
+        if response.status_code == 304 and cache:
+            response.close()
+            cached = cache.load(zip_file_url)
+            if cached is not None:
+                logger.info(f"ZIPファイル未更新（キャッシュ使用）: {zip_file_url}")
+                return _juyo_frame_from_arrays(cached)
+            # 304後にキャッシュが消えていた場合は条件なしで再取得
+            response = session.get(zip_file_url, timeout=config.REQUEST_TIMEOUT, stream=True)
+        try:
+            response.raise_for_status()
+            spool, digest = spool_response(response, config.ZIP_SPOOL_MAX_BYTES, config.ZIP_CHUNK_BYTES)
+        finally:
+            response.close()
+
+        with spool:
+            meta = cache.read_meta(zip_file_url) if cache else None
+            previous = cache.load(zip_file_url) if meta else None
+            if previous is not None and meta.get("sha256") == digest:
+                # 内容が前回と同一（サーバーが検証子を返さない場合など）: 再パースせず検証子のみ更新
+                cache.store(zip_file_url, response.headers, digest)
+                logger.info(f"ZIPファイル内容未変更（キャッシュ使用）: {zip_file_url}")
+                return _juyo_frame_from_arrays(previous)
+
+            new_df, arrays = parse_month_zip(spool, previous)
+        if cache:
+            cache.store(zip_file_url, response.headers, digest, arrays)
         logger.info(f"ZIPファイルダウンロード・処理完了: {zip_file_url}")
+        return new_df
 
     except requests.exceptions.RequestException as e:
         logger.error(f"ZIPファイルダウンロードエラー: {zip_file_url}, {e}")
         return None
+    except zipfile.BadZipFile as e:
         print(f"ZIPファイル形式エラー: {e}")
         traceback.print_exc()
         return None
@@ -530,58 +716,43 @@ def download_and_extract_latest_data(
         traceback.print_exc()
         return None
 
+def merge_and_write_juyo_file(
+    existing_df: pd.DataFrame, 
+    new_df: pd.DataFrame, 
+    original_metadata_lines: List[str], 
+    original_japanese_header_line: str, 
+    juyo_target_path: str
+) -> Optional[pd.DataFrame]:
+    """
+    既存データと取得データをマージし、年別ファイル全体を書き換える
+    
+    Args:
+        existing_df: 既存データフレーム（DATETIME・KW列）
+        new_df: 取得データフレーム（DATETIME・KW列）
+        original_metadata_lines: 元のメタデータ行
+        original_japanese_header_line: 元の日本語ヘッダー行
+        juyo_target_path: 出力ファイルパス
+        
+    Returns:
+        Optional[pd.DataFrame]: マージ済みデータフレーム（DATETIME・KW列）、失敗時はNone
+    """
     # 既存データと新規データをマージ
-    if new_data_dfs:
-        combined_df = pd.concat([existing_df] + new_data_dfs, ignore_index=True)
+    if len(new_df):
+        combined_df = pd.concat([existing_df, new_df], ignore_index=True)
     else:
         combined_df = existing_df
 
-    # TIMEカラム処理（開始時刻のみ取得）
-    if 'TIME' in combined_df.columns:
-        combined_df['TIME'] = combined_df['TIME'].astype(str).apply(lambda x: x.split('〜')[0] if '〜' in x else x)
-    else:
-        print("警告: 'TIME'カラムが見つかりません。時刻処理をスキップします。")
-
-    # 全カラムの改行文字除去
-    for col in combined_df.columns:
-        combined_df[col] = combined_df[col].astype(str).str.replace('\r', '')
-
-    # DATE/TIME を日時型に統一し、重複除去・正しい時系列ソートを保証
-    if 'DATE' in combined_df.columns and 'TIME' in combined_df.columns:
-        combined_df['DATETIME'] = pd.to_datetime(
-            combined_df['DATE'].astype(str).str.strip() + ' ' + combined_df['TIME'].astype(str).str.strip(),
-            format="%Y/%m/%d %H:%M",
-            errors='coerce'
-        )
-        before_len = len(combined_df)
-        combined_df.dropna(subset=['DATETIME'], inplace=True)
-
-        # 日時重複は最新を優先して1行残す
-        combined_df.drop_duplicates(subset=['DATETIME'], keep='last', inplace=True)
-
-        # 正しい時系列順にソート
-        combined_df = combined_df.sort_values(['DATETIME']).reset_index(drop=True)
-
-        # DATE/TIME をゼロパディングして正規化（例: 2026/02/01, 00:00）
-        combined_df['DATE'] = combined_df['DATETIME'].dt.strftime('%Y/%m/%d')
-        combined_df['TIME'] = combined_df['DATETIME'].dt.strftime('%H:%M')
-
-        combined_df.drop(columns=['DATETIME'], inplace=True)
-
-        after_len = len(combined_df)
-        if before_len != after_len:
-            print(f"重複・無効行を除去: {before_len} → {after_len}")
-    else:
-        print("警告: 'DATE'または'TIME'カラムが見つかりません。重複除去・ソートをスキップします。")
+    # 日時重複は最新を優先して1行残し、正しい時系列順にソート
+    before_len = len(combined_df)
+    combined_df = combined_df.drop_duplicates(subset=['DATETIME'], keep='last')
+    combined_df = combined_df.sort_values('DATETIME', kind='mergesort').reset_index(drop=True)
+    after_len = len(combined_df)
+    if before_len != after_len:
+        print(f"重複・無効行を除去: {before_len} → {after_len}")
 
-    # クリーンアップしたデータをCSVに保存
+    # クリーンアップしたデータをCSVに保存（DATE/TIME はゼロパディングで正規化）
     try:
-        # データフレームを文字列バッファに書き込み
-        data_buffer = io.StringIO()
-        combined_df.to_csv(data_buffer, header=False, index=False, encoding=config.ENCODING, lineterminator='\n')
-        data_content = data_buffer.getvalue()
-        # 改行文字の正規化
-        data_content = data_content.replace('\r\n', '\n')
+        data_content = format_juyo_rows(combined_df['DATETIME'].to_numpy(), combined_df['KW'].to_numpy())
 
         with open(juyo_target_path, 'wb') as f:  # バイナリ書き込みモード
             for line in original_metadata_lines:
@@ -597,6 +768,179 @@ def download_and_extract_latest_data(
         traceback.print_exc()
         return None
 
+def download_and_extract_latest_data(
+    zip_file_url: str, 
+    existing_df: pd.DataFrame, 
+    original_metadata_lines: List[str], 
+    original_japanese_header_line: str, 
+    juyo_target_path: str,
+    new_df: Optional[pd.DataFrame] = None
+) -> Optional[pd.DataFrame]:
+    """
+    最新データをダウンロード・展開し、既存データとマージ（年別ファイル全体を書き換え）
+    
+    Args:
+        zip_file_url: ZIPファイルURL
+        existing_df: 既存データフレーム（DATETIME・KW列）
+        original_metadata_lines: 元のメタデータ行
+        original_japanese_header_line: 元の日本語ヘッダー行
+        juyo_target_path: 出力ファイルパス
+        new_df: 取得済みの最新データ（Noneならここでダウンロード）
+        
+    Returns:
+        Optional[pd.DataFrame]: マージ済みデータフレーム（DATETIME・KW列）、失敗時はNone
+        
+    Raises:
+        Exception: ダウンロード・展開・マージ処理エラー
+    """
+    # 出力先ディレクトリ作成
+    os.makedirs(os.path.dirname(juyo_target_path), exist_ok=True)
+    
+    # 最新データダウンロード・展開
+    if new_df is None:
+        new_df = fetch_latest_month_data(zip_file_url)
+    if new_df is None:
+        return None
+
+    return merge_and_write_juyo_file(
+        existing_df, new_df, original_metadata_lines, 
+        original_japanese_header_line, juyo_target_path
+    )
+
+def is_incremental_update_enabled() -> bool:
+    """
+    年別ファイルの差分更新（末尾読み込み・追記）が有効か判定する
+    
+    Returns:
+        bool: 環境変数 AI_JUYO_INCREMENTAL が "0"/"false"/"off"/"no" の場合は False
+    """
+    value = os.environ.get(config.INCREMENTAL_ENV_VAR, "").strip().lower()
+    if value in ("0", "false", "off", "no"):
+        return False
+    return config.INCREMENTAL_UPDATE
+
+def read_juyo_tail(file_path: str, since: pd.Timestamp) -> Optional[pd.DataFrame]:
+    """
+    年別ファイルの末尾だけを読み込み、指定日時以前の行から最終行までを取得する
+    
+    ファイル末尾から TAIL_READ_BYTES ずつ（不足時は4倍に拡大して）読み込み、
+    先頭の途中行を除いてパースする。
+    
+    Args:
+        file_path: 年別ファイルパス
+        since: 取得範囲に含める必要がある日時
+        
+    Returns:
+        Optional[pd.DataFrame]: 末尾データ（DATETIME・KW列）。読み込み範囲がファイル先頭に達した
+            （ファイル全体の読み込みと変わらない）場合はNone
+    """
+    file_size = os.path.getsize(file_path)
+    block_size = config.TAIL_READ_BYTES
+    with open(file_path, 'rb') as f:
+        while block_size < file_size:
+            f.seek(file_size - block_size)
+            chunk = f.read()
+            # 先頭の途中行を除外（行の先頭から始まるようにする）
+            chunk = chunk[chunk.find(b'\n') + 1:]
+            parsed = parse_juyo(chunk, skiprows=0, encoding=config.ENCODING)
+            if len(parsed):
+                tail_df = parsed_juyo_frame(parsed)
+                if tail_df['DATETIME'].iloc[0] <= since:
+                    return tail_df
+            block_size *= 4
+    return None
+
+def append_juyo_rows(file_path: str, rows_df: pd.DataFrame) -> None:
+    """
+    年別ファイルの末尾にデータ行を追記する
+    
+    Args:
+        file_path: 年別ファイルパス
+        rows_df: 追記データ（DATETIME・KW列、既存の最終行より新しい日時のみ・時系列順）
+    """
+    data_content = format_juyo_rows(rows_df['DATETIME'].to_numpy(), rows_df['KW'].to_numpy())
+    with open(file_path, 'rb+') as f:
+        # 最終行が改行で終わっていない場合は改行を補う
+        f.seek(0, os.SEEK_END)
+        needs_newline = False
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b'\n'
+        if needs_newline:
+            f.write(b'\n')
+        f.write(data_content.encode(config.ENCODING))
+
+@safe_file_operation("年別ファイル差分更新")
+@monitor_memory_usage
+def update_juyo_file_incremental(zip_file_url: str, juyo_target_path: str,
+                                 new_df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+    """
+    最新データを取得し、年別ファイルに新しい行だけを追記する
+    
+    既存ファイルは末尾（取得データの先頭日時以前、かつ最終行から TAIL_MIN_DAYS 日以上）のみ読み込む。
+    取得データのうち既存の最終日時以前の行が既存値と異なる・欠けている（過去行の修正）場合、
+    またはファイルが小さく末尾読み込みの意味がない場合のみ、従来どおりファイル全体を書き換える。
+    
+    Args:
+        zip_file_url: ZIPファイルURL
+        juyo_target_path: 年別ファイルパス
+        new_df: 取得済みの最新データ（Noneならここでダウンロード）
+        
+    Returns:
+        Optional[pd.DataFrame]: 更新後の末尾データ（全体書き換え時はファイル全体、DATETIME・KW列）、
+            失敗時はNone
+    """
+    os.makedirs(os.path.dirname(juyo_target_path), exist_ok=True)
+    
+    if new_df is None:
+        new_df = fetch_latest_month_data(zip_file_url)
+    if new_df is None:
+        return None
+    new_df = new_df.drop_duplicates(subset=['DATETIME'], keep='last')
+    new_df = new_df.sort_values('DATETIME', kind='mergesort').reset_index(drop=True)
+
+    tail_df = None
+    if os.path.exists(juyo_target_path) and len(new_df):
+        since = new_df['DATETIME'].iloc[0]
+        tail_df = read_juyo_tail(juyo_target_path, since)
+        if tail_df is not None:
+            # 予測データセットの過去期間分を確保（不足時は範囲を広げて再読み込み）
+            min_start = tail_df['DATETIME'].iloc[-1] - pd.Timedelta(days=config.TAIL_MIN_DAYS)
+            if tail_df['DATETIME'].iloc[0] > min_start:
+                tail_df = read_juyo_tail(juyo_target_path, min(since, min_start))
+
+    if tail_df is not None:
+        tail_df = tail_df.drop_duplicates(subset=['DATETIME'], keep='last')
+        last_datetime = tail_df['DATETIME'].iloc[-1]
+        overlap_df = new_df[new_df['DATETIME'] <= last_datetime]
+        existing_kw = tail_df.set_index('DATETIME')['KW'].reindex(overlap_df['DATETIME'])
+        corrected = existing_kw.isna().to_numpy() | (existing_kw.to_numpy() != overlap_df['KW'].to_numpy())
+
+        if not corrected.any():
+            append_df = new_df[new_df['DATETIME'] > last_datetime].reset_index(drop=True)
+            if len(append_df):
+                append_juyo_rows(juyo_target_path, append_df)
+                print(f"データ追記完了: {juyo_target_path} ({len(append_df)}行追加)")
+            else:
+                print(f"追記対象の新しいデータはありません: {juyo_target_path}")
+            return pd.concat([tail_df, append_df], ignore_index=True)
+
+        print(f"既存データの修正を検出しました（{int(corrected.sum())}行）。ファイル全体を更新します")
+
+    # 全体書き換え（新規作成・過去行の修正・小さなファイル）
+    try:
+        existing_df, original_metadata_lines, original_japanese_header_line = load_existing_data(juyo_target_path)
+    except FileNotFoundError:
+        logger.info(f"ファイル {juyo_target_path} が存在しません。新規作成します。")
+        existing_df = empty_juyo_frame()
+        original_metadata_lines = []
+        original_japanese_header_line = config.JAPANESE_HEADER
+
+    return merge_and_write_juyo_file(
+        existing_df, new_df, original_metadata_lines, 
+        original_japanese_header_line, juyo_target_path
+    )
+
 @safe_file_operation("tomorrow予測データセット作成")
 def create_tomorrow_prediction_dataset(
     combined_df: pd.DataFrame, 
@@ -608,7 +952,7 @@ def create_tomorrow_prediction_dataset(
     tomorrow予測用データセットを作成
     
     Args:
-        combined_df: マージ済みデータフレーム（前月・当月を統合済み）
+        combined_df: マージ済みデータフレーム（DATETIME・KW列、前月・当月を統合済み）
         Ytest_csv: 出力CSVファイルパス
         past_days: 過去データ取得日数
         forecast_days: 予測日数
@@ -620,27 +964,11 @@ def create_tomorrow_prediction_dataset(
         Exception: データセット作成エラー
     """
     try:
-        # combined_dfをそのまま使用（年跨ぎ対応済み）
+        # combined_dfをそのまま使用（年跨ぎ対応済み、日時はパース済み）
         df = combined_df.copy()
-        
-        # TIMEカラム処理（開始時刻のみ取得）
-        df['TIME'] = df['TIME'].astype(str).apply(lambda x: x.split('〜')[0] if '〜' in x else x)
-
-        # DATE・TIME結合
-        df['DATETIME_COMBINED'] = df['DATE'].astype(str) + " " + df['TIME'].astype(str)
-
-        # 日時変換（エラー強制変換）
-        df['DATETIME_COMBINED'] = pd.to_datetime(
-            df['DATETIME_COMBINED'], 
-            format="%Y/%m/%d %H:%M", 
-            errors='coerce'
-        )
-
-        # 日時変換失敗行の除去
-        df.dropna(subset=['DATETIME_COMBINED'], inplace=True)
 
         # 日時カラムをインデックスに設定
-        df.set_index('DATETIME_COMBINED', inplace=True)
+        df.set_index('DATETIME', inplace=True)
 
         # 重複日時を除去（最新データ優先）
         if df.index.has_duplicates:
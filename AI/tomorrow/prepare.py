@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+電力需要予測AIモデル - tomorrow入力データ一括作成モジュール
+
+tomorrow/data.py（TEPCO電力データ取得・Ytest.csv / period_info.json 作成）と
+tomorrow/temp.py（Open-Meteo気温データ取得・tomorrow.csv 作成）を並行実行する。
+
+気温データは period_info.json を待たずに、期間を必ず含む広めの日付範囲で取得を開始し、
+電力データ側の処理完了後に period_info の期間へ切り出して保存する。
+広めの範囲で期間を満たせない場合のみ、従来どおり period_info に合わせて取得し直す。
+
+コマンドライン実行（AI/ ディレクトリから）:
+    python tomorrow/prepare.py
+"""
+
+import logging
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from tomorrow import data as tomorrow_data
+from tomorrow import temp as tomorrow_temp
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PrepareConfig:
+    """tomorrow入力データ一括作成設定クラス"""
+    DEFAULT_PAST_DAYS: int = 7
+    DEFAULT_FORECAST_DAYS: int = 7
+    # 電力データの最新日時が現在日から何日遅れても気温の取得範囲に含まれるか（月初の公開遅れを考慮）
+    PERIOD_LAG_DAYS: int = 3
+
+
+config = PrepareConfig()
+
+
+def superset_window(past_days: int, forecast_days: int, timezone: str,
+                    lag_days: int = config.PERIOD_LAG_DAYS) -> Tuple[str, str]:
+    """
+    period_info の期間を必ず含む気温データの取得範囲（日付）
+
+    電力データの最新日時（period_info の end_datetime）が現地時刻で当日〜lag_days日前にある場合、
+    過去 past_days 日と以降 forecast_days 日の全時間がこの範囲に含まれる。
+
+    Args:
+        past_days: 過去日数
+        forecast_days: 予測日数
+        timezone: タイムゾーン
+        lag_days: 電力データの最新日時の想定最大遅れ（日）
+
+    Returns:
+        Tuple[str, str]: 開始日, 終了日（YYYY-MM-DD、当日を含む）
+    """
+    today = tomorrow_temp.local_now(timezone).astype('datetime64[D]')
+    start = today - np.timedelta64(lag_days + past_days, 'D')
+    end = today + np.timedelta64(forecast_days, 'D')
+    return str(start), str(end)
+
+
+def prepare_tomorrow_inputs(output_dir: Optional[str] = None,
+                            past_days: int = config.DEFAULT_PAST_DAYS,
+                            forecast_days: int = config.DEFAULT_FORECAST_DAYS) -> Optional[str]:
+    """
+    電力データ（Ytest.csv）と気温データ（tomorrow.csv）を並行して作成する
+
+    Args:
+        output_dir: 出力ディレクトリ（Noneなら tomorrow/）
+        past_days: 過去データ取得日数
+        forecast_days: 予測日数
+
+    Returns:
+        Optional[str]: エラーが発生した場合はエラーメッセージ、正常終了時はNone
+    """
+    output_dir = output_dir or os.path.dirname(os.path.abspath(__file__))
+    ytest_csv = os.path.join(output_dir, "Ytest.csv")
+    xtomorrow_csv = os.path.join(output_dir, "tomorrow.csv")
+    period_info_path = os.path.join(output_dir, "period_info.json")
+
+    temp_config = tomorrow_temp.config
+    latitude, longitude = temp_config.DEFAULT_LATITUDE, temp_config.DEFAULT_LONGITUDE
+    timezone = temp_config.DEFAULT_TIMEZONE
+    start_date, end_date = superset_window(past_days, forecast_days, timezone)
+    logger.info(f"気温データを先行取得: {start_date} 〜 {end_date}（電力データ取得と並行）")
+
+    errors = []
+    api_data: Optional[Dict[str, Any]] = None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        data_future = executor.submit(tomorrow_data.data, ytest_csv, str(past_days), str(forecast_days))
+        temp_future = executor.submit(tomorrow_temp.fetch_window_temperature, latitude, longitude, timezone,
+                                      past_days, forecast_days, start_date, end_date)
+        try:
+            data_error = data_future.result()
+            if data_error:
+                errors.append(f"電力データ: {data_error}")
+        except Exception as e:
+            errors.append(f"電力データ: {e}")
+        try:
+            api_data = temp_future.result()
+        except Exception as e:
+            logger.warning(f"気温データの先行取得に失敗しました（期間確定後に再取得します）: {e}")
+
+    # 電力データ側で確定した期間に切り出して保存（満たせない場合は従来の期間指定取得）
+    period_info = tomorrow_temp.load_period_info(period_info_path)
+    written = False
+    if api_data is not None and period_info is not None:
+        try:
+            written = tomorrow_temp.write_period_temperature(api_data, period_info, xtomorrow_csv)
+        except Exception as e:
+            logger.warning(f"先行取得した気温データの保存に失敗しました: {e}")
+    if not written:
+        logger.info("period_info に合わせて気温データを取得します")
+        temp_error = tomorrow_temp.temp(latitude, longitude, timezone, xtomorrow_csv, past_days, forecast_days)
+        if temp_error:
+            errors.append(f"気温データ: {temp_error}")
+
+    return "\n".join(errors) if errors else None
+
+
+def main() -> None:
+    """コマンドライン実行: python tomorrow/prepare.py"""
+    start_time = time.time()
+    print("=== tomorrow入力データ作成開始（電力・気温並行取得） ===")
+    try:
+        result = prepare_tomorrow_inputs()
+    except Exception as e:
+        traceback.print_exc()
+        result = str(e)
+    elapsed_time = time.time() - start_time
+    if result:
+        print(f"エラーが発生しました: {result}")
+        print(f"=== tomorrow入力データ作成失敗 (実行時間: {elapsed_time:.2f}秒) ===")
+        sys.exit(1)
+    print(f"=== tomorrow入力データ作成完了 (実行時間: {elapsed_time:.2f}秒) ===")
+
+
+if __name__ == "__main__":
+    main()
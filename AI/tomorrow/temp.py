@@ -14,7 +14,8 @@ import warnings
 import logging
 import threading
 import gc
-from typing import List, Tuple, Optional, Dict, Any, Union
+import hashlib
+from typing import List, Tuple, Optional, Dict, Any, Union, Sequence
 from functools import lru_cache
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
@@ -24,8 +25,16 @@ import pandas as pd
 import numpy as np
 import datetime as dt
 import requests
+from urllib.parse import unquote
 from urllib3.exceptions import InsecureRequestWarning
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.hourly_cache import HourlyValueCache, as_hours
+from common.stations import Station, resolve_stations, weighted_temperature
+
 # システム監視ライブラリインポート（オプション）
 try:
     import psutil
@@ -66,6 +75,7 @@ if not PSUTIL_AVAILABLE:
 class TempConfig:
     """気温データ取得設定クラス（設定値統一管理）"""
     OPEN_METEO_BASE_URL: str = "https://api.open-meteo.com/v1/forecast"
+    OPEN_METEO_ARCHIVE_URL: str = "https://archive-api.open-meteo.com/v1/archive"  # 過去の気象データ（再解析）
     DEFAULT_LATITUDE: str = "35.6785"  # 東京の緯度
     DEFAULT_LONGITUDE: str = "139.6823"  # 東京の経度
     DEFAULT_TIMEZONE: str = "Asia%2FTokyo"
@@ -76,6 +86,12 @@ class TempConfig:
     FLOAT_PRECISION: str = "float32"  # メモリ効率化
     MAX_WORKERS: int = 4  # 並列処理ワーカー数
     MEMORY_THRESHOLD_MB: int = 1000  # メモリ使用量監視閾値
+    
+    # 時間別気温のディスクキャッシュ（地点・時間単位。環境変数 AI_TEMP_CACHE=0 で無効化）
+    TEMP_CACHE_DIR: str = os.path.join(_AI_DIR, "data", "cache", "temperature")
+    TEMP_CACHE_ENV_VAR: str = "AI_TEMP_CACHE"
+    FORECAST_TTL_SECONDS: int = 3600  # 予測値（未確定の時間）の有効期間
+    PAST_FINAL_LAG_HOURS: int = 3     # 取得時点でこの時間数以上前の時間は確定値として永続保持
 
 # 統一設定インスタンス
 config = TempConfig()
@@ -142,7 +158,8 @@ def cached_url_generation(
     past_days: int,
     forecast_days: int,
     start_date: str,
-    end_date: str
+    end_date: str,
+    base_url: str = ""
 ) -> str:
     """
     APIURLキャッシュ生成（パフォーマンス最適化）
@@ -155,11 +172,12 @@ def cached_url_generation(
         forecast_days: 予測日数
         start_date: 開始日（YYYY-MM-DD、未指定なら空文字）
         end_date: 終了日（YYYY-MM-DD、未指定なら空文字）
+        base_url: APIエンドポイント（未指定なら OPEN_METEO_BASE_URL）
 
     Returns:
         str: キャッシュされたAPIURL
     """
-    base = (f"{config.OPEN_METEO_BASE_URL}"
+    base = (f"{base_url or config.OPEN_METEO_BASE_URL}"
             f"?latitude={latitude}"
             f"&longitude={longitude}"
             f"&hourly=temperature_2m"
@@ -217,7 +235,8 @@ def generate_api_url(
     past_days: Union[str, int],
     forecast_days: Union[str, int],
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None
+    end_date: Optional[str] = None,
+    base_url: Optional[str] = None
 ) -> str:
     """
     Open-Meteo APIのURL生成（キャッシュ対応）
@@ -228,6 +247,9 @@ def generate_api_url(
         timezone: タイムゾーン
         past_days: 過去日数
         forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+        base_url: APIエンドポイント（Noneなら OPEN_METEO_BASE_URL）
         
     Returns:
         str: 生成されたAPIURL
@@ -242,9 +264,248 @@ def generate_api_url(
         int(past_days),
         int(forecast_days),
         start_date_str,
-        end_date_str
+        end_date_str,
+        base_url or ""
     )
 
+def is_temperature_cache_enabled() -> bool:
+    """
+    時間別気温キャッシュが有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_TEMP_CACHE が "0"/"false"/"off"/"no" の場合は False
+    """
+    value = os.environ.get(config.TEMP_CACHE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+@lru_cache(maxsize=8)
+def _hourly_cache(cache_dir: str, ttl_seconds: int, final_lag_hours: int) -> HourlyValueCache:
+    return HourlyValueCache(cache_dir, ttl_seconds, final_lag_hours)
+
+def get_temperature_cache() -> HourlyValueCache:
+    """時間別気温キャッシュを取得（同じ設定ならプロセス内で共有）"""
+    return _hourly_cache(config.TEMP_CACHE_DIR, config.FORECAST_TTL_SECONDS, config.PAST_FINAL_LAG_HOURS)
+
+def cache_source(base_url: Optional[str] = None) -> str:
+    """
+    APIエンドポイントのキャッシュ上の区分（予測APIと過去データAPIの値を混在させない）
+
+    Args:
+        base_url: APIエンドポイント（Noneなら予測API）
+
+    Returns:
+        str: "forecast" / "archive"（その他のエンドポイントはURLのハッシュ）
+    """
+    if not base_url or base_url == config.OPEN_METEO_BASE_URL:
+        return "forecast"
+    if base_url == config.OPEN_METEO_ARCHIVE_URL:
+        return "archive"
+    return hashlib.sha256(base_url.encode("utf-8")).hexdigest()[:12]
+
+def location_cache_key(latitude: str, longitude: str, timezone: str, base_url: Optional[str] = None) -> str:
+    """地点（緯度・経度・タイムゾーン）とAPIエンドポイント（予測・過去データ）のキャッシュキー"""
+    return f"{cache_source(base_url)}_{float(latitude):.4f}_{float(longitude):.4f}_{unquote(timezone)}"
+
+def local_now(timezone: str) -> np.datetime64:
+    """
+    APIの時刻系（指定タイムゾーンの現地時刻）での現在時刻
+
+    Args:
+        timezone: タイムゾーン（URLエンコード可、例: Asia%2FTokyo）
+
+    Returns:
+        np.datetime64: 現地時刻（タイムゾーン情報なし）
+    """
+    try:
+        from zoneinfo import ZoneInfo
+        now = dt.datetime.now(ZoneInfo(unquote(timezone))).replace(tzinfo=None)
+    except Exception:
+        now = dt.datetime.now()
+    return np.datetime64(now, 's')
+
+def requested_hours(
+    past_days: Union[str, int],
+    forecast_days: Union[str, int],
+    start_date: Optional[str],
+    end_date: Optional[str],
+    now_local: np.datetime64
+) -> np.ndarray:
+    """
+    APIリクエストが返す時間の範囲（past_days/forecast_days または start_date/end_date）
+
+    Args:
+        past_days: 過去日数
+        forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD、当日を含む）
+        now_local: 現地時刻の現在時刻
+
+    Returns:
+        np.ndarray: 対象時間（datetime64[h]、1時間刻み）
+    """
+    one_day = np.timedelta64(1, 'D')
+    if start_date and end_date:
+        first = np.datetime64(start_date, 'D')
+        stop = np.datetime64(end_date, 'D') + one_day
+    else:
+        today = now_local.astype('datetime64[D]')
+        first = today - int(past_days) * one_day
+        stop = today + int(forecast_days) * one_day
+    return np.arange(as_hours(first), as_hours(stop), np.timedelta64(1, 'h'))
+
+def request_temperature_data(api_url: str) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Open-Meteo APIにリクエストしてレスポンスを検証する
+
+    Args:
+        api_url: APIのURL（緯度・経度をカンマ区切りで複数指定した場合は地点ごとのリスト）
+
+    Returns:
+        Union[Dict[str, Any], List[Dict[str, Any]]]: APIレスポンスデータ
+
+    Raises:
+        requests.exceptions.RequestException: APIリクエストエラー
+        ValueError: APIレスポンス検証エラー
+    """
+    logger.info(f"API Request URL: {api_url}")
+    
+    # セッション使用による最適化APIリクエスト実行
+    session = get_api_session()
+    response = session.get(api_url, timeout=config.API_TIMEOUT)
+    response.raise_for_status()  # HTTPステータスエラーチェック
+    
+    # レスポンスデータ取得・検証
+    data = response.json()
+    
+    for item in (data if isinstance(data, list) else [data]):
+        if 'hourly' not in item:
+            raise ValueError("APIレスポンスに'hourly'キーが存在しません")
+        
+        if 'time' not in item['hourly'] or 'temperature_2m' not in item['hourly']:
+            raise ValueError("APIレスポンスに必要なデータ('time', 'temperature_2m')が不足しています")
+    
+    return data
+
+def _hourly_arrays(item: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """APIレスポンス（1地点分）の時間・気温配列（欠損はNaN）"""
+    hours = as_hours(pd.to_datetime(item['hourly']['time']).values)
+    values = pd.array(item['hourly']['temperature_2m'], dtype='float64').to_numpy(dtype='float64', na_value=np.nan)
+    return hours, values
+
+def _hourly_response(hours: np.ndarray, values: np.ndarray, timezone: str) -> Dict[str, Any]:
+    """時間・気温配列をAPIレスポンスと同じ形式（hourly.time / hourly.temperature_2m）に変換"""
+    return {
+        'timezone': unquote(timezone),
+        'hourly': {
+            'time': [str(h) + ':00' for h in hours],
+            'temperature_2m': [None if np.isnan(v) else float(v) for v in values],
+        },
+    }
+
+def fetch_hourly_matrix(
+    coordinates: Sequence[Tuple[str, str]],
+    timezone: str,
+    past_days: Union[str, int],
+    forecast_days: Union[str, int],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    base_url: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    複数地点の時間別気温を取得する（APIリクエストは地点数に関わらず最大1回）
+
+    キャッシュ有効時は、キャッシュにない・期限切れの時間がある地点のみを、必要な時間を含む
+    日付範囲で1回の複数地点リクエスト（緯度・経度のカンマ区切り指定）で取得し、キャッシュと結合する。
+    過去の時間（取得時点で PAST_FINAL_LAG_HOURS 以上前）は確定値として永続保持し、
+    予測値は FORECAST_TTL_SECONDS で期限切れとする。
+    キャッシュはAPIエンドポイントごとに分け、予測APIの値を過去データ（再解析）として使用しない。
+
+    Args:
+        coordinates: 地点の (緯度, 経度) リスト
+        timezone: タイムゾーン
+        past_days: 過去日数
+        forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+        base_url: APIエンドポイント（Noneなら予測API。過去データの一括取得では OPEN_METEO_ARCHIVE_URL）
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: 時間（datetime64[h]）, 気温（時間 × 地点、欠損はNaN）
+    """
+    latitudes = ",".join(lat for lat, _ in coordinates)
+    longitudes = ",".join(lon for _, lon in coordinates)
+
+    if not is_temperature_cache_enabled():
+        data = request_temperature_data(
+            generate_api_url(latitudes, longitudes, timezone, past_days, forecast_days, start_date, end_date,
+                             base_url))
+        arrays = [_hourly_arrays(item) for item in (data if isinstance(data, list) else [data])]
+        return arrays[0][0], np.column_stack([values for _, values in arrays])
+
+    now_local = local_now(timezone)
+    hours = requested_hours(past_days, forecast_days, start_date, end_date, now_local)
+    keys = [location_cache_key(lat, lon, timezone, base_url) for lat, lon in coordinates]
+    cache = get_temperature_cache()
+
+    stale = np.column_stack([cache.stale_mask(key, hours) for key in keys])
+    values = np.column_stack([cache.get(key, hours) for key in keys])
+    available = ~stale
+
+    targets = np.flatnonzero(stale.any(axis=0))
+    if len(targets):
+        stale_days = hours[stale[:, targets].any(axis=1)].astype('datetime64[D]')
+        data = request_temperature_data(generate_api_url(
+            ",".join(coordinates[k][0] for k in targets), ",".join(coordinates[k][1] for k in targets),
+            timezone, past_days, forecast_days, str(stale_days[0]), str(stale_days[-1]), base_url))
+        items = data if isinstance(data, list) else [data]
+        for k, item in zip(targets, items):
+            fetched_hours, fetched_values = _hourly_arrays(item)
+            cache.update(keys[k], fetched_hours, fetched_values, now_local)
+
+            # キャッシュ保存の成否に関わらず、今回取得した値で結果を更新（有効なキャッシュ値は維持）
+            pos = np.searchsorted(hours, fetched_hours)
+            in_range = pos < len(hours)
+            in_range[in_range] = hours[pos[in_range]] == fetched_hours[in_range]
+            in_range[in_range] = stale[pos[in_range], k]
+            values[pos[in_range], k] = fetched_values[in_range]
+            available[pos[in_range], k] = True
+        logger.info(f"気温データ取得: API {len(targets)}地点・{int(stale.sum())}時間 / "
+                    f"キャッシュ {int((~stale).sum())}時間")
+    else:
+        logger.info(f"気温データ取得: {len(keys)}地点・全{len(hours)}時間をキャッシュから使用")
+
+    rows = available.any(axis=1)
+    values[~available] = np.nan
+    return hours[rows], values[rows]
+
+def fetch_temperature_cached(
+    latitude: str,
+    longitude: str,
+    timezone: str,
+    past_days: Union[str, int],
+    forecast_days: Union[str, int],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    キャッシュにない・期限切れの時間のみAPIから取得し、キャッシュと結合する（1地点）
+
+    Args:
+        latitude: 緯度
+        longitude: 経度
+        timezone: タイムゾーン
+        past_days: 過去日数
+        forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+
+    Returns:
+        Dict[str, Any]: APIレスポンスと同じ形式のデータ（hourly.time / hourly.temperature_2m）
+    """
+    hours, values = fetch_hourly_matrix([(latitude, longitude)], timezone, past_days, forecast_days,
+                                        start_date, end_date)
+    return _hourly_response(hours, values[:, 0], timezone)
+
 @safe_api_operation("気温データAPI取得")
 def fetch_temperature_data(
     latitude: str,
@@ -256,7 +517,7 @@ def fetch_temperature_data(
     end_date: Optional[str] = None
 ) -> Dict[str, Any]:
     """
-    Open-Meteo APIから気温データを取得（セッション最適化版）
+    Open-Meteo APIから気温データを取得（セッション最適化・ディスクキャッシュ対応版）
     
     Args:
         latitude: 緯度
@@ -272,25 +533,42 @@ def fetch_temperature_data(
         requests.exceptions.RequestException: APIリクエストエラー
         ValueError: APIレスポンス検証エラー
     """
+    if is_temperature_cache_enabled():
+        return fetch_temperature_cached(latitude, longitude, timezone, past_days, forecast_days,
+                                        start_date, end_date)
+
     # APIエンドポイントURL生成（キャッシュ利用）
     api_url = generate_api_url(latitude, longitude, timezone, past_days, forecast_days, start_date, end_date)
-    logger.info(f"API Request URL: {api_url}")
-    
-    # セッション使用による最適化APIリクエスト実行
-    session = get_api_session()
-    response = session.get(api_url, timeout=config.API_TIMEOUT)
-    response.raise_for_status()  # HTTPステータスエラーチェック
-    
-    # レスポンスデータ取得・検証
-    data = response.json()
-    
-    if 'hourly' not in data:
-        raise ValueError("APIレスポンスに'hourly'キーが存在しません")
-    
-    if 'time' not in data['hourly'] or 'temperature_2m' not in data['hourly']:
-        raise ValueError("APIレスポンスに必要なデータ('time', 'temperature_2m')が不足しています")
-    
-    return data
+    return request_temperature_data(api_url)
+
+@safe_api_operation("複数地点気温データAPI取得")
+def fetch_weighted_temperature_data(
+    stations: Sequence[Station],
+    timezone: str,
+    past_days: Union[str, int],
+    forecast_days: Union[str, int],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    複数地点の気温を1回のAPIリクエストで取得し、地点の重みで加重平均する
+
+    Args:
+        stations: 地点セット（common.stations.Station）
+        timezone: タイムゾーン
+        past_days: 過去日数
+        forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+
+    Returns:
+        Dict[str, Any]: APIレスポンスと同じ形式のデータ（temperature_2m は加重平均気温）
+    """
+    coordinates = [(f"{s.latitude:.4f}", f"{s.longitude:.4f}") for s in stations]
+    hours, values = fetch_hourly_matrix(coordinates, timezone, past_days, forecast_days, start_date, end_date)
+    weighted = weighted_temperature(values, np.array([s.weight for s in stations]))
+    logger.info(f"{len(stations)}地点の加重平均気温を作成: {', '.join(s.name for s in stations)}")
+    return _hourly_response(hours, weighted, timezone)
 
 def create_temperature_dataframe(api_data: Dict[str, Any], include_time: bool = False) -> pd.DataFrame:
     """
@@ -496,13 +774,73 @@ def apply_period_info_filter(df: pd.DataFrame, period_info: Dict[str, Any]) -> p
         return df
 
 
+def fetch_window_temperature(
+    latitude: str,
+    longitude: str,
+    timezone: str,
+    past_days: Union[str, int],
+    forecast_days: Union[str, int],
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    stations: Optional[Sequence[Station]] = None
+) -> Dict[str, Any]:
+    """
+    地点セットに応じて気温データを取得する（複数地点は1回のリクエストで取得して加重平均）
+
+    Args:
+        latitude: 緯度（地点セット未指定時）
+        longitude: 経度（地点セット未指定時）
+        timezone: タイムゾーン
+        past_days: 過去日数
+        forecast_days: 予測日数
+        start_date: 開始日（YYYY-MM-DD）
+        end_date: 終了日（YYYY-MM-DD）
+        stations: 地点セット（Noneなら環境変数 AI_TEMP_STATIONS、未指定なら latitude/longitude の1地点）
+
+    Returns:
+        Dict[str, Any]: APIレスポンスと同じ形式のデータ
+    """
+    if stations is None:
+        stations = resolve_stations(default=())
+    if len(stations) > 1:
+        return fetch_weighted_temperature_data(stations, timezone, past_days, forecast_days,
+                                               start_date, end_date)
+    if stations:
+        latitude, longitude = f"{stations[0].latitude:.4f}", f"{stations[0].longitude:.4f}"
+    return fetch_temperature_data(latitude, longitude, timezone, past_days, forecast_days,
+                                  start_date, end_date)
+
+
+def write_period_temperature(api_data: Dict[str, Any], period_info: Dict[str, Any], Xtomorrow_csv: str) -> bool:
+    """
+    取得済みの気温データを period_info の期間に揃えて保存する
+
+    Args:
+        api_data: 気温データ（period_info の期間を含む範囲）
+        period_info: period_info.json の内容
+        Xtomorrow_csv: 出力CSVファイルパス
+
+    Returns:
+        bool: 期間の全時間を含み保存できた場合はTrue（不足時は保存せずFalse）
+    """
+    temperature_df = create_temperature_dataframe(api_data, include_time=True)
+    temperature_df = apply_period_info_filter(temperature_df, period_info)
+    expected_rows = int(period_info.get("target_hours", 0)) + int(period_info.get("forecast_days", 0)) * 24
+    if len(temperature_df) != expected_rows:
+        logger.warning(f"取得済み気温データが期間を満たしません ({len(temperature_df)}/{expected_rows}行)")
+        return False
+    save_temperature_csv(temperature_df[config.REQUIRED_COLUMNS].copy(), Xtomorrow_csv)
+    return True
+
+
 def temp(
     latitude: str,
     longitude: str,
     timezone: str,
     Xtomorrow_csv: str,
     past_days: Union[str, int],
-    forecast_days: Union[str, int]
+    forecast_days: Union[str, int],
+    stations: Optional[Sequence[Station]] = None
 ) -> Optional[str]:
     """
     気温データ取得・処理メイン関数（パフォーマンス最適化版）
@@ -514,6 +852,8 @@ def temp(
         Xtomorrow_csv: 出力CSVファイルパス
         past_days: 過去データ取得日数
         forecast_days: 予測日数
+        stations: 加重平均する地点セット（Noneなら環境変数 AI_TEMP_STATIONS、
+            未指定なら latitude/longitude の1地点）
         
     Returns:
         Optional[str]: エラーが発生した場合はエラーメッセージ、正常終了時はNone
@@ -557,8 +897,9 @@ def temp(
         else:
             logger.info("最新データ日時マーカーなし - 既定のpast_days/forecast_daysを使用")
 
-        # APIから気温データ取得
-        api_data = fetch_temperature_data(latitude, longitude, timezone, past_days, forecast_days, start_date, end_date)
+        # APIから気温データ取得（複数地点は1回のリクエストで取得して加重平均）
+        api_data = fetch_window_temperature(latitude, longitude, timezone, past_days, forecast_days,
+                                            start_date, end_date, stations)
         
         # データフレーム作成
         temperature_df = create_temperature_dataframe(api_data, include_time=(anchor_dt is not None or period_info is not None))
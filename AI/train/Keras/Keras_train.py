@@ -4,6 +4,8 @@
 
 深層ニューラルネットワークを構築し電力需要で学習を行い、
 電力消費予測のための予測モデルを作成するモジュール。
+環境変数 AI_WARM_START=1 の場合は前回のモデルバンドルの重みを直近の期間で数エポックだけ再学習する
+（定期的な全体再学習・ドリフト検出時は全期間で学習し直す。判定は common/warm_start.py）。
 """
 
 # 標準ライブラリインポート
@@ -50,6 +52,15 @@ try:
 except Exception:
     pass
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import DatasetSplit, load_training_split, read_feature_columns
+from common.artifact import FORMAT_KERAS, build_artifact, bundle_path, save_artifact
+from common.warm_start import MODE_REUSE, MODE_WARM, plan_training, training_info
+from common.search import use_tuned_params
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -118,6 +129,10 @@ class KerasConfig:
     DROPOUT_RATE: float = 0.05  # 過学習抑制を緩めつつ汎化維持
     L2_REGULARIZATION: float = 0.0005  # L2正則化を軽減
     
+    # 追加学習設定（前回の重みを直近の期間で再学習するエポック数・学習率の倍率）
+    WARM_START_EPOCHS: int = 5
+    WARM_START_LEARNING_RATE_FACTOR: float = 0.2
+    
     # メモリ最適化設定
     DTYPE_CONFIG: Dict[str, str] = field(default_factory=lambda: {
         'float_dtype': 'float32',
@@ -173,7 +188,8 @@ def ensure_directory_exists(file_path: str) -> None:
 def load_training_data(xtrain_csv: str, 
                       xtest_csv: str, 
                       ytrain_csv: str, 
-                      ytest_csv: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+                      ytest_csv: str,
+                      dataset: Optional[DatasetSplit] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     学習・テストデータを読み込む（最適化版）
     
@@ -182,6 +198,7 @@ def load_training_data(xtrain_csv: str,
         xtest_csv: テスト用特徴量データのパス
         ytrain_csv: 学習用目的変数データのパス
         ytest_csv: テスト用目的変数データのパス
+        dataset: メモリ上の分割済みデータセット（指定時はファイルを読み込まない）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: 
@@ -193,11 +210,14 @@ def load_training_data(xtrain_csv: str,
     """
     print("学習データを読み込み中...")
     
-    # メモリ効率化された読み込み
-    X_train = pd.read_csv(xtrain_csv).to_numpy().astype(config.DTYPE_CONFIG['float_dtype'])
-    X_test = pd.read_csv(xtest_csv).to_numpy().astype(config.DTYPE_CONFIG['float_dtype'])
-    y_train = pd.read_csv(ytrain_csv).values.astype(config.DTYPE_CONFIG['float_dtype']).flatten()
-    y_test = pd.read_csv(ytest_csv).values.astype(config.DTYPE_CONFIG['float_dtype']).flatten()
+    # メモリ効率化された読み込み（メモリ上のデータセット指定時はそのまま使用、
+    # それ以外はバイナリデータセットがあればメモリマップ、なければCSV）
+    if dataset is not None:
+        X_train, X_test, y_train, y_test = dataset.astype(config.DTYPE_CONFIG['float_dtype']).arrays()
+    else:
+        X_train, X_test, y_train, y_test = load_training_split(
+            xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dtype=config.DTYPE_CONFIG['float_dtype']
+        ).arrays()
     
     print(f"学習データ形状: X_train={X_train.shape}, y_train={y_train.shape}")
     print(f"テストデータ形状: X_test={X_test.shape}, y_test={y_test.shape}")
@@ -217,7 +237,9 @@ def load_training_data(xtrain_csv: str,
 def prepare_data_with_scaling(X_train: np.ndarray, 
                              X_test: np.ndarray,
                              y_train: np.ndarray,
-                             y_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]:
+                             y_test: np.ndarray,
+                             x_scaler: Optional[StandardScaler] = None,
+                             y_scaler: Optional[StandardScaler] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]:
     """
     データの標準化を実行する（目的変数正規化対応版）
     
@@ -226,6 +248,8 @@ def prepare_data_with_scaling(X_train: np.ndarray,
         X_test: テスト用特徴量データ
         y_train: 学習用目的変数データ
         y_test: テスト用目的変数データ
+        x_scaler: 学習済みの特徴量標準化オブジェクト（追加学習時は前回のもの、Noneなら学習データで fit）
+        y_scaler: 学習済みの目的変数標準化オブジェクト（追加学習時は前回のもの、Noneなら学習データで fit）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, StandardScaler, StandardScaler]: 
@@ -241,19 +265,41 @@ def prepare_data_with_scaling(X_train: np.ndarray,
         raise ValueError(f"特徴量数が不一致: train={X_train.shape[1]}, test={X_test.shape[1]}")
     
     # 特徴量標準化
-    x_scaler = StandardScaler()
-    x_scaler.fit(X_train)
+    if x_scaler is None:
+        x_scaler = StandardScaler()
+        x_scaler.fit(X_train)
     X_train_scaled = x_scaler.transform(X_train).astype(config.DTYPE_CONFIG['float_dtype'])
     X_test_scaled = x_scaler.transform(X_test).astype(config.DTYPE_CONFIG['float_dtype'])
     
     # 目的変数正規化（過学習対策）
-    y_scaler = StandardScaler()
-    y_train_scaled = y_scaler.fit_transform(y_train.reshape(-1, 1)).flatten().astype(config.DTYPE_CONFIG['float_dtype'])
+    if y_scaler is None:
+        y_scaler = StandardScaler()
+        y_scaler.fit(y_train.reshape(-1, 1))
+    y_train_scaled = y_scaler.transform(y_train.reshape(-1, 1)).flatten().astype(config.DTYPE_CONFIG['float_dtype'])
     y_test_scaled = y_scaler.transform(y_test.reshape(-1, 1)).flatten().astype(config.DTYPE_CONFIG['float_dtype'])
     
     print(f"標準化完了: 特徴量数={X_train_scaled.shape[1]}, 目的変数正規化適用")
     return X_train_scaled, X_test_scaled, y_train_scaled, y_test_scaled, x_scaler, y_scaler
 
+def compile_keras_model(model: Sequential, learning_rate: float) -> Sequential:
+    """
+    モデルをコンパイルする（バンドルから復元した未コンパイルのモデルにも使用）
+    
+    Args:
+        model: Kerasモデル
+        learning_rate: 学習率
+        
+    Returns:
+        Sequential: コンパイル済みモデル
+    """
+    model.compile(
+        loss='mean_squared_error',
+        optimizer=Adam(learning_rate=learning_rate),
+        metrics=['mean_absolute_error']
+    )
+    return model
+
+
 @robust_model_operation("Kerasモデル構築")
 def create_keras_model(input_dim: int, learning_rate: float = None) -> Sequential:
     """
@@ -304,11 +350,7 @@ def create_keras_model(input_dim: int, learning_rate: float = None) -> Sequentia
     ])
     
     # コンパイル
-    model.compile(
-        loss='mean_squared_error',
-        optimizer=Adam(learning_rate=learning_rate),
-        metrics=['mean_absolute_error']
-    )
+    compile_keras_model(model, learning_rate)
     
     model.summary()
     print(f"Kerasモデル構築完了 (学習率: {learning_rate}, Batch: {config.DEFAULT_BATCH_SIZE})")
@@ -378,6 +420,33 @@ def train_model_with_validation(model: Sequential,
     
     print(f"学習完了 (実際のエポック数: {len(history.history['loss'])})")
     return history
+@robust_model_operation("モデル追加学習")
+def fine_tune_keras_model(model: Sequential,
+                          X_recent: np.ndarray,
+                          y_recent: np.ndarray,
+                          learning_rate: float = None):
+    """
+    前回の重みを直近の期間で WARM_START_EPOCHS エポックだけ再学習する
+    
+    Args:
+        model: 前回の学習済みKerasモデル（バンドルから復元したもの、未コンパイル）
+        X_recent: 直近の学習用特徴量データ（前回と同じ標準化済み）
+        y_recent: 直近の学習用目的変数データ（前回と同じ正規化済み）
+        learning_rate: 全体学習時の学習率（WARM_START_LEARNING_RATE_FACTOR 倍で再学習）
+        
+    Returns:
+        学習履歴オブジェクト
+    """
+    if learning_rate is None:
+        learning_rate = config.DEFAULT_LEARNING_RATE
+    fine_tune_rate = learning_rate * config.WARM_START_LEARNING_RATE_FACTOR
+    compile_keras_model(model, fine_tune_rate)
+    print(f"追加学習: 直近{len(X_recent)}行で前回の重みを再学習します (学習率: {fine_tune_rate})")
+    return train_model_with_validation(
+        model, X_recent, y_recent, epochs=config.WARM_START_EPOCHS, patience=config.WARM_START_EPOCHS
+    )
+
+
 @robust_model_operation("学習履歴可視化")
 def save_learning_history_plot(history, history_png: str) -> None:
     """
@@ -429,16 +498,10 @@ def save_model_files(model: Sequential, x_scaler: StandardScaler, y_scaler: Stan
     """
     ensure_directory_exists(model_path)
     
-    # h5形式で保存（Keras推奨形式）
+    # h5形式で保存（Keras推奨形式。翌日予測はモデルバンドルを優先して使用）
     model.save(model_path)
     print(f"Kerasモデル保存: {model_path}")
     
-    # pickle形式でも保存（互換性確保）
-    pickle_path = model_path.replace('.h5', '.sav')
-    with open(pickle_path, 'wb') as f:
-        pickle.dump(model, f)
-    print(f"Pickleモデル保存: {pickle_path}")
-    
     # 特徴量スケーラー保存
     x_scaler_path = model_path.replace('.h5', '_scaler.pkl')
     with open(x_scaler_path, 'wb') as f:
@@ -451,6 +514,45 @@ def save_model_files(model: Sequential, x_scaler: StandardScaler, y_scaler: Stan
         pickle.dump(y_scaler, f)
     print(f"目的変数スケーラー保存: {y_scaler_path}")
 
+@robust_model_operation("モデルバンドル保存")
+def save_model_bundle(model: Sequential,
+                      x_scaler: StandardScaler,
+                      y_scaler: StandardScaler,
+                      X_train: np.ndarray,
+                      y_train: np.ndarray,
+                      feature_columns: List[str],
+                      metrics: Dict[str, float],
+                      model_path: str,
+                      training: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    翌日予測用のモデルバンドル（モデル構成・重み・両スケーラー・特徴量範囲・列順・評価指標）を保存する
+    
+    Args:
+        model: 学習済みKerasモデル
+        x_scaler: 特徴量標準化オブジェクト
+        y_scaler: 目的変数標準化オブジェクト
+        X_train: 標準化前の学習用特徴量データ
+        y_train: 学習用目的変数データ（元スケール）
+        feature_columns: 特徴量の列名
+        metrics: 評価指標（rmse / r2 / mae）
+        model_path: モデル保存先パス（バンドルは拡張子を .bundle.npz に置き換えたパス）
+        training: 学習モード・前回の全体再学習日時（common/warm_start.training_info の戻り値）
+        
+    Returns:
+        Optional[str]: バンドルのパス（保存失敗時はNone、h5・スケーラーは保存済み）
+    """
+    path = bundle_path(model_path)
+    try:
+        artifact = build_artifact("Keras", FORMAT_KERAS, model, x_scaler, X_train, y_train,
+                                  feature_columns, metrics, target_scaler=y_scaler, training=training)
+        save_artifact(path, artifact)
+    except (OSError, ValueError) as e:
+        print(f"警告: モデルバンドルの保存に失敗しました: {e}")
+        return None
+    print(f"モデルバンドル保存: {path}")
+    return path
+
+
 @robust_model_operation("モデル性能評価")
 def evaluate_model_performance(model: Sequential,
                               X_test: np.ndarray,
@@ -589,6 +691,7 @@ def create_prediction_plots(y_pred: np.ndarray,
         print(f"グラフ作成・保存でエラー: {e}")
         traceback.print_exc()
 
+@use_tuned_params("Keras")
 def train(xtrain_csv: str,
           xtest_csv: str,
           ytrain_csv: str,
@@ -600,10 +703,13 @@ def train(xtrain_csv: str,
           learning_rate: float = None,
           epochs: int = None,
           validation_split: float = None,
-          history_png: str = None) -> Optional[Tuple[float, float]]:
+          history_png: str = None,
+          dataset: Optional[DatasetSplit] = None) -> Optional[Tuple[float, float]]:
     """
     Kerasを使用した電力需要予測モデルの学習を実行する（最適化版）
     
+    AI_USE_TUNED_PARAMS 有効時は探索済みパラメータ（common/search.py）を設定に適用して学習する。
+    
     Args:
         xtrain_csv: 学習用特徴量データのパス
         xtest_csv: テスト用特徴量データのパス
@@ -617,6 +723,7 @@ def train(xtrain_csv: str,
         epochs: エポック数
         validation_split: 検証データの割合
         history_png: 学習履歴グラフ保存先パス
+        dataset: メモリ上の分割済みデータセット（指定時はCSVを読み込まない）
         
     Returns:
         Optional[Tuple[float, float]]: RMSE, R2スコア（エラー時はNone）
@@ -634,29 +741,39 @@ def train(xtrain_csv: str,
     try:
         # 1. データの読み込み
         X_train, X_test, y_train, y_test = load_training_data(
-            xtrain_csv, xtest_csv, ytrain_csv, ytest_csv
+            xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dataset=dataset
         )
 
-        # 2. データの標準化（目的変数正規化対応）
+        # 2. 学習モードの判定（AI_WARM_START 有効時は前回のバンドルからの追加学習を検討）
+        feature_columns = dataset.feature_columns if dataset is not None else read_feature_columns(xtrain_csv)
+        plan = plan_training(model_sav, X_train, y_train, feature_columns)
+
+        # 3. データの標準化（目的変数正規化対応、追加学習・再利用時は前回の標準化パラメータを使用）
+        previous_scalers = (None, None) if plan.is_full else (plan.previous.scaler(), plan.previous.target_scaler())
         X_train_scaled, X_test_scaled, y_train_scaled, y_test_scaled, x_scaler, y_scaler = prepare_data_with_scaling(
-            X_train, X_test, y_train, y_test
+            X_train, X_test, y_train, y_test, *previous_scalers
         )
 
         # 追加チェック: 学習/テストの特徴量数が一致するかを厳密に確認
         if X_train_scaled.shape[1] != X_test_scaled.shape[1]:
             raise ValueError(f"特徴量数の不一致: X_train={X_train_scaled.shape[1]}, X_test={X_test_scaled.shape[1]}")
 
-        # 3. モデルの作成
-        input_dim = X_train_scaled.shape[1]
-        model = create_keras_model(input_dim, learning_rate)
-
-        # 4. モデルの学習（正規化済み目的変数使用）
-        history = train_model_with_validation(
-            model, X_train_scaled, y_train_scaled, epochs, validation_split
-        )
+        # 4. モデルの作成・学習（正規化済み目的変数使用）
+        if plan.mode == MODE_WARM:
+            model = plan.previous.model
+            X_recent, y_recent = plan.recent_window(X_train_scaled, y_train_scaled)
+            history = fine_tune_keras_model(model, X_recent, y_recent, learning_rate)
+        elif plan.mode == MODE_REUSE:
+            model, history = compile_keras_model(plan.previous.model, learning_rate), None
+        else:
+            input_dim = X_train_scaled.shape[1]
+            model = create_keras_model(input_dim, learning_rate)
+            history = train_model_with_validation(
+                model, X_train_scaled, y_train_scaled, epochs, validation_split
+            )
 
         # 5. 学習履歴の保存
-        if history_png:
+        if history_png and history is not None:
             save_learning_history_plot(history, history_png)
 
         # 6. モデルの保存（両方のスケーラー保存）
@@ -665,10 +782,15 @@ def train(xtrain_csv: str,
         # 7. モデルの評価（逆正規化対応）
         rmse, r2, mae, y_pred = evaluate_model_performance(model, X_test_scaled, y_test_scaled, y_scaler)
 
-        # 8. 予測結果の保存（元スケール）
+        # 8. モデルバンドルの保存（翌日予測は学習データを読み込まずにバンドルのみ使用）
+        save_model_bundle(model, x_scaler, y_scaler, X_train, y_train, feature_columns,
+                          {"rmse": rmse, "r2": r2, "mae": mae}, model_sav,
+                          training=training_info(plan, X_train, y_train))
+
+        # 9. 予測結果の保存（元スケール）
         save_predictions_to_csv(y_pred, ypred_csv)
 
-        # 9. 予測結果グラフの作成（元スケール）
+        # 10. 予測結果グラフの作成（元スケール）
         y_test_original = y_scaler.inverse_transform(y_test_scaled.reshape(-1, 1)).flatten()
         create_prediction_plots(y_pred, y_test_original, ypred_png, ypred_7d_png)
 
@@ -719,7 +841,7 @@ def main() -> None:
         result = train(
             xtrain_csv, xtest_csv, ytrain_csv, ytest_csv,
             model_sav, ypred_csv, ypred_png, ypred_7d_png,
-            learning_rate=config.DEFAULT_LEARNING_RATE,
+            learning_rate=None,  # 未指定なら設定値（探索済みパラメータの適用時はその値）
             epochs=config.DEFAULT_EPOCHS,
             validation_split=config.DEFAULT_VALIDATION_SPLIT,
             history_png=history_png
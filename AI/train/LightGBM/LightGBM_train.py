@@ -4,6 +4,15 @@
 
 勾配ブースティング決定木を構築し電力需要で学習を行い、
 電力消費予測のための予測モデルを作成するモジュール。
+
+学習データの末尾（時系列で最も新しい行）を検証データとして早期終了し、
+最良の反復数で全期間の学習データを使って学習し直す（最新の期間もモデルに反映する）。
+学習済みモデルは lgb.Booster として保存する。
+ビン化済みの lgb.Dataset は学習データのハッシュごとにLightGBMバイナリ形式で
+data/cache/lightgbm/ に保存し、同じデータでの再学習（学習率の変更・最適化スイープの再実行）では
+ヒストグラム作成を省略して読み込む。
+環境変数 AI_WARM_START=1 の場合は前回のモデルバンドルを init_model として直近の期間で反復を追加する
+（定期的な全体再学習・ドリフト検出時は全期間で学習し直す。判定は common/warm_start.py）。
 """
 
 import pandas as pd
@@ -11,6 +20,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import pickle
 import traceback
+import hashlib
 import os
 import sys
 import time
@@ -23,6 +33,15 @@ from typing import Tuple, Optional, Any, Callable
 import warnings
 from functools import wraps
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import DatasetSplit, load_training_split, read_feature_columns
+from common.artifact import FORMAT_LIGHTGBM, build_artifact, bundle_path, save_artifact
+from common.warm_start import MODE_REUSE, MODE_WARM, plan_training, training_info
+from common.search import use_tuned_params
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -78,13 +97,31 @@ class LightGBMConfig:
     RANDOM_STATE: int = 42
     
     # LightGBMハイパーパラメータ
-    DEFAULT_N_ESTIMATORS: int = 100
+    DEFAULT_N_ESTIMATORS: int = 100  # 検証データを確保できない場合の木の数
     DEFAULT_LEARNING_RATE: float = 0.1
     DEFAULT_MAX_DEPTH: int = -1
     DEFAULT_NUM_LEAVES: int = 31
     DEFAULT_MIN_CHILD_SAMPLES: int = 20
     DEFAULT_SUBSAMPLE: float = 1.0
     DEFAULT_COLSAMPLE_BYTREE: float = 1.0
+    MAX_BIN: int = 255
+    
+    # 早期終了設定（学習データ末尾を検証データとして使用）
+    MAX_N_ESTIMATORS: int = 2000
+    EARLY_STOPPING_ROUNDS: int = 50
+    VALIDATION_FRACTION: float = 0.1
+    MIN_VALIDATION_ROWS: int = 24
+    
+    # lgb.Dataset バイナリキャッシュ（データディレクトリ配下、パース済みCSVキャッシュと同じ cache/）
+    DATASET_CACHE_SUBDIR: str = os.path.join("cache", "lightgbm")
+    DATASET_CACHE_ENV_VAR: str = "AI_LGBM_DATASET_CACHE"  # "0"/"false"/"off" でキャッシュ無効化
+    DATASET_CACHE_MAX_FILES: int = 16
+    # ビン化に影響するパラメータ（キャッシュキーに含める。学習率などは含めない）
+    DATASET_PARAM_KEYS: Tuple[str, ...] = ("max_bin", "min_child_samples", "subsample_for_bin", "random_state")
+    
+    # 追加学習設定（前回のモデルに直近の期間で追加する反復数・学習率の倍率）
+    WARM_START_ROUNDS: int = 10
+    WARM_START_LEARNING_RATE_FACTOR: float = 0.1
     
     # パフォーマンス設定
     MEMORY_OPTIMIZATION: bool = True
@@ -158,7 +195,8 @@ def ensure_directory_exists(file_path: str) -> None:
 def load_training_data(xtrain_csv: str, 
                       xtest_csv: str, 
                       ytrain_csv: str, 
-                      ytest_csv: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+                      ytest_csv: str,
+                      dataset: Optional[DatasetSplit] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     学習・テストデータを読み込む（メモリ最適化済み）
     
@@ -167,6 +205,7 @@ def load_training_data(xtrain_csv: str,
         xtest_csv: テスト用特徴量データのパス
         ytrain_csv: 学習用目的変数データのパス
         ytest_csv: テスト用目的変数データのパス
+        dataset: メモリ上の分割済みデータセット（指定時はファイルを読み込まない）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: 
@@ -180,10 +219,14 @@ def load_training_data(xtrain_csv: str,
     # pandas設定最適化
     pd.set_option('mode.copy_on_write', True)
     
-    X_train = pd.read_csv(xtrain_csv).to_numpy().astype(config.DATA_TYPE)
-    X_test = pd.read_csv(xtest_csv).to_numpy().astype(config.DATA_TYPE)
-    y_train = pd.read_csv(ytrain_csv).values.astype(config.DATA_TYPE).flatten()
-    y_test = pd.read_csv(ytest_csv).values.astype(config.DATA_TYPE).flatten()
+    # メモリ上のデータセット指定時はそのまま使用
+    # それ以外はバイナリデータセット（data/dataset/）があればメモリマップで読み込み、なければCSV
+    if dataset is not None:
+        X_train, X_test, y_train, y_test = dataset.astype(config.DATA_TYPE).arrays()
+    else:
+        X_train, X_test, y_train, y_test = load_training_split(
+            xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dtype=config.DATA_TYPE
+        ).arrays()
     
     print(f"学習データ形状: X_train={X_train.shape}, y_train={y_train.shape}")
     print(f"テストデータ形状: X_test={X_test.shape}, y_test={y_test.shape}")
@@ -194,22 +237,25 @@ def load_training_data(xtrain_csv: str,
 
 @robust_model_operation("データ標準化処理")
 def prepare_data_with_scaling(X_train: np.ndarray, 
-                             X_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+                             X_test: np.ndarray,
+                             scaler: Optional[StandardScaler] = None) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
     """
     データの標準化を実行する（メモリ最適化済み）
     
     Args:
         X_train: 学習用特徴量データ
         X_test: テスト用特徴量データ
+        scaler: 学習済みの標準化オブジェクト（追加学習時は前回のものを指定、Noneなら学習データで fit）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, StandardScaler]: 
             標準化後のX_train, X_test, scaler（float32最適化済み）
     """
     print("データの標準化を実行中...")
-    scaler = StandardScaler()
+    if scaler is None:
+        scaler = StandardScaler().fit(X_train)
     
-    X_train_scaled = scaler.fit_transform(X_train).astype(config.DATA_TYPE)
+    X_train_scaled = scaler.transform(X_train).astype(config.DATA_TYPE)
     X_test_scaled = scaler.transform(X_test).astype(config.DATA_TYPE)
     
     print(f"データの標準化が完了しました（{config.DATA_TYPE}最適化済み）")
@@ -260,31 +306,216 @@ def create_lightgbm_model(n_estimators: int = None,
     return model
 
 
+def is_dataset_cache_enabled() -> bool:
+    """
+    lgb.Dataset バイナリキャッシュが有効か判定する
+
+    Returns:
+        bool: 環境変数 AI_LGBM_DATASET_CACHE が無効値でなければTrue
+    """
+    value = os.environ.get(config.DATASET_CACHE_ENV_VAR, "1").strip().lower()
+    return value not in ("0", "false", "off", "no")
+
+
+def split_validation(X_train: np.ndarray,
+                     y_train: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray, Optional[np.ndarray]]:
+    """
+    学習データの末尾を早期終了用の検証データとして分割する（時系列順のためシャッフルしない）
+    
+    Args:
+        X_train: 学習用特徴量データ（時系列順）
+        y_train: 学習用目的変数データ（時系列順）
+        
+    Returns:
+        Tuple: X_fit, X_valid, y_fit, y_valid（検証データを確保できない場合は X_valid, y_valid が None）
+    """
+    n_rows = len(X_train)
+    n_valid = int(n_rows * config.VALIDATION_FRACTION)
+    if n_valid < config.MIN_VALIDATION_ROWS or n_rows - n_valid < config.MIN_VALIDATION_ROWS:
+        return X_train, None, y_train, None
+    split = n_rows - n_valid
+    return X_train[:split], X_train[split:], y_train[:split], y_train[split:]
+
+
+def booster_params(model: lgb.LGBMRegressor) -> dict:
+    """
+    LGBMRegressor の設定を lgb.train 用のパラメータに変換する（fit() と同じ内容）
+    
+    Args:
+        model: LightGBMモデル（create_lightgbm_model の戻り値）
+        
+    Returns:
+        dict: lgb.train / lgb.Dataset 用パラメータ
+    """
+    params = model.get_params()
+    for key in ("silent", "importance_type", "n_estimators", "class_weight"):
+        params.pop(key, None)
+    params.update(objective="regression", metric="l2", max_bin=config.MAX_BIN)
+    return params
+
+
+def dataset_cache_key(X: np.ndarray, y: np.ndarray, params: dict) -> str:
+    """
+    学習データとビン化パラメータから lgb.Dataset キャッシュのキーを作成する
+    
+    Args:
+        X: 学習用特徴量データ（標準化済み）
+        y: 学習用目的変数データ
+        params: lgb.Dataset 用パラメータ（DATASET_PARAM_KEYS のみ使用）
+        
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    digest = hashlib.sha256()
+    binning = {key: params.get(key) for key in config.DATASET_PARAM_KEYS}
+    digest.update(f"{lgb.__version__}|{X.shape}|{X.dtype}|{y.dtype}|{sorted(binning.items())}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(X))
+    digest.update(np.ascontiguousarray(y))
+    return digest.hexdigest()
+
+
+def _prune_dataset_cache(cache_dir: str) -> None:
+    """古いキャッシュファイルを削除し、DATASET_CACHE_MAX_FILES 個以内に保つ"""
+    try:
+        paths = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if name.endswith(".bin")]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[config.DATASET_CACHE_MAX_FILES:]:
+            os.remove(path)
+    except OSError as e:
+        print(f"警告: Datasetキャッシュの整理に失敗しました: {e}")
+
+
+def build_training_dataset(X: np.ndarray,
+                           y: np.ndarray,
+                           params: dict,
+                           cache_dir: Optional[str] = None) -> Tuple[lgb.Dataset, bool]:
+    """
+    ビン化済みの学習用 lgb.Dataset を作成する（キャッシュがあればバイナリから読み込む）
+    
+    Args:
+        X: 学習用特徴量データ
+        y: 学習用目的変数データ
+        params: lgb.Dataset 用パラメータ
+        cache_dir: バイナリキャッシュの保存先（Noneまたは無効化時はキャッシュしない）
+        
+    Returns:
+        Tuple[lgb.Dataset, bool]: 構築済みDataset, キャッシュから読み込んだか
+    """
+    y = np.ravel(y)
+    if cache_dir is None or not is_dataset_cache_enabled():
+        return lgb.Dataset(X, label=y, params=params, free_raw_data=False).construct(), False
+
+    path = os.path.join(cache_dir, f"{dataset_cache_key(X, y, params)}.bin")
+    if os.path.exists(path):
+        try:
+            train_set = lgb.Dataset(path, params=params).construct()
+            if train_set.num_data() == len(y):
+                os.utime(path)
+                print(f"Datasetキャッシュを使用します（ビン化を省略）: {path}")
+                return train_set, True
+        except lgb.basic.LightGBMError as e:
+            print(f"警告: Datasetキャッシュを読み込めません（作成し直します）: {path}, {e}")
+
+    train_set = lgb.Dataset(X, label=y, params=params, free_raw_data=False).construct()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        train_set.save_binary(tmp_path)
+        os.replace(tmp_path, path)
+        print(f"Datasetキャッシュを保存しました: {path}")
+        _prune_dataset_cache(cache_dir)
+    except (OSError, lgb.basic.LightGBMError) as e:
+        print(f"警告: Datasetキャッシュの保存に失敗しました: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return train_set, False
+
+
 @robust_model_operation("LightGBMモデル学習")
 def train_lightgbm_model(model: lgb.LGBMRegressor,
                         X_train: np.ndarray,
-                        y_train: np.ndarray) -> lgb.LGBMRegressor:
+                        y_train: np.ndarray,
+                        cache_dir: Optional[str] = None) -> lgb.Booster:
     """
     LightGBMモデルの学習を実行する
     
+    学習データ末尾の検証データでL2損失が EARLY_STOPPING_ROUNDS 回改善しなければ終了し
+    （最大 MAX_N_ESTIMATORS）、最良の反復数で全期間の学習データを使って学習し直す。
+    
     Args:
-        model: 学習対象のLightGBMモデル
-        X_train: 学習用特徴量データ
-        y_train: 学習用目的変数データ
+        model: パラメータ設定用のLightGBMモデル（create_lightgbm_model の戻り値）
+        X_train: 学習用特徴量データ（時系列順）
+        y_train: 学習用目的変数データ（時系列順）
+        cache_dir: lgb.Dataset バイナリキャッシュの保存先（Noneならキャッシュしない）
         
     Returns:
-        lgb.LGBMRegressor: 学習済みモデル
+        lgb.Booster: 学習済みモデル
     """
     print("LightGBMモデルの学習を開始します...")
     
-    model.fit(X_train, y_train)
-    
+    params = booster_params(model)
+    X_fit, X_valid, y_fit, y_valid = split_validation(X_train, y_train)
+    train_set, cached = build_training_dataset(X_fit, y_fit, params, cache_dir)
+    
+    evals_result = {}
+    callbacks = [lgb.record_evaluation(evals_result)]
+    valid_sets = []
+    num_boost_round = model.n_estimators
+    if X_valid is not None:
+        valid_sets.append(lgb.Dataset(X_valid, label=np.ravel(y_valid), reference=train_set))
+        callbacks.append(lgb.early_stopping(config.EARLY_STOPPING_ROUNDS, verbose=False))
+        num_boost_round = config.MAX_N_ESTIMATORS
+        print(f"早期終了: 学習{len(X_fit)}行・検証{len(X_valid)}行（学習データ末尾）")
+    else:
+        print(f"検証データを確保できないため早期終了なしで学習します（木の数: {num_boost_round}）")
+    
+    booster = lgb.train(params, train_set, num_boost_round=num_boost_round,
+                        valid_sets=valid_sets, valid_names=["valid"] if valid_sets else None,
+                        callbacks=callbacks)
+    
+    if X_valid is not None:
+        # 検証に使った最新の期間も学習するため、最良の反復数で全期間を学習し直す
+        best_iteration = booster.best_iteration if booster.best_iteration > 0 else booster.current_iteration()
+        n_rounds = len(evals_result["valid"]["l2"])
+        print(f"最良の反復数: {best_iteration}（{n_rounds}回で終了、全期間{len(X_train)}行で学習し直します）")
+        booster.free_dataset()
+        train_set, _ = build_training_dataset(X_train, y_train, params, cache_dir)
+        booster = lgb.train(params, train_set, num_boost_round=best_iteration)
+    booster.free_dataset()
     print("LightGBMモデルの学習が完了しました")
-    return model
+    return booster
+
+
+@robust_model_operation("LightGBM追加学習")
+def warm_start_lightgbm_model(model: lgb.LGBMRegressor,
+                              init_booster: lgb.Booster,
+                              X_recent: np.ndarray,
+                              y_recent: np.ndarray) -> lgb.Booster:
+    """
+    前回のモデルを init_model として、直近の期間で WARM_START_ROUNDS 回の反復を追加する
+    （学習率は WARM_START_LEARNING_RATE_FACTOR 倍。直近の期間への過学習を抑える）
+    
+    Args:
+        model: パラメータ設定用のLightGBMモデル（create_lightgbm_model の戻り値）
+        init_booster: 前回のモデル（バンドルから復元した Booster）
+        X_recent: 直近の学習用特徴量データ（前回と同じ標準化済み）
+        y_recent: 直近の学習用目的変数データ
+        
+    Returns:
+        lgb.Booster: 追加学習済みモデル
+    """
+    params = booster_params(model)
+    params["learning_rate"] = model.learning_rate * config.WARM_START_LEARNING_RATE_FACTOR
+    train_set = lgb.Dataset(X_recent, label=np.ravel(y_recent), params=params, free_raw_data=False)
+    n_previous = init_booster.current_iteration()
+    booster = lgb.train(params, train_set, num_boost_round=config.WARM_START_ROUNDS, init_model=init_booster)
+    booster.free_dataset()
+    print(f"追加学習: 前回の{n_previous}回に直近{len(X_recent)}行で{config.WARM_START_ROUNDS}回を追加しました")
+    return booster
 
 
 @robust_model_operation("モデル・スケーラー保存")
-def save_model_and_scaler(model: lgb.LGBMRegressor, scaler: StandardScaler, model_path: str) -> None:
+def save_model_and_scaler(model: lgb.Booster, scaler: StandardScaler, model_path: str) -> None:
     """
     モデルとスケーラーを保存する
     
@@ -307,8 +538,45 @@ def save_model_and_scaler(model: lgb.LGBMRegressor, scaler: StandardScaler, mode
     print(f"スケーラーを {scaler_path} に保存しました")
 
 
+@robust_model_operation("モデルバンドル保存")
+def save_model_bundle(model: lgb.Booster,
+                      scaler: StandardScaler,
+                      X_train: np.ndarray,
+                      y_train: np.ndarray,
+                      feature_columns: list,
+                      metrics: dict,
+                      model_path: str,
+                      training: Optional[dict] = None) -> Optional[str]:
+    """
+    翌日予測用のモデルバンドル（モデル文字列・スケーラー・特徴量範囲・列順・評価指標）を保存する
+    
+    Args:
+        model: 学習済みLightGBMモデル
+        scaler: 標準化オブジェクト
+        X_train: 標準化前の学習用特徴量データ
+        y_train: 学習用目的変数データ
+        feature_columns: 特徴量の列名
+        metrics: 評価指標（rmse / r2 / mae）
+        model_path: モデル保存先パス（バンドルは拡張子を .bundle.npz に置き換えたパス）
+        training: 学習モード・前回の全体再学習日時（common/warm_start.training_info の戻り値）
+        
+    Returns:
+        Optional[str]: バンドルのパス（保存失敗時はNone、旧形式のモデルファイルは保存済み）
+    """
+    path = bundle_path(model_path)
+    try:
+        artifact = build_artifact("LightGBM", FORMAT_LIGHTGBM, model, scaler, X_train, y_train,
+                                  feature_columns, metrics, training=training)
+        save_artifact(path, artifact)
+    except (OSError, ValueError) as e:
+        print(f"警告: モデルバンドルの保存に失敗しました: {e}")
+        return None
+    print(f"モデルバンドルを {path} に保存しました")
+    return path
+
+
 @robust_model_operation("モデル性能評価")
-def evaluate_model_performance(model: lgb.LGBMRegressor,
+def evaluate_model_performance(model: lgb.Booster,
                               X_test: np.ndarray,
                               y_test: np.ndarray) -> Tuple[float, float, float, np.ndarray]:
     """
@@ -325,12 +593,12 @@ def evaluate_model_performance(model: lgb.LGBMRegressor,
     print("=== モデル性能評価開始 ===")
     print("モデル性能評価を実行中...")
     
-    # テストスコア
-    test_score = model.score(X_test, y_test)
-    print(f'テストスコア: {test_score:.4f}')
-
     # 予測値の計算
     y_pred = model.predict(X_test).astype(config.DATA_TYPE)
+
+    # テストスコア（LGBMRegressor.score と同じ決定係数）
+    test_score = r2_score(y_test, y_pred)
+    print(f'テストスコア: {test_score:.4f}')
     
     # 性能指標の計算
     mse = mean_squared_error(y_test, y_pred)
@@ -426,6 +694,7 @@ def create_prediction_plots(y_pred: np.ndarray,
     plt.close()
     print(f"1週間グラフを {week_period_png} に保存しました（16:9統一フォーマット）")
 
+@use_tuned_params("LightGBM")
 @robust_model_operation("LightGBM学習統合処理")
 def train(xtrain_csv: str,
           xtest_csv: str,
@@ -438,10 +707,13 @@ def train(xtrain_csv: str,
           learning_rate: Optional[str] = None,
           epochs: Optional[str] = None,
           validation_split: Optional[str] = None,
-          history_png: Optional[str] = None) -> Optional[Tuple[float, float, float]]:
+          history_png: Optional[str] = None,
+          dataset: Optional[DatasetSplit] = None) -> Optional[Tuple[float, float, float]]:
     """
     LightGBMを使用した電力需要予測モデルの学習を実行する（統一パターン対応）
     
+    AI_USE_TUNED_PARAMS 有効時は探索済みパラメータ（common/search.py）を設定に適用して学習する。
+    
     Args:
         xtrain_csv: 学習用特徴量データのパス
         xtest_csv: テスト用特徴量データのパス
@@ -455,6 +727,7 @@ def train(xtrain_csv: str,
         epochs: エポック数（使用されない、互換性のため）
         validation_split: 検証データ割合（使用されない、互換性のため）
         history_png: 学習履歴グラフ（使用されない、互換性のため）
+        dataset: メモリ上の分割済みデータセット（指定時はCSVを読み込まない）
         
     Returns:
         Optional[Tuple[float, float, float]]: RMSE, R2スコア, MAE（エラー時はNone）
@@ -463,13 +736,18 @@ def train(xtrain_csv: str,
     
     # 1. データの読み込み
     X_train, X_test, y_train, y_test = load_training_data(
-        xtrain_csv, xtest_csv, ytrain_csv, ytest_csv
+        xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dataset=dataset
     )
     
-    # 2. データの標準化
-    X_train_scaled, X_test_scaled, scaler = prepare_data_with_scaling(X_train, X_test)
+    # 2. 学習モードの判定（AI_WARM_START 有効時は前回のバンドルからの追加学習を検討）
+    feature_columns = dataset.feature_columns if dataset is not None else read_feature_columns(xtrain_csv)
+    plan = plan_training(model_sav, X_train, y_train, feature_columns)
+    
+    # 3. データの標準化（追加学習・再利用時は既存の木と整合するよう前回の標準化パラメータを使用）
+    X_train_scaled, X_test_scaled, scaler = prepare_data_with_scaling(
+        X_train, X_test, scaler=None if plan.is_full else plan.previous.scaler())
     
-    # 3. モデルの作成（学習率の設定）
+    # 4. モデルの作成（学習率の設定）
     lr = config.DEFAULT_LEARNING_RATE
     if learning_rate is not None:
         try:
@@ -484,19 +762,31 @@ def train(xtrain_csv: str,
     
     model = create_lightgbm_model(learning_rate=lr)
     
-    # 4. モデルの学習
-    trained_model = train_lightgbm_model(model, X_train_scaled, y_train)
+    # 5. モデルの学習（Datasetキャッシュはデータディレクトリ配下）
+    if plan.mode == MODE_WARM:
+        X_recent, y_recent = plan.recent_window(X_train_scaled, y_train)
+        trained_model = warm_start_lightgbm_model(model, plan.previous.model, X_recent, y_recent)
+    elif plan.mode == MODE_REUSE:
+        trained_model = plan.previous.model
+    else:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(xtrain_csv)), config.DATASET_CACHE_SUBDIR)
+        trained_model = train_lightgbm_model(model, X_train_scaled, y_train, cache_dir=cache_dir)
     
-    # 5. モデルとスケーラーの保存
+    # 6. モデルとスケーラーの保存
     save_model_and_scaler(trained_model, scaler, model_sav)
     
-    # 6. モデルの評価
+    # 7. モデルの評価
     rmse, r2, mae, y_pred = evaluate_model_performance(trained_model, X_test_scaled, y_test)
     
-    # 7. 予測結果の保存
+    # 8. モデルバンドルの保存（翌日予測は学習データを読み込まずにバンドルのみ使用）
+    save_model_bundle(trained_model, scaler, X_train, y_train, feature_columns,
+                      {"rmse": rmse, "r2": r2, "mae": mae}, model_sav,
+                      training=training_info(plan, X_train, y_train))
+    
+    # 9. 予測結果の保存
     save_predictions_to_csv(y_pred, ypred_csv)
     
-    # 8. 予測結果グラフの作成
+    # 10. 予測結果グラフの作成
     create_prediction_plots(y_pred, y_test, ypred_png, ypred_7d_png)
     
     print("=== LightGBM電力需要予測モデル学習完了 ===")
@@ -531,8 +821,8 @@ def main() -> None:
         ypred_png = r'train/LightGBM/LightGBM_Ypred.png'
         ypred_7d_png = r'train/LightGBM/LightGBM_Ypred_7d.png'
         
-        # ハイパーパラメータ設定（LightGBMでは使用されないが互換性のため）
-        learning_rate_param = config.DEFAULT_LEARNING_RATE
+        # ハイパーパラメータ設定（学習率は未指定なら設定値。探索済みパラメータの適用時はその値）
+        learning_rate_param = None
         epochs = ''
         validation_split = ''
         history_png = r'train/LightGBM/LightGBM_history.png'
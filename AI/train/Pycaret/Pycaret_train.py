@@ -4,6 +4,11 @@
 
 自動機械学習ライブラリを使用し電力需要で学習を行い、
 電力消費予測のための予測モデルを作成するモジュール。
+
+setup() の結果（前処理パイプライン・データ分割）は学習データと設定のハッシュごとに
+data/cache/pycaret/ に保存し、同じデータでの再学習（最適化スイープの再実行など）では
+setup() を省略して読み込む。最終モデルだけが必要な場合は環境変数 AI_PYCARET_CV=0 で
+交差検証によるスコア計算を省略する。
 """
 
 import numpy as np
@@ -14,6 +19,7 @@ import os
 import sys
 import gc
 import functools
+import hashlib
 from dataclasses import dataclass, field
 from typing import Tuple, Optional, Any, Dict, List, Callable
 from pathlib import Path
@@ -23,6 +29,12 @@ import warnings
 from pycaret.regression import *
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import DatasetSplit, load_training_split
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -82,6 +94,13 @@ class PyCaretConfig:
     cv_folds: int = 10
     session_id: int = 123
     silent_mode: bool = True
+    # 交差検証スコア（"0"/"false"/"off" で省略し、最終モデルの学習のみ行う）
+    cv_env_var: str = "AI_PYCARET_CV"
+    
+    # setup() 結果のキャッシュ（データディレクトリ配下、パース済みCSVキャッシュと同じ cache/）
+    setup_cache_subdir: str = os.path.join("cache", "pycaret")
+    setup_cache_env_var: str = "AI_PYCARET_SETUP_CACHE"  # "0"/"false"/"off" でキャッシュ無効化
+    setup_cache_max_entries: int = 8
     
     # 可視化設定（16:9アスペクト比統一）
     figure_size: Tuple[int, int] = (16, 9)
@@ -110,6 +129,16 @@ class PyCaretConfig:
         
         return base_params, try_params
     
+    def is_cross_validation_enabled(self) -> bool:
+        """交差検証スコアを計算するか判定する（環境変数 AI_PYCARET_CV が無効値でなければTrue）"""
+        value = os.environ.get(self.cv_env_var, "1").strip().lower()
+        return value not in ("0", "false", "off", "no")
+    
+    def is_setup_cache_enabled(self) -> bool:
+        """setup() 結果のキャッシュが有効か判定する（環境変数 AI_PYCARET_SETUP_CACHE が無効値でなければTrue）"""
+        value = os.environ.get(self.setup_cache_env_var, "1").strip().lower()
+        return value not in ("0", "false", "off", "no")
+    
     def optimize_memory_if_enabled(self) -> None:
         """メモリ最適化実行（有効時のみ）"""
         if self.enable_garbage_collection:
@@ -158,7 +187,8 @@ def load_training_data(config: PyCaretConfig,
                       xtrain_csv: str, 
                       xtest_csv: str, 
                       ytrain_csv: str, 
-                      ytest_csv: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+                      ytest_csv: str,
+                      dataset: Optional[DatasetSplit] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     学習・テストデータを読み込む（PyCaretConfig対応版）
     
@@ -168,6 +198,7 @@ def load_training_data(config: PyCaretConfig,
         xtest_csv: テスト用特徴量データのパス
         ytrain_csv: 学習用目的変数データのパス
         ytest_csv: テスト用目的変数データのパス
+        dataset: メモリ上の分割済みデータセット（指定時はファイルを読み込まない）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: 
@@ -180,23 +211,23 @@ def load_training_data(config: PyCaretConfig,
     dtype = config.data_dtype
     
     print("学習データを読み込み中...")
-    # CSVのヘッダを保持して読み込み、実際の特徴量列名を config に反映する
-    X_train_df = pd.read_csv(xtrain_csv)
-    X_test_df = pd.read_csv(xtest_csv)
+    # メモリ上のデータセット指定時はそのまま使用
+    # それ以外はバイナリデータセット（data/dataset/）があればメモリマップで読み込み、なければCSV（列名も保持）
+    if dataset is not None:
+        split = dataset.astype(dtype)
+    else:
+        split = load_training_split(xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dtype=dtype)
 
     # 読み込んだ実際の列名を config.feature_columns に設定（後続処理で使用されるため）
     try:
-        cols = list(X_train_df.columns)
+        cols = list(split.feature_columns)
         if cols:
             config.feature_columns = cols
             print(f"設定: 読み込んだ特徴量列を config.feature_columns に反映しました ({len(cols)} 列)")
     except Exception as e:
         print(f"特徴量列の反映に失敗しました: {e}")
 
-    X_train = X_train_df.to_numpy().astype(dtype)
-    X_test = X_test_df.to_numpy().astype(dtype)
-    y_train = pd.read_csv(ytrain_csv).values.astype(dtype).flatten()
-    y_test = pd.read_csv(ytest_csv).values.astype(dtype).flatten()
+    X_train, X_test, y_train, y_test = split.arrays()
     
     print(f"学習データ形状: X_train={X_train.shape}, y_train={y_train.shape}")
     print(f"テストデータ形状: X_test={X_test.shape}, y_test={y_test.shape}")
@@ -208,10 +239,114 @@ def load_training_data(config: PyCaretConfig,
     return X_train, X_test, y_train, y_test
 
 
+def setup_cache_key(config: PyCaretConfig, train_data: pd.DataFrame) -> str:
+    """
+    学習データとセットアップ設定から setup() キャッシュのキーを作成する
+    
+    Args:
+        config: PyCaret設定オブジェクト
+        train_data: setup() に渡す学習データ（特徴量列＋目的変数列）
+        
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    import pycaret
+    base_params, try_params = config.get_pycaret_setup_params()
+    digest = hashlib.sha256()
+    digest.update(f"{pycaret.__version__}|{config.target_column_name}|{sorted(base_params.items())}|"
+                  f"{try_params}|{list(train_data.columns)}|{list(train_data.dtypes.astype(str))}|"
+                  f"{train_data.shape}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(train_data.to_numpy()))
+    return digest.hexdigest()
+
+
+def _setup_cache_paths(cache_dir: str, key: str) -> Tuple[str, str]:
+    """キャッシュキーに対応する実験ファイル・データファイルのパス"""
+    return os.path.join(cache_dir, f"{key}.experiment.pkl"), os.path.join(cache_dir, f"{key}.data.pkl")
+
+
+def _prune_setup_cache(config: PyCaretConfig, cache_dir: str) -> None:
+    """古いキャッシュを削除し、setup_cache_max_entries 組以内に保つ"""
+    try:
+        keys = [name[:-len(".experiment.pkl")] for name in os.listdir(cache_dir) if name.endswith(".experiment.pkl")]
+        keys.sort(key=lambda key: os.path.getmtime(_setup_cache_paths(cache_dir, key)[0]), reverse=True)
+        for key in keys[config.setup_cache_max_entries:]:
+            for path in _setup_cache_paths(cache_dir, key):
+                if os.path.exists(path):
+                    os.remove(path)
+    except OSError as e:
+        print(f"警告: PyCaretセットアップキャッシュの整理に失敗しました: {e}")
+
+
+def load_cached_experiment(config: PyCaretConfig, train_data: pd.DataFrame, cache_dir: str) -> Optional[Any]:
+    """
+    保存済みの setup() 結果を読み込み、現在の実験として設定する
+    
+    Args:
+        config: PyCaret設定オブジェクト
+        train_data: setup() に渡す学習データ
+        cache_dir: キャッシュの保存先
+        
+    Returns:
+        Optional[Any]: PyCaretの実験オブジェクト（キャッシュがない・読み込めない場合はNone）
+    """
+    try:
+        from pycaret.regression import load_experiment
+    except ImportError:
+        # load_experiment は PyCaret 3.0 以降のみ
+        return None
+
+    experiment_path, data_path = _setup_cache_paths(cache_dir, setup_cache_key(config, train_data))
+    if not (os.path.exists(experiment_path) and os.path.exists(data_path)):
+        return None
+    try:
+        exp = load_experiment(experiment_path, data=pd.read_pickle(data_path), preprocess_data=False)
+    except Exception as e:
+        print(f"警告: PyCaretセットアップキャッシュを読み込めません（setupを実行し直します）: {experiment_path}, {e}")
+        return None
+    os.utime(experiment_path)
+    print(f"PyCaretセットアップキャッシュを使用します（setupを省略）: {experiment_path}")
+    return exp
+
+
+def save_experiment_cache(config: PyCaretConfig, exp: Any, train_data: pd.DataFrame, cache_dir: str) -> None:
+    """
+    setup() 結果（実験オブジェクトと前処理前データ）をキャッシュに保存する
+    
+    Args:
+        config: PyCaret設定オブジェクト
+        exp: setup() が返した実験オブジェクト
+        train_data: setup() に渡した学習データ
+        cache_dir: キャッシュの保存先
+    """
+    try:
+        from pycaret.regression import save_experiment
+    except ImportError:
+        return
+
+    experiment_path, data_path = _setup_cache_paths(cache_dir, setup_cache_key(config, train_data))
+    tmp_suffix = f".{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # データを先に置き、実験ファイルの有無でキャッシュの有無を判定する
+        exp.data.to_pickle(data_path + tmp_suffix)
+        os.replace(data_path + tmp_suffix, data_path)
+        save_experiment(experiment_path + tmp_suffix)
+        os.replace(experiment_path + tmp_suffix, experiment_path)
+        print(f"PyCaretセットアップキャッシュを保存しました: {experiment_path}")
+        _prune_setup_cache(config, cache_dir)
+    except Exception as e:
+        print(f"警告: PyCaretセットアップキャッシュの保存に失敗しました: {e}")
+        for path in (data_path + tmp_suffix, experiment_path + tmp_suffix):
+            if os.path.exists(path):
+                os.remove(path)
+
+
 @robust_model_operation("PyCaret実験環境セットアップ")
 def setup_pycaret_experiment(config: PyCaretConfig, 
                             X_train: np.ndarray, 
-                            y_train: np.ndarray) -> Any:
+                            y_train: np.ndarray,
+                            cache_dir: Optional[str] = None) -> Any:
     """
     PyCaretの実験環境をセットアップする（設定管理統一版）
     
@@ -219,6 +354,7 @@ def setup_pycaret_experiment(config: PyCaretConfig,
         config: PyCaret設定オブジェクト
         X_train: 学習用特徴量データ
         y_train: 学習用目的変数データ
+        cache_dir: setup() 結果のキャッシュの保存先（Noneまたは無効化時はキャッシュしない）
         
     Returns:
         Any: PyCaretの実験オブジェクト
@@ -229,6 +365,12 @@ def setup_pycaret_experiment(config: PyCaretConfig,
         pd.DataFrame(y_train, columns=config.target_columns)
     ], axis=1)
     
+    use_cache = cache_dir is not None and config.is_setup_cache_enabled()
+    if use_cache:
+        exp = load_cached_experiment(config, train_data, cache_dir)
+        if exp is not None:
+            return exp
+    
     # PyCaretセットアップ（バージョン互換性対応）
     base_params, try_params = config.get_pycaret_setup_params()
     
@@ -255,6 +397,9 @@ def setup_pycaret_experiment(config: PyCaretConfig,
         )
         print("PyCaretセットアップ: 基本パラメータで実行")
     
+    if use_cache:
+        save_experiment_cache(config, exp, train_data, cache_dir)
+    
     return exp
 
 
@@ -269,9 +414,13 @@ def create_pycaret_model(config: PyCaretConfig) -> Any:
     Returns:
         Any: 学習済みPyCaretモデル
     """
-    print(f"PyCaretモデル（{config.model_type}）を作成・学習中...")
+    cross_validation = config.is_cross_validation_enabled()
+    if cross_validation:
+        print(f"PyCaretモデル（{config.model_type}）を作成・学習中（{config.cv_folds}分割交差検証）...")
+    else:
+        print(f"PyCaretモデル（{config.model_type}）を作成・学習中（交差検証を省略）...")
     
-    model = create_model(config.model_type, fold=config.cv_folds)
+    model = create_model(config.model_type, fold=config.cv_folds, cross_validation=cross_validation)
     
     # メモリ最適化
     config.optimize_memory_if_enabled()
@@ -464,7 +613,8 @@ def train(xtrain_csv: str,
           learning_rate: Optional[str] = None,
           epochs: Optional[str] = None,
           validation_split: Optional[str] = None,
-          history_png: Optional[str] = None) -> Optional[Tuple[float, float]]:
+          history_png: Optional[str] = None,
+          dataset: Optional[DatasetSplit] = None) -> Optional[Tuple[float, float]]:
     """
     PyCaretを使用した電力需要予測モデルの学習を実行する（統一仕様版）
     
@@ -481,6 +631,7 @@ def train(xtrain_csv: str,
         epochs: エポック数（使用されない、互換性のため）
         validation_split: 検証データ割合（使用されない、互換性のため）
         history_png: 学習履歴グラフ（使用されない、互換性のため）
+        dataset: メモリ上の分割済みデータセット（指定時はCSVを読み込まない）
         
     Returns:
         Optional[Tuple[float, float]]: RMSE, R2スコア（エラー時はNone）
@@ -490,11 +641,12 @@ def train(xtrain_csv: str,
     
     # 1. データの読み込み
     X_train, X_test, y_train, y_test = load_training_data(
-        config, xtrain_csv, xtest_csv, ytrain_csv, ytest_csv
+        config, xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dataset=dataset
     )
     
-    # 2. PyCaret実験環境のセットアップ
-    exp = setup_pycaret_experiment(config, X_train, y_train)
+    # 2. PyCaret実験環境のセットアップ（同じデータ・設定なら data/cache/pycaret/ から読み込む）
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(xtrain_csv)), config.setup_cache_subdir)
+    exp = setup_pycaret_experiment(config, X_train, y_train, cache_dir=cache_dir)
     
     # 3. モデルの作成・学習
     model = create_pycaret_model(config)
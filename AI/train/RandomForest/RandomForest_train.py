@@ -4,6 +4,8 @@
 
 ランダムフォレスト回帰を構築し電力需要で学習を行い、
 電力消費予測のための予測モデルを作成するモジュール。
+環境変数 AI_WARM_START=1 の場合は前回のモデルバンドルに warm_start で直近の期間から学習した木を追加する
+（定期的な全体再学習・ドリフト検出時は全期間で学習し直す。判定は common/warm_start.py）。
 """
 
 import pandas as pd
@@ -25,6 +27,15 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
 
+# 共通モジュール（AI/common）のインポート設定
+_AI_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _AI_DIR not in sys.path:
+    sys.path.append(_AI_DIR)
+from common.dataset import DatasetSplit, load_training_split, read_feature_columns
+from common.artifact import FORMAT_SKLEARN, build_artifact, bundle_path, save_artifact
+from common.warm_start import MODE_REUSE, MODE_WARM, plan_training, training_info
+from common.search import tuned_config
+
 # パフォーマンス最適化設定（統合版）
 warnings.filterwarnings('ignore', category=UserWarning)
 warnings.filterwarnings('ignore', category=FutureWarning)
@@ -68,6 +79,9 @@ class RandomForestConfig:
     n_jobs: int = -1  # すべてのCPUコアを使用（パフォーマンス最適化）
     random_state: int = 42
     
+    # 追加学習設定（前回のモデルに直近の期間で学習して追加する木の数）
+    warm_start_trees: int = 10
+    
     # データ前処理設定
     enable_scaling: bool = True
     scaler_type: str = 'StandardScaler'
@@ -144,7 +158,8 @@ def load_training_data(config: RandomForestConfig,
                       xtrain_csv: str, 
                       xtest_csv: str, 
                       ytrain_csv: str, 
-                      ytest_csv: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+                      ytest_csv: str,
+                      dataset: Optional[DatasetSplit] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     """
     学習・テストデータを読み込む（RandomForestConfig対応版）
     
@@ -154,6 +169,7 @@ def load_training_data(config: RandomForestConfig,
         xtest_csv: テスト用特徴量データのパス
         ytrain_csv: 学習用目的変数データのパス
         ytest_csv: テスト用目的変数データのパス
+        dataset: メモリ上の分割済みデータセット（指定時はファイルを読み込まない）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: 
@@ -166,10 +182,14 @@ def load_training_data(config: RandomForestConfig,
     dtype = config.data_dtype
     
     print("学習データを読み込み中...")
-    X_train = pd.read_csv(xtrain_csv).to_numpy().astype(dtype)
-    X_test = pd.read_csv(xtest_csv).to_numpy().astype(dtype)
-    y_train = pd.read_csv(ytrain_csv).values.astype(dtype).flatten()
-    y_test = pd.read_csv(ytest_csv).values.astype(dtype).flatten()
+    # メモリ上のデータセット指定時はそのまま使用
+    # それ以外はバイナリデータセット（data/dataset/）があればメモリマップで読み込み、なければCSV
+    if dataset is not None:
+        X_train, X_test, y_train, y_test = dataset.astype(dtype).arrays()
+    else:
+        X_train, X_test, y_train, y_test = load_training_split(
+            xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dtype=dtype
+        ).arrays()
     
     print(f"学習データ形状: X_train={X_train.shape}, y_train={y_train.shape}")
     print(f"テストデータ形状: X_test={X_test.shape}, y_test={y_test.shape}")
@@ -184,7 +204,8 @@ def load_training_data(config: RandomForestConfig,
 @robust_model_operation("データ標準化")
 def prepare_data_with_scaling(config: RandomForestConfig,
                              X_train: np.ndarray, 
-                             X_test: np.ndarray) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
+                             X_test: np.ndarray,
+                             scaler: Optional[StandardScaler] = None) -> Tuple[np.ndarray, np.ndarray, StandardScaler]:
     """
     データの標準化を実行する（設定統一版）
     
@@ -192,6 +213,7 @@ def prepare_data_with_scaling(config: RandomForestConfig,
         config: RandomForest設定オブジェクト
         X_train: 学習用特徴量データ
         X_test: テスト用特徴量データ
+        scaler: 学習済みの標準化オブジェクト（追加学習時は前回のものを指定、Noneなら学習データで fit）
         
     Returns:
         Tuple[np.ndarray, np.ndarray, StandardScaler]: 
@@ -201,8 +223,9 @@ def prepare_data_with_scaling(config: RandomForestConfig,
         print("データ標準化をスキップします")
         return X_train, X_test, None
     
-    scaler = StandardScaler()
-    scaler.fit(X_train)
+    if scaler is None:
+        scaler = StandardScaler()
+        scaler.fit(X_train)
     X_train_scaled = scaler.transform(X_train).astype(config.data_dtype)
     X_test_scaled = scaler.transform(X_test).astype(config.data_dtype)
     
@@ -255,6 +278,34 @@ def train_random_forest_model(config: RandomForestConfig,
     
     return model
 
+@robust_model_operation("RandomForest追加学習")
+def warm_start_random_forest_model(config: RandomForestConfig,
+                                   model: RandomForestRegressor,
+                                   X_recent: np.ndarray,
+                                   y_recent: np.ndarray) -> RandomForestRegressor:
+    """
+    前回のモデルに warm_start で直近の期間から学習した木を warm_start_trees 本追加する
+    
+    Args:
+        config: RandomForest設定オブジェクト
+        model: 前回の学習済みRandom Forestモデル（バンドルから復元したもの）
+        X_recent: 直近の学習用特徴量データ（前回と同じ標準化済み）
+        y_recent: 直近の学習用目的変数データ
+        
+    Returns:
+        RandomForestRegressor: 木を追加したモデル
+    """
+    n_previous = model.n_estimators
+    model.set_params(warm_start=True, n_estimators=n_previous + config.warm_start_trees, n_jobs=config.n_jobs)
+    model.fit(X_recent, y_recent)
+    model.set_params(warm_start=False)
+    print(f"追加学習: 前回の{n_previous}本に直近{len(X_recent)}行で学習した{config.warm_start_trees}本を追加しました")
+    
+    # メモリ最適化
+    config.optimize_memory_if_enabled()
+    
+    return model
+
 @robust_model_operation("モデル・スケーラー保存")
 def save_model_and_scaler(config: RandomForestConfig,
                          model: RandomForestRegressor, 
@@ -286,6 +337,43 @@ def save_model_and_scaler(config: RandomForestConfig,
         print("スケーラーなし（標準化無効のため保存をスキップ）")
 
 
+@robust_model_operation("モデルバンドル保存")
+def save_model_bundle(model: RandomForestRegressor,
+                      scaler: Optional[StandardScaler],
+                      X_train: np.ndarray,
+                      y_train: np.ndarray,
+                      feature_columns: List[str],
+                      metrics: dict,
+                      model_path: str,
+                      training: Optional[dict] = None) -> Optional[str]:
+    """
+    翌日予測用のモデルバンドル（モデル・スケーラー・特徴量範囲・列順・評価指標）を保存する
+    
+    Args:
+        model: 学習済みRandom Forestモデル
+        scaler: 標準化オブジェクト（None可）
+        X_train: 標準化前の学習用特徴量データ
+        y_train: 学習用目的変数データ
+        feature_columns: 特徴量の列名
+        metrics: 評価指標（rmse / r2 / mae）
+        model_path: モデル保存先パス（バンドルは拡張子を .bundle.npz に置き換えたパス）
+        training: 学習モード・前回の全体再学習日時（common/warm_start.training_info の戻り値）
+        
+    Returns:
+        Optional[str]: バンドルのパス（保存失敗時はNone、旧形式のモデルファイルは保存済み）
+    """
+    path = bundle_path(model_path)
+    try:
+        artifact = build_artifact("RandomForest", FORMAT_SKLEARN, model, scaler, X_train, y_train,
+                                  feature_columns, metrics, training=training)
+        save_artifact(path, artifact)
+    except (OSError, ValueError) as e:
+        print(f"警告: モデルバンドルの保存に失敗しました: {e}")
+        return None
+    print(f"モデルバンドルを {path} に保存しました")
+    return path
+
+
 @robust_model_operation("モデル性能評価")
 def evaluate_model_performance(config: RandomForestConfig,
                               model: RandomForestRegressor,
@@ -425,7 +513,8 @@ def train(xtrain_csv: str,
           learning_rate: Optional[str] = None,
           epochs: Optional[str] = None,
           validation_split: Optional[str] = None,
-          history_png: Optional[str] = None) -> Optional[Tuple[float, float]]:
+          history_png: Optional[str] = None,
+          dataset: Optional[DatasetSplit] = None) -> Optional[Tuple[float, float]]:
     """
     Random Forestを使用した電力需要予測モデルの学習を実行する（統一仕様版）
     
@@ -442,28 +531,37 @@ def train(xtrain_csv: str,
         epochs: エポック数（使用されない、互換性のため）
         validation_split: 検証データ割合（使用されない、互換性のため）
         history_png: 学習履歴グラフ（使用されない、互換性のため）
+        dataset: メモリ上の分割済みデータセット（指定時はCSVを読み込まない）
         
     Returns:
         Optional[Tuple[float, float]]: RMSE, R2スコア（エラー時はNone）
     """
-    # 設定オブジェクト初期化
-    config = RandomForestConfig()
+    # 設定オブジェクト初期化（AI_USE_TUNED_PARAMS 有効時は探索済みパラメータを適用）
+    config = tuned_config("RandomForest", RandomForestConfig())
     
     # 1. データの読み込み
     X_train, X_test, y_train, y_test = load_training_data(
-        config, xtrain_csv, xtest_csv, ytrain_csv, ytest_csv
+        config, xtrain_csv, xtest_csv, ytrain_csv, ytest_csv, dataset=dataset
     )
     
-    # 2. データの標準化
+    # 2. 学習モードの判定（AI_WARM_START 有効時は前回のバンドルからの追加学習を検討）
+    feature_columns = dataset.feature_columns if dataset is not None else read_feature_columns(xtrain_csv)
+    plan = plan_training(model_sav, X_train, y_train, feature_columns)
+    
+    # 3. データの標準化（追加学習・再利用時は既存の木と整合するよう前回の標準化パラメータを使用）
     X_train_scaled, X_test_scaled, scaler = prepare_data_with_scaling(
-        config, X_train, X_test
+        config, X_train, X_test, scaler=None if plan.is_full else plan.previous.scaler()
     )
     
-    # 3. モデルの作成
-    model = create_random_forest_model(config)
-    
-    # 4. モデルの学習
-    trained_model = train_random_forest_model(config, model, X_train_scaled, y_train)
+    # 4. モデルの作成・学習
+    if plan.mode == MODE_WARM:
+        X_recent, y_recent = plan.recent_window(X_train_scaled, y_train)
+        trained_model = warm_start_random_forest_model(config, plan.previous.model, X_recent, y_recent)
+    elif plan.mode == MODE_REUSE:
+        trained_model = plan.previous.model
+    else:
+        model = create_random_forest_model(config)
+        trained_model = train_random_forest_model(config, model, X_train_scaled, y_train)
     
     # 5. モデルとスケーラーの保存
     save_model_and_scaler(config, trained_model, scaler, model_sav)
@@ -471,10 +569,15 @@ def train(xtrain_csv: str,
     # 6. モデルの評価
     rmse, r2, mae, y_pred = evaluate_model_performance(config, trained_model, X_test_scaled, y_test)
     
-    # 7. 予測結果の保存
+    # 7. モデルバンドルの保存（翌日予測は学習データを読み込まずにバンドルのみ使用）
+    save_model_bundle(trained_model, scaler, X_train, y_train, feature_columns,
+                      {"rmse": rmse, "r2": r2, "mae": mae}, model_sav,
+                      training=training_info(plan, X_train, y_train))
+    
+    # 8. 予測結果の保存
     save_predictions_to_csv(config, y_pred, ypred_csv)
     
-    # 8. 予測結果グラフの作成
+    # 9. 予測結果グラフの作成
     create_prediction_plots(config, y_pred, y_test, ypred_png, ypred_7d_png)
     
     return rmse, r2, mae
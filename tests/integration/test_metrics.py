@@ -207,13 +207,15 @@ def _extract_metrics_from_csv(model_name: str) -> Dict[str, float]:
     if not ypred_csv.exists():
         pytest.fail(f"{model_name}_Ypred.csvが見つかりません")
     
-    # Ytest.csv読み込み
+    # Ytest.csv読み込み（バイナリデータセット優先。学習・テスト別CSVは AI_DATASET_SPLIT_CSV=1 の場合のみ出力）
+    sys.path.insert(0, str(AI_DIR))
+    from common.dataset import dataset_exists, load_dataset_array
     ytest_csv = AI_DIR / "data" / "Ytest.csv"
-    if not ytest_csv.exists():
+    if not dataset_exists(str(ytest_csv)):
         pytest.fail("Ytest.csvが見つかりません")
     
     y_pred = pd.read_csv(ypred_csv).values.flatten()
-    y_test_full = pd.read_csv(ytest_csv).values.flatten()
+    y_test_full = load_dataset_array(str(ytest_csv)).flatten()
     
     # 予測結果の長さに合わせてy_testを切り出す（時系列データなので末尾を使用）
     y_test = y_test_full[-len(y_pred):]
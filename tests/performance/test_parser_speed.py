@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+パフォーマンステスト: CSVパーサー速度
+
+検証要件:
+- common.parsers による年別CSVのパース結果が従来の pandas 文字列処理と一致する
+- 全年分のパース時間が従来処理を上回らない
+
+実行方法:
+    pytest tests/performance/test_parser_speed.py -v
+
+前提条件:
+    AI/data/juyo-YYYY.csv・temperature-YYYY.csv が存在する
+"""
+
+import sys
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+
+# 定数
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+AI_DIR = PROJECT_ROOT / "AI"
+DATA_DIR = AI_DIR / "data"
+
+sys.path.insert(0, str(AI_DIR))
+from common.parsers import parse_jma_temperature, parse_juyo
+
+# 計測の繰り返し回数（最小値を採用）
+REPEAT = 3
+
+
+def _legacy_power(path: Path) -> pd.DataFrame:
+    """従来の電力データ読み込み（read_csv + 範囲表記除去 + 文字列日時変換）"""
+    df = pd.read_csv(path, encoding="shift_jis", skiprows=3, names=["DATE", "TIME", "KW"])
+    df["TIME"] = df["TIME"].apply(lambda x: x.split("〜")[0] if "〜" in x else x)
+    index = pd.to_datetime(df["DATE"] + " " + df["TIME"], format="%Y/%m/%d %H:%M")
+    return pd.DataFrame({"KW": df["KW"].to_numpy()}, index=index)
+
+
+def _legacy_temperature(path: Path) -> pd.DataFrame:
+    """従来の気温データ読み込み（read_csv + 文字列日時変換）"""
+    df = pd.read_csv(path, encoding="shift_jis", skiprows=5, usecols=[0, 1], names=["DATE", "TEMP"])
+    index = pd.to_datetime(df["DATE"], format="%Y/%m/%d %H:%M:%S")
+    return pd.DataFrame({"TEMP": df["TEMP"].to_numpy()}, index=index)
+
+
+def _best_time(func) -> float:
+    """REPEAT回実行した最短時間（秒）"""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+@pytest.fixture(scope="module")
+def year_files():
+    power_files = sorted(DATA_DIR.glob("juyo-*.csv"))
+    temp_files = sorted(DATA_DIR.glob("temperature-*.csv"))
+    if not power_files or not temp_files:
+        pytest.skip("年別CSVファイルが存在しません")
+    return power_files, temp_files
+
+
+class TestParserSpeed:
+    """CSVパーサー速度のテスト"""
+
+    def test_results_match_legacy(self, year_files):
+        """全年分のパース結果が従来処理と一致する"""
+        power_files, temp_files = year_files
+        for path in power_files:
+            legacy = _legacy_power(path)
+            parsed = parse_juyo(str(path))
+            np.testing.assert_array_equal(parsed.datetimes(), legacy.index.values, err_msg=str(path))
+            np.testing.assert_array_equal(parsed.columns["KW"], legacy["KW"].to_numpy(), err_msg=str(path))
+        for path in temp_files:
+            legacy = _legacy_temperature(path)
+            parsed = parse_jma_temperature(str(path))
+            np.testing.assert_array_equal(parsed.datetimes(), legacy.index.values, err_msg=str(path))
+            np.testing.assert_array_equal(parsed.columns["TEMP"], legacy["TEMP"].to_numpy(), err_msg=str(path))
+
+    def test_not_slower_than_legacy(self, year_files):
+        """全年分のパース時間が従来処理以下"""
+        power_files, temp_files = year_files
+
+        def legacy():
+            for path in power_files:
+                _legacy_power(path)
+            for path in temp_files:
+                _legacy_temperature(path)
+
+        def fast():
+            for path in power_files:
+                parse_juyo(str(path))
+            for path in temp_files:
+                parse_jma_temperature(str(path))
+
+        legacy_time = _best_time(legacy)
+        fast_time = _best_time(fast)
+        print(f"\n従来処理: {legacy_time * 1000:.1f}ms / 高速パーサー: {fast_time * 1000:.1f}ms")
+        assert fast_time <= legacy_time, f"高速パーサーが従来処理より遅い: {fast_time:.3f}s > {legacy_time:.3f}s"
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/artifact.py module（モデル成果物バンドル）
+
+注意:
+- 合成データで学習した小さなモデルを使用する（train/ 配下のモデルファイルは使用しない）。
+"""
+
+import sys
+import json
+import pickle
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import artifact
+from common import dataset
+from common.trees import TreeEnsemble
+
+COLUMNS = ["MONTH", "WEEK", "HOUR", "TEMP"]
+
+
+def _synthetic(n_rows: int = 500):
+    """需要に似た合成データ（float32特徴量・int32目的変数）"""
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        np.arange(n_rows) % 12 + 1,
+        np.arange(n_rows) % 7,
+        np.arange(n_rows) % 24,
+        rng.uniform(-5, 35, n_rows),
+    ]).astype(np.float32)
+    y = (3000 + X[:, 2] * 20 + (X[:, 3] - 15) ** 2 * 3).astype(np.int32)
+    return X, y
+
+
+def _save_and_load(temp_dir, bundle):
+    path = artifact.bundle_path(str(temp_dir / "model.sav"))
+    artifact.save_artifact(path, bundle)
+    return artifact.load_artifact(path)
+
+
+class TestRoundTrip:
+    """バンドルの保存・読み込みのテスト"""
+
+    def test_sklearn(self, temp_dir):
+        """scikit-learn のモデルと標準化パラメータを復元し、同じ予測値になる"""
+        X, y = _synthetic()
+        scaler = StandardScaler().fit(X)
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(scaler.transform(X), y)
+        bundle = artifact.build_artifact("RandomForest", artifact.FORMAT_SKLEARN, model, scaler, X, y,
+                                         COLUMNS, metrics={"rmse": 1.5})
+
+        restored = _save_and_load(temp_dir, bundle)
+
+        assert restored.feature_columns == COLUMNS
+        assert restored.metrics == {"rmse": 1.5}
+        assert restored.train_data_hash == artifact.data_hash(X, y)
+        np.testing.assert_array_equal(restored.scaler().transform(X), scaler.transform(X))
+        np.testing.assert_array_equal(restored.predict(X), model.predict(scaler.transform(X)))
+
+    def test_lightgbm(self, temp_dir, monkeypatch):
+        """LightGBM はモデル文字列から Booster を復元し、同じ予測値になる（NumPy 推論を無効にした場合）"""
+        lgb = pytest.importorskip("lightgbm")
+        monkeypatch.setenv("AI_TREE_NUMPY", "0")
+        X, y = _synthetic()
+        scaler = StandardScaler().fit(X)
+        model = lgb.LGBMRegressor(n_estimators=20, verbose=-1).fit(scaler.transform(X), y)
+        bundle = artifact.build_artifact("LightGBM", artifact.FORMAT_LIGHTGBM, model, scaler, X, y, COLUMNS)
+
+        restored = _save_and_load(temp_dir, bundle)
+
+        assert isinstance(restored.model, lgb.Booster)
+        np.testing.assert_allclose(restored.predict(X), model.predict(scaler.transform(X)))
+
+    def test_keras(self, temp_dir):
+        """Keras は構成JSONと重みから復元し、目的変数の標準化も戻して予測する"""
+        tf = pytest.importorskip("tensorflow")
+        X, y = _synthetic(100)
+        scaler = StandardScaler().fit(X)
+        y_scaler = StandardScaler().fit(y.reshape(-1, 1).astype(np.float32))
+        model = tf.keras.Sequential([tf.keras.layers.Dense(8, activation="relu", input_shape=(4,)),
+                                     tf.keras.layers.Dense(1)])
+        bundle = artifact.build_artifact("Keras", artifact.FORMAT_KERAS, model, scaler, X, y, COLUMNS,
+                                         target_scaler=y_scaler)
+
+        restored = _save_and_load(temp_dir, bundle)
+
+        expected = y_scaler.inverse_transform(
+            model.predict(scaler.transform(X).astype(np.float32), verbose=0)).ravel()
+        np.testing.assert_allclose(restored.predict(X), expected, rtol=1e-5)
+        assert restored.target_scaler().mean_[0] == y_scaler.mean_[0]
+
+    def test_version_mismatch(self, temp_dir):
+        """形式バージョンが異なるバンドルは読み込まない"""
+        X, y = _synthetic()
+        bundle = artifact.build_artifact("RandomForest", artifact.FORMAT_SKLEARN, None, None, X, y, COLUMNS)
+        bundle.format_version = artifact.ARTIFACT_FORMAT_VERSION + 1
+        path = artifact.bundle_path(str(temp_dir / "model.sav"))
+        artifact.save_artifact(path, bundle)
+
+        with pytest.raises(ValueError, match="形式バージョン"):
+            artifact.load_artifact(path)
+
+
+class TestSklearnStorage:
+    """RandomForest のノード配列ファイルでの保存・.sav の参照のテスト"""
+
+    def _save(self, temp_dir, write_sav: bool = True):
+        """学習スクリプトと同じ順（.sav → バンドル）で保存する"""
+        X, y = _synthetic()
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        model_path = temp_dir / "model.sav"
+        if write_sav:
+            model_path.write_bytes(pickle.dumps(model))
+        path = artifact.bundle_path(str(model_path))
+        artifact.save_artifact(path, artifact.build_artifact(
+            "RandomForest", artifact.FORMAT_SKLEARN, model, None, X, y, COLUMNS))
+        return path, model, X
+
+    def test_no_pickle_in_bundle(self, temp_dir):
+        """バンドルは pickle を持たず、ノード配列ファイルと .sav のハッシュを記録する"""
+        path, model, X = self._save(temp_dir)
+
+        with np.load(path) as npz:
+            assert "model" not in npz.files
+            meta = json.loads(npz["meta"].tobytes().decode("utf-8"))
+        assert meta["model_file"] == {"name": "model.sav", "sha256": artifact.file_hash(str(temp_dir / "model.sav"))}
+        np.testing.assert_allclose(artifact.load_artifact(path).predict(X), model.predict(X), rtol=1e-12)
+
+    def test_library_model_from_sav(self, temp_dir, monkeypatch):
+        """library_model=True・AI_TREE_NUMPY=0 では .sav の推定器を読み込む"""
+        path, model, X = self._save(temp_dir)
+
+        restored = artifact.load_artifact(path, library_model=True)
+        monkeypatch.setenv("AI_TREE_NUMPY", "0")
+
+        assert isinstance(restored.model, RandomForestRegressor)
+        assert isinstance(artifact.load_artifact(path).model, RandomForestRegressor)
+        np.testing.assert_array_equal(restored.predict(X), model.predict(X))
+
+    def test_missing_or_updated_sav(self, temp_dir, monkeypatch):
+        """.sav がない・バンドル保存後に更新された場合、予測はノード配列、追加学習用の読み込みはValueError"""
+        monkeypatch.setenv("AI_TREE_NUMPY", "0")
+        path, model, X = self._save(temp_dir)
+        (temp_dir / "model.sav").write_bytes(pickle.dumps(RandomForestRegressor(n_estimators=1).fit(X, X[:, 0])))
+
+        assert isinstance(artifact.load_artifact(path).model, TreeEnsemble)
+        with pytest.raises(ValueError, match="モデル本体を復元できません"):
+            artifact.load_artifact(path, library_model=True)
+
+        path, model, X = self._save(temp_dir / "no_sav", write_sav=False)
+        np.testing.assert_allclose(artifact.load_artifact(path).predict(X), model.predict(X), rtol=1e-12)
+
+
+class TestModelArtifact:
+    """バンドルの前処理のテスト"""
+
+    def test_select_features_reorders(self):
+        """学習時の列順で特徴量を取り出し、不足している列はValueError"""
+        X, y = _synthetic(10)
+        bundle = artifact.build_artifact("RandomForest", artifact.FORMAT_SKLEARN, None, None, X, y, COLUMNS)
+        frame = pd.DataFrame(X, columns=COLUMNS)[["TEMP", "HOUR", "MONTH", "WEEK"]]
+
+        np.testing.assert_array_equal(bundle.select_features(frame), X)
+        with pytest.raises(ValueError, match="特徴量列が不足"):
+            bundle.select_features(frame.drop(columns=["TEMP"]))
+
+    def test_invalid_arguments(self):
+        """未対応のモデル形式・列名と特徴量数の不一致はValueError"""
+        X, y = _synthetic(10)
+        with pytest.raises(ValueError, match="未対応のモデル形式"):
+            artifact.build_artifact("PyCaret", "pycaret", None, None, X, y, COLUMNS)
+        with pytest.raises(ValueError, match="一致しません"):
+            artifact.build_artifact("RandomForest", artifact.FORMAT_SKLEARN, None, None, X, y, COLUMNS[:3])
+
+    def test_clip_to_training_range(self):
+        """学習データの範囲外の特徴量をクリップする"""
+        X, y = _synthetic()
+        bundle = artifact.build_artifact("RandomForest", artifact.FORMAT_SKLEARN, None, None, X, y, COLUMNS)
+
+        clipped = bundle.clip(np.array([[0, 0, 30, 50]], dtype=np.float32))
+
+        np.testing.assert_array_equal(clipped, [[1, 0, 23, X[:, 3].max()]])
+
+
+class TestFindArtifact:
+    """翌日予測用のバンドル検索のテスト"""
+
+    def test_missing_or_corrupt(self, temp_dir):
+        """バンドルがない・壊れている場合は None（旧形式のモデルファイルを使用）"""
+        model_path = str(temp_dir / "LightGBM_model.sav")
+        assert artifact.find_artifact(model_path) is None
+
+        Path(artifact.bundle_path(model_path)).write_bytes(b"broken")
+
+        assert artifact.find_artifact(model_path) is None
+
+    def test_read_feature_columns(self, temp_dir):
+        """学習用特徴量CSVのヘッダーから列名を読み込む"""
+        X, _ = _synthetic(10)
+        xtrain_csv = temp_dir / "Xtrain.csv"
+        pd.DataFrame(X, columns=COLUMNS).to_csv(xtrain_csv, index=False)
+
+        assert dataset.read_feature_columns(str(xtrain_csv)) == COLUMNS
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for data/backfill_temperature.py module（過去気温データの一括取得）
+
+注意:
+- Open-Meteo には接続しない（ローカルのHTTPサーバーで過去データAPIを代替する）。
+"""
+
+import json
+import sys
+import threading
+import time
+import pytest
+import numpy as np
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from data import backfill_temperature as backfill
+from data import data as data_module
+from tomorrow import temp as tomorrow_temp
+from common.parsers import parse_jma_temperature
+from common.stations import Station
+
+
+NOW = np.datetime64("2025-03-20T12:00:00")
+TOKYO = (Station("東京", 35.6785, 139.6823, 1.0),)
+TWO_STATIONS = (Station("東京", 35.6785, 139.6823, 3.0), Station("横浜", 35.4383, 139.6517, 1.0))
+
+
+def _temperature(hours: np.ndarray, latitude: float) -> np.ndarray:
+    """時間・地点ごとに決まる合成気温"""
+    return np.round(10 + (hours.astype("int64") % 24) * 0.5 + (latitude - 35.6785) * 10, 1)
+
+
+class _ArchiveHandler(BaseHTTPRequestHandler):
+    """過去データAPIの代替（緯度・経度のカンマ区切り指定で地点ごとのリストを返す）"""
+
+    def do_GET(self):
+        server = self.server
+        query = {key: values[0] for key, values in parse_qs(urlparse(self.path).query).items()}
+        start, end = query["start_date"], query["end_date"]
+        with server.lock:
+            server.requests.append((start, end, query["latitude"]))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            fail = start in server.fail_starts
+            server.fail_starts.discard(start)
+        if fail:
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        hours = np.arange(np.datetime64(start, "h"), np.datetime64(end, "h") + np.timedelta64(24, "h"))
+        items = [{"hourly": {"time": [str(h) + ":00" for h in hours],
+                             "temperature_2m": _temperature(hours, float(lat)).tolist()}}
+                 for lat in query["latitude"].split(",")]
+        body = json.dumps(items[0] if len(items) == 1 else items).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def archive_server(temp_dir, monkeypatch):
+    """過去データAPIを代替するローカルHTTPサーバー（気温キャッシュは一時ディレクトリ）"""
+    monkeypatch.delenv("AI_TEMP_CACHE", raising=False)
+    monkeypatch.setattr(tomorrow_temp, "config",
+                        tomorrow_temp.TempConfig(TEMP_CACHE_DIR=str(temp_dir / "temperature")))
+    monkeypatch.setattr(tomorrow_temp, "local_now", lambda timezone: NOW)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ArchiveHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.delay = 0.0
+    server.active = 0
+    server.max_active = 0
+    server.fail_starts = set()
+    server.url = "http://127.0.0.1:%d/v1/archive" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _run(server, temp_dir, years, stations=TOKYO, **kwargs):
+    kwargs.setdefault("min_interval", 0.0)
+    return backfill.backfill_temperature(years, stations=stations, data_dir=str(temp_dir),
+                                         base_url=server.url, **kwargs)
+
+
+class TestYearChunks:
+    """取得期間の分割のテスト"""
+
+    def test_full_year(self):
+        """1年（＋翌年1/1）を最大日数ごとに分割"""
+        chunks = backfill.year_chunks(2024, np.datetime64("2025-03-15"), chunk_days=92)
+
+        assert chunks == [("2024-01-01", "2024-04-01"), ("2024-04-02", "2024-07-02"),
+                          ("2024-07-03", "2024-10-02"), ("2024-10-03", "2025-01-01")]
+
+    def test_next_day_merged_into_last_chunk(self):
+        """翌年1/1のみの期間は作らず直前の期間に含める"""
+        chunks = backfill.year_chunks(2023, np.datetime64("2024-06-01"), chunk_days=365)
+
+        assert chunks == [("2023-01-01", "2024-01-01")]
+
+    def test_current_year_until_last_day(self):
+        """当年は取得可能な最終日まで"""
+        assert backfill.year_chunks(2025, np.datetime64("2025-03-15"), chunk_days=92) == [
+            ("2025-01-01", "2025-03-15")]
+
+
+class TestBackfillTemperature:
+    """過去気温データ一括取得のテスト"""
+
+    def test_writes_jma_layout(self, archive_server, temp_dir):
+        """気象庁形式（1/1 1:00 〜 翌年1/1 0:00）で年ファイルを作成し、data.py で読み込める"""
+        results = _run(archive_server, temp_dir, [2024])
+
+        path = temp_dir / "temperature-2024.csv"
+        assert results == {2024: str(path)}
+        parsed = parse_jma_temperature(str(path))
+        hours = parsed.datetimes().astype("datetime64[h]")
+        assert parsed.stations == ["東京"]
+        assert len(parsed) == 366 * 24
+        assert hours[0] == np.datetime64("2024-01-01T01") and hours[-1] == np.datetime64("2025-01-01T00")
+        np.testing.assert_allclose(parsed.columns["TEMP"], _temperature(hours, 35.6785))
+        assert not backfill.needs_backfill(str(path), 2024)
+
+        df = data_module._read_temperature_csv(str(path))
+        np.testing.assert_allclose(df["TEMP"], _temperature(hours, 35.6785))
+
+    def test_chunks_fetched_concurrently(self, archive_server, temp_dir):
+        """期間ごとのリクエストを並列実行（所要時間は合計より短い）"""
+        archive_server.delay = 0.3
+        start = time.perf_counter()
+        _run(archive_server, temp_dir, [2024], max_workers=4)
+        elapsed = time.perf_counter() - start
+
+        assert len(archive_server.requests) == 4
+        assert archive_server.max_active > 1
+        assert elapsed < 0.3 * 4 - 0.2
+
+    def test_rate_limited(self, archive_server, temp_dir):
+        """リクエスト開始間隔は min_interval 以上"""
+        start = time.perf_counter()
+        _run(archive_server, temp_dir, [2024], max_workers=4, min_interval=0.2)
+        elapsed = time.perf_counter() - start
+
+        assert len(archive_server.requests) == 4
+        assert elapsed >= 0.2 * 3
+
+    def test_resumes_after_failure(self, archive_server, temp_dir):
+        """失敗した期間がある年は書き込まず、再実行では未取得の期間のみリクエストする"""
+        archive_server.fail_starts = {"2024-07-03"}
+        assert _run(archive_server, temp_dir, [2024]) == {2024: None}
+        assert not (temp_dir / "temperature-2024.csv").exists()
+
+        results = _run(archive_server, temp_dir, [2024])
+
+        assert results[2024] == str(temp_dir / "temperature-2024.csv")
+        assert [r[:2] for r in archive_server.requests[4:]] == [("2024-07-03", "2024-10-02")]
+
+    def test_current_year_refreshed(self, archive_server, temp_dir):
+        """当年は公開済みの日まで作成し、年末まで揃っていないため再実行の対象になる"""
+        _run(archive_server, temp_dir, [2025])
+
+        path = temp_dir / "temperature-2025.csv"
+        hours = parse_jma_temperature(str(path)).datetimes().astype("datetime64[h]")
+        assert hours[-1] == np.datetime64("2025-03-15T23")
+        assert backfill.needs_backfill(str(path), 2025)
+
+    def test_existing_jma_file_kept(self, temp_dir):
+        """気象庁からダウンロードしたファイルは作成対象にしない"""
+        (temp_dir / "juyo-2024.csv").write_text("", encoding="shift_jis")
+        (temp_dir / "juyo-2025.csv").write_text("", encoding="shift_jis")
+        (temp_dir / "temperature-2024.csv").write_text(
+            "ダウンロードした時刻：2025/01/21 13:57:39\n\n,東京,東京,東京\n年月日時,気温(℃),気温(℃),気温(℃)\n"
+            ",,品質情報,均質番号\n2024/1/1 1:00:00,9.0,8,1\n", encoding="shift_jis")
+
+        assert backfill.missing_years(str(temp_dir)) == [2025]
+
+    def test_multiple_stations_weighted_by_data(self, archive_server, temp_dir, monkeypatch):
+        """複数地点は1リクエストで取得して地点別の列で保存し、data.py が地点セットの重みで加重平均する"""
+        _run(archive_server, temp_dir, [2024], stations=TWO_STATIONS)
+
+        assert all(r[2] == "35.6785,35.4383" for r in archive_server.requests)
+        path = str(temp_dir / "temperature-2024.csv")
+        parsed = parse_jma_temperature(path)
+        assert parsed.stations == ["東京", "横浜"]
+
+        monkeypatch.setenv("AI_TEMP_STATIONS", "東京:35.6785:139.6823:3;横浜:35.4383:139.6517:1")
+        hours = parsed.datetimes().astype("datetime64[h]")
+        expected = (_temperature(hours, 35.6785) * 3 + _temperature(hours, 35.4383)) / 4
+        np.testing.assert_allclose(data_module._read_temperature_csv(path)["TEMP"], expected)
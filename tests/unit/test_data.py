@@ -137,5 +137,219 @@ class TestDataIntegration:
             data_module.get_common_years(power_files, temp_files)
 
 
+def _write_juyo_csv(path: Path, rows: list) -> None:
+    """TEPCO形式（ヘッダー3行）の電力データCSVを作成"""
+    lines = ["2024/1/2 5:40 UPDATE", "", "DATE,TIME,実績(万kW)"] + rows
+    path.write_text("\n".join(lines) + "\n", encoding='shift_jis')
+
+
+def _write_temperature_csv(path: Path, rows: list) -> None:
+    """気象庁形式（ヘッダー5行）の気温データCSVを作成"""
+    lines = [
+        "ダウンロードした時刻：2024/01/02 13:57:39",
+        "",
+        ",東京,東京,東京",
+        "年月日時,気温(℃),気温(℃),気温(℃)",
+        ",,品質情報,均質番号",
+    ] + rows
+    path.write_text("\n".join(lines) + "\n", encoding='shift_jis')
+
+
+class TestParseCache:
+    """年単位パース済みCSVキャッシュのテスト"""
+
+    @pytest.fixture
+    def year_files(self, temp_dir, monkeypatch):
+        monkeypatch.delenv('AI_DATA_CACHE', raising=False)
+        power = temp_dir / "juyo-2024.csv"
+        temp = temp_dir / "temperature-2024.csv"
+        _write_juyo_csv(power, ["2024/1/1,0:00,2402", "2024/1/1,1:00,2286", "2024/1/1,2:00,2200"])
+        _write_temperature_csv(temp, ["2024/1/1 0:00:00,9.0,8,1", "2024/1/1 1:00:00,,8,1", "2024/1/1 2:00:00,8.5,8,1"])
+        return power, temp
+
+    def test_cache_created_and_reused(self, year_files):
+        """2回目以降はCSVの検証・デコードを行わずにキャッシュから復元される"""
+        power, temp = year_files
+        power_map, temp_map = {"2024": str(power)}, {"2024": str(temp)}
+
+        power_first = data_module.load_power_data([str(power)], power_map, ["2024"])
+        temp_first = data_module.load_temperature_data([str(temp)], temp_map, ["2024"])
+        assert os.path.exists(data_module.get_cache_path(str(power)))
+        assert os.path.exists(data_module.get_cache_path(str(temp)))
+
+        with patch.object(data_module, 'validate_csv_file') as mock_validate, \
+                patch.object(data_module.pd, 'read_csv') as mock_read:
+            power_cached = data_module.load_power_data([str(power)], power_map, ["2024"])
+            temp_cached = data_module.load_temperature_data([str(temp)], temp_map, ["2024"])
+            mock_validate.assert_not_called()
+            mock_read.assert_not_called()
+
+        pd.testing.assert_frame_equal(power_first, power_cached)
+        pd.testing.assert_frame_equal(temp_first, temp_cached)
+        assert power_cached['KW'].dtype == np.int32
+
+    def test_cache_invalidated_on_change(self, year_files):
+        """ソースCSVが更新されるとキャッシュを破棄して再読み込みする"""
+        power, _ = year_files
+        power_map = {"2024": str(power)}
+        data_module.load_power_data([str(power)], power_map, ["2024"])
+
+        _write_juyo_csv(power, ["2024/1/1,0:00,2402", "2024/1/1,1:00,2286", "2024/1/1,2:00,9999"])
+        reloaded = data_module.load_power_data([str(power)], power_map, ["2024"])
+        assert reloaded['KW'].tolist() == [2402, 2286, 9999]
+
+    def test_cache_survives_mtime_only_change(self, year_files):
+        """内容が同一で更新時刻のみ変わった場合はハッシュ照合でキャッシュを採用する"""
+        power, _ = year_files
+        power_map = {"2024": str(power)}
+        data_module.load_power_data([str(power)], power_map, ["2024"])
+
+        stat = os.stat(power)
+        os.utime(power, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with patch.object(data_module.pd, 'read_csv') as mock_read:
+            data_module.load_power_data([str(power)], power_map, ["2024"])
+            mock_read.assert_not_called()
+
+    def test_cache_disabled_by_env(self, year_files, monkeypatch):
+        """AI_DATA_CACHE=0 でキャッシュを使用しない"""
+        power, _ = year_files
+        monkeypatch.setenv('AI_DATA_CACHE', '0')
+        data_module.load_power_data([str(power)], {"2024": str(power)}, ["2024"])
+        assert not os.path.exists(data_module.get_cache_path(str(power)))
+
+
+class TestParallelYearProcessing:
+    """年単位並列読み込み・前処理のテスト"""
+
+    def test_resolve_max_workers(self, monkeypatch):
+        """ワーカー数は環境変数で指定でき、年数を上限とする"""
+        monkeypatch.setenv('AI_DATA_WORKERS', '8')
+        assert data_module.resolve_max_workers(3) == 3
+        monkeypatch.setenv('AI_DATA_WORKERS', '1')
+        assert data_module.resolve_max_workers(3) == 1
+        monkeypatch.setenv('AI_DATA_WORKERS', 'invalid')
+        assert 1 <= data_module.resolve_max_workers(3) <= 3
+
+    def test_parallel_matches_serial(self, temp_dir, monkeypatch):
+        """並列処理の結果が逐次処理と一致する"""
+        monkeypatch.setenv('AI_DATA_CACHE', '0')
+        power_map, temp_map = {}, {}
+        for year in ("2023", "2024"):
+            power = temp_dir / f"juyo-{year}.csv"
+            temp = temp_dir / f"temperature-{year}.csv"
+            _write_juyo_csv(power, [f"{year}/1/1,{h}:00,{2000 + h}" for h in range(24)])
+            _write_temperature_csv(temp, [f"{year}/1/1 {h}:00:00,{h / 2},8,1" for h in range(24)])
+            power_map[year], temp_map[year] = str(power), str(temp)
+        years = ["2023", "2024"]
+
+        power_serial = data_module.process_power_data(
+            data_module.load_power_data(list(power_map.values()), power_map, years))
+        temp_serial = data_module.process_temperature_data(
+            data_module.load_temperature_data(list(temp_map.values()), temp_map, years))
+        power_parallel, temp_parallel = data_module.load_and_process_years(power_map, temp_map, years, 2)
+
+        pd.testing.assert_frame_equal(power_serial, power_parallel)
+        pd.testing.assert_frame_equal(temp_serial, temp_parallel)
+
+
+class TestFeatureStore:
+    """年単位マージ済み特徴量ストアのテスト"""
+
+    @pytest.fixture
+    def year_maps(self, temp_dir, monkeypatch):
+        monkeypatch.delenv('AI_DATA_CACHE', raising=False)
+        monkeypatch.setenv('AI_DATA_WORKERS', '1')
+        power_map, temp_map = {}, {}
+        for year in ("2023", "2024"):
+            power = temp_dir / f"juyo-{year}.csv"
+            temp = temp_dir / f"temperature-{year}.csv"
+            _write_juyo_csv(power, [f"{year}/12/31,{h}:00,{3000 + h}" for h in range(20, 24)]
+                            + [f"{year}/1/1,{h}:00,{2000 + h}" for h in range(3)])
+            # 気象庁形式は1時〜翌年1月1日0時（24時）を1年分として保持する
+            _write_temperature_csv(temp, [f"{year}/1/1 {h}:00:00,{h / 2},8,1" for h in range(1, 3)]
+                                   + [f"{year}/12/31 {h}:00:00,{h / 4},8,1" for h in range(20, 24)]
+                                   + [f"{int(year) + 1}/1/1 0:00:00,1.5,8,1"])
+            power_map[year], temp_map[year] = str(power), str(temp)
+        return power_map, temp_map
+
+    def _legacy_merge(self, power_map, temp_map, years):
+        power_df = data_module.process_power_data(
+            data_module.load_power_data(list(power_map.values()), power_map, years))
+        temp_df = data_module.process_temperature_data(
+            data_module.load_temperature_data(list(temp_map.values()), temp_map, years))
+        return data_module.merge_data(power_df, temp_df)
+
+    def test_store_matches_full_merge(self, year_maps):
+        """年境界を含めて、結合結果が全年一括マージと一致する"""
+        power_map, temp_map = year_maps
+        for years in (["2023", "2024"], ["2024"]):
+            expected_X, expected_y = data_module.create_feature_target_data(
+                self._legacy_merge(power_map, temp_map, years))
+            actual_X, actual_y = data_module.create_feature_target_data(
+                data_module.load_feature_store(power_map, temp_map, years))
+            pd.testing.assert_frame_equal(expected_X, actual_X)
+            pd.testing.assert_frame_equal(expected_y, actual_y)
+        # 2024/1/1 0:00 の気温は2023年ファイルにのみ存在する
+        assert len(data_module.load_feature_store(power_map, temp_map, ["2023", "2024"])) == \
+            len(data_module.load_feature_store(power_map, temp_map, ["2023"])) + \
+            len(data_module.load_feature_store(power_map, temp_map, ["2024"])) + 1
+
+    def test_only_changed_year_rebuilt(self, year_maps):
+        """ソースが変更された年のパーティションのみ再作成される"""
+        power_map, temp_map = year_maps
+        data_module.load_feature_store(power_map, temp_map, ["2023", "2024"])
+
+        _write_juyo_csv(Path(power_map["2024"]), ["2024/1/1,1:00,1234", "2024/1/1,2:00,2345"])
+        with patch.object(data_module, 'load_and_process_year',
+                          wraps=data_module.load_and_process_year) as mock_year:
+            merged = data_module.load_feature_store(power_map, temp_map, ["2023", "2024"])
+            assert [c.args[0] for c in mock_year.call_args_list] == ["2024"]
+        assert merged.loc["2024-01-01 01:00:00", "KW"] == 1234
+
+
+class TestHolidayCalendar:
+    """祝日カレンダー・連休判定のテスト"""
+
+    @pytest.mark.parametrize("date_str", [
+        "2019-05-01",  # 即位の日
+        "2019-04-30",  # 国民の休日
+        "2020-07-24",  # スポーツの日（東京五輪特例）
+        "2021-08-09",  # 山の日の振替休日
+        "2023-01-02",  # 元日の振替休日
+        "2024-03-20",  # 春分の日
+        "2026-09-22",  # 国民の休日（敬老の日と秋分の日の間）
+        "2031-02-24",  # 天皇誕生日の振替休日（2025年以降も対応）
+    ])
+    def test_special_holidays(self, date_str):
+        """振替休日・国民の休日・特例祝日が検出される"""
+        index = pd.DatetimeIndex([date_str + " 12:00"])
+        assert data_module._detect_holidays(index).iloc[0] == 1
+
+    def test_regular_days_not_holiday(self):
+        """平日・祝日廃止後の日付は祝日にならない"""
+        index = pd.DatetimeIndex(["2019-12-23", "2024-07-16", "2024-12-23"])
+        assert data_module._detect_holidays(index).tolist() == [0, 0, 0]
+
+    def test_holiday_count_per_year(self):
+        """年間の祝日数（振替休日を含む）"""
+        assert len(data_module.get_holiday_table(2024, 2024)) == 21
+        assert len(data_module.get_holiday_table(2019, 2019)) == 22
+        assert len(data_module.get_holiday_table(2016, 2025)) == \
+            sum(len(data_module.get_holiday_table(y, y)) for y in range(2016, 2026))
+
+    def test_out_of_range_year_raises(self):
+        """対応範囲外の年はValueError"""
+        with pytest.raises(ValueError, match="対応範囲外"):
+            data_module.get_holiday_table(1999, 2001)
+
+    def test_long_weekends_by_calendar_day(self):
+        """3日以上連続する休日のみ連休と判定される（時間単位インデックス）"""
+        index = pd.date_range("2025-04-26", "2025-05-07 23:00", freq="h")
+        flags = data_module._detect_long_weekends(index, data_module._detect_holidays(index))
+        daily = flags.resample("D").max()
+        long_days = [d.strftime("%m-%d") for d in daily[daily == 1].index]
+        assert long_days == ["05-03", "05-04", "05-05", "05-06"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/dataset.py module
+"""
+
+import os
+import shutil
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import dataset
+from data import data as data_module
+
+
+@pytest.fixture
+def feature_frames():
+    """特徴量・目的変数のサンプルデータ（data.py の出力と同じ列・dtype）"""
+    n = 50
+    rng = np.random.default_rng(0)
+    X_df = pd.DataFrame({
+        "MONTH": (np.arange(n) % 12 + 1).astype("int8"),
+        "WEEK": (np.arange(n) % 7).astype("int8"),
+        "HOUR": (np.arange(n) % 24).astype("int8"),
+        "TEMP": np.round(rng.uniform(-5, 35, n), 1).astype("float32"),
+    })
+    y_df = pd.DataFrame({"KW": rng.integers(2000, 5000, n).astype("int32")})
+    return X_df, y_df
+
+
+def _csv_paths(directory: Path) -> list:
+    return [str(directory / f"{name}.csv") for name in ("X", "Y", "Xtrain", "Xtest", "Ytrain", "Ytest")]
+
+
+def _save(directory: Path, X_df, y_df, dataset_format: str, split_csv: bool = False) -> list:
+    directory.mkdir(parents=True, exist_ok=True)
+    x_csv, y_csv, xtrain, xtest, ytrain, ytest = _csv_paths(directory)
+    data_module.save_datasets(X_df, y_df, x_csv, y_csv, 0.2, xtrain, xtest, ytrain, ytest,
+                              dataset_format=dataset_format, split_csv=split_csv)
+    return [xtrain, xtest, ytrain, ytest]
+
+
+class TestDatasetFormat:
+    """出力形式指定のテスト"""
+
+    def test_default_is_csv(self, monkeypatch):
+        """未指定時はCSV"""
+        monkeypatch.delenv("AI_DATASET_FORMAT", raising=False)
+        assert dataset.resolve_dataset_format() == "csv"
+
+    def test_env_var(self, monkeypatch):
+        """環境変数 AI_DATASET_FORMAT で指定できる"""
+        monkeypatch.setenv("AI_DATASET_FORMAT", "Binary")
+        assert dataset.resolve_dataset_format() == "binary"
+
+    def test_invalid_format_raises(self):
+        """未対応の形式はValueError"""
+        with pytest.raises(ValueError, match="未対応のデータセット形式"):
+            dataset.resolve_dataset_format("parquet")
+
+    def test_split_csv_opt_in(self, monkeypatch):
+        """学習・テスト別CSVは AI_DATASET_SPLIT_CSV が有効値の場合のみ出力"""
+        monkeypatch.delenv("AI_DATASET_SPLIT_CSV", raising=False)
+        assert not dataset.is_split_csv_enabled()
+        for value, expected in (("1", True), ("true", True), ("0", False), ("off", False)):
+            monkeypatch.setenv("AI_DATASET_SPLIT_CSV", value)
+            assert dataset.is_split_csv_enabled() == expected
+
+
+class TestBinaryDataset:
+    """バイナリデータセットの保存・読み込みのテスト"""
+
+    def test_binary_matches_csv(self, temp_dir, feature_frames):
+        """バイナリ形式の読み込み結果は学習・テスト別CSVとdtype・形状・値が一致"""
+        X_df, y_df = feature_frames
+        csv_paths = _save(temp_dir / "csv", X_df, y_df, "csv", split_csv=True)
+        shutil.rmtree(temp_dir / "csv" / "dataset")  # バイナリデータセットのない従来のデータディレクトリ
+        csv_split = dataset.load_training_split(*csv_paths)
+        bin_split = dataset.load_training_split(*_save(temp_dir / "bin", X_df, y_df, "binary"))
+
+        assert csv_split.source == "csv"
+        assert bin_split.source == "binary"
+        for expected, actual in zip(csv_split.arrays(), bin_split.arrays()):
+            assert actual.dtype == expected.dtype
+            assert actual.shape == expected.shape
+            np.testing.assert_array_equal(actual, expected)
+        assert bin_split.feature_columns == ["MONTH", "WEEK", "HOUR", "TEMP"]
+
+    def test_binary_only_writes_no_csv(self, temp_dir, feature_frames):
+        """binary指定時はCSVを出力しない"""
+        X_df, y_df = feature_frames
+        _save(temp_dir, X_df, y_df, "binary")
+
+        assert not any(os.path.exists(p) for p in _csv_paths(temp_dir))
+        assert dataset.read_dataset_meta(str(temp_dir / "dataset"))["n_rows"] == len(X_df)
+
+    def test_memory_mapped_views(self, temp_dir, feature_frames):
+        """連続範囲の分割はメモリマップのビューとして返る（コピーなし）"""
+        X_df, y_df = feature_frames
+        _save(temp_dir, X_df, y_df, "binary")
+        split = dataset.load_binary_dataset(str(temp_dir / "dataset"), dtype=np.float32)
+
+        assert isinstance(split.X_train, np.memmap)
+        assert isinstance(split.X_test, np.memmap)
+        assert not split.X_train.flags.writeable
+
+    def test_non_contiguous_index(self, temp_dir):
+        """連続していないテスト行マスクも取り出せる"""
+        X = np.arange(20, dtype=np.float32).reshape(10, 2)
+        y = np.arange(10)
+        test_mask = np.arange(10) % 2 == 1
+        dataset.save_binary_dataset(str(temp_dir), X, y, test_mask, ["A", "B"], ["KW"])
+        split = dataset.load_binary_dataset(str(temp_dir))
+
+        np.testing.assert_array_equal(split.y_train, [0, 2, 4, 6, 8])
+        np.testing.assert_array_equal(split.X_test[:, 0], [2, 6, 10, 14, 18])
+
+    def test_newer_csv_takes_precedence(self, temp_dir, feature_frames):
+        """CSVがバイナリデータセットより新しい場合はCSVを読み込む"""
+        X_df, y_df = feature_frames
+        paths = _save(temp_dir, X_df, y_df, "csv", split_csv=True)
+        assert dataset.load_training_split(*paths).source == "binary"
+
+        meta_mtime = os.stat(temp_dir / "dataset" / "meta.json").st_mtime_ns
+        os.utime(paths[0], ns=(meta_mtime + 10**9, meta_mtime + 10**9))
+        assert dataset.load_training_split(*paths).source == "csv"
+
+    def test_csv_format_saves_split(self, temp_dir, feature_frames):
+        """既定のCSV形式でも分割マスク・メタ情報を保存し、学習・テスト別CSVは出力しない"""
+        X_df, y_df = feature_frames
+        paths = _save(temp_dir, X_df, y_df, "csv")
+
+        assert (temp_dir / "X.csv").exists() and (temp_dir / "Y.csv").exists()
+        assert not any(os.path.exists(p) for p in paths)
+        meta = dataset.read_dataset_meta(str(temp_dir / "dataset"))
+        assert (meta["n_train"], meta["n_test"]) == (40, 10)
+        split = dataset.load_training_split(*paths)
+        assert split.source == "binary"
+        np.testing.assert_array_equal(split.y_test, y_df["KW"].to_numpy()[40:])
+
+    def test_stale_split_csv_removed(self, temp_dir, feature_frames):
+        """学習・テスト別CSVを出力しない場合、以前に出力したものを削除"""
+        X_df, y_df = feature_frames
+        paths = _save(temp_dir, X_df, y_df, "csv", split_csv=True)
+        assert all(os.path.exists(p) for p in paths)
+
+        _save(temp_dir, X_df, y_df, "csv")
+
+        assert not any(os.path.exists(p) for p in paths)
+
+    def test_single_file_helpers_match_csv(self, temp_dir, feature_frames):
+        """CSV1ファイル単位の読み込み・特徴量DataFrameもCSVと一致"""
+        X_df, y_df = feature_frames
+        xtrain, xtest, ytrain, ytest = _save(temp_dir, X_df, y_df, "csv", split_csv=True)
+        for path in (xtrain, xtest, ytrain, ytest):
+            expected = pd.read_csv(path).values.astype("float32")
+            actual = dataset.load_dataset_array(path, dtype="float32")
+            assert actual.shape == expected.shape
+            np.testing.assert_array_equal(actual, expected)
+
+        pd.testing.assert_frame_equal(dataset.load_feature_frame(xtrain), pd.read_csv(xtrain), check_dtype=False)
+
+
+class TestSplitMask:
+    """テスト行マスクのテスト"""
+
+    def test_matches_train_test_split(self):
+        """train_test_split(shuffle=False) と同じ行配分"""
+        from sklearn.model_selection import train_test_split
+        for n_rows, test_size in ((100, 0.1), (76723, 0.1), (7, 0.3)):
+            _, test_index = train_test_split(np.arange(n_rows), test_size=test_size, shuffle=False)
+            mask = dataset.split_test_mask(n_rows, test_size)
+            np.testing.assert_array_equal(np.flatnonzero(mask), test_index)
+
+    def test_mask_length_mismatch_raises(self, temp_dir):
+        """マスクの行数が一致しない場合はValueError"""
+        with pytest.raises(ValueError, match="分割マスクの行数"):
+            dataset.save_binary_dataset(str(temp_dir), np.zeros((5, 1)), np.zeros(5), np.zeros(4, bool), ["A"], ["KW"])
+
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for train/LightGBM/LightGBM_train.py module（Datasetバイナリキャッシュ・早期終了）
+
+注意:
+- 合成データで学習する（data/ 配下のデータセットは使用しない）。
+"""
+
+import os
+import pickle
+import sys
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import pipeline
+
+lgbm_train = pipeline.load_trainer("LightGBM")
+
+
+def _synthetic(n_rows: int = 2000):
+    """需要に似た非線形の合成データ（float32特徴量・int32目的変数）"""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(n_rows, 4)).astype(np.float32)
+    y = (3000 + X[:, 0] * 100 + X[:, 1] ** 2 * 50 + rng.normal(size=n_rows) * 5).astype(np.int32)
+    return X, y
+
+
+@pytest.fixture(autouse=True)
+def cache_enabled(monkeypatch):
+    """環境変数によるキャッシュ無効化の影響を受けないようにする"""
+    monkeypatch.delenv(lgbm_train.config.DATASET_CACHE_ENV_VAR, raising=False)
+
+
+class TestSplitValidation:
+    """早期終了用の検証データ分割のテスト"""
+
+    def test_tail_rows_used(self):
+        """学習データの末尾（最新の行）を検証データにする"""
+        X, y = _synthetic(1000)
+        X_fit, X_valid, y_fit, y_valid = lgbm_train.split_validation(X, y)
+
+        assert len(X_valid) == 100
+        np.testing.assert_array_equal(X_fit, X[:900])
+        np.testing.assert_array_equal(y_valid, y[900:])
+
+    def test_too_few_rows(self):
+        """検証データを確保できない行数では分割しない"""
+        X, y = _synthetic(100)
+        X_fit, X_valid, _, y_valid = lgbm_train.split_validation(X, y)
+
+        assert X_fit is X and X_valid is None and y_valid is None
+
+
+class TestTrainLightGBMModel:
+    """Datasetキャッシュ・早期終了付き学習のテスト"""
+
+    def test_early_stopping(self, temp_dir, monkeypatch):
+        """検証データの損失が改善しなくなった時点で終了し、最良の反復数で全期間を学習し直す"""
+        X, y = _synthetic()
+        calls = []
+        original_train = lgbm_train.lgb.train
+
+        def recording_train(params, train_set, num_boost_round=100, **kwargs):
+            booster = original_train(params, train_set, num_boost_round=num_boost_round, **kwargs)
+            calls.append({"rows": train_set.num_data(), "best_iteration": booster.best_iteration,
+                          "iterations": booster.current_iteration()})
+            return booster
+
+        monkeypatch.setattr(lgbm_train.lgb, "train", recording_train)
+        model = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                cache_dir=str(temp_dir))
+
+        early, refit = calls
+        assert isinstance(model, lgbm_train.lgb.Booster)
+        assert early["rows"] == 1800 and 0 < early["best_iteration"] < lgbm_train.config.MAX_N_ESTIMATORS
+        assert refit["rows"] == len(X)
+        assert model.current_iteration() == refit["iterations"] == early["best_iteration"]
+
+    def test_refit_learns_newest_rows(self, temp_dir):
+        """全期間で学習し直したモデルは検証に使った最新の期間も学習している"""
+        X, y = _synthetic()
+        X[:, 3] = np.linspace(-1, 1, len(X))  # 時刻に相当する特徴量（最新の期間を木で区別できる）
+        y_shifted = y.copy()
+        y_shifted[1800:] += 500
+        base = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                               cache_dir=str(temp_dir))
+        shifted = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y_shifted,
+                                                  cache_dir=str(temp_dir))
+
+        assert np.mean(shifted.predict(X[1800:]) - base.predict(X[1800:])) > 250
+
+    def test_cached_dataset_reused(self, temp_dir):
+        """同じデータでは学習率を変えてもバイナリキャッシュ（早期終了用・全期間用）を読み込み、作成時と同じモデルになる"""
+        X, y = _synthetic()
+        first = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                cache_dir=str(temp_dir))
+        cache_files = os.listdir(temp_dir)
+        params = lgbm_train.booster_params(lgbm_train.create_lightgbm_model(learning_rate=0.05))
+        cached = [lgbm_train.build_training_dataset(X_part, y_part, params, str(temp_dir))[1]
+                  for X_part, y_part in ((X[:1800], y[:1800]), (X, y))]
+        second = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                 cache_dir=str(temp_dir))
+
+        assert len(cache_files) == 2 and all(name.endswith(".bin") for name in cache_files)
+        assert all(cached)
+        np.testing.assert_array_equal(first.predict(X), second.predict(X))
+
+    def test_matches_uncached(self, temp_dir, monkeypatch):
+        """キャッシュ無効時（環境変数）も同じモデルになり、キャッシュファイルは作らない"""
+        X, y = _synthetic()
+        cached = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                 cache_dir=str(temp_dir / "on"))
+        monkeypatch.setenv(lgbm_train.config.DATASET_CACHE_ENV_VAR, "0")
+        uncached = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                   cache_dir=str(temp_dir / "off"))
+
+        assert not (temp_dir / "off").exists()
+        np.testing.assert_array_equal(cached.predict(X), uncached.predict(X))
+
+    def test_corrupt_cache_rebuilt(self, temp_dir):
+        """壊れたキャッシュファイルは作成し直す"""
+        X, y = _synthetic()
+        params = lgbm_train.booster_params(lgbm_train.create_lightgbm_model())
+        path = temp_dir / f"{lgbm_train.dataset_cache_key(X, y, params)}.bin"
+        path.write_bytes(b"broken")
+
+        train_set, cached = lgbm_train.build_training_dataset(X, y, params, str(temp_dir))
+
+        assert not cached and train_set.num_data() == len(y)
+        assert lgbm_train.build_training_dataset(X, y, params, str(temp_dir))[1]
+
+    def test_pickled_model_compatible(self, temp_dir):
+        """保存形式は lgb.Booster（翌日予測の pickle 読み込み後も同じ予測値になる）"""
+        X, y = _synthetic()
+        model = lgbm_train.train_lightgbm_model(lgbm_train.create_lightgbm_model(), X, y,
+                                                cache_dir=str(temp_dir))
+
+        restored = pickle.loads(pickle.dumps(model))
+
+        assert isinstance(restored, lgbm_train.lgb.Booster)
+        assert lgbm_train.r2_score(y, restored.predict(X)) > 0.9
+        np.testing.assert_array_equal(restored.predict(X), model.predict(X))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/mlp.py module（Keras 全結合ネットワークの NumPy 推論）
+
+注意:
+- Keras モデルとの一致の確認は TensorFlow がある環境のみ実行する。
+"""
+
+import json
+import sys
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import artifact
+from common.mlp import DenseLayer, DenseMLP
+
+
+def _sequential_config(*layers) -> str:
+    """Sequential の to_json と同じ構造のモデル構成"""
+    return json.dumps({"class_name": "Sequential", "config": {"name": "sequential", "layers": [
+        {"class_name": class_name, "config": config} for class_name, config in layers]}})
+
+
+def _keras_mlp(tf, input_dim: int = 6):
+    """create_keras_model と同じ構成（Dense/ReLU と Dropout）の小さなモデル"""
+    layers = tf.keras.layers
+    return tf.keras.Sequential([
+        layers.Dense(32, input_dim=input_dim, activation="relu", name="hidden1"),
+        layers.Dropout(0.05, name="dropout1"),
+        layers.Dense(16, activation="relu", name="hidden2"),
+        layers.Dense(1, name="output"),
+    ])
+
+
+class TestDenseMLP:
+    """NumPy 推論のテスト"""
+
+    def test_matches_keras(self):
+        """Keras の model.predict と float32 の誤差範囲で一致する"""
+        tf = pytest.importorskip("tensorflow")
+        model = _keras_mlp(tf)
+        X = np.random.default_rng(0).normal(size=(336, 6)).astype(np.float32)
+
+        mlp = DenseMLP.from_keras_model(model)
+
+        assert [layer.activation for layer in mlp.layers] == ["relu", "relu", "linear"]
+        np.testing.assert_allclose(mlp.predict(X, verbose=0), model.predict(X, verbose=0), rtol=1e-5, atol=1e-5)
+
+    def test_forward_pass(self):
+        """Dropout を除外し、Dense 層の行列積・バイアス・活性化関数を順に適用する"""
+        config = _sequential_config(
+            ("InputLayer", {}),
+            ("Dense", {"units": 2, "activation": "relu", "use_bias": True}),
+            ("Dropout", {"rate": 0.5}),
+            ("Dense", {"units": 1, "activation": "linear", "use_bias": False}),
+        )
+        weights = [np.array([[1.0, -1.0], [2.0, 0.0]]), np.array([0.5, 0.0]), np.array([[1.0], [10.0]])]
+
+        mlp = DenseMLP.from_keras_config(config, weights)
+        y = mlp.predict(np.array([[1.0, 1.0], [-1.0, 0.0]]))
+
+        assert y.dtype == np.float32 and y.shape == (2, 1)
+        np.testing.assert_allclose(y, [[3.5], [10.0]])
+
+    def test_unsupported_layer(self):
+        """Dense / Dropout 以外のレイヤー・重み数の不一致はValueError"""
+        conv = _sequential_config(("Conv1D", {"filters": 4}))
+        with pytest.raises(ValueError, match="未対応のレイヤー"):
+            DenseMLP.from_keras_config(conv, [])
+
+        dense = _sequential_config(("Dense", {"units": 1, "activation": "linear"}))
+        with pytest.raises(ValueError, match="重みの数"):
+            DenseMLP.from_keras_config(dense, [np.ones((2, 1)), np.zeros(1), np.zeros(1)])
+
+    def test_input_dim_checked(self):
+        """特徴量数が入力次元と異なる場合はValueError"""
+        mlp = DenseMLP([DenseLayer(np.ones((3, 1), dtype=np.float32), np.zeros(1, dtype=np.float32), "linear")])
+
+        with pytest.raises(ValueError, match="入力次元"):
+            mlp.predict(np.ones((2, 4)))
+
+
+class TestKerasBundle:
+    """Keras 形式のモデルバンドルの読み込みのテスト"""
+
+    def test_bundle_loads_without_tensorflow_model(self, temp_dir, monkeypatch):
+        """バンドルは DenseMLP として復元し、AI_KERAS_NUMPY=0 では Keras モデルとして復元する"""
+        tf = pytest.importorskip("tensorflow")
+        model = _keras_mlp(tf, input_dim=4)
+        X = np.random.default_rng(1).normal(size=(50, 4)).astype(np.float32)
+        path = artifact.bundle_path(str(temp_dir / "Keras_model.sav"))
+        artifact.save_artifact(path, artifact.build_artifact(
+            "Keras", artifact.FORMAT_KERAS, model, None, X, np.zeros(50), ["A", "B", "C", "D"]))
+
+        monkeypatch.delenv("AI_KERAS_NUMPY", raising=False)
+        numpy_bundle = artifact.load_artifact(path)
+        monkeypatch.setenv("AI_KERAS_NUMPY", "0")
+        keras_bundle = artifact.load_artifact(path)
+
+        assert isinstance(numpy_bundle.model, DenseMLP)
+        assert not isinstance(keras_bundle.model, DenseMLP)
+        np.testing.assert_allclose(numpy_bundle.predict(X), keras_bundle.predict(X), rtol=1e-5, atol=1e-5)
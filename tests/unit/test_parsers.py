@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/parsers.py module
+"""
+
+import io
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import parsers
+
+
+def _encode(lines: list) -> bytes:
+    """Shift-JIS・CRLF のCSVバイト列を作成"""
+    return ("\r\n".join(lines) + "\r\n").encode("shift_jis")
+
+
+def _daily_zip_csv(day: int, kw_blank_from: int = 24) -> bytes:
+    """TEPCO日別ZIP内CSV（ヘッダー14行 + 当日実績24行 + 後続セクション）を作成"""
+    lines = ["2024/1/%d 23:55 UPDATE" % day,
+             "ピーク時供給力(万kW),時間帯,供給力情報更新日,供給力情報更新時刻",
+             "4964,17:00〜18:00,1/%d,8:30" % day, ""]
+    lines += ["予想最大電力(万kW),時間帯"] * 9
+    lines.append("DATE,TIME,当日実績(万kW),予測値(万kW),使用率(%),供給力(万kW)")
+    for hour in range(24):
+        kw = "" if hour >= kw_blank_from else str(3000 + hour)
+        lines.append("2024/1/%d,%d:00,%s,2900,70,4000" % (day, hour, kw))
+    lines += ["", "DATE,TIME,当日実績(５分間隔値)(万kW),太陽光発電実績(万kW)",
+              "2024/1/%d,0:00,2950,0" % day]
+    return _encode(lines)
+
+
+class TestParseJuyo:
+    """TEPCO電力需要実績パーサーのテスト"""
+
+    def test_year_file_layout(self):
+        """年別ファイル（ヘッダー3行）の日時・値・メタデータを取得"""
+        raw = _encode(["2024/1/2 5:40 UPDATE", "", "DATE,TIME,実績(万kW)",
+                       "2024/1/1,0:00,2402", "2024/01/01,01:00,2350", "2024/12/31,23:00,2846"])
+        parsed = parsers.parse_juyo(raw)
+
+        assert parsed.metadata_lines == ["2024/1/2 5:40 UPDATE", "", "DATE,TIME,実績(万kW)"]
+        expected = pd.to_datetime(["2024-01-01 00:00", "2024-01-01 01:00", "2024-12-31 23:00"])
+        np.testing.assert_array_equal(parsed.datetimes(), expected.values)
+        np.testing.assert_array_equal(parsed.columns["KW"], [2402, 2350, 2846])
+        assert parsed.invalid_rows == 0
+
+    def test_time_range_notation(self):
+        """TIME列の範囲表記（0:00〜1:00）は開始時刻として扱う"""
+        raw = _encode(["m", "", "h", "2024/3/1,0:00〜1:00,2500", "2024/3/1,23:00〜24:00,2600"])
+        parsed = parsers.parse_juyo(raw)
+
+        expected = pd.to_datetime(["2024-03-01 00:00", "2024-03-01 23:00"])
+        np.testing.assert_array_equal(parsed.datetimes(), expected.values)
+        np.testing.assert_array_equal(parsed.columns["KW"], [2500, 2600])
+
+    def test_time_range_notation_cp932(self):
+        """cp932の全角チルダ（～）による範囲表記にも対応"""
+        raw = "m\r\n\r\nh\r\n2024/3/1,5:00～6:00,2500\r\n".encode("cp932")
+        parsed = parsers.parse_juyo(raw, encoding="cp932")
+
+        assert parsed.datetimes()[0] == np.datetime64("2024-03-01T05:00")
+
+    def test_invalid_rows_dropped(self):
+        """不正な日付・欠損値の行は除外して件数を記録"""
+        raw = _encode(["m", "", "h", "2023/2/29,0:00,2500", "2024/2/29,0:00,2500",
+                       "2024/2/29,1:00,", "2024/2/29,25:00,2500", "合計,,99999"])
+        parsed = parsers.parse_juyo(raw)
+
+        assert len(parsed) == 1
+        assert parsed.invalid_rows == 4
+        assert parsed.datetimes()[0] == np.datetime64("2024-02-29T00:00")
+
+    def test_daily_zip_layout(self):
+        """日別ZIP内CSVは先頭24行のみ読み込み、後続セクションを無視"""
+        parsed = parsers.parse_juyo(io.BytesIO(_daily_zip_csv(5)), skiprows=14, nrows=24)
+
+        assert len(parsed) == 24
+        assert parsed.datetimes()[0] == np.datetime64("2024-01-05T00:00")
+        assert parsed.datetimes()[-1] == np.datetime64("2024-01-05T23:00")
+        np.testing.assert_array_equal(parsed.columns["KW"], np.arange(3000, 3024))
+
+    def test_daily_zip_partial_day(self):
+        """当日実績が未確定（空欄）の時間帯は除外"""
+        parsed = parsers.parse_juyo(_daily_zip_csv(5, kw_blank_from=18), skiprows=14, nrows=24)
+
+        assert len(parsed) == 18
+        assert parsed.invalid_rows == 6
+
+    def test_empty_body(self):
+        """データ行がない場合は0行の結果を返す"""
+        parsed = parsers.parse_juyo(_encode(["m", "", "h"]))
+
+        assert len(parsed) == 0
+        assert len(parsed.columns["KW"]) == 0
+
+
+class TestParseJmaTemperature:
+    """気象庁気温データパーサーのテスト"""
+
+    def _raw(self, rows: list, stations: str = ",東京,東京,東京") -> bytes:
+        return _encode(["ダウンロードした時刻：2024/01/02 13:57:39", "", stations,
+                        "年月日時,気温(℃),気温(℃),気温(℃)", ",,品質情報,均質番号"] + rows)
+
+    def test_single_station(self):
+        """気温・品質情報・均質番号と地点名を取得"""
+        parsed = parsers.parse_jma_temperature(self._raw(
+            ["2024/1/1 1:00:00,9.0,8,1", "2024/1/1 2:00:00,-0.5,8,1", "2025/1/1 0:00:00,5.1,8,1"]))
+
+        assert parsed.stations == ["東京"]
+        expected = pd.to_datetime(["2024-01-01 01:00", "2024-01-01 02:00", "2025-01-01 00:00"])
+        np.testing.assert_array_equal(parsed.datetimes(), expected.values)
+        np.testing.assert_array_equal(parsed.columns["TEMP"], [9.0, -0.5, 5.1])
+        assert parsed.columns["QUALITY"].shape == (3, 1)
+        np.testing.assert_array_equal(parsed.columns["HOMOGENEITY"][:, 0], [1, 1, 1])
+
+    def test_missing_temperature_kept(self):
+        """気温の欠損はNaNとして保持し、行は除外しない"""
+        parsed = parsers.parse_jma_temperature(self._raw(
+            ["2024/1/1 1:00:00,9.0,8,1", "2024/1/1 2:00:00,,0,1"]))
+
+        assert len(parsed) == 2
+        assert np.isnan(parsed.columns["TEMP"][1])
+        assert parsed.invalid_rows == 0
+
+    def test_multiple_stations(self):
+        """複数地点の列を地点ごとに分割"""
+        parsed = parsers.parse_jma_temperature(self._raw(
+            ["2024/1/1 1:00:00,9.0,8,1,7.5,8,1"], stations=",東京,東京,東京,横浜,横浜,横浜"))
+
+        assert parsed.stations == ["東京", "横浜"]
+        np.testing.assert_array_equal(parsed.columns["TEMP_ALL"], [[9.0, 7.5]])
+        np.testing.assert_array_equal(parsed.columns["TEMP"], [9.0])
+
+
+class TestFormatJuyoRows:
+    """juyo-YYYY.csv データ行整形のテスト"""
+
+    def test_zero_padded_rows(self):
+        """日付・時刻はゼロパディングで出力"""
+        datetimes = pd.to_datetime(["2024-01-01 00:00", "2024-12-31 23:00"]).values
+        text = parsers.format_juyo_rows(datetimes, np.array([2402, 2846], dtype=np.int32))
+
+        assert text == "2024/01/01,00:00,2402\n2024/12/31,23:00,2846\n"
+
+    def test_round_trip(self):
+        """整形結果を再パースすると同じ日時・値になる"""
+        datetimes = pd.date_range("2024-02-28", periods=48, freq="H").values
+        kw = np.arange(48, dtype=np.int32) + 2000
+        raw = ("m\n\nh\n" + parsers.format_juyo_rows(datetimes, kw)).encode("shift_jis")
+        parsed = parsers.parse_juyo(raw)
+
+        np.testing.assert_array_equal(parsed.datetimes(), datetimes)
+        np.testing.assert_array_equal(parsed.columns["KW"], kw)
+
+    def test_empty(self):
+        """0行の場合は空文字列"""
+        assert parsers.format_juyo_rows(np.array([], dtype="datetime64[ns]"), np.array([])) == ""
+
+
+class TestFormatJmaTemperatureRows:
+    """気象庁形式の気温データ行整形のテスト"""
+
+    def test_jma_datetime_layout(self):
+        """日時は気象庁CSVと同じ表記（ゼロパディングなし、0時のみ "00"）、欠損は空欄"""
+        datetimes = pd.to_datetime(["2024-12-31 23:00", "2025-01-01 00:00", "2025-01-01 01:00"]).values
+        text = parsers.format_jma_temperature_rows(datetimes, np.array([6.3, np.nan, -0.04]))
+
+        assert text == "2024/12/31 23:00:00,6.3,8,1\n2025/1/1 00:00:00,,1,1\n2025/1/1 1:00:00,0.0,8,1\n"
+
+    def test_round_trip_multiple_stations(self):
+        """整形結果を再パースすると同じ日時・地点別気温になる"""
+        datetimes = pd.date_range("2024-02-28 01:00", periods=48, freq="H").values
+        temps = np.round(np.column_stack([np.linspace(-3, 12, 48), np.linspace(20, 5, 48)]), 1)
+        raw = _encode(["ダウンロードした時刻：2024/03/01 00:00:00", "", ",東京,東京,東京,横浜,横浜,横浜",
+                       "年月日時" + ",気温(℃)" * 6, ",,品質情報,均質番号" * 2]
+                      + parsers.format_jma_temperature_rows(datetimes, temps).splitlines())
+        parsed = parsers.parse_jma_temperature(raw)
+
+        assert parsed.stations == ["東京", "横浜"]
+        np.testing.assert_array_equal(parsed.datetimes(), datetimes)
+        np.testing.assert_array_equal(parsed.columns["TEMP_ALL"], temps)
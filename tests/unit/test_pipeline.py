@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/pipeline.py module
+"""
+
+import sys
+import types
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+AI_DIR = Path(__file__).parent.parent.parent / "AI"
+sys.path.insert(0, str(AI_DIR))
+from common import dataset, pipeline
+from data import data as data_module
+
+
+@pytest.fixture
+def fake_trainer(monkeypatch):
+    """学習モジュールの代わりに引数を記録するだけのモジュールを登録"""
+    calls = []
+
+    def train(*args, **kwargs):
+        calls.append((args, kwargs))
+        return 150.0, 0.95, 110.0
+
+    module = types.SimpleNamespace(train=train, calls=calls)
+    monkeypatch.setitem(pipeline._module_cache, "LightGBM_train", module)
+    return module
+
+
+class TestSplitArrays:
+    """メモリ上のデータセット分割のテスト"""
+
+    def test_matches_csv_round_trip(self, temp_dir):
+        """save_datasets の保存・再読み込みと同じdtype・形状・値"""
+        n = 40
+        rng = np.random.default_rng(1)
+        X_df = pd.DataFrame({"MONTH": np.arange(n) % 12 + 1, "HOUR": np.arange(n) % 24,
+                             "TEMP": rng.uniform(-5, 35, n).astype("float32")}).astype(float)
+        y_df = pd.DataFrame({"KW": rng.integers(2000, 5000, n)})
+        paths = [str(temp_dir / f"{name}.csv") for name in ("X", "Y", "Xtrain", "Xtest", "Ytrain", "Ytest")]
+        data_module.save_datasets(X_df, y_df, paths[0], paths[1], 0.1, *paths[2:], dataset_format="csv")
+
+        expected = dataset.load_training_split(*paths[2:])
+        actual = dataset.split_arrays(X_df.to_numpy(), y_df.to_numpy(), dataset.split_test_mask(n, 0.1),
+                                      list(X_df.columns), list(y_df.columns))
+
+        assert actual.source == "memory"
+        assert actual.feature_columns == expected.feature_columns
+        for a, e in zip(actual.arrays(), expected.arrays()):
+            assert a.dtype == e.dtype and a.shape == e.shape
+            np.testing.assert_array_equal(a, e)
+
+    def test_views_without_copy(self):
+        """時系列順の分割は変換済み配列のビュー"""
+        X = np.arange(20, dtype=np.float32).reshape(10, 2)
+        split = dataset.split_arrays(X, np.arange(10), dataset.split_test_mask(10, 0.2), ["A", "B"], ["KW"])
+
+        assert np.shares_memory(split.X_train, X) and np.shares_memory(split.X_test, X)
+        assert split.y_train.shape == (8,)
+
+    def test_row_mismatch_raises(self):
+        """行数が一致しない場合はValueError"""
+        with pytest.raises(ValueError, match="行数が一致しません"):
+            dataset.split_arrays(np.zeros((5, 1)), np.zeros(4), np.zeros(5, bool), ["A"], ["KW"])
+
+
+class TestPipelineTrain:
+    """インプロセス学習APIのテスト"""
+
+    def _split(self):
+        X = np.arange(40, dtype=np.float32).reshape(20, 2)
+        return dataset.split_arrays(X, np.arange(20), dataset.split_test_mask(20, 0.2), ["A", "B"], ["KW"])
+
+    def test_passes_dataset_in_memory(self, fake_trainer):
+        """学習モジュールの train() にメモリ上のデータセットとパラメータを渡す"""
+        split = self._split()
+        artifact = pipeline.train("LightGBM", split, {"learning_rate": 0.05})
+
+        args, kwargs = fake_trainer.calls[0]
+        assert kwargs["dataset"] is split
+        assert kwargs["learning_rate"] == 0.05
+        assert args[4] == artifact.model_path == pipeline.model_output_paths("LightGBM")["model_sav"]
+        assert artifact.metrics == {"rmse": 150.0, "r2": 0.95, "mae": 110.0}
+
+    def test_failed_training_raises(self, fake_trainer):
+        """学習モジュールが結果を返さない場合はRuntimeError"""
+        fake_trainer.train = lambda *args, **kwargs: None
+        with pytest.raises(RuntimeError, match="学習に失敗しました"):
+            pipeline.train("LightGBM", self._split())
+
+    def test_invalid_model_raises(self):
+        """未対応のモデル名はValueError"""
+        with pytest.raises(ValueError, match="未対応のモデル名"):
+            pipeline.train("InvalidModel", self._split())
+
+    def test_unknown_param_raises(self, fake_trainer):
+        """未対応のパラメータはValueError"""
+        with pytest.raises(ValueError, match="未対応のパラメータ"):
+            pipeline.train("LightGBM", self._split(), {"n_layers": 3})
+
+
+class TestBuildDataset:
+    """データセット作成APIのテスト"""
+
+    def test_matches_data_script(self, temp_dir, monkeypatch):
+        """data() のCSV出力と同じ学習・テストデータをメモリ上に作成"""
+        data_dir = AI_DIR / "data"
+        if not list(data_dir.glob("juyo-2024.csv")) or not list(data_dir.glob("temperature-2024.csv")):
+            pytest.skip("2024年のデータファイルが存在しません")
+        monkeypatch.setenv("AI_DATA_CACHE", "0")
+        monkeypatch.setenv("AI_DATA_WORKERS", "1")
+
+        X_df, y_df, split = pipeline.build_dataset(["2024"], data_dir=str(data_dir))
+        paths = [str(temp_dir / f"{name}.csv") for name in ("X", "Y", "Xtrain", "Xtest", "Ytrain", "Ytest")]
+        data_module.save_datasets(X_df, y_df, paths[0], paths[1], pipeline.DEFAULT_TEST_SIZE, *paths[2:],
+                                  dataset_format="csv")
+        expected = dataset.load_training_split(*paths[2:])
+
+        assert len(X_df) == len(split.X_train) + len(split.X_test)
+        for a, e in zip(split.arrays(), expected.arrays()):
+            np.testing.assert_array_equal(a, e)
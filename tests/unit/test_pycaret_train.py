@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for train/Pycaret/Pycaret_train.py module（setup() キャッシュ・交差検証の省略）
+
+注意:
+- pycaret / pycaret.regression はテスト用のスタブに置き換える（PyCaret 本体は使用しない）。
+- スタブの setup() は PyCaret 3.0 と同じく silent 引数を受け付けない。
+"""
+
+import os
+import sys
+import types
+import pickle
+import importlib.util
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+AI_DIR = Path(__file__).parent.parent.parent / "AI"
+sys.path.insert(0, str(AI_DIR))
+
+_module = None
+
+
+class FakeExperiment:
+    """setup() が返す実験オブジェクトのスタブ（前処理前データを保持）"""
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+
+
+class FakeRegression:
+    """pycaret.regression のスタブ（呼び出しを記録する）"""
+
+    def __init__(self):
+        self.setup_calls = []
+        self.create_model_calls = []
+        self.load_error = None
+        self.current = None
+
+    def setup(self, data, target, session_id=None, verbose=True):
+        self.setup_calls.append({"target": target, "session_id": session_id})
+        self.current = FakeExperiment(data)
+        return self.current
+
+    def create_model(self, estimator, fold=10, cross_validation=True):
+        self.create_model_calls.append({"estimator": estimator, "fold": fold, "cross_validation": cross_validation})
+        return object()
+
+    def save_experiment(self, path):
+        with open(path, "wb") as f:
+            pickle.dump({"marker": "experiment"}, f)
+
+    def load_experiment(self, path, data=None, preprocess_data=True):
+        if self.load_error is not None:
+            raise self.load_error
+        with open(path, "rb") as f:
+            assert pickle.load(f) == {"marker": "experiment"}
+        assert preprocess_data is False
+        self.current = FakeExperiment(data)
+        return self.current
+
+    def module(self) -> types.ModuleType:
+        regression = types.ModuleType("pycaret.regression")
+        for name in ("setup", "create_model", "save_experiment", "load_experiment"):
+            setattr(regression, name, getattr(self, name))
+        regression.save_model = regression.predict_model = lambda *args, **kwargs: None
+        return regression
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    """pycaret をスタブに置き換え、学習モジュールのスタブ参照を差し替える"""
+    global _module
+    fake = FakeRegression()
+    package = types.ModuleType("pycaret")
+    package.__version__ = "3.0.0"
+    package.regression = fake.module()
+    monkeypatch.setitem(sys.modules, "pycaret", package)
+    monkeypatch.setitem(sys.modules, "pycaret.regression", package.regression)
+    if _module is None:
+        spec = importlib.util.spec_from_file_location(
+            "Pycaret_train_under_test", AI_DIR / "train" / "Pycaret" / "Pycaret_train.py")
+        _module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_module)
+    monkeypatch.setattr(_module, "setup", fake.setup)
+    monkeypatch.setattr(_module, "create_model", fake.create_model)
+    monkeypatch.delenv("AI_PYCARET_SETUP_CACHE", raising=False)
+    monkeypatch.delenv("AI_PYCARET_CV", raising=False)
+    fake.package = package
+    fake.train = _module
+    return fake
+
+
+def _synthetic(n_rows: int = 200, seed: int = 0):
+    """需要に似た合成データ（float32特徴量）"""
+    rng = np.random.default_rng(seed)
+    X = np.column_stack([rng.integers(1, 13, n_rows), rng.integers(0, 7, n_rows),
+                         rng.integers(0, 24, n_rows), rng.uniform(-5, 35, n_rows)]).astype(np.float32)
+    y = (3000 + X[:, 2] * 20 + (X[:, 3] - 15) ** 2 * 3).astype(np.float32)
+    return X, y
+
+
+def _frame(config, X, y) -> pd.DataFrame:
+    return pd.concat([pd.DataFrame(X, columns=config.feature_columns),
+                      pd.DataFrame(y, columns=config.target_columns)], axis=1)
+
+
+class TestSetupCacheKey:
+    """setup() キャッシュのキーのテスト"""
+
+    def test_key_changes_with_data_params_version(self, fake, monkeypatch):
+        """学習データ・セットアップ設定・PyCaret のバージョンが変わるとキーが変わる"""
+        config = fake.train.PyCaretConfig()
+        X, y = _synthetic()
+        key = fake.train.setup_cache_key(config, _frame(config, X, y))
+
+        assert fake.train.setup_cache_key(config, _frame(config, X, y)) == key
+        y_changed = y.copy()
+        y_changed[0] += 1
+        assert fake.train.setup_cache_key(config, _frame(config, X, y_changed)) != key
+        assert fake.train.setup_cache_key(fake.train.PyCaretConfig(session_id=1), _frame(config, X, y)) != key
+        monkeypatch.setattr(fake.package, "__version__", "3.1.0")
+        assert fake.train.setup_cache_key(config, _frame(config, X, y)) != key
+
+
+class TestSetupCache:
+    """setup() 結果のキャッシュのテスト"""
+
+    def test_miss_saves_and_hit_skips_setup(self, fake, temp_dir):
+        """初回は setup() を実行してキャッシュを保存し、同じデータでは setup() を省略して読み込む"""
+        config = fake.train.PyCaretConfig()
+        X, y = _synthetic()
+
+        fake.train.setup_pycaret_experiment(config, X, y, cache_dir=str(temp_dir))
+        assert len(fake.setup_calls) == 1
+        assert len(list(temp_dir.glob("*.experiment.pkl"))) == len(list(temp_dir.glob("*.data.pkl"))) == 1
+
+        exp = fake.train.setup_pycaret_experiment(config, X, y, cache_dir=str(temp_dir))
+
+        assert len(fake.setup_calls) == 1
+        pd.testing.assert_frame_equal(exp.data, _frame(config, X, y))
+        # 異なるデータは別のキャッシュ
+        fake.train.setup_pycaret_experiment(config, *_synthetic(seed=1), cache_dir=str(temp_dir))
+        assert len(fake.setup_calls) == 2
+
+    def test_load_error_falls_back_to_setup(self, fake, temp_dir):
+        """キャッシュを読み込めない場合は通常の setup() を実行する"""
+        config = fake.train.PyCaretConfig()
+        X, y = _synthetic()
+        fake.train.setup_pycaret_experiment(config, X, y, cache_dir=str(temp_dir))
+        fake.load_error = ValueError("壊れたキャッシュ")
+
+        exp = fake.train.setup_pycaret_experiment(config, X, y, cache_dir=str(temp_dir))
+
+        assert len(fake.setup_calls) == 2 and exp is fake.current
+
+    def test_disabled_by_env(self, fake, temp_dir, monkeypatch):
+        """AI_PYCARET_SETUP_CACHE=0 ではキャッシュを読み書きしない"""
+        monkeypatch.setenv("AI_PYCARET_SETUP_CACHE", "0")
+        config = fake.train.PyCaretConfig()
+        X, y = _synthetic()
+
+        for _ in range(2):
+            fake.train.setup_pycaret_experiment(config, X, y, cache_dir=str(temp_dir))
+
+        assert len(fake.setup_calls) == 2 and not list(temp_dir.iterdir())
+
+    def test_prune_keeps_newest(self, fake, temp_dir):
+        """setup_cache_max_entries 組を超えた古いキャッシュを削除する"""
+        config = fake.train.PyCaretConfig(setup_cache_max_entries=2)
+        for i, key in enumerate(["a", "b", "c", "d"]):
+            for path in fake.train._setup_cache_paths(str(temp_dir), key):
+                Path(path).write_bytes(b"x")
+                os.utime(path, (1000 + i, 1000 + i))
+
+        fake.train._prune_setup_cache(config, str(temp_dir))
+
+        assert sorted(p.name for p in temp_dir.iterdir()) == [
+            "c.data.pkl", "c.experiment.pkl", "d.data.pkl", "d.experiment.pkl"]
+
+
+class TestCrossValidation:
+    """交差検証の省略のテスト"""
+
+    @pytest.mark.parametrize("value, expected", [(None, True), ("1", True), ("0", False), ("off", False)])
+    def test_env_reaches_create_model(self, fake, monkeypatch, value, expected):
+        """AI_PYCARET_CV=0 で create_model(cross_validation=False)、未設定時は交差検証する"""
+        if value is not None:
+            monkeypatch.setenv("AI_PYCARET_CV", value)
+        config = fake.train.PyCaretConfig()
+
+        fake.train.create_pycaret_model(config)
+
+        assert fake.create_model_calls == [{"estimator": config.model_type, "fold": config.cv_folds,
+                                            "cross_validation": expected}]
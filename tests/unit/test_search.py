@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/search.py module（ローリング組み合わせでのハイパーパラメータ探索）
+
+注意:
+- 打ち切り・再開の確認は評価関数を差し替えて実行する（実際の学習は RandomForest の小さなモデルのみ）。
+- プロセスプールの確認は fork で起動したワーカーに差し替えた評価関数を引き継ぐ。
+"""
+
+import os
+import sys
+import types
+import dataclasses
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import pipeline, search
+
+FOLDS = [([2022, 2023], 2024), ([2021, 2022], 2023), ([2020, 2021], 2022), ([2019, 2020], 2021)]
+SPACE = {"n_estimators": [5, 10, 20], "max_depth": [2, 4, None]}
+
+
+def _year_data(years=(2019, 2020, 2021, 2022, 2023, 2024), n_rows: int = 200):
+    """年ごとの合成データ（需要に似た特徴量・目的変数）"""
+    rng = np.random.default_rng(0)
+    data = {}
+    for year in years:
+        X = np.column_stack([np.arange(n_rows) % 12 + 1, np.arange(n_rows) % 7,
+                             np.arange(n_rows) % 24, rng.uniform(-5, 35, n_rows)]).astype(np.float32)
+        data[str(year)] = (X, (3000 + X[:, 2] * 20 + (X[:, 3] - 15) ** 2 * 3).astype(np.int64))
+    return data
+
+
+def _fake_run_jobs(calls, failing=()):
+    """RMSE = 試行番号 × 10 + 組み合わせ番号 を返す評価関数（評価した (試行, 組み合わせ) を記録）"""
+    def run_jobs(jobs):
+        for trial, fold in jobs:
+            calls.append((trial.number, fold))
+            if trial.number in failing:
+                yield trial, fold, RuntimeError("学習に失敗しました")
+            else:
+                yield trial, fold, {"rmse": trial.number * 10.0 + fold, "r2": 0.9, "mae": 1.0, "elapsed": 0.0}
+    return run_jobs
+
+
+class TestSampling:
+    """段階・候補の作成のテスト"""
+
+    def test_rung_budgets(self):
+        """評価する組み合わせ数は 1, eta, eta^2, ... と増え、最後は全組み合わせ"""
+        assert search.rung_budgets(7, 3) == [1, 3, 7]
+        assert search.rung_budgets(9, 3) == [1, 3, 9]
+        assert search.rung_budgets(1, 3) == [1]
+        with pytest.raises(ValueError, match="組み合わせがありません"):
+            search.rung_budgets(0, 3)
+
+    def test_sample_params(self):
+        """1件目は既定値、以降は重複のない候補（同じシードなら同じ候補）"""
+        candidates = search.sample_params(SPACE, 5, seed=0)
+
+        assert candidates[0] == {}
+        assert len(candidates) == 5
+        assert len({tuple(sorted(c.items())) for c in candidates[1:]}) == 4
+        assert all(c[name] in SPACE[name] for c in candidates[1:] for name in SPACE)
+        assert search.sample_params(SPACE, 5, seed=0) == candidates
+        # 組み合わせ総数（9）を超える試行数は全組み合わせ
+        assert len(search.sample_params(SPACE, 100, seed=0)) == 10
+
+
+class TestSuccessiveHalving:
+    """打ち切り・試行記録ファイルからの再開のテスト"""
+
+    def test_prunes_weak_trials(self, temp_dir):
+        """各段階で RMSE 上位 1/eta のみ次の組み合わせを評価し、失敗した試行は除外する"""
+        study = search.Study.load_or_create(str(temp_dir / "study.json"), "RandomForest", SPACE,
+                                            FOLDS, n_trials=9, eta=3, seed=0)
+        calls = []
+
+        search.successive_halving(study, _fake_run_jobs(calls, failing={0}))
+
+        states = {trial.number: trial.state for trial in study.trials}
+        assert states[0] == search.STATE_FAILED
+        assert states[1] == search.STATE_COMPLETE
+        assert sorted(n for n, s in states.items() if s == search.STATE_PRUNED) == [2, 3, 4, 5, 6, 7, 8]
+        # 段階1: 9試行×1組み合わせ、段階2: 3試行×残り2組み合わせ、段階3: 1試行×残り1組み合わせ
+        assert len(calls) == 9 + 3 * 2 + 1
+        assert study.best_trial().number == 1
+        assert study.trials[4].pruned_at == 1
+
+    def test_resume_skips_evaluated_folds(self, temp_dir):
+        """保存した試行記録から再開すると評価済みの組み合わせは再計算しない"""
+        path = str(temp_dir / "study.json")
+        study = search.Study.load_or_create(path, "RandomForest", SPACE, FOLDS, n_trials=4, eta=2, seed=0)
+        search.successive_halving(study, _fake_run_jobs([]))
+
+        resumed = search.Study.load_or_create(path, "RandomForest", SPACE, FOLDS, n_trials=4, eta=2, seed=0)
+        calls = []
+        search.successive_halving(resumed, _fake_run_jobs(calls))
+
+        assert calls == []
+        assert resumed.best_trial().params == study.best_trial().params
+        assert [t.scores for t in resumed.trials] == [t.scores for t in study.trials]
+
+    def test_settings_mismatch(self, temp_dir):
+        """探索条件が異なる試行記録ファイルはValueError"""
+        path = str(temp_dir / "study.json")
+        search.Study.load_or_create(path, "RandomForest", SPACE, FOLDS, n_trials=4, eta=3, seed=0)
+
+        with pytest.raises(ValueError, match="探索条件が異なります"):
+            search.Study.load_or_create(path, "RandomForest", SPACE, FOLDS[:3], n_trials=4, eta=3, seed=0)
+
+
+class TestEvaluate:
+    """組み合わせごとの学習・評価のテスト"""
+
+    def test_random_forest_fold(self):
+        """学習年を結合して学習し、テスト年の RMSE / R2 / MAE を返す"""
+        search._init_worker("RandomForest", _year_data())
+
+        result = search.evaluate_fold({"n_estimators": 5, "max_depth": 6}, [2022, 2023], 2024)
+
+        assert set(result) == {"rmse", "r2", "mae", "elapsed"}
+        assert np.isfinite(result["rmse"]) and result["r2"] > 0.5
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が使えない環境")
+    def test_run_search_in_process_pool(self, temp_dir, monkeypatch):
+        """プロセスプールで並列に評価し、全組み合わせで評価した試行から最良の試行を選ぶ"""
+        def fit_predict(trainer, params, X_train, y_train, X_test):
+            return np.full(len(X_test), y_train.mean() + params.get("n_estimators", 0))
+
+        monkeypatch.setitem(pipeline._module_cache, "RandomForest_train", types.SimpleNamespace())
+        monkeypatch.setitem(search.FIT_PREDICT, "RandomForest", fit_predict)
+        monkeypatch.setattr(search, "rolling_folds", lambda model_name, years=None: FOLDS)
+        monkeypatch.setattr(search, "load_year_data", lambda years, data_dir: _year_data())
+
+        study = search.run_search("RandomForest", n_trials=4, workers=2, study_path=str(temp_dir / "study.json"),
+                                  start_method="fork")
+
+        assert (temp_dir / "study.json").exists()
+        assert all(trial.state != search.STATE_FAILED for trial in study.trials)
+        assert study.best_trial() is not None
+
+    def test_unsupported_model(self):
+        """探索範囲のないモデルはValueError"""
+        with pytest.raises(ValueError, match="探索に未対応"):
+            search.run_search("PyCaret")
+
+
+@dataclasses.dataclass(frozen=True)
+class _Config:
+    """学習モジュールの設定クラスの代わり"""
+    n_estimators: int = 100
+    max_depth: int = 8
+    RANDOM_STATE: int = 42
+
+
+def _completed_study(path: str):
+    """全段階を評価済みの試行記録ファイルを作成する（最良の試行は RMSE 最小の試行1）"""
+    study = search.Study.load_or_create(path, "RandomForest", SPACE, FOLDS, n_trials=9, eta=3, seed=0)
+    search.successive_halving(study, _fake_run_jobs([], failing={0}))
+    return study
+
+
+class TestTunedParams:
+    """探索済みパラメータの学習への適用のテスト"""
+
+    def test_load_best_params(self, temp_dir):
+        """試行記録ファイルから最良の試行のパラメータを読み込み、ファイルがなければNone"""
+        path = str(temp_dir / "study.json")
+        study = _completed_study(path)
+
+        assert search.load_tuned_params("RandomForest", path) == study.best_trial().params
+        assert search.load_tuned_params("RandomForest", str(temp_dir / "missing.json")) is None
+        with pytest.raises(ValueError, match="モデル名が異なります"):
+            search.load_tuned_params("LightGBM", path)
+
+    def test_tuned_config_toggle(self, temp_dir, monkeypatch):
+        """AI_USE_TUNED_PARAMS 有効時のみ設定を最良の試行のパラメータで置き換える"""
+        path = str(temp_dir / "study.json")
+        best = _completed_study(path).best_trial().params
+        base = _Config()
+
+        monkeypatch.delenv(search.TUNED_PARAMS_ENV_VAR, raising=False)
+        assert search.tuned_config("RandomForest", base, path) is base
+
+        monkeypatch.setenv(search.TUNED_PARAMS_ENV_VAR, "1")
+        tuned = search.tuned_config("RandomForest", base, path)
+        assert tuned == dataclasses.replace(base, **best)
+        assert tuned.RANDOM_STATE == base.RANDOM_STATE
+        # 探索結果がなければ既定の設定
+        assert search.tuned_config("RandomForest", base, str(temp_dir / "missing.json")) is base
+
+    def test_decorator_swaps_module_config(self, temp_dir, monkeypatch):
+        """デコレータは学習関数の実行中のみモジュール変数 config を差し替え、終了後（例外時も）元に戻す"""
+        path = str(temp_dir / "study.json")
+        best = _completed_study(path).best_trial().params
+        monkeypatch.setattr(search, "default_study_path", lambda model_name: path)
+        monkeypatch.setenv(search.TUNED_PARAMS_ENV_VAR, "1")
+
+        namespace = {"config": _Config()}
+        exec("def train(fail=False):\n"
+             "    if fail:\n"
+             "        raise RuntimeError(config)\n"
+             "    return config\n", namespace)
+        train = search.use_tuned_params("RandomForest")(namespace["train"])
+
+        assert train() == dataclasses.replace(_Config(), **best)
+        assert namespace["config"] == _Config()
+        with pytest.raises(RuntimeError):
+            train(fail=True)
+        assert namespace["config"] == _Config()
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/stations.py module
+"""
+
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import stations
+from data import data as data_module
+
+
+def _jma_csv(path: Path, names: list, rows: list) -> None:
+    """気象庁形式の気温CSV（地点名行・項目名行・品質情報行の後にデータ行）を作成"""
+    header = ["ダウンロードした時刻：2025/01/21 13:57:39", "",
+              "," + ",".join(n for name in names for n in (name, name, name)),
+              "年月日時," + ",".join("気温(℃),気温(℃),気温(℃)" for _ in names),
+              "," + ",".join(",品質情報,均質番号" for _ in names)]
+    lines = [f"2024/1/1 {h}:00:00," + ",".join(f"{t},8,1" for t in temps) for h, temps in enumerate(rows, 1)]
+    path.write_bytes(("\r\n".join(header + lines) + "\r\n").encode("shift_jis"))
+
+
+class TestStations:
+    """地点セット指定のテスト"""
+
+    def test_default_is_tokyo(self, monkeypatch):
+        """未指定時は東京1地点"""
+        monkeypatch.delenv("AI_TEMP_STATIONS", raising=False)
+        assert stations.resolve_stations() == stations.DEFAULT_STATIONS
+
+    def test_preset_and_explicit_spec(self):
+        """プリセット名と「地点名:緯度:経度[:重み]」指定"""
+        assert stations.parse_stations("Kanto") == stations.KANTO_STATIONS
+        parsed = stations.parse_stations("東京:35.6:139.6:3; 横浜:35.4:139.6")
+        assert parsed == (stations.Station("東京", 35.6, 139.6, 3.0), stations.Station("横浜", 35.4, 139.6, 1.0))
+
+    @pytest.mark.parametrize("spec", ["東京:35.6", "東京:35.6:139.6:0", ";"])
+    def test_invalid_spec_raises(self, spec):
+        """書式不正・重み0以下はValueError"""
+        with pytest.raises(ValueError):
+            stations.parse_stations(spec)
+
+
+class TestWeightedTemperature:
+    """加重平均のテスト"""
+
+    def test_missing_station_renormalized(self):
+        """欠損地点を除いて重みを正規化し、全地点欠損はNaN"""
+        temps = np.array([[10.0, 20.0], [10.0, np.nan], [np.nan, np.nan]])
+        result = stations.weighted_temperature(temps, np.array([3.0, 1.0]))
+
+        np.testing.assert_allclose(result[:2], [12.5, 10.0])
+        assert np.isnan(result[2])
+
+    def test_single_station_exact(self):
+        """重みが1地点のみの場合は値をそのまま返す"""
+        temps = np.array([[0.1, 5.0], [np.nan, 6.0]])
+        result = stations.weighted_temperature(temps, np.array([0.7, 0.0]))
+
+        assert result[0] == 0.1 and np.isnan(result[1])
+
+    def test_weights_by_column_name(self):
+        """列の地点名で重みを対応付け（地点セットにない列は0）"""
+        weights = stations.weights_for_columns(["横浜", "東京", "大阪"], stations.KANTO_STATIONS[:2])
+        np.testing.assert_array_equal(weights, [9.2, 14.0, 0.0])
+
+    def test_missing_station_raises(self):
+        """地点セットの地点が列にない場合はValueError（学習と翌日予測で TEMP の定義が変わるため）"""
+        with pytest.raises(ValueError, match="横浜"):
+            stations.weights_for_columns(["東京"], stations.parse_stations("東京:35.6:139.6:3;横浜:35.4:139.6:1"))
+
+
+class TestHistoricalTemperature:
+    """temperature-YYYY.csv（複数地点レイアウト）への適用のテスト"""
+
+    def test_weighted_columns(self, temp_dir, monkeypatch):
+        """地点セットの重みで複数地点の列を加重平均"""
+        path = temp_dir / "temperature-2024.csv"
+        _jma_csv(path, ["東京", "横浜"], [(10.0, 14.0), (11.0, "")])
+        monkeypatch.setenv("AI_TEMP_STATIONS", "東京:35.6785:139.6823:3;横浜:35.4383:139.6517:1")
+
+        df = data_module._read_temperature_csv(str(path))
+
+        np.testing.assert_allclose(df["TEMP"], [11.0, 11.0])
+
+    def test_default_uses_tokyo_column(self, temp_dir, monkeypatch):
+        """未指定時は東京の列（先頭でなくても地点名で選択）"""
+        path = temp_dir / "temperature-2024.csv"
+        _jma_csv(path, ["横浜", "東京"], [(14.0, 10.0)])
+        monkeypatch.delenv("AI_TEMP_STATIONS", raising=False)
+
+        assert data_module._read_temperature_csv(str(path))["TEMP"].tolist() == [10.0]
+
+    def test_missing_station_in_file_raises(self, temp_dir, monkeypatch):
+        """地点セットの地点が気温データにない場合は東京のみで学習せずエラー"""
+        path = temp_dir / "temperature-2024.csv"
+        _jma_csv(path, ["東京"], [(10.0,)])
+        monkeypatch.setenv("AI_TEMP_STATIONS", "kanto")
+
+        with pytest.raises(ValueError, match="temperature-2024.csv"):
+            data_module._read_temperature_csv(str(path))
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for tomorrow/data.py module（年別ファイルの差分更新）
+
+注意:
+- TEPCO のZIPダウンロードは行わない（fetch_latest_month_data を差し替える）。
+"""
+
+import sys
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from tomorrow import data as tomorrow_data
+
+
+METADATA_LINES = ["2024/5/1 0:05 UPDATE", ""]
+
+
+def _frame(start: str, hours: int, offset: int = 0) -> pd.DataFrame:
+    """DATETIME・KW列の電力データフレームを作成"""
+    datetimes = pd.date_range(start, periods=hours, freq="H")
+    kw = (np.arange(hours) % 1000 + 2000 + offset).astype("int32")
+    return pd.DataFrame({"DATETIME": datetimes, "KW": kw})
+
+
+def _write_year_file(path: Path, df: pd.DataFrame) -> None:
+    """従来の全体書き換えで年別ファイルを作成"""
+    tomorrow_data.merge_and_write_juyo_file(
+        tomorrow_data.empty_juyo_frame(), df, METADATA_LINES, tomorrow_data.config.JAPANESE_HEADER, str(path)
+    )
+
+
+@pytest.fixture
+def year_file(temp_dir):
+    """1/1〜4/30（末尾読み込みの初期サイズより大きい）の年別ファイル"""
+    path = temp_dir / "juyo-2024.csv"
+    _write_year_file(path, _frame("2024-01-01", 121 * 24))
+    return path
+
+
+@pytest.fixture
+def month_zip(monkeypatch):
+    """ZIPダウンロードの代わりに指定データを返す"""
+    def _set(df):
+        monkeypatch.setattr(tomorrow_data, "fetch_latest_month_data", lambda url: df.copy())
+    return _set
+
+
+def _full_rewrite(temp_dir: Path, existing: Path, month_df: pd.DataFrame) -> bytes:
+    """従来の全体書き換えによる結果（比較用）"""
+    expected_path = temp_dir / "expected.csv"
+    expected_path.write_bytes(existing.read_bytes())
+    existing_df, metadata, header = tomorrow_data.load_existing_data(str(expected_path))
+    tomorrow_data.merge_and_write_juyo_file(existing_df, month_df, metadata, header, str(expected_path))
+    return expected_path.read_bytes()
+
+
+class TestIncrementalUpdate:
+    """年別ファイル差分更新のテスト"""
+
+    def test_appends_only_new_rows(self, temp_dir, year_file, month_zip, monkeypatch):
+        """新しい行のみ追記し、結果は全体書き換えと同一"""
+        # 5月分ZIP（4/1〜5/2。4月分は既存と同じ値）
+        month_df = pd.concat([_frame("2024-01-01", 121 * 24).iloc[-30 * 24:], _frame("2024-05-01", 48)],
+                             ignore_index=True)
+        month_zip(month_df)
+        expected = _full_rewrite(temp_dir, year_file, month_df)
+
+        def _no_full_load(*args, **kwargs):
+            raise AssertionError("ファイル全体を読み込みました")
+        monkeypatch.setattr(tomorrow_data, "load_existing_data", _no_full_load)
+
+        result = tomorrow_data.update_juyo_file_incremental("http://example.invalid/202405.zip", str(year_file))
+
+        assert year_file.read_bytes() == expected
+        assert result["DATETIME"].iloc[-1] == pd.Timestamp("2024-05-02 23:00")
+        assert result["DATETIME"].iloc[0] <= pd.Timestamp("2024-05-02 23:00") - pd.Timedelta(days=35)
+
+    def test_correction_rewrites_file(self, temp_dir, year_file, month_zip):
+        """既存行の値が変わった場合はファイル全体を書き換え"""
+        month_df = _frame("2024-04-20", 12 * 24)
+        month_df.loc[5, "KW"] += 1
+        month_zip(month_df)
+        expected = _full_rewrite(temp_dir, year_file, month_df)
+
+        tomorrow_data.update_juyo_file_incremental("http://example.invalid/202404.zip", str(year_file))
+
+        assert year_file.read_bytes() == expected
+
+    def test_no_new_rows_keeps_file(self, year_file, month_zip):
+        """新しい行がなければファイルを変更しない"""
+        before = year_file.read_bytes()
+        month_zip(_frame("2024-01-01", 121 * 24).iloc[-48:])
+
+        result = tomorrow_data.update_juyo_file_incremental("http://example.invalid/202404.zip", str(year_file))
+
+        assert year_file.read_bytes() == before
+        assert len(result) >= 35 * 24
+
+    def test_missing_trailing_newline(self, year_file, month_zip):
+        """最終行が改行で終わっていなくても追記行は次の行になる"""
+        year_file.write_bytes(year_file.read_bytes().rstrip(b"\n"))
+        month_zip(_frame("2024-05-01", 2))
+
+        tomorrow_data.update_juyo_file_incremental("http://example.invalid/202405.zip", str(year_file))
+
+        assert year_file.read_bytes().endswith(b"2024/04/30,23:00,2903\n2024/05/01,00:00,2000\n2024/05/01,01:00,2001\n")
+
+    def test_new_file_created(self, temp_dir, month_zip):
+        """年別ファイルがなければ新規作成"""
+        path = temp_dir / "juyo-2025.csv"
+        month_zip(_frame("2025-01-01", 24))
+
+        result = tomorrow_data.update_juyo_file_incremental("http://example.invalid/202501.zip", str(path))
+
+        assert len(result) == 24
+        assert path.read_bytes().startswith(tomorrow_data.config.JAPANESE_HEADER.encode("shift_jis") + b"\n")
+
+    def test_env_var_disables(self, monkeypatch):
+        """環境変数 AI_JUYO_INCREMENTAL=0 で無効化"""
+        monkeypatch.setenv("AI_JUYO_INCREMENTAL", "0")
+        assert not tomorrow_data.is_incremental_update_enabled()
+        monkeypatch.delenv("AI_JUYO_INCREMENTAL")
+        assert tomorrow_data.is_incremental_update_enabled()
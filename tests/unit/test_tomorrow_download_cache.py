@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for tomorrow/data.py module（月別ZIPの取得・条件付きGETキャッシュ）
+
+注意:
+- TEPCO には接続しない（ローカルのHTTPサーバーで月別ZIPを配信する）。
+"""
+
+import io
+import sys
+import threading
+import time
+import zipfile
+import pytest
+import numpy as np
+import pandas as pd
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from tomorrow import data as tomorrow_data
+
+
+def _month_zip(days: int, offset: int = 0) -> bytes:
+    """日別CSV（ヘッダー14行 + 当日実績24行）を格納した月別ZIPを作成"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as z:
+        for day in range(1, days + 1):
+            lines = ["2024/5/%d 23:55 UPDATE" % day] + [""] * 12
+            lines.append("DATE,TIME,当日実績(万kW),予測値(万kW)")
+            lines += ["2024/5/%d,%d:00,%d,2900" % (day, hour, 3000 + hour + offset) for hour in range(24)]
+            z.writestr("202405%02d_power_usage.csv" % day, ("\r\n".join(lines) + "\r\n").encode("shift_jis"))
+    return buffer.getvalue()
+
+
+class _ZipHandler(BaseHTTPRequestHandler):
+    """server.content を配信し、validators 有効時は ETag / Last-Modified で304を返す"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        time.sleep(server.delay)
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = '"%d"' % server.version
+        if server.validators and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(len(server.content)))
+        if server.validators:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", "Wed, 01 May 2024 00:00:00 GMT")
+        self.end_headers()
+        self.wfile.write(server.content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def zip_server():
+    """月別ZIPを配信するローカルHTTPサーバー"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ZipHandler)
+    server.content = _month_zip(3)
+    server.version = 1
+    server.validators = True
+    server.requests = []
+    server.delay = 0.0
+    server.failures = 0
+    server.url = "http://127.0.0.1:%d/202405_power_usage.zip" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def download_cache(temp_dir, monkeypatch):
+    """キャッシュ保存先を一時ディレクトリに変更し、パースした日別CSV名を記録"""
+    monkeypatch.delenv("AI_DOWNLOAD_CACHE", raising=False)
+    monkeypatch.setattr(tomorrow_data, "config",
+                        tomorrow_data.TomorrowDataConfig(DOWNLOAD_CACHE_DIR=str(temp_dir / "downloads")))
+    parse_calls = []
+    original = tomorrow_data._parse_zip_member
+
+    def _counting_parse(z, filename):
+        parse_calls.append(filename)
+        return original(z, filename)
+    monkeypatch.setattr(tomorrow_data, "_parse_zip_member", _counting_parse)
+    return parse_calls
+
+
+class TestConditionalDownloadCache:
+    """月別ZIPダウンロードキャッシュのテスト"""
+
+    def test_not_modified_reuses_parsed_rows(self, zip_server, download_cache):
+        """2回目は条件付きGETで304となり、再ダウンロード・再パースしない"""
+        first = tomorrow_data.fetch_latest_month_data(zip_server.url)
+        second = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        assert len(first) == 72
+        assert first["DATETIME"].iloc[-1] == pd.Timestamp("2024-05-03 23:00")
+        pd.testing.assert_frame_equal(first, second)
+        assert len(download_cache) == 3
+        assert zip_server.requests[1]["If-None-Match"] == '"1"'
+
+    def test_changed_content_parses_new_members(self, zip_server, download_cache):
+        """ZIPが更新された場合は新しい日の日別CSVのみパースする"""
+        first = tomorrow_data.fetch_latest_month_data(zip_server.url)
+        zip_server.content = _month_zip(4)
+        zip_server.version = 2
+
+        result = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        assert len(result) == 96
+        pd.testing.assert_frame_equal(result.iloc[:72], first)
+        assert download_cache[3:] == ["20240504_power_usage.csv"]
+
+    def test_same_hash_without_validators(self, zip_server, download_cache):
+        """検証子を返さないサーバーでも内容ハッシュが同じなら再パースしない"""
+        zip_server.validators = False
+        first = tomorrow_data.fetch_latest_month_data(zip_server.url)
+        second = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        pd.testing.assert_frame_equal(first, second)
+        assert len(download_cache) == 3
+        assert "If-None-Match" not in zip_server.requests[1]
+
+        zip_server.content = _month_zip(3, offset=1)
+        third = tomorrow_data.fetch_latest_month_data(zip_server.url)
+        np.testing.assert_array_equal(third["KW"], first["KW"] + 1)
+        assert len(download_cache) == 6
+
+    def test_missing_payload_refetches(self, zip_server, download_cache, temp_dir):
+        """キャッシュの配列が失われた場合は条件なしで取得し直す"""
+        tomorrow_data.fetch_latest_month_data(zip_server.url)
+        for path in (temp_dir / "downloads").glob("*.npz"):
+            path.unlink()
+
+        result = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        assert len(result) == 72
+        assert "If-None-Match" not in zip_server.requests[1]
+        assert len(download_cache) == 6
+
+    def test_env_var_disables(self, zip_server, download_cache, temp_dir, monkeypatch):
+        """環境変数 AI_DOWNLOAD_CACHE=0 で無効化（毎回ダウンロード・パース）"""
+        monkeypatch.setenv("AI_DOWNLOAD_CACHE", "0")
+        tomorrow_data.fetch_latest_month_data(zip_server.url)
+        tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        assert len(download_cache) == 6
+        assert not (temp_dir / "downloads").exists()
+
+
+class TestConcurrentFetch:
+    """共有セッションによる月別ZIP並列取得のテスト"""
+
+    def test_fetches_concurrently(self, zip_server, download_cache):
+        """当月・前月の取得時間は合計ではなく最も遅いダウンロードで決まる"""
+        zip_server.delay = 0.5
+        urls = [zip_server.url, zip_server.url.replace("202405", "202404")]
+
+        start = time.perf_counter()
+        results = tomorrow_data.fetch_months_concurrently(urls)
+        elapsed = time.perf_counter() - start
+
+        assert list(results) == urls
+        assert all(len(df) == 72 for df in results.values())
+        assert elapsed < 0.9
+
+    def test_retries_server_errors(self, zip_server, download_cache):
+        """一時的な503は共有セッションのリトライで回復する"""
+        zip_server.failures = 2
+
+        result = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        assert len(result) == 72
+        assert len(zip_server.requests) == 3
+
+    def test_failed_month_is_none(self, zip_server, download_cache):
+        """リトライ上限を超えた月はNone（他の月の取得は継続）"""
+        zip_server.failures = 100
+        results = tomorrow_data.fetch_months_concurrently([zip_server.url])
+
+        assert results == {zip_server.url: None}
+        assert len(zip_server.requests) == tomorrow_data.config.MAX_RETRIES + 1
+
+    def test_session_shared(self):
+        """HTTPセッションはプロセス内で共有"""
+        assert tomorrow_data.get_http_session() is tomorrow_data.get_http_session()
+
+
+class TestStreamingZip:
+    """月別ZIPのストリーミング取得・メンバー単位パースのテスト"""
+
+    def test_large_zip_spooled_to_disk(self, zip_server, download_cache, monkeypatch):
+        """メモリ上限を超えるZIPは一時ファイル経由で処理し、結果は同じ"""
+        expected = tomorrow_data.parse_month_zip(io.BytesIO(zip_server.content))[0]
+        monkeypatch.setattr(tomorrow_data, "config", tomorrow_data.TomorrowDataConfig(
+            DOWNLOAD_CACHE_DIR=tomorrow_data.config.DOWNLOAD_CACHE_DIR, ZIP_SPOOL_MAX_BYTES=1024,
+            ZIP_CHUNK_BYTES=256))
+
+        result = tomorrow_data.fetch_latest_month_data(zip_server.url)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_corrected_member_reparsed(self, download_cache):
+        """内容が修正された日別CSVは名前が同じでも再パースする"""
+        first, arrays = tomorrow_data.parse_month_zip(io.BytesIO(_month_zip(3)))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(io.BytesIO(_month_zip(3))) as src, zipfile.ZipFile(buffer, "w") as dst:
+            for name in src.namelist():
+                data = src.read(name)
+                dst.writestr(name, data.replace(b"3005,2900", b"3999,2900") if name.startswith("20240502") else data)
+        download_cache.clear()
+
+        second, _ = tomorrow_data.parse_month_zip(buffer, arrays)
+
+        assert download_cache == ["20240502_power_usage.csv"]
+        assert second.loc[24 + 5, "KW"] == 3999
+        pd.testing.assert_frame_equal(second.drop(index=29), first.drop(index=29))
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for tomorrow/prepare.py module（電力データ・気温データの並行取得）
+
+注意:
+- TEPCO / Open-Meteo にはアクセスしない（data / 気温取得関数を差し替える）。
+"""
+
+import json
+import sys
+import time
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from tomorrow import prepare
+from tomorrow import data as tomorrow_data
+from tomorrow import temp as tomorrow_temp
+
+
+NOW = np.datetime64("2024-07-10T09:30:00")
+DELAY = 0.5
+
+
+@pytest.fixture
+def fake_sources(temp_dir, monkeypatch):
+    """電力データ取得（period_info 作成）と気温データ取得をそれぞれ DELAY 秒かかる処理に差し替える"""
+    monkeypatch.setattr(tomorrow_temp, "local_now", lambda timezone: NOW)
+    fake_sources.end_datetime = "2024-07-09 23:00:00"
+    fake_sources.windows = []
+    fake_sources.fallback = []
+
+    def _data(Ytest_csv, past_days, forecast_days):
+        time.sleep(DELAY)
+        end_dt = pd.Timestamp(fake_sources.end_datetime)
+        pd.DataFrame({"KW": np.arange(168)}).to_csv(Ytest_csv, index=False)
+        with open(Path(Ytest_csv).parent / "period_info.json", "w", encoding="utf-8") as f:
+            json.dump({"start_datetime": str(end_dt - pd.Timedelta(hours=167)), "end_datetime": str(end_dt),
+                       "past_days": 7, "forecast_days": 7, "target_hours": 168}, f)
+        return None
+
+    def _fetch(latitude, longitude, timezone, past_days, forecast_days, start_date=None, end_date=None,
+               stations=None):
+        time.sleep(DELAY)
+        fake_sources.windows.append((start_date, end_date))
+        hours = np.arange(np.datetime64(start_date, "h"), np.datetime64(end_date, "h") + np.timedelta64(24, "h"))
+        return {"hourly": {"time": [str(h) + ":00" for h in hours],
+                           "temperature_2m": (20 + (hours.astype("int64") % 24) * 0.5).tolist()}}
+
+    def _temp(latitude, longitude, timezone, Xtomorrow_csv, past_days, forecast_days, stations=None):
+        fake_sources.fallback.append(Xtomorrow_csv)
+        return None
+
+    monkeypatch.setattr(tomorrow_data, "data", _data)
+    monkeypatch.setattr(tomorrow_temp, "fetch_window_temperature", _fetch)
+    monkeypatch.setattr(tomorrow_temp, "temp", _temp)
+    return fake_sources
+
+
+class TestPrepareTomorrowInputs:
+    """tomorrow入力データ一括作成のテスト"""
+
+    def test_runs_concurrently(self, fake_sources, temp_dir):
+        """電力・気温の取得は並行実行され、所要時間は合計より短い"""
+        start = time.perf_counter()
+        result = prepare.prepare_tomorrow_inputs(str(temp_dir))
+        elapsed = time.perf_counter() - start
+
+        assert result is None
+        assert elapsed < DELAY * 2 - 0.1
+        assert fake_sources.windows == [("2024-06-30", "2024-07-17")]
+        assert fake_sources.fallback == []
+
+    def test_trims_to_period_info(self, fake_sources, temp_dir):
+        """先行取得した気温データを period_info の期間（過去168行 + 未来168行）に切り出す"""
+        prepare.prepare_tomorrow_inputs(str(temp_dir))
+
+        saved = pd.read_csv(temp_dir / "tomorrow.csv")
+        assert len(saved) == 336
+        assert list(saved.columns) == list(tomorrow_temp.config.REQUIRED_COLUMNS)
+        assert (saved["MONTH"] == 7).all()
+        np.testing.assert_array_equal(saved["HOUR"], np.tile(np.arange(24), 14))
+        np.testing.assert_allclose(saved["TEMP"], 20 + saved["HOUR"] * 0.5)
+
+    def test_falls_back_outside_window(self, fake_sources, temp_dir):
+        """period_info の期間が先行取得範囲を外れる場合は期間指定で取得し直す"""
+        fake_sources.end_datetime = "2024-06-28 23:00:00"
+
+        assert prepare.prepare_tomorrow_inputs(str(temp_dir)) is None
+
+        assert fake_sources.fallback == [str(temp_dir / "tomorrow.csv")]
+        assert not (temp_dir / "tomorrow.csv").exists()
+
+    def test_data_error_reported(self, fake_sources, temp_dir, monkeypatch):
+        """電力データ取得のエラーは戻り値で返す"""
+        monkeypatch.setattr(tomorrow_data, "data", lambda *args: "TEPCO取得エラー")
+
+        result = prepare.prepare_tomorrow_inputs(str(temp_dir))
+
+        assert "TEPCO取得エラー" in result
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for tomorrow/temp.py module（時間別気温のディスクキャッシュ・複数地点取得）
+
+注意:
+- Open-Meteo API にはアクセスしない（request_temperature_data を差し替える）。
+"""
+
+import sys
+import re
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from tomorrow import temp as temp_module
+from common.stations import Station
+
+
+NOW = np.datetime64("2024-07-10T09:30:00")
+
+
+def _temperature(hours: np.ndarray, version: int = 0) -> np.ndarray:
+    """時間ごとに決まる合成気温（version で予測値の更新を表現）"""
+    return np.round(20 + (hours.astype("int64") % 24) * 0.5 + version, 1)
+
+
+@pytest.fixture
+def fake_api(temp_dir, monkeypatch):
+    """APIの代わりに URL の日付範囲・地点（緯度）ごとの合成データを返し、リクエスト範囲を記録（過去データAPIは+100℃）"""
+    monkeypatch.delenv("AI_TEMP_CACHE", raising=False)
+    monkeypatch.setattr(temp_module, "config", temp_module.TempConfig(TEMP_CACHE_DIR=str(temp_dir / "temperature")))
+    monkeypatch.setattr(temp_module, "local_now", lambda timezone: fake_api.now)
+    calls = []
+
+    def _request(api_url):
+        start, end = re.search(r"start_date=([\d-]+)&end_date=([\d-]+)", api_url).groups()
+        latitudes = re.search(r"latitude=([\d.,]+)", api_url).group(1).split(",")
+        calls.append((start, end) if len(latitudes) == 1 else (start, end, latitudes))
+        hours = np.arange(np.datetime64(start, "h"), np.datetime64(end, "h") + np.timedelta64(24, "h"))
+        offset = 100.0 if api_url.startswith(temp_module.config.OPEN_METEO_ARCHIVE_URL) else 0.0
+        items = [{"hourly": {"time": [str(h) + ":00" for h in hours],
+                             "temperature_2m": (_temperature(hours, fake_api.version) + float(lat) - 35.6785
+                                                + offset).tolist()}}
+                 for lat in latitudes]
+        return items[0] if len(items) == 1 else items
+    monkeypatch.setattr(temp_module, "request_temperature_data", _request)
+    fake_api.now = NOW
+    fake_api.version = 0
+    fake_api.calls = calls
+    return fake_api
+
+
+def _fetch(past_days=7, forecast_days=7):
+    return temp_module.fetch_temperature_data("35.6785", "139.6823", "Asia%2FTokyo", past_days, forecast_days)
+
+
+class TestTemperatureCache:
+    """時間別気温キャッシュのテスト"""
+
+    def test_second_call_uses_cache(self, fake_api):
+        """2回目はAPIにアクセスせず同じデータを返す"""
+        first = _fetch()
+        second = _fetch()
+
+        assert fake_api.calls == [("2024-07-03", "2024-07-16")]
+        assert first == second
+        assert len(first["hourly"]["time"]) == 14 * 24
+        assert first["hourly"]["time"][0] == "2024-07-03T00:00"
+
+    def test_next_day_fetches_only_new_hours(self, fake_api):
+        """翌日は未取得の日のみ取得（過去の時間は確定値として再利用）"""
+        _fetch()
+        fake_api.now = NOW + np.timedelta64(1, "D")
+        result = _fetch()
+
+        assert fake_api.calls[1] == ("2024-07-17", "2024-07-17")
+        assert result["hourly"]["time"][0] == "2024-07-04T00:00"
+        assert result["hourly"]["time"][-1] == "2024-07-17T23:00"
+
+    def test_expired_forecast_refetched(self, fake_api, monkeypatch):
+        """期限切れの予測値は再取得し、確定済みの過去の時間は再取得しない"""
+        monkeypatch.setattr(temp_module, "config", temp_module.TempConfig(
+            TEMP_CACHE_DIR=temp_module.config.TEMP_CACHE_DIR, FORECAST_TTL_SECONDS=0))
+        first = _fetch()
+        fake_api.version = 1
+        second = _fetch()
+
+        assert fake_api.calls[1] == ("2024-07-10", "2024-07-16")
+        past = 7 * 24 + 6  # 09:30 から3時間以上前（06:00まで）は確定値
+        assert second["hourly"]["temperature_2m"][:past] == first["hourly"]["temperature_2m"][:past]
+        assert second["hourly"]["temperature_2m"][-1] == first["hourly"]["temperature_2m"][-1] + 1
+
+    def test_matches_direct_request(self, fake_api, monkeypatch):
+        """キャッシュ経由の特徴量データはAPI直接取得と同じ"""
+        cached_df = temp_module.create_temperature_dataframe(_fetch(), include_time=True)
+        monkeypatch.setenv("AI_TEMP_CACHE", "0")
+        direct = temp_module.fetch_temperature_data("35.6785", "139.6823", "Asia%2FTokyo", 7, 7,
+                                                    "2024-07-03", "2024-07-16")
+        direct_df = temp_module.create_temperature_dataframe(direct, include_time=True)
+
+        pd.testing.assert_frame_equal(cached_df, direct_df)
+
+    def test_archive_not_served_from_forecast(self, fake_api):
+        """過去データAPIの取得は予測APIでキャッシュした時間を使わず、予測APIも過去データの値を使わない"""
+        forecast = _fetch()
+        archive_url = temp_module.config.OPEN_METEO_ARCHIVE_URL
+        coordinates = [("35.6785", "139.6823")]
+
+        hours, values = temp_module.fetch_hourly_matrix(coordinates, "Asia%2FTokyo", 0, 0,
+                                                        "2024-07-03", "2024-07-05", base_url=archive_url)
+
+        assert fake_api.calls == [("2024-07-03", "2024-07-16"), ("2024-07-03", "2024-07-05")]
+        np.testing.assert_allclose(values[:, 0], _temperature(hours) + 100.0)
+        assert _fetch() == forecast and len(fake_api.calls) == 2
+        temp_module.fetch_hourly_matrix(coordinates, "Asia%2FTokyo", 0, 0, "2024-07-03", "2024-07-05",
+                                        base_url=archive_url)
+        assert len(fake_api.calls) == 2
+
+    def test_env_var_disables(self, fake_api, monkeypatch, temp_dir):
+        """環境変数 AI_TEMP_CACHE=0 で無効化（キャッシュを作成しない）"""
+        monkeypatch.setenv("AI_TEMP_CACHE", "0")
+        monkeypatch.setattr(temp_module, "request_temperature_data",
+                            lambda api_url: fake_api.calls.append(api_url) or {"hourly": {"time": [], "temperature_2m": []}})
+        _fetch()
+        _fetch()
+
+        assert len(fake_api.calls) == 2
+        assert "past_days=7" in fake_api.calls[0]
+        assert not (temp_dir / "temperature").exists()
+
+
+STATIONS = (Station("東京", 35.6785, 139.6823, 2.0), Station("横浜", 35.4383, 139.6517, 1.0),
+            Station("千葉", 35.6017, 140.1033, 1.0))
+
+
+class TestWeightedTemperature:
+    """複数地点の加重平均気温のテスト"""
+
+    def test_single_batched_request(self, fake_api):
+        """地点数に関わらずAPIリクエストは1回、結果は加重平均"""
+        result = temp_module.fetch_weighted_temperature_data(STATIONS, "Asia%2FTokyo", 7, 7)
+
+        assert len(fake_api.calls) == 1
+        assert fake_api.calls[0][2] == ["35.6785", "35.4383", "35.6017"]
+        hours = np.arange(np.datetime64("2024-07-03T00"), np.datetime64("2024-07-17T00"))
+        offsets = np.array([0.0, 35.4383 - 35.6785, 35.6017 - 35.6785])
+        expected = _temperature(hours) + (offsets * [2, 1, 1]).sum() / 4
+        np.testing.assert_allclose(result["hourly"]["temperature_2m"], expected)
+
+    def test_cached_stations_not_requested(self, fake_api):
+        """キャッシュ済みの地点はリクエストに含めない"""
+        temp_module.fetch_weighted_temperature_data(STATIONS[:2], "Asia%2FTokyo", 7, 7)
+        temp_module.fetch_weighted_temperature_data(STATIONS, "Asia%2FTokyo", 7, 7)
+
+        assert fake_api.calls[1] == ("2024-07-03", "2024-07-16")  # 千葉のみ（1地点）
+
+    def test_temp_uses_station_env(self, fake_api, monkeypatch, temp_dir):
+        """環境変数 AI_TEMP_STATIONS の地点セットで TEMP 列を作成"""
+        monkeypatch.setenv("AI_TEMP_STATIONS", "東京:35.6785:139.6823:1;横浜:35.4383:139.6517:1")
+        monkeypatch.setattr(temp_module, "load_period_info", lambda path: None)
+        monkeypatch.setattr(temp_module, "load_latest_anchor_datetime", lambda path: None)
+        output = temp_dir / "tomorrow.csv"
+
+        assert temp_module.temp("35.6785", "139.6823", "Asia%2FTokyo", str(output), 7, 7) is None
+
+        saved = pd.read_csv(output)
+        assert len(fake_api.calls) == 1 and len(fake_api.calls[0]) == 3
+        assert saved["TEMP"].iloc[0] == pytest.approx(20 + (35.4383 - 35.6785) / 2, abs=1e-5)
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/training_service.py module（常駐学習ワーカー・メモリ上のデータセット）
+
+注意:
+- 実際の学習モジュールは読み込まない（学習モジュールの代わりに待機して結果を返すモジュールを登録し、
+  fork で起動したワーカーに引き継ぐ）。
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+import pytest
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import pipeline, training_service
+from data import data as data_module
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が使えない環境")
+
+DELAY = 0.5
+
+
+def _fake_trainer(run_dir: Path, delay: float = DELAY):
+    """待機後にプロセスIDを RMSE として返す学習モジュール（学習の開始・終了時刻を run_dir に記録）"""
+    def train(*args, dataset=None, learning_rate=None, **kwargs):
+        if learning_rate == "fail":
+            raise ValueError("学習率が不正です")
+        started = time.time()
+        time.sleep(delay)
+        (run_dir / f"{os.getpid()}-{time.time_ns()}.txt").write_text(f"{started} {time.time()}")
+        return float(os.getpid()), 0.9, float(len(dataset.X_train))
+    return types.SimpleNamespace(train=train)
+
+
+def _training_runs(run_dir: Path) -> dict:
+    """ワーカーのプロセスIDごとの学習の (開始, 終了) 時刻"""
+    runs = {}
+    for path in run_dir.iterdir():
+        started, finished = map(float, path.read_text().split())
+        runs.setdefault(int(path.name.split("-")[0]), []).append((started, finished))
+    return runs
+
+
+@pytest.fixture
+def fake_data(temp_dir, monkeypatch):
+    """データセット作成・保存を記録し、学習モジュールを差し替えたサービス"""
+    (temp_dir / "juyo-2024.csv").write_text("2024", encoding="utf-8")
+    (temp_dir / "temperature-2024.csv").write_text("2024", encoding="utf-8")
+    builds, persists = [], []
+    run_dir = temp_dir / "runs"
+    run_dir.mkdir()
+
+    def _build(years, data_dir):
+        builds.append(years)
+        X_df = pd.DataFrame({"MONTH": np.arange(20) % 12 + 1, "TEMP": np.linspace(0, 30, 20)})
+        return X_df, pd.DataFrame({"KW": np.arange(20) + 3000})
+
+    monkeypatch.setattr(data_module, "build_feature_target", _build)
+    monkeypatch.setattr(pipeline, "persist_dataset", lambda *args: persists.append(args))
+    monkeypatch.delenv("AI_TARGET_YEARS", raising=False)
+    for model_name in ("LightGBM", "RandomForest"):
+        monkeypatch.setitem(pipeline._module_cache, f"{model_name}_train", _fake_trainer(run_dir))
+
+    service = training_service.TrainingService(data_dir=str(temp_dir), start_method="fork")
+    fake_data.service = service
+    fake_data.builds = builds
+    fake_data.persists = persists
+    fake_data.run_dir = run_dir
+    yield fake_data
+    service.shutdown()
+
+
+class TestDatasetStore:
+    """メモリ上のデータセットキャッシュのテスト"""
+
+    def test_reused_until_source_changes(self, fake_data, temp_dir):
+        """同じ対象年は再作成・再保存せず、元データが更新されたら作成し直す"""
+        store = fake_data.service.datasets
+        first, cached_first = store.get(["2024"])
+        second, cached_second = store.get(["2024"])
+
+        assert (cached_first, cached_second) == (False, True)
+        assert second is first
+        assert len(fake_data.builds) == 1 and len(fake_data.persists) == 1
+
+        os.utime(temp_dir / "juyo-2024.csv", ns=(0, time.time_ns() + 10 ** 9))
+        store.get(["2024"])
+        assert len(fake_data.builds) == 2
+
+    def test_switching_years_repersists(self, fake_data):
+        """別の対象年を保存した後は、キャッシュ済みの年でもデータセットファイルを保存し直す"""
+        store = fake_data.service.datasets
+        store.get(["2024"])
+        store.get(["2023", "2024"])
+        store.get(["2024"])
+
+        assert len(fake_data.builds) == 2
+        assert len(fake_data.persists) == 3
+
+
+class TestTrainingService:
+    """常駐学習ワーカーのテスト"""
+
+    def test_worker_stays_warm(self, fake_data):
+        """同じモデルの学習は同じワーカープロセスで実行（プロセスを起動し直さない）"""
+        first = fake_data.service.train("LightGBM", ["2024"])
+        second = fake_data.service.train("LightGBM", ["2024"])
+
+        assert first["status"] == second["status"] == "ok"
+        assert first["rmse"] == second["rmse"] != float(os.getpid())
+        assert first["mae"] == 18.0
+        assert (first["dataset_cached"], second["dataset_cached"]) == (False, True)
+
+    def test_models_train_concurrently(self, fake_data):
+        """異なるモデルは別プロセスで並行に学習する（学習中の時間帯が重なる）"""
+        fake_data.service.warmup(["LightGBM", "RandomForest"])
+        results = {}
+
+        def _train(model_name):
+            results[model_name] = fake_data.service.train(model_name, ["2024"])
+
+        threads = [threading.Thread(target=_train, args=(name,)) for name in ("LightGBM", "RandomForest")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        runs = _training_runs(fake_data.run_dir)
+
+        assert all(result["status"] == "ok" for result in results.values())
+        assert sorted(runs) == sorted(int(result["rmse"]) for result in results.values())
+        (first,), (second,) = runs.values()
+        assert max(first[0], second[0]) < min(first[1], second[1])
+
+    def test_concurrent_requests_keep_stdout(self, fake_data, monkeypatch):
+        """並行する学習要求はそれぞれのデータセット作成メッセージを受け取り、sys.stdout は差し替えない"""
+        build = data_module.build_feature_target
+
+        def _slow_build(years, data_dir):
+            data_module.report_progress(f"作成: {years}")
+            time.sleep(0.2)
+            return build(years, data_dir)
+
+        monkeypatch.setattr(data_module, "build_feature_target", _slow_build)
+        stdout = sys.stdout
+        results = {}
+
+        def _train(model_name, years):
+            results[model_name] = fake_data.service.train(model_name, years)
+
+        threads = [threading.Thread(target=_train, args=("LightGBM", ["2024"])),
+                   threading.Thread(target=_train, args=("RandomForest", ["2023", "2024"]))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sys.stdout is stdout
+        assert "作成: ['2024']" in results["LightGBM"]["stdout"]
+        assert "作成: ['2023', '2024']" in results["RandomForest"]["stdout"]
+        assert "2023" not in results["LightGBM"]["stdout"]
+        assert all("メモリ上のデータセット作成完了" in result["stdout"] for result in results.values())
+
+    def test_training_error_reported(self, fake_data):
+        """学習中の例外はエラー結果として返し、ワーカーは引き続き使用できる"""
+        failed = fake_data.service.train("LightGBM", ["2024"], {"learning_rate": "fail"})
+        succeeded = fake_data.service.train("LightGBM", ["2024"])
+
+        assert failed["status"] == "error" and failed["returncode"] == 1
+        assert "学習率が不正です" in failed["stderr"]
+        assert succeeded["status"] == "ok"
+
+    def test_dead_worker_restarted(self, fake_data):
+        """停止したワーカーは次の学習要求で起動し直す"""
+        first = fake_data.service.train("LightGBM", ["2024"])
+        fake_data.service._workers["LightGBM"].process.kill()
+        fake_data.service._workers["LightGBM"].process.join()
+
+        second = fake_data.service.train("LightGBM", ["2024"])
+
+        assert second["status"] == "ok"
+        assert second["rmse"] != first["rmse"]
+
+    def test_invalid_request_raises(self, fake_data):
+        """未対応のモデル名・パラメータはValueError"""
+        with pytest.raises(ValueError, match="未対応のモデル名"):
+            fake_data.service.train("InvalidModel")
+        with pytest.raises(ValueError, match="未対応のパラメータ"):
+            fake_data.service.train("LightGBM", params={"n_layers": 3})
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/trees.py module（決定木アンサンブルの NumPy 推論・メモリマップ用ファイル）
+
+注意:
+- 合成データで学習した小さなモデルを使用する（train/ 配下のモデルファイルは使用しない）。
+"""
+
+import sys
+import pickle
+import pytest
+import numpy as np
+from pathlib import Path
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import artifact
+from common import trees
+from common.trees import TreeEnsemble
+
+lgb = pytest.importorskip("lightgbm")
+
+
+def _synthetic(n_rows: int = 2000, seed: int = 0):
+    """需要に似た非線形の合成データ（float32特徴量）"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, 5)).astype(np.float32)
+    y = 3000 + X[:, 0] * 100 + X[:, 1] ** 2 * 50 + np.sin(X[:, 2]) * 30 + rng.normal(size=n_rows) * 5
+    return X, y
+
+
+class TestFromLightGBM:
+    """LightGBM モデルの変換のテスト"""
+
+    def test_matches_booster(self):
+        """LGBMRegressor.predict と同じ予測値になる"""
+        X, y = _synthetic()
+        model = lgb.LGBMRegressor(n_estimators=100, verbose=-1).fit(X, y)
+
+        ensemble = TreeEnsemble.from_lightgbm(model)
+
+        assert ensemble.n_trees == 100 and ensemble.n_features == 5
+        X_new, _ = _synthetic(500, seed=1)
+        np.testing.assert_allclose(ensemble.predict(X_new), model.predict(X_new), rtol=1e-12)
+
+    def test_missing_values(self):
+        """NaN・ゼロを欠損値として学習したモデルも LightGBM と同じ分岐をたどる"""
+        X, y = _synthetic()
+        X[::5, 0] = np.nan
+        X[::7, 1] = 0.0
+        X_new, _ = _synthetic(500, seed=1)
+        X_new[::3, 0] = np.nan
+        X_new[::4, 1] = 0.0
+        X_new[::6, 2] = np.nan
+
+        for zero_as_missing in (False, True):
+            model = lgb.LGBMRegressor(n_estimators=50, verbose=-1, zero_as_missing=zero_as_missing).fit(X, y)
+            ensemble = TreeEnsemble.from_lightgbm(model)
+            np.testing.assert_allclose(ensemble.predict(X_new), model.predict(X_new), rtol=1e-12)
+
+    def test_unsupported_objective(self):
+        """回帰以外の目的関数はValueError"""
+        X, y = _synthetic(200)
+        model = lgb.LGBMRegressor(n_estimators=5, objective="poisson", verbose=-1).fit(X, y)
+
+        with pytest.raises(ValueError, match="目的関数"):
+            TreeEnsemble.from_lightgbm(model)
+
+
+class TestFromSklearn:
+    """RandomForest モデルの変換のテスト"""
+
+    def test_matches_random_forest(self):
+        """RandomForestRegressor.predict と同じ予測値になる（float64 の入力も float32 に変換して比較）"""
+        X, y = _synthetic()
+        model = RandomForestRegressor(n_estimators=20, max_depth=12, min_samples_leaf=2, random_state=0).fit(X, y)
+
+        ensemble = TreeEnsemble.from_sklearn(model)
+
+        X_new = np.random.default_rng(1).normal(size=(3000, 5))
+        assert ensemble.max_depth == 12
+        np.testing.assert_allclose(ensemble.predict(X_new), model.predict(X_new), rtol=1e-12)
+        np.testing.assert_allclose(ensemble.predict(X), model.predict(X), rtol=1e-12)
+
+    def test_batches_rows(self, monkeypatch):
+        """（行数×木の数）の上限ごとに分割しても同じ予測値になる"""
+        X, y = _synthetic(500)
+        model = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=0).fit(X, y)
+        ensemble = TreeEnsemble.from_sklearn(model)
+        expected = ensemble.predict(X)
+
+        monkeypatch.setattr("common.trees.MAX_BATCH_CELLS", 70)
+
+        np.testing.assert_array_equal(ensemble.predict(X), expected)
+
+    def test_unsupported_model(self):
+        """決定木の平均で予測するアンサンブル以外はValueError"""
+        X, y = _synthetic(200)
+        model = GradientBoostingRegressor(n_estimators=5).fit(X, y)
+
+        with pytest.raises(ValueError, match="未対応のモデル"):
+            TreeEnsemble.from_sklearn(model)
+
+    def test_feature_count_checked(self):
+        """特徴量数が学習時と異なる場合はValueError"""
+        X, y = _synthetic(200)
+        ensemble = TreeEnsemble.from_sklearn(RandomForestRegressor(n_estimators=2).fit(X, y))
+
+        with pytest.raises(ValueError, match="特徴量数"):
+            ensemble.predict(X[:, :4])
+
+
+class TestTreeFile:
+    """メモリマップ用のノード配列ファイルのテスト"""
+
+    def test_compact_arrays(self):
+        """RandomForest は小さな整数型の特徴量番号・float32 のしきい値・int32 の子ノードで保持する"""
+        X, y = _synthetic(500)
+        ensemble = TreeEnsemble.from_sklearn(RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y))
+
+        assert ensemble.feature.dtype == np.int8 and ensemble.threshold.dtype == np.float32
+        assert ensemble.left.dtype == ensemble.right.dtype == np.int32
+        assert len(ensemble.leaf_value) == len(ensemble.feature) + ensemble.n_trees
+
+    def test_round_down_float32(self):
+        """float32 に切り下げたしきい値でも float32 の特徴量の分岐は変わらない"""
+        upper = np.float32(1.0) + np.finfo(np.float32).eps
+        threshold = np.array([(1.0 + float(upper)) / 2 + 1e-12, 0.1, -0.1])
+
+        rounded = trees.round_down_float32(threshold)
+
+        x = np.array([1.0, upper, 0.1, -0.1], dtype=np.float32)
+        assert rounded[0] == np.float32(1.0)
+        for value in x:
+            np.testing.assert_array_equal(value <= rounded, value.astype(np.float64) <= threshold)
+
+    def test_save_and_mmap(self, temp_dir):
+        """保存したファイルをメモリマップして読み込み、同じ予測値になる"""
+        X, y = _synthetic()
+        ensemble = TreeEnsemble.from_sklearn(
+            RandomForestRegressor(n_estimators=10, max_depth=10, random_state=0).fit(X, y))
+        path = str(temp_dir / "model.trees")
+        ensemble.save(path, file_id="abc")
+
+        loaded = TreeEnsemble.load(path, file_id="abc")
+
+        assert not loaded.threshold.flags.writeable
+        assert loaded.max_depth == ensemble.max_depth and loaded.float32_input
+        np.testing.assert_array_equal(loaded.predict(X), ensemble.predict(X))
+        np.testing.assert_array_equal(TreeEnsemble.load(path, use_mmap=False).predict(X), ensemble.predict(X))
+
+    def test_invalid_file(self, temp_dir):
+        """識別子・照合用IDが一致しないファイル、途中で切れたファイルはValueError"""
+        X, y = _synthetic(200)
+        path = temp_dir / "model.trees"
+        TreeEnsemble.from_lightgbm(lgb.LGBMRegressor(n_estimators=5, verbose=-1).fit(X, y)).save(str(path), "abc")
+
+        with pytest.raises(ValueError, match="対応していません"):
+            TreeEnsemble.load(str(path), file_id="other")
+        path.write_bytes(path.read_bytes()[:-100])
+        with pytest.raises(ValueError, match="途中で切れています"):
+            TreeEnsemble.load(str(path))
+        path.write_bytes(b"broken")
+        with pytest.raises(ValueError, match="形式が不正"):
+            TreeEnsemble.load(str(path))
+
+
+class TestTreeBundle:
+    """決定木モデルのバンドル保存・読み込みのテスト"""
+
+    @pytest.mark.parametrize("model_format", [artifact.FORMAT_LIGHTGBM, artifact.FORMAT_SKLEARN])
+    def test_bundle_uses_node_arrays(self, temp_dir, monkeypatch, model_format):
+        """ノード配列から TreeEnsemble を復元し、AI_TREE_NUMPY=0 では保存時のモデルを復元する"""
+        X, y = _synthetic(500)
+        if model_format == artifact.FORMAT_LIGHTGBM:
+            model = lgb.LGBMRegressor(n_estimators=30, verbose=-1).fit(X, y)
+        else:
+            model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+            # 推定器は学習スクリプトが保存する .sav（バンドルは pickle を持たない）
+            with open(temp_dir / "model.sav", "wb") as f:
+                pickle.dump(model, f)
+        path = artifact.bundle_path(str(temp_dir / "model.sav"))
+        artifact.save_artifact(path, artifact.build_artifact(
+            "Model", model_format, model, None, X, y, ["A", "B", "C", "D", "E"]))
+
+        monkeypatch.delenv("AI_TREE_NUMPY", raising=False)
+        numpy_bundle = artifact.load_artifact(path)
+        monkeypatch.setenv("AI_TREE_NUMPY", "0")
+        library_bundle = artifact.load_artifact(path)
+
+        assert isinstance(numpy_bundle.model, TreeEnsemble)
+        assert not isinstance(library_bundle.model, TreeEnsemble)
+        assert (temp_dir / "model.trees").exists()
+        np.testing.assert_allclose(numpy_bundle.predict(X), library_bundle.predict(X), rtol=1e-12)
+
+    def test_stale_tree_file_ignored(self, temp_dir, monkeypatch):
+        """バンドルと対応しないノード配列ファイル（別の学習で上書き）は使わず、.sav の推定器で予測する"""
+        monkeypatch.delenv("AI_TREE_NUMPY", raising=False)
+        X, y = _synthetic(500)
+        path = artifact.bundle_path(str(temp_dir / "model.sav"))
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, y)
+        with open(temp_dir / "model.sav", "wb") as f:
+            pickle.dump(model, f)
+        artifact.save_artifact(path, artifact.build_artifact(
+            "RandomForest", artifact.FORMAT_SKLEARN, model, None, X, y, ["A", "B", "C", "D", "E"]))
+        TreeEnsemble.from_sklearn(RandomForestRegressor(n_estimators=3, random_state=1).fit(X, y)).save(
+            artifact.tree_file_path(path), file_id="other")
+
+        bundle = artifact.load_artifact(path)
+
+        assert isinstance(bundle.model, RandomForestRegressor)
+        np.testing.assert_array_equal(bundle.predict(X), model.predict(X))
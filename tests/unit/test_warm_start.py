@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Unit Tests for common/warm_start.py module（追加学習・全体再学習の判定）
+
+注意:
+- 合成データで学習した小さな RandomForest のバンドルを使用する（train/ 配下のモデルファイルは使用しない）。
+"""
+
+import sys
+import pickle
+import datetime
+import pytest
+import numpy as np
+from pathlib import Path
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler
+
+# Import module under test
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "AI"))
+from common import artifact, warm_start
+
+COLUMNS = ["MONTH", "WEEK", "HOUR", "TEMP"]
+NOW = datetime.datetime(2025, 10, 20, 6, 0)
+
+
+def _synthetic(n_rows: int = 1000):
+    """需要に似た時系列の合成データ（float32特徴量）"""
+    t = np.arange(n_rows)
+    temp = 15 + 10 * np.sin(t / 200) + np.random.default_rng(0).normal(size=n_rows)
+    X = np.column_stack([t // 720 % 12 + 1, t // 24 % 7, t % 24, temp]).astype(np.float32)
+    y = (3000 + X[:, 2] * 20 + (X[:, 3] - 15) ** 2 * 3).astype(np.float32)
+    return X, y
+
+
+def _save_bundle(model_path: str, X: np.ndarray, y: np.ndarray, training: dict, rmse: float = 50.0):
+    """合成データで学習した RandomForest のモデルファイル・バンドルを学習モード付きで保存する（学習スクリプトと同じ順）"""
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(scaler.transform(X), y)
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+    artifact.save_artifact(artifact.bundle_path(model_path), artifact.build_artifact(
+        "RandomForest", artifact.FORMAT_SKLEARN, model, scaler, X, y, COLUMNS, {"rmse": rmse},
+        training=training))
+
+
+def _previous_full(X: np.ndarray, y: np.ndarray, days_ago: float = 1.0) -> dict:
+    """days_ago 日前に全体再学習した学習モード"""
+    plan = warm_start.WarmStartPlan(warm_start.MODE_FULL, "テスト")
+    return warm_start.training_info(plan, X, y, now=NOW - datetime.timedelta(days=days_ago))
+
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setenv(warm_start.WARM_START_ENV_VAR, "1")
+
+
+class TestPlanTraining:
+    """学習モードの判定のテスト"""
+
+    def test_disabled_by_default(self, temp_dir, monkeypatch):
+        """AI_WARM_START が未設定・無効値なら前回のバンドルがあっても全体再学習"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X[:-48], y[:-48], _previous_full(X[:-48], y[:-48]))
+
+        for value in (None, "0", "false"):
+            if value is None:
+                monkeypatch.delenv(warm_start.WARM_START_ENV_VAR, raising=False)
+            else:
+                monkeypatch.setenv(warm_start.WARM_START_ENV_VAR, value)
+            assert warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW).is_full
+
+    def test_no_previous_bundle(self, temp_dir, enabled):
+        """前回のバンドルがない・読み込めない場合は全体再学習"""
+        X, y = _synthetic()
+        model_path = temp_dir / "model.sav"
+
+        assert warm_start.plan_training(str(model_path), X, y, COLUMNS, now=NOW).is_full
+        Path(artifact.bundle_path(str(model_path))).write_bytes(b"broken")
+        assert warm_start.plan_training(str(model_path), X, y, COLUMNS, now=NOW).is_full
+
+    def test_appended_rows_warm_start(self, temp_dir, enabled):
+        """前回の学習データに行が追加された場合は追加学習（前回のモデル・スケーラーを引き継ぐ）"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X[:-48], y[:-48], _previous_full(X[:-48], y[:-48]))
+
+        plan = warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW)
+
+        assert plan.mode == warm_start.MODE_WARM
+        assert isinstance(plan.previous.model, RandomForestRegressor)
+        X_recent, y_recent = plan.recent_window(X, y)
+        assert len(X_recent) == len(y_recent) == warm_start.config.RECENT_WINDOW_HOURS
+        np.testing.assert_array_equal(X_recent[-1], X[-1])
+
+    def test_same_data_reuses_model(self, temp_dir, enabled):
+        """学習データが前回と同じ場合は前回のモデルを再利用"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X, y, _previous_full(X, y))
+
+        assert warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW).mode == warm_start.MODE_REUSE
+
+    def test_scheduled_full_retrain(self, temp_dir, enabled):
+        """前回の全体再学習から FULL_RETRAIN_DAYS 日以上経過したら全体再学習"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X[:-48], y[:-48],
+                     _previous_full(X[:-48], y[:-48], days_ago=warm_start.config.FULL_RETRAIN_DAYS))
+
+        plan = warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW)
+
+        assert plan.is_full and "定期的な全体再学習" in plan.reason
+
+    def test_history_changed(self, temp_dir, enabled):
+        """特徴量の列・学習データの先頭（対象年）が前回と異なる場合は全体再学習"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X[:-48], y[:-48], _previous_full(X[:-48], y[:-48]))
+
+        assert warm_start.plan_training(model_path, X, y, ["MONTH", "WEEK", "HOUR", "TEMP2"], now=NOW).is_full
+        assert warm_start.plan_training(model_path, X[24:], y[24:], COLUMNS, now=NOW).is_full
+
+    @pytest.mark.parametrize("kind", ["rmse", "range"])
+    def test_drift_full_retrain(self, temp_dir, enabled, kind):
+        """追加された行で前回モデルの誤差が大きい・特徴量範囲外の行が多い場合は全体再学習"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        _save_bundle(model_path, X[:-48], y[:-48], _previous_full(X[:-48], y[:-48]), rmse=10.0)
+        X, y = X.copy(), y.copy()
+        if kind == "rmse":
+            y[-48:] += 1000
+        else:
+            X[-48:, 3] = 60.0
+
+        plan = warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW)
+
+        assert plan.is_full and "ドリフト検出" in plan.reason
+
+
+class TestTrainingInfo:
+    """バンドルに記録する学習モードのテスト"""
+
+    def test_carry_over(self, temp_dir, enabled):
+        """追加学習・再利用は前回の全体再学習日時を引き継ぎ、全体再学習で更新する"""
+        X, y = _synthetic()
+        model_path = str(temp_dir / "model.sav")
+        previous = _previous_full(X[:-48], y[:-48])
+        _save_bundle(model_path, X[:-48], y[:-48], previous)
+        plan = warm_start.plan_training(model_path, X, y, COLUMNS, now=NOW)
+
+        warm = warm_start.training_info(plan, X, y, now=NOW)
+        full = warm_start.training_info(warm_start.WarmStartPlan(warm_start.MODE_FULL, "テスト"), X, y, now=NOW)
+
+        assert warm["mode"] == warm_start.MODE_WARM
+        assert warm["full_trained_at"] == previous["full_trained_at"]
+        assert warm["warm_updates"] == 1 and warm["train_rows"] == len(X)
+        assert full["full_trained_at"] == NOW.isoformat(timespec="seconds") and full["warm_updates"] == 0
+
+    def test_saved_in_bundle(self, temp_dir):
+        """学習モードはバンドルの meta に保存され、library_model=True なら学習ライブラリのモデルを復元する"""
+        X, y = _synthetic(200)
+        model_path = str(temp_dir / "model.sav")
+        training = _previous_full(X, y)
+        _save_bundle(model_path, X, y, training)
+
+        bundle = artifact.load_artifact(artifact.bundle_path(model_path), library_model=True)
+
+        assert bundle.training == training
+        assert isinstance(bundle.model, RandomForestRegressor)